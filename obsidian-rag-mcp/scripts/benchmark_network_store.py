@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+NetworkMetadataStore 마이크로 벤치마크
+
+합성 링크 그래프(기본 10,000개 노트)로 제목 해석, 백링크 계산, 노트 수정 시
+백링크 갱신, CSR 링크 그래프의 메모리/순회 성능, 저장/로드 시간을 측정합니다.
+실제 Vault나 데이터 파일은 건드리지 않습니다.
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from network_store import NetworkMetadataStore
+
+
+def build_synthetic_metadata(num_notes: int, links_per_note: int, seed: int = 42) -> dict:
+    """합성 네트워크 메타데이터 생성
+
+    Args:
+        num_notes: 노트 수
+        links_per_note: 노트당 포워드링크 수
+        seed: 난수 시드
+
+    Returns:
+        NetworkMetadataStore.metadata 형식의 딕셔너리
+    """
+    rng = random.Random(seed)
+    titles = [f"Note {i:05d}" for i in range(num_notes)]
+    files = {}
+    for i, title in enumerate(titles):
+        folder = f"{i % 10:02d} Folder"
+        targets = rng.sample(titles, links_per_note)
+        files[f"/vault/{folder}/{title}.md"] = {
+            "title": title,
+            "para_folder": folder,
+            "backlinks": [],
+            "forward_links": [t for t in targets if t != title],
+            "tags": [f"tag{i % 50}"],
+            "yaml_frontmatter": {
+                "created": f"2024-{i % 12 + 1:02d}-01",
+                "status": "draft",
+                "summary": f"{title} 요약 " * 20,
+            },
+        }
+    return {
+        "version": "2.0.0",
+        "last_update": "",
+        "files": files,
+        "stats": {"total_files": 0, "total_backlinks": 0, "orphaned_notes": 0},
+    }
+
+
+def linear_find_file_by_title(store: NetworkMetadataStore, title: str):
+    """기존 방식(전체 선형 탐색) 제목 해석 - 비교 기준"""
+    for file_path, file_data in store.metadata["files"].items():
+        if file_data["title"] == title:
+            return file_path
+    return None
+
+
+def build_edit_docs(
+    store: NetworkMetadataStore, count: int, links_per_note: int, seed: int = 3
+) -> list:
+    """기존 노트의 링크를 바꾼 update_metadata() 입력 문서 생성"""
+    rng = random.Random(seed)
+    paths = rng.sample(sorted(store.metadata["files"]), count)
+    titles = list(store.title_index)
+    docs = []
+    for path in paths:
+        targets = rng.sample(titles, links_per_note)
+        docs.append(
+            {
+                "path": path,
+                "title": store.metadata["files"][path]["title"],
+                "content": " ".join(f"[[{t}]]" for t in targets),
+                "metadata": {},
+                "para_folder": store.metadata["files"][path]["para_folder"],
+            }
+        )
+    return docs
+
+
+def adjacency_dict_bytes(store: NetworkMetadataStore) -> int:
+    """딕셔너리 방식 인접 리스트(forward_links/backlinks)의 대략적인 메모리"""
+    total = 0
+    for path, file_data in store.metadata["files"].items():
+        total += sys.getsizeof(path)
+        for key in ("forward_links", "backlinks"):
+            links = file_data[key]
+            total += sys.getsizeof(links) + sum(sys.getsizeof(link) for link in links)
+    return total
+
+
+def dict_two_hop(store: NetworkMetadataStore, path: str) -> set:
+    """딕셔너리 + 제목 해석으로 2-hop 포워드 이웃 수집 (비교 기준)"""
+    files = store.metadata["files"]
+    reached = set()
+    frontier = [path]
+    for _ in range(2):
+        next_frontier = []
+        for current in frontier:
+            for link in files[current]["forward_links"]:
+                target = store._find_file_by_title(link)
+                if target and target not in reached:
+                    reached.add(target)
+                    next_frontier.append(target)
+        frontier = next_frontier
+    return reached
+
+
+def csr_two_hop(graph, node: int) -> set:
+    """CSR 배열로 2-hop 포워드 이웃 수집"""
+    first = graph.successors(node)
+    reached = set(first.tolist())
+    for neighbor in first:
+        reached.update(graph.successors(neighbor).tolist())
+    return reached
+
+
+def timed(func, *args):
+    """함수 실행 시간(초)과 결과 반환"""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def benchmark(num_notes: int, links_per_note: int, lookups: int, updates: int):
+    """벤치마크 실행"""
+    print("╔══════════════════════════════════════════════════════════╗")
+    print("║                                                          ║")
+    print("║         NetworkMetadataStore Benchmark                   ║")
+    print("║                                                          ║")
+    print("╚══════════════════════════════════════════════════════════╝")
+    print()
+    print(f"  📊 노트 {num_notes:,}개, 노트당 링크 {links_per_note}개")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = NetworkMetadataStore(metadata_file=Path(tmpdir) / "network_metadata.json")
+
+        elapsed, _ = timed(
+            setattr, store, "metadata", build_synthetic_metadata(num_notes, links_per_note)
+        )
+        print(f"  ✅ 메타데이터 로드 + 인덱스 구축: {elapsed * 1000:.1f}ms")
+
+        # 1. 제목 해석: 선형 탐색 vs 제목 인덱스
+        rng = random.Random(7)
+        titles = [f"Note {rng.randrange(num_notes):05d}" for _ in range(lookups)]
+
+        linear_time, _ = timed(
+            lambda: [linear_find_file_by_title(store, t) for t in titles]
+        )
+        indexed_time, _ = timed(lambda: [store._find_file_by_title(t) for t in titles])
+
+        print()
+        print(f"  🔎 제목 해석 {lookups:,}회")
+        print(f"     - 선형 탐색: {linear_time * 1000:.1f}ms ({linear_time / lookups * 1e6:.1f}µs/회)")
+        print(f"     - 제목 인덱스: {indexed_time * 1000:.2f}ms ({indexed_time / lookups * 1e6:.2f}µs/회)")
+        if indexed_time > 0:
+            print(f"     - 개선: {linear_time / indexed_time:,.0f}배")
+
+        # 2. 전체 백링크 재계산
+        rebuild_time, _ = timed(store._rebuild_backlinks)
+        print()
+        print(f"  🔗 전체 백링크 재계산: {rebuild_time * 1000:.1f}ms")
+
+        # 3. 단일 노트 수정: 델타 갱신 vs 매번 전체 재계산 (기존 방식)
+        edits = build_edit_docs(store, updates, links_per_note)
+        delta_time, _ = timed(lambda: [store.update_metadata(doc) for doc in edits])
+        full_time, _ = timed(
+            lambda: [store._rebuild_backlinks() for _ in range(min(updates, 20))]
+        )
+        full_per_update = full_time / min(updates, 20)
+        delta_per_update = delta_time / updates
+
+        print()
+        print(f"  ✏️  노트 수정 {updates:,}회")
+        print(f"     - 전체 재계산(기존): {full_per_update * 1000:.1f}ms/회")
+        print(f"     - 델타 갱신: {delta_per_update * 1e6:.1f}µs/회")
+        if delta_per_update > 0:
+            print(f"     - 개선: {full_per_update / delta_per_update:,.0f}배")
+
+        # 4. 일괄 업데이트: batch()로 백링크 계산 1회
+        edits = build_edit_docs(store, updates, links_per_note, seed=11)
+        batch_time, _ = timed(store.update_many, edits)
+        print()
+        print(f"  📦 update_many {updates:,}개: {batch_time * 1000:.1f}ms")
+
+        # 5. CSR 링크 그래프: 구축 시간, 메모리, 2-hop 순회
+        graph_time, graph = timed(lambda: store.graph)
+        dict_bytes = adjacency_dict_bytes(store)
+        print()
+        print(f"  🕸️  CSR 그래프 구축: {graph_time * 1000:.1f}ms "
+              f"(노드 {graph.num_nodes:,}개, 간선 {graph.num_edges:,}개)")
+        print(f"     - 인접 리스트 메모리: dict {dict_bytes / 1024:,.0f}KB → "
+              f"CSR {graph.memory_bytes() / 1024:,.0f}KB")
+
+        starts = [rng.randrange(graph.num_nodes) for _ in range(lookups)]
+        start_paths = [graph.paths[i] for i in starts]
+        dict_hop_time, dict_reached = timed(
+            lambda: [len(dict_two_hop(store, p)) for p in start_paths]
+        )
+        csr_hop_time, csr_reached = timed(
+            lambda: [len(csr_two_hop(graph, i)) for i in starts]
+        )
+        assert dict_reached == csr_reached
+        print(f"     - 2-hop 순회 {lookups:,}회: dict {dict_hop_time * 1000:.1f}ms → "
+              f"CSR {csr_hop_time * 1000:.1f}ms")
+
+        # 6. 두 노트 연결 경로 (BFS 최단 경로)
+        pairs = [
+            (graph.titles[rng.randrange(graph.num_nodes)], graph.titles[rng.randrange(graph.num_nodes)])
+            for _ in range(200)
+        ]
+        path_time, paths = timed(lambda: [store.find_path(a, b) for a, b in pairs])
+        found = [len(p) - 1 for p in paths if p]
+        print(f"     - 최단 경로 {len(pairs)}회: {path_time / len(pairs) * 1000:.2f}ms/회 "
+              f"(평균 {sum(found) / max(len(found), 1):.1f}단계)")
+
+        # 7. 태그 조회: 전체 스캔 vs 태그 역인덱스
+        tags = [f"tag{rng.randrange(50)}" for _ in range(200)]
+        scan_time, _ = timed(
+            lambda: [
+                [d["title"] for d in store.metadata["files"].values() if t in d["tags"]]
+                for t in tags
+            ]
+        )
+        index_time, _ = timed(lambda: [store.get_paths_by_tag(t) for t in tags])
+        print()
+        print(f"  🏷️  태그 조회 {len(tags)}회: 전체 스캔 {scan_time / len(tags) * 1000:.2f}ms/회 → "
+              f"역인덱스 {index_time / len(tags) * 1000:.3f}ms/회")
+
+        # 8. 저장/로드: 들여쓰기 JSON(기존) vs SQLite (지연 로드 + 증분 저장)
+        legacy_file = Path(tmpdir) / "legacy.json"
+
+        def write_legacy():
+            with open(legacy_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {**store.metadata, "files": dict(store.metadata["files"])},
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+
+        def read_legacy():
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        legacy_save_time, _ = timed(write_legacy)
+        legacy_read_time, _ = timed(read_legacy)
+
+        db_file = Path(tmpdir) / "network_metadata.db"
+        store.metadata_file = db_file
+        db_save_time, _ = timed(store.save_metadata)
+        db_read_time, _ = timed(store.load_metadata)
+        db_load_time, db_store = timed(NetworkMetadataStore, db_file)
+        db_store.update_many(build_edit_docs(db_store, 10, links_per_note, seed=13))
+        incremental_time, _ = timed(db_store.save_metadata)
+
+        print()
+        print(f"  💾 저장/로드 (JSON {legacy_file.stat().st_size / 1024:,.0f}KB → "
+              f"SQLite {db_file.stat().st_size / 1024:,.0f}KB)")
+        print(f"     - 전체 저장: JSON {legacy_save_time * 1000:.1f}ms → "
+              f"SQLite {db_save_time * 1000:.1f}ms")
+        print(f"     - 파일 읽기: JSON 전체 {legacy_read_time * 1000:.1f}ms → "
+              f"SQLite 헤더+요약 {db_read_time * 1000:.1f}ms")
+        print(f"     - SQLite 로드 + 인덱스 구축: {db_load_time * 1000:.1f}ms")
+        print(f"     - 노트 10개 수정 후 저장: SQLite 증분 {incremental_time * 1000:.1f}ms")
+
+    print()
+    print("━" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NetworkMetadataStore 마이크로 벤치마크")
+    parser.add_argument("--notes", type=int, default=10000, help="합성 노트 수")
+    parser.add_argument("--links", type=int, default=5, help="노트당 링크 수")
+    parser.add_argument("--lookups", type=int, default=2000, help="제목 해석 횟수")
+    parser.add_argument("--updates", type=int, default=200, help="노트 수정 횟수")
+    args = parser.parse_args()
+
+    benchmark(args.notes, args.links, args.lookups, args.updates)
+
+
+if __name__ == "__main__":
+    main()
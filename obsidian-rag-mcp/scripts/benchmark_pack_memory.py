@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+패키지 포맷팅 최대 메모리 벤치마크
+
+합성 노트(기본 40개 × 10,000자)로 패킹된 컨텍스트를 만들고, tracemalloc으로
+- format(): 전체 패키지를 하나의 문자열로 만들고 안내 문구를 앞에 붙이는 기존 방식
+- iter_format() + split_parts(): 조각을 생성하며 응답 부분으로 나누는 방식
+의 최대 메모리와 시간을 비교합니다. 실제 Vault나 데이터 파일은 건드리지 않습니다.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from config import PACK_RESPONSE_PART_CHARS
+from context_packer import PackageFormatter, split_parts
+
+
+def build_packed_context(num_notes: int, note_chars: int) -> dict:
+    """SmartPacker.pack() 형식의 합성 컨텍스트 (한국어/영어 섞인 본문)"""
+    line = "한국어 문장과 English words가 섞인 노트 본문 한 줄입니다.\n"
+    content = line * (note_chars // len(line))
+    notes = [
+        {
+            "path": f"/vault/00 Notes/Note {i:04d}.md",
+            "title": f"Note {i:04d}",
+            "para_folder": "00 Notes",
+            "tags": ["benchmark"],
+            "wiki_links": [f"Note {i + 1:04d}"],
+            "content": content,
+        }
+        for i in range(num_notes)
+    ]
+    return {"primary": notes[:1], "backlinks": notes[1:]}
+
+
+def measure(func):
+    """(결과, 최대 메모리 바이트, 소요 초)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - started
+        return result, tracemalloc.get_traced_memory()[1], elapsed
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="패키지 포맷팅 최대 메모리 벤치마크")
+    parser.add_argument("--notes", type=int, default=40, help="노트 수")
+    parser.add_argument("--note-chars", type=int, default=10000, help="노트당 문자 수")
+    parser.add_argument(
+        "--part-chars", type=int, default=PACK_RESPONSE_PART_CHARS, help="응답 부분 최대 문자 수"
+    )
+    args = parser.parse_args()
+
+    packed = build_packed_context(args.notes, args.note_chars)
+    formatter = PackageFormatter()
+    notice = "⏳ 초기 인덱싱 중...\n\n"
+
+    text, joined_peak, joined_time = measure(lambda: notice + formatter.format(packed))
+    parts, streamed_peak, streamed_time = measure(
+        lambda: list(split_parts(formatter.iter_format(packed), args.part_chars))
+    )
+    assert "".join(parts) == text[len(notice):]
+
+    print(f"📦 패키지: {len(text):,}자 (노트 {args.notes}개)")
+    print(f"  format() + 안내 문구:        최대 {joined_peak / 1024 / 1024:7.2f}MB, {joined_time * 1000:6.1f}ms")
+    print(
+        f"  iter_format() + split_parts(): 최대 {streamed_peak / 1024 / 1024:7.2f}MB, "
+        f"{streamed_time * 1000:6.1f}ms ({len(parts)}개 부분)"
+    )
+    print(f"  최대 메모리 {joined_peak / max(streamed_peak, 1):.1f}배 감소")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
+from index_metrics import IndexRunMetrics
 from indexer import UnifiedIndexer
 from network_store import NetworkMetadataStore
 from repomix_store import RepomixIndexStore
@@ -47,7 +48,7 @@ def full_reindex():
     # 증분 업데이트 실행 (새 파일, 수정된 파일, 삭제된 파일 모두 처리)
     print("📊 변경사항 확인 및 인덱싱 시작...")
     print()
-    indexer.update_index()
+    indexer.update_index(metrics=IndexRunMetrics(source="full_reindex"))
 
     print()
     print("━" * 60)
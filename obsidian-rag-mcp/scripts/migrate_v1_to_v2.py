@@ -21,6 +21,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from config import METADATA_FILE, PROJECT_ROOT, VAULT_PATH
+from index_metrics import IndexRunMetrics
 from indexer import UnifiedIndexer
 from network_store import NetworkMetadataStore
 from repomix_store import RepomixIndexStore
@@ -243,7 +244,7 @@ def reindex_vault(
     start_time = datetime.now()
 
     try:
-        indexer.update_index()
+        indexer.update_index(metrics=IndexRunMetrics(source="migrate_v1_to_v2"))
 
         elapsed = (datetime.now() - start_time).total_seconds()
         print(
@@ -300,12 +301,12 @@ def verify_migration(verbose: bool = False) -> bool:
     checks.append(("index_metadata.json", METADATA_FILE.exists()))
 
     # 2. Network 메타데이터 존재 확인
-    network_file = PROJECT_ROOT / "data" / "network_metadata.json"
-    checks.append(("network_metadata.json", network_file.exists()))
+    network_file = PROJECT_ROOT / "data" / "network_metadata.db"
+    checks.append(("network_metadata.db", network_file.exists()))
 
     # 3. Repomix 인덱스 존재 확인
-    repomix_file = PROJECT_ROOT / "data" / "repomix_index.json"
-    checks.append(("repomix_index.json", repomix_file.exists()))
+    repomix_file = PROJECT_ROOT / "data" / "repomix_index.db"
+    checks.append(("repomix_index.db", repomix_file.exists()))
 
     # 4. 백업 존재 확인
     backup_file = METADATA_FILE.with_suffix(".json.v1.backup")
@@ -361,8 +362,8 @@ def rollback_migration(verbose: bool = False) -> bool:
         shutil.copy(backup_file, METADATA_FILE)
 
         # v2.0 파일 삭제
-        network_file = PROJECT_ROOT / "data" / "network_metadata.json"
-        repomix_file = PROJECT_ROOT / "data" / "repomix_index.json"
+        network_file = PROJECT_ROOT / "data" / "network_metadata.db"
+        repomix_file = PROJECT_ROOT / "data" / "repomix_index.db"
 
         if network_file.exists():
             network_file.unlink()
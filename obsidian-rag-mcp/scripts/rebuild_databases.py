@@ -16,45 +16,46 @@ import json
 from datetime import datetime
 
 from config import METADATA_FILE, VAULT_PATH
-from indexer import UnifiedIndexer
+from index_metrics import IndexRunMetrics, write_run_report
+from indexer import UnifiedIndexer, iter_batches
 from network_store import NetworkMetadataStore
 from repomix_store import RepomixIndexStore
 from vector_store import VectorStore
 
 
-def rebuild_databases():
-    """데이터베이스 재빌드"""
+def _rebuild_stores(metrics: IndexRunMetrics):
+    """Step 1-3: 백업, 저장소 초기화, 전체 재인덱싱 후 저장
 
-    print("╔══════════════════════════════════════════════════════════╗")
-    print("║                                                          ║")
-    print("║         Obsidian RAG MCP Database Rebuild                ║")
-    print("║                                                          ║")
-    print("╚══════════════════════════════════════════════════════════╝")
-    print()
+    Args:
+        metrics: 계측 객체
 
+    Returns:
+        (network_store, repomix_store, network_file, repomix_file)
+    """
     # Step 1: 기존 Network와 Repomix 데이터베이스 백업
     print("📦 Step 1: 기존 데이터베이스 백업")
     print("━" * 60)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_dir = PROJECT_ROOT / "data" / "backup" / f"rebuild_{timestamp}"
-    backup_dir.mkdir(parents=True, exist_ok=True)
+    with metrics.stage("backup"):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_dir = PROJECT_ROOT / "data" / "backup" / f"rebuild_{timestamp}"
+        backup_dir.mkdir(parents=True, exist_ok=True)
 
-    network_file = PROJECT_ROOT / "data" / "network_metadata.json"
-    repomix_file = PROJECT_ROOT / "data" / "repomix_index.json"
+        network_file = PROJECT_ROOT / "data" / "network_metadata.db"
+        repomix_file = PROJECT_ROOT / "data" / "repomix_index.db"
 
-    if network_file.exists():
+        # SQLite 파일과 마이그레이션 전 JSON 파일 모두 백업
         import shutil
 
-        shutil.copy(network_file, backup_dir / "network_metadata.json")
-        print(f"  ✅ Network 백업: {backup_dir}/network_metadata.json")
-
-    if repomix_file.exists():
-        import shutil
-
-        shutil.copy(repomix_file, backup_dir / "repomix_index.json")
-        print(f"  ✅ Repomix 백업: {backup_dir}/repomix_index.json")
-
+        for file in (
+            network_file,
+            network_file.with_suffix(".json"),
+            repomix_file,
+            repomix_file.with_suffix(".json"),
+        ):
+            if file.exists():
+                shutil.copy(file, backup_dir / file.name)
+                print(f"  ✅ 백업: {backup_dir}/{file.name}")
     print()
 
     # Step 2: Network와 Repomix 데이터베이스 초기화
@@ -80,7 +81,9 @@ def rebuild_databases():
     print("━" * 60)
 
     # 마크다운 파일 목록
-    md_files = list(VAULT_PATH.rglob("*.md"))
+    with metrics.stage("walk"):
+        md_files = list(VAULT_PATH.rglob("*.md"))
+    metrics.incr("files_scanned", len(md_files))
     print(f"  📂 발견된 마크다운 파일: {len(md_files)}개")
     print()
 
@@ -108,45 +111,95 @@ def rebuild_databases():
     success_count = 0
     error_count = 0
 
-    for i, md_file in enumerate(md_files, 1):
-        file_path = str(md_file)
-
-        # indexed_files에 있는 파일만 처리
-        if file_path not in indexed_files:
-            continue
+    # indexed_files에 있는 파일만 처리
+    target_files = [md_file for md_file in md_files if str(md_file) in indexed_files]
+
+    # 백링크는 모든 파일을 반영한 뒤 한 번만 계산 (파일마다 전체 재계산하지 않음)
+    # 파일은 TOKENIZE_BATCH_SIZE개(또는 TOKENIZE_BATCH_BYTES)씩 파싱하고 토큰 수를 배치로 계산
+    done = 0
+    with network_store.batch():
+        for chunk in iter_batches(target_files):
+            start = done
+
+            parsed = []
+            for md_file in chunk:
+                try:
+                    with metrics.stage("parse"):
+                        doc = parser.parse_file(md_file)
+                    if doc:
+                        parsed.append((md_file, doc))
+                except Exception as e:
+                    error_count += 1
+                    if error_count <= 10:  # 처음 10개 에러만 출력
+                        print(f"  ⚠️  에러: {md_file.name} - {e}")
+
+            with metrics.stage("repomix_update"):
+                repomix_store.prefetch_token_counts(doc for _, doc in parsed)
+
+            for md_file, doc in parsed:
+                try:
+                    # Network Metadata 업데이트
+                    with metrics.stage("network_update"):
+                        network_store.update_metadata(doc)
+
+                    # Repomix Index 업데이트
+                    with metrics.stage("repomix_update"):
+                        repomix_store.update_index(doc, md_file)
+
+                    success_count += 1
+
+                except Exception as e:
+                    error_count += 1
+                    if error_count <= 10:  # 처음 10개 에러만 출력
+                        print(f"  ⚠️  에러: {md_file.name} - {e}")
+
+            # 진행 상황 출력 (매 청크마다)
+            done = start + len(chunk)
+            if done // 100 > start // 100 or done == len(target_files):
+                print(f"  ➕ 진행 중: {done}/{len(target_files)} ({success_count} 성공)")
+
+    # Network에서 계산한 백링크를 Repomix에 반영
+    with metrics.stage("repomix_update"):
+        repomix_store.update_backlinks(network_store.pop_dirty_backlinks())
 
-        try:
-            # 파일 파싱
-            doc = parser.parse_file(md_file)
-            if not doc:
-                continue
+    print()
+    print(f"  ✅ 재인덱싱 완료!")
+    print(f"     - 성공: {success_count}개")
+    print(f"     - 에러: {error_count}개")
+    print()
 
-            # Network Metadata 업데이트
-            network_store.update_metadata(doc)
+    metrics.incr("files_indexed", success_count)
+    metrics.incr("files_failed", error_count)
 
-            # Repomix Index 업데이트
-            repomix_store.update_index(doc, md_file)
+    # Network와 Repomix 저장
+    with metrics.stage("save"):
+        network_store.save_metadata()
+        repomix_store.save_index()
 
-            success_count += 1
+    return network_store, repomix_store, network_file, repomix_file
 
-            # 진행 상황 출력 (매 100개마다)
-            if i % 100 == 0:
-                print(f"  ➕ 진행 중: {i}/{len(md_files)} ({success_count} 성공)")
 
-        except Exception as e:
-            error_count += 1
-            if error_count <= 10:  # 처음 10개 에러만 출력
-                print(f"  ⚠️  에러: {md_file.name} - {e}")
+def rebuild_databases():
+    """데이터베이스 재빌드"""
 
-    print()
-    print(f"  ✅ 재인덱싱 완료!")
-    print(f"     - 성공: {success_count}개")
-    print(f"     - 에러: {error_count}개")
+    print("╔══════════════════════════════════════════════════════════╗")
+    print("║                                                          ║")
+    print("║         Obsidian RAG MCP Database Rebuild                ║")
+    print("║                                                          ║")
+    print("╚══════════════════════════════════════════════════════════╝")
     print()
 
-    # Network와 Repomix 저장
-    network_store.save_metadata()
-    repomix_store.save_index()
+    metrics = IndexRunMetrics(source="rebuild_databases")
+
+    try:
+        network_store, repomix_store, network_file, repomix_file = _rebuild_stores(metrics)
+    except Exception as e:
+        # 실패한 실행도 리포트에 기록 (UnifiedIndexer._apply_changes와 같은 방식)
+        write_run_report(metrics.to_report(status="failed", error=str(e)))
+        raise
+
+    report = metrics.to_report()
+    write_run_report(report)
 
     print("  💾 메타데이터 저장 완료")
     print()
@@ -156,15 +209,15 @@ def rebuild_databases():
     print("━" * 60)
 
     # 파일 존재 확인
-    assert network_file.exists(), "network_metadata.json이 생성되지 않았습니다"
-    assert repomix_file.exists(), "repomix_index.json이 생성되지 않았습니다"
+    assert network_file.exists(), f"{network_file.name}이 생성되지 않았습니다"
+    assert repomix_file.exists(), f"{repomix_file.name}이 생성되지 않았습니다"
 
     # 파일 크기 확인
     network_size = network_file.stat().st_size
     repomix_size = repomix_file.stat().st_size
 
-    print(f"  ✅ network_metadata.json: {network_size:,} bytes")
-    print(f"  ✅ repomix_index.json: {repomix_size:,} bytes")
+    print(f"  ✅ {network_file.name}: {network_size:,} bytes")
+    print(f"  ✅ {repomix_file.name}: {repomix_size:,} bytes")
     print()
 
     # 통계 출력
@@ -178,6 +231,7 @@ def rebuild_databases():
 
     print("━" * 60)
     print("🎉 데이터베이스 재빌드 완료!")
+    print(f"⏱️ 소요 시간: {report['duration_seconds']:.1f}초 (run_id={report['run_id']})")
     print("━" * 60)
     print()
 
@@ -16,6 +16,7 @@ from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
 from config import EXCLUDE_PATTERNS, VAULT_PATH
+from index_metrics import IndexRunMetrics
 
 
 class FileWatcher(FileSystemEventHandler):
@@ -187,7 +188,9 @@ class UpdateQueue:
             # UnifiedIndexer의 update_index()는 check_updates()를 호출하므로
             # 파일 시스템을 직접 스캔합니다.
             # 우리는 그냥 update_index()를 호출하면 됩니다.
-            self.indexer.update_index()
+            metrics = IndexRunMetrics(source="auto_update")
+            metrics.incr("queued_changes", len(changes_to_process))
+            self.indexer.update_index(metrics=metrics)
 
             print("✅ 자동 업데이트 완료\n", file=sys.stderr)
 
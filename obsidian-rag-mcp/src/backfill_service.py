@@ -0,0 +1,231 @@
+"""
+Backfill Service
+
+인덱싱되지 않은 파일이 있으면 MCP 서버를 먼저 띄우고, 초기 인덱싱을 백그라운드에서
+우선순위 순서(우선 폴더 → 최근 수정 노트 → 나머지)로 진행하는 서비스
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from config import (
+    BACKFILL_BATCH_SIZE,
+    BACKFILL_MAX_BATCH_SIZE,
+    BACKFILL_RECENT_DAYS,
+    PRIORITY_FOLDERS,
+)
+from index_metrics import IndexRunMetrics
+
+
+class BackfillProgress:
+    """백필 진행 상황
+
+    검색 도구가 응답에 진행률을 표시할 수 있도록 스레드 안전하게 공유됩니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.total = 0
+        self.done = 0
+        self.running = False
+        self.error: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+
+    def snapshot(self) -> dict:
+        """현재 진행 상황 복사본"""
+        with self.lock:
+            return {
+                "total": self.total,
+                "done": self.done,
+                "running": self.running,
+                "error": self.error,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+    def describe(self) -> str:
+        """응답에 붙일 진행률/실패 안내 문구 (인덱싱할 파일이 없거나 끝났으면 빈 문자열)"""
+        state = self.snapshot()
+        if state["error"] and not state["running"]:
+            return (
+                f"⚠️ 초기 인덱싱 실패: {state['error']}"
+                " - update_index 도구로 다시 시도하세요. 결과가 일부일 수 있습니다.\n\n"
+            )
+        total = state["total"]
+        if not state["running"] or not total:
+            return ""
+        percent = (state["done"] / total * 100) if total else 0.0
+        return (
+            f"⏳ 초기 인덱싱 진행 중: {state['done']}/{total}개 ({percent:.0f}%)"
+            " - 결과가 일부일 수 있습니다.\n\n"
+        )
+
+
+class BackfillService:
+    """초기 인덱싱 백필 서비스
+
+    UnifiedIndexer.index_files()로 아직 인덱싱되지 않은 파일을 배치 단위로 인덱싱합니다.
+    서버를 시작할 때마다 실행하므로, 이전 실행이 중단되거나 실패해서 남은 파일도 이어서 처리합니다.
+    첫 배치는 작게 시작해서 검색이 빨리 가능해지도록 하고,
+    이후 배치 크기를 두 배씩 늘려 저장/백업 횟수를 줄입니다.
+    """
+
+    def __init__(
+        self,
+        indexer,
+        priority_folders: Optional[List[str]] = None,
+        recent_days: int = BACKFILL_RECENT_DAYS,
+        batch_size: int = BACKFILL_BATCH_SIZE,
+        max_batch_size: int = BACKFILL_MAX_BATCH_SIZE,
+        on_complete: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+            indexer: UnifiedIndexer 인스턴스
+            priority_folders: 먼저 인덱싱할 PARA 폴더 (기본값: config.PRIORITY_FOLDERS)
+            recent_days: 최근 N일 내 수정된 노트를 우선 인덱싱
+            batch_size: 첫 배치 크기
+            max_batch_size: 최대 배치 크기
+            on_complete: 백필이 성공적으로 끝난 뒤 호출할 콜백 (예: Auto-Update Service 시작,
+                실패하거나 중지되면 호출하지 않음)
+        """
+        self.indexer = indexer
+        self.priority_folders = (
+            priority_folders if priority_folders is not None else PRIORITY_FOLDERS
+        )
+        self.recent_days = recent_days
+        self.batch_size = batch_size
+        self.max_batch_size = max_batch_size
+        self.on_complete = on_complete
+
+        self.progress = BackfillProgress()
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+
+    def plan(self) -> List[Path]:
+        """인덱싱 순서 결정
+
+        Returns:
+            아직 인덱싱되지 않은 파일 리스트 (우선 폴더 → 최근 수정 → 나머지, 각 그룹은 최신순)
+        """
+        indexed_files = self.indexer.metadata.get("indexed_files", {})
+        recent_cutoff = time.time() - self.recent_days * 86400
+        folder_rank = {folder: i for i, folder in enumerate(self.priority_folders)}
+
+        candidates = []
+        for file in self.indexer.get_md_files():
+            if str(file) in indexed_files:
+                continue
+            try:
+                mtime = file.stat().st_mtime
+            except OSError:
+                continue
+
+            try:
+                para_folder = file.relative_to(self.indexer.vault_path).parts[0]
+            except (ValueError, IndexError):
+                para_folder = "root"
+
+            if para_folder in folder_rank:
+                tier = (0, folder_rank[para_folder])
+            elif mtime >= recent_cutoff:
+                tier = (1, 0)
+            else:
+                tier = (2, 0)
+            candidates.append((tier, -mtime, str(file), file))
+
+        candidates.sort()
+        return [file for _, _, _, file in candidates]
+
+    def start(self):
+        """백필 스레드 시작"""
+        if self.thread and self.thread.is_alive():
+            return
+
+        self.stop_event.clear()
+        with self.progress.lock:
+            self.progress.running = True
+            self.progress.total = 0
+            self.progress.done = 0
+            self.progress.error = None
+            self.progress.started_at = datetime.now().isoformat()
+            self.progress.finished_at = None
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print("🌱 초기 인덱싱 백필 시작됨", file=sys.stderr)
+
+    def stop(self):
+        """백필 스레드 중지 (진행 중인 배치는 끝까지 처리)"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=10)
+
+    @property
+    def running(self) -> bool:
+        """백필 진행 여부"""
+        return self.progress.snapshot()["running"]
+
+    @property
+    def failed(self) -> bool:
+        """마지막 백필이 실패했는지 여부"""
+        state = self.progress.snapshot()
+        return not state["running"] and state["error"] is not None
+
+    def _run(self):
+        """백필 루프 (백그라운드 스레드에서 실행)"""
+        succeeded = False
+        try:
+            files = self.plan()
+            with self.progress.lock:
+                self.progress.total = len(files)
+
+            print(f"🌱 백필 대상: {len(files)}개 파일", file=sys.stderr)
+
+            # 배치마다 DB 전체를 복사하지 않도록 실행 시작 시점에 한 번만 백업
+            # (배치가 실패하면 이 스냅샷으로 롤백되고, 이미 끝난 배치는 다음 실행에서 다시 인덱싱)
+            backup_dir = self.indexer.create_backup() if files else None
+
+            position = 0
+            batch_size = self.batch_size
+            while position < len(files) and not self.stop_event.is_set():
+                batch = files[position : position + batch_size]
+                metrics = IndexRunMetrics(source="backfill")
+                metrics.incr("backfill_position", position)
+                self.indexer.index_files(batch, metrics=metrics, backup_dir=backup_dir)
+
+                position += len(batch)
+                with self.progress.lock:
+                    self.progress.done = position
+                print(
+                    f"🌱 백필 진행: {position}/{len(files)}",
+                    file=sys.stderr,
+                )
+                batch_size = min(batch_size * 2, self.max_batch_size)
+
+            if not self.stop_event.is_set():
+                if files:
+                    # 백필 중 생기거나 바뀐 파일 반영
+                    self.indexer.update_index(
+                        metrics=IndexRunMetrics(source="backfill_final")
+                    )
+                    print("✅ 초기 인덱싱 백필 완료", file=sys.stderr)
+                succeeded = True
+
+        except Exception as e:
+            with self.progress.lock:
+                self.progress.error = str(e)
+            print(f"❌ 초기 인덱싱 백필 실패: {e}", file=sys.stderr)
+
+        finally:
+            with self.progress.lock:
+                self.progress.running = False
+                self.progress.finished_at = datetime.now().isoformat()
+
+        if succeeded and self.on_complete:
+            self.on_complete()
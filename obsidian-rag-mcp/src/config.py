@@ -32,3 +32,73 @@ METADATA_FILE = PROJECT_ROOT / "data" / "index_metadata.json"
 # 백업 설정
 BACKUP_DIR = PROJECT_ROOT / "data" / "backup"
 MAX_BACKUPS = 5
+
+# 인덱싱 계측 설정
+METRICS_FILE = PROJECT_ROOT / "data" / "index_metrics.jsonl"
+# node_exporter textfile collector 경로 (설정 시에만 기록)
+PROMETHEUS_TEXTFILE = os.getenv("OBSIDIAN_RAG_PROMETHEUS_TEXTFILE")
+
+# 초기 백필 설정 (인덱스가 비어 있을 때 서버를 먼저 띄우고 백그라운드에서 인덱싱)
+# 우선 인덱싱할 폴더 (쉼표 구분, 예: "00 Notes,01 Projects")
+PRIORITY_FOLDERS = [
+    folder.strip()
+    for folder in os.getenv("OBSIDIAN_RAG_PRIORITY_FOLDERS", "").split(",")
+    if folder.strip()
+]
+BACKFILL_RECENT_DAYS = 14  # 최근 N일 내 수정된 노트를 먼저 인덱싱
+BACKFILL_BATCH_SIZE = 25  # 첫 배치 크기 (배치마다 2배씩 증가)
+BACKFILL_MAX_BATCH_SIZE = 400
+
+# 대용량 파일 처리 설정
+# 이 크기를 넘는 파일은 전체를 메모리에 올리지 않고 줄 단위로 스트리밍 처리
+LARGE_FILE_THRESHOLD_BYTES = 1 * 1024 * 1024
+# 이 크기를 넘는 파일은 OVERSIZE_POLICY에 따라 처리 ("truncate": 앞부분만 인덱싱, "skip": 본문 제외)
+MAX_FILE_BYTES = 20 * 1024 * 1024
+OVERSIZE_POLICY = "truncate"
+# 임베딩 배치당 최대 청크 수
+EMBED_BATCH_SIZE = 64
+
+# 토큰 계산 설정
+TOKENIZER_ENCODING = "cl100k_base"  # GPT-4 토크나이저
+TOKEN_CACHE_SIZE = 50000  # 내용 해시 → 토큰 수 캐시 최대 항목 수
+# 일괄 인덱싱은 파싱한 문서를 배치 단위로 들고 있으므로(토큰 수 일괄 계산)
+# 문서 수와 원본 파일 크기 합계 중 먼저 닿는 쪽에서 배치를 끊어 메모리를 제한
+# (파일 하나가 상한보다 크면 그 파일만 단독 배치)
+TOKENIZE_BATCH_SIZE = 32  # 일괄 인덱싱 시 한 번에 토큰화하는 문서 수
+TOKENIZE_BATCH_BYTES = 8 * 1024 * 1024  # 한 배치에 담는 파일 크기 합계 상한
+TOKENIZE_THREADS = min(8, os.cpu_count() or 1)  # 배치 인코딩 스레드 수
+
+# Vault 통계 설정
+TOP_TAGS_LIMIT = 20  # 통계에 포함하는 상위 태그 수
+
+# 컨텍스트 패킹 설정
+NOTE_CACHE_SIZE = 512  # 파싱된 노트 캐시 최대 항목 수 (경로 + mtime + 크기로 검증)
+CONTEXT_LOAD_THREADS = 8  # 관련 노트를 동시에 로드하는 스레드 수
+PACK_MIN_NOTE_TOKENS = 100  # 트리밍해서 넣을 때 최소 토큰 수 (이보다 작으면 넣지 않음)
+PACK_DP_BUCKETS = 2048  # optimal 패킹 DP의 토큰 예산 분할 수 (클수록 정밀, 느림)
+
+# 노트 요약 표현 설정 (인덱싱 시 미리 계산, LLM 없이 규칙 기반)
+REPRESENTATION_MAX_HEADINGS = 40  # 개요(outline)에 넣는 최대 제목 수
+REPRESENTATION_LEAD_CHARS = 600  # 첫 문단(lead) 최대 문자 수
+REPRESENTATION_KEY_LINES = 12  # 핵심 줄(key_lines) 최대 줄 수
+# 패킹 시 요약 표현의 가치 (전체 노트 = 1.0)
+PACK_REPRESENTATION_VALUES = {"digest": 0.5, "outline": 0.25}
+
+# 패킹 결과 캐시 설정 (같은 노트/파라미터/인덱스 세대면 포맷팅된 패키지 재사용)
+PACK_CACHE_SIZE = 64  # 최대 항목 수
+PACK_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 캐시된 패키지 문자열의 최대 메모리 합계
+
+# 검색어 중심 컨텍스트 패킹 설정 (pack_query_context)
+QUERY_SEED_COUNT = 5  # 시드로 쓰는 검색 결과 노트 수
+QUERY_SEARCH_OVERFETCH = 4  # 시드 노트당 가져오는 검색 결과(청크) 수 (같은 노트의 청크 중복 대비)
+QUERY_LINKS_PER_SEED = 8  # 시드 하나에서 링크 그래프로 확장하는 최대 노트 수
+QUERY_EXPANSION_DEPTH = 1  # 링크 그래프 확장 홉 수
+QUERY_LINK_DECAY = 0.5  # 한 홉마다 관련도에 곱하는 감쇠 비율
+
+# 패킹 응답 설정 (패키지를 여러 TextContent로 나눠서 반환)
+PACK_RESPONSE_PART_CHARS = 100_000  # 응답 부분 하나의 최대 문자 수
+# MCP 도구 응답은 하나의 메시지라 스트리밍할 수 없고, 부분으로 나눠도 전체가 한 번에
+# 메모리에 올라가므로(캐시 포함) 응답 메모리 상한은 이 토큰 예산 제한으로 정해짐
+PACK_MAX_TOKENS = 200_000  # 한 번의 패킹에 허용하는 최대 토큰 예산 (응답 메모리 상한)
+PACK_TRACE_MEMORY = True  # 패킹마다 tracemalloc으로 최대 메모리 측정 (측정 중에는 할당이 약간 느려짐)
+PACK_PEAK_MEMORY_WARN_BYTES = 256 * 1024 * 1024  # 패킹 최대 메모리가 이보다 크면 경고 출력
@@ -4,20 +4,153 @@ Context Packer
 Obsidian vault의 노트들을 LLM에 최적화된 형태로 패키징하는 엔진
 """
 
+import math
+import re
 import sys
+import threading
+import tracemalloc
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
-
-import tiktoken
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 # 프로젝트 루트를 sys.path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
+import numpy as np
+
+from config import (
+    CONTEXT_LOAD_THREADS,
+    PACK_DP_BUCKETS,
+    PACK_MIN_NOTE_TOKENS,
+    PACK_REPRESENTATION_VALUES,
+    PACK_TRACE_MEMORY,
+    QUERY_EXPANSION_DEPTH,
+    QUERY_LINK_DECAY,
+    QUERY_LINKS_PER_SEED,
+    QUERY_SEARCH_OVERFETCH,
+    QUERY_SEED_COUNT,
+    TOKENIZER_ENCODING,
+)
+from graph_analytics import GraphAnalytics
 from network_store import NetworkMetadataStore
-from obsidian_parser import ObsidianParser
+from note_cache import NoteCache
+from note_representations import build_representations
+from pack_cache import PackCache, file_stamp
 from repomix_store import RepomixIndexStore
+from tokenizer import content_hash, get_token_counter, get_tokenizer
 from vector_store import VectorStore
 
+# 섹션별 기본 우선순위
+DEFAULT_PRIORITIES = {
+    "primary": 1.0,
+    "backlinks": 0.8,
+    "forward_links": 0.7,
+    "semantic_related": 0.6,
+    "tag_related": 0.5,
+}
+
+# 검색어 중심 컨텍스트의 섹션 우선순위 (차이는 노트별 관련도에 반영)
+QUERY_PRIORITIES = {
+    "seeds": 1.0,
+    "linked": 1.0,
+}
+
+# 패킹 모드 ("greedy": 섹션 순서대로, "optimal": 우선순위×관련도 합 최대화)
+PACK_MODES = ("greedy", "optimal")
+
+# 트리밍한 노트 끝에 붙이는 표시 (토큰 예산에 포함)
+TRIM_MARKER = "\n\n... (내용이 생략되었습니다)"
+# 섹션을 건너뛴 자리에 넣는 표시
+SKIP_MARKER = "(...)\n\n"
+# 트리밍 경계(제목/문단/줄)를 찾을 때 최소한 남길 비율 (이보다 앞이면 토큰 경계에서 자름)
+TRIM_BOUNDARY_MIN_RATIO = 0.5
+# 제목 줄 시작 위치
+HEADING_PATTERN = re.compile(r"(?m)^(?=#{1,6}\s)")
+
+
+def search_distance(result: dict) -> float:
+    """검색 결과의 거리 (VectorStore.search()는 "score" 키에 거리를 넣음)"""
+    return result.get("score", result.get("distance", 0.0))
+
+
+def split_parts(pieces: Iterable[str], max_chars: int) -> Iterator[str]:
+    """문자열 조각들을 max_chars 이하의 부분으로 묶기
+
+    조각은 가능한 한 나누지 않고, max_chars보다 큰 조각(긴 노트 본문)은 줄 경계에서
+    (줄이 너무 길면 max_chars 위치에서) 나눕니다. 한 번에 부분 하나만 만들므로
+    전체 패키지를 하나의 문자열로 이어 붙이지 않습니다.
+
+    Args:
+        pieces: 문자열 조각들 (PackageFormatter.iter_format()의 결과)
+        max_chars: 부분 하나의 최대 문자 수
+
+    Yields:
+        이어 붙이면 원래 조각들을 이은 것과 같은 부분 문자열
+    """
+    buffer: List[str] = []
+    size = 0
+    for piece in pieces:
+        start = 0
+        while start < len(piece):
+            room = max_chars - size
+            rest = len(piece) - start
+            if rest <= room:
+                buffer.append(piece[start:] if start else piece)
+                size += rest
+                break
+            newline = piece.rfind("\n", start, start + room)
+            if size and (rest <= max_chars or newline < 0):
+                # 다음 부분에 통째로 들어가거나 남은 자리에 줄 경계가 없으면 새 부분에서 시작
+                yield "".join(buffer)
+                buffer, size = [], 0
+                continue
+            cut = newline + 1 if newline >= 0 else start + room
+            buffer.append(piece[start:cut])
+            yield "".join(buffer)
+            buffer, size = [], 0
+            start = cut
+    if buffer:
+        yield "".join(buffer)
+
+
+# tracemalloc은 프로세스 전체에 하나뿐이므로 동시에 실행 중인 패킹 수를 세어
+# 첫 패킹이 측정을 시작하고 마지막 패킹이 멈춤
+_memory_trace_lock = threading.Lock()
+_memory_trace_users = 0
+_memory_trace_owned = False
+
+
+@contextmanager
+def track_peak_memory() -> Iterator[dict]:
+    """블록 실행 중의 최대 메모리 증가량을 tracemalloc으로 측정
+
+    블록이 끝나면 넘겨준 dict의 "peak_bytes"에 시작 시점 대비 최대 할당량을 넣습니다.
+    다른 패킹과 동시에 실행되면 그 할당도 포함되므로 상한값입니다.
+
+    Yields:
+        측정 결과를 담을 dict
+    """
+    global _memory_trace_users, _memory_trace_owned
+    with _memory_trace_lock:
+        if _memory_trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _memory_trace_owned = True
+        if _memory_trace_users == 0 and _memory_trace_owned:
+            tracemalloc.reset_peak()
+        _memory_trace_users += 1
+        baseline = tracemalloc.get_traced_memory()[0]
+    result = {"peak_bytes": 0}
+    try:
+        yield result
+    finally:
+        with _memory_trace_lock:
+            result["peak_bytes"] = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+            _memory_trace_users -= 1
+            if _memory_trace_users == 0 and _memory_trace_owned:
+                tracemalloc.stop()
+                _memory_trace_owned = False
+
 
 class ContextBuilder:
     """컨텍스트 빌더
@@ -30,17 +163,37 @@ class ContextBuilder:
         vector_store: VectorStore,
         network_store: NetworkMetadataStore,
         repomix_store: RepomixIndexStore,
+        graph_analytics: Optional[GraphAnalytics] = None,
+        note_cache: Optional[NoteCache] = None,
+        store_lock: Optional[threading.RLock] = None,
     ):
         """
         Args:
             vector_store: VectorStore 인스턴스
             network_store: NetworkMetadataStore 인스턴스
             repomix_store: RepomixIndexStore 인스턴스
+            graph_analytics: GraphAnalytics 인스턴스 (기본값: network_store로 생성)
+            note_cache: 파싱된 노트 캐시 (기본값: 새로 생성)
+            store_lock: network/repomix 스토어를 읽는 동안만 잡는 락
+                (인덱서와 공유하면 인덱싱과 겹쳐도 안전, 기본값: 전용 락)
         """
         self.vector_store = vector_store
         self.network_store = network_store
         self.repomix_store = repomix_store
-        self.parser = ObsidianParser()
+        self.graph_analytics = (
+            graph_analytics if graph_analytics else GraphAnalytics(network_store)
+        )
+        self.note_cache = note_cache if note_cache else NoteCache()
+        # 스토어 조회 구간만 잠그고 파일 로드, 검색, 패킹, 포맷팅은 락 없이 실행
+        self.store_lock = store_lock if store_lock else threading.RLock()
+        # 관련 노트 로드(파일 I/O, YAML 파싱)와 시맨틱 검색을 동시에 실행하는 스레드 풀
+        self._executor = ThreadPoolExecutor(
+            max_workers=CONTEXT_LOAD_THREADS, thread_name_prefix="context-load"
+        )
+
+    def close(self):
+        """스레드 풀 종료"""
+        self._executor.shutdown(wait=True)
 
     def build_context(
         self,
@@ -53,6 +206,7 @@ class ContextBuilder:
         max_forward_links: int = 10,
         max_semantic_related: int = 5,
         max_tag_related: int = 5,
+        rank_backlinks: bool = True,
     ) -> Dict[str, List[dict]]:
         """주어진 노트를 중심으로 컨텍스트 구성
 
@@ -66,6 +220,7 @@ class ContextBuilder:
             max_forward_links: 최대 포워드링크 수
             max_semantic_related: 최대 시맨틱 유사 노트 수
             max_tag_related: 최대 태그 관련 노트 수
+            rank_backlinks: 백링크를 PageRank 높은 순으로 골라 담을지 여부
 
         Returns:
             컨텍스트 딕셔너리
@@ -92,60 +247,194 @@ class ContextBuilder:
 
         context["primary"] = [primary_note]
 
-        # 처리된 노트 추적 (중복 방지)
-        processed_paths: Set[str] = {primary_note["path"]}
-
-        # 2. 백링크 수집
-        if include_backlinks:
-            backlink_titles = self.network_store.get_backlinks(note_title)
-            for title in backlink_titles[:max_backlinks]:
-                note = self._get_note_by_title(title)
-                if note and note["path"] not in processed_paths:
-                    context["backlinks"].append(note)
-                    processed_paths.add(note["path"])
-
-        # 3. 포워드링크 수집
-        if include_forward_links:
-            forward_link_titles = self.network_store.get_forward_links(note_title)
-            for title in forward_link_titles[:max_forward_links]:
-                note = self._get_note_by_title(title)
-                if note and note["path"] not in processed_paths:
-                    context["forward_links"].append(note)
-                    processed_paths.add(note["path"])
-
-        # 4. 시맨틱 유사 노트 수집
+        # 2. 시맨틱 검색은 그래프 확장과 동시에 실행
+        semantic_future = None
         if include_semantic_related:
             # 주 노트 내용으로 유사 검색
-            results = self.vector_store.search(
+            semantic_future = self._executor.submit(
+                self.vector_store.search,
                 query=primary_note["content"][:500],  # 앞부분만 사용
                 top_k=max_semantic_related + 1,  # 자기 자신 제외
             )
 
-            for result in results:
-                if result["path"] not in processed_paths:
-                    note = self._get_note_by_path(result["path"])
-                    if note:
-                        note["similarity_score"] = result.get("distance", 0.0)
-                        context["semantic_related"].append(note)
-                        processed_paths.add(note["path"])
+        # 3. 백링크/포워드링크/태그 관련 노트 경로 해석 (메모리 조회)
+        backlink_paths: List[str] = []
+        forward_link_paths: List[str] = []
+        tag_paths: List[str] = []
+        with self.store_lock:
+            if include_backlinks:
+                backlink_titles = self.network_store.get_backlinks(note_title)
+                if rank_backlinks:
+                    backlink_titles = self._rank_titles(backlink_titles)
+                backlink_paths = self._resolve_titles(backlink_titles[:max_backlinks])
+
+            if include_forward_links:
+                forward_link_titles = self.network_store.get_forward_links(note_title)
+                forward_link_paths = self._resolve_titles(
+                    forward_link_titles[:max_forward_links]
+                )
 
-                if len(context["semantic_related"]) >= max_semantic_related:
-                    break
+            if include_tag_related and primary_note.get("tags"):
+                # 주 노트의 첫 번째 태그 사용
+                main_tag = primary_note["tags"][0]
+                tag_note_titles = self.network_store.get_notes_by_tag(main_tag)
+                tag_paths = self._resolve_titles(tag_note_titles[:max_tag_related])
 
-        # 5. 태그 관련 노트 수집
-        if include_tag_related and primary_note.get("tags"):
-            # 주 노트의 첫 번째 태그 사용
-            main_tag = primary_note["tags"][0]
-            tag_note_titles = self.network_store.get_notes_by_tag(main_tag)
+        # 4. 노트 로드 (스레드 풀, 경로별로 한 번만)
+        # 그래프 이웃 로드를 먼저 시작하고, 검색 결과가 나오면 나머지를 이어서 로드
+        futures = self._submit_loads(
+            backlink_paths + forward_link_paths + tag_paths, skip={primary_note["path"]}
+        )
+        semantic_results = semantic_future.result() if semantic_future else []
+        futures.update(
+            self._submit_loads(
+                [result["path"] for result in semantic_results],
+                skip={primary_note["path"], *futures},
+            )
+        )
+        loaded = {path: future.result() for path, future in futures.items()}
 
-            for title in tag_note_titles[:max_tag_related]:
-                note = self._get_note_by_title(title)
+        # 5. 우선순위 순서로 수집 (처리된 노트는 중복 제외)
+        processed_paths: Set[str] = {primary_note["path"]}
+
+        def collect(section: str, paths: Iterable[str]):
+            for path in paths:
+                note = loaded.get(path)
                 if note and note["path"] not in processed_paths:
-                    context["tag_related"].append(note)
+                    context[section].append(note)
+                    processed_paths.add(note["path"])
+
+        collect("backlinks", backlink_paths)
+        collect("forward_links", forward_link_paths)
+
+        for result in semantic_results:
+            if result["path"] not in processed_paths:
+                note = loaded.get(result["path"])
+                if note:
+                    note["similarity_score"] = search_distance(result)
+                    context["semantic_related"].append(note)
                     processed_paths.add(note["path"])
 
+            if len(context["semantic_related"]) >= max_semantic_related:
+                break
+
+        collect("tag_related", tag_paths)
+
+        return context
+
+    def build_query_context(
+        self,
+        query: str,
+        max_seeds: int = QUERY_SEED_COUNT,
+        max_links_per_seed: int = QUERY_LINKS_PER_SEED,
+        depth: int = QUERY_EXPANSION_DEPTH,
+        decay: float = QUERY_LINK_DECAY,
+        folder: Optional[str] = None,
+    ) -> Dict[str, List[dict]]:
+        """검색어로 찾은 여러 시드 노트와 링크 이웃으로 컨텍스트 구성
+
+        1. 시맨틱 검색 한 번으로 상위 max_seeds개 노트를 시드로 선택 (관련도 = 1 / (1 + 거리))
+        2. 시드마다 링크 그래프(양방향)를 depth홉까지 확장, 관련도 = 시드 관련도 × decay^홉
+        3. 여러 시드에서 도달한 노트는 한 번만 (가장 높은 관련도와 그 시드 사용)
+
+        Args:
+            query: 검색어
+            max_seeds: 시드 노트 수
+            max_links_per_seed: 시드 하나에서 확장하는 최대 노트 수
+            depth: 링크 확장 홉 수 (0이면 확장 안 함)
+            decay: 홉마다 곱하는 관련도 감쇠 비율
+            folder: 검색할 PARA 폴더 (None이면 전체)
+
+        Returns:
+            {
+                "seeds": [시드 노트들],
+                "linked": [링크로 확장한 노트들]
+            }
+            (섹션 안은 관련도 내림차순, 노트마다 "relevance"와 시드 제목 "seed" 포함)
+        """
+        context = {"seeds": [], "linked": []}
+
+        # 1. 시드 (같은 노트의 청크는 거리가 가장 가까운 것만)
+        results = self.vector_store.search(
+            query=query, top_k=max_seeds * QUERY_SEARCH_OVERFETCH, folder=folder
+        )
+        seed_scores: Dict[str, float] = {}
+        for result in results:
+            if result["path"] not in seed_scores:
+                seed_scores[result["path"]] = 1.0 / (1.0 + max(search_distance(result), 0.0))
+            if len(seed_scores) >= max_seeds:
+                break
+        if not seed_scores:
+            return context
+        futures = self._submit_loads(seed_scores, skip=set())
+
+        # 2. 링크 그래프 확장 (메모리 조회, 시드 로드와 동시에)
+        linked: Dict[str, Tuple[float, str]] = {}
+        if depth > 0 and max_links_per_seed > 0:
+            with self.store_lock:
+                graph = self.network_store.graph
+                for seed_path, seed_score in seed_scores.items():
+                    node = graph.node_id(seed_path)
+                    if node is None:
+                        continue
+                    for neighbor, hops in graph.neighborhood(
+                        node, depth, "both", max_links_per_seed + 1
+                    )[1:]:
+                        path = graph.paths[neighbor]
+                        score = seed_score * decay ** hops
+                        if path not in seed_scores and score > linked.get(path, (0.0, ""))[0]:
+                            linked[path] = (score, graph.titles[node])
+        ranked_links = sorted(linked, key=lambda path: -linked[path][0])
+        futures.update(self._submit_loads(ranked_links, skip=set(futures)))
+
+        # 3. 관련도 순서로 수집
+        for path in sorted(seed_scores, key=lambda path: -seed_scores[path]):
+            note = futures[path].result()
+            if note:
+                note["relevance"] = seed_scores[path]
+                note["seed"] = note["title"]
+                context["seeds"].append(note)
+        for path in ranked_links:
+            note = futures[path].result()
+            if note:
+                note["relevance"], note["seed"] = linked[path]
+                context["linked"].append(note)
+
         return context
 
+    def _resolve_titles(self, titles: List[str]) -> List[str]:
+        """노트 제목들을 파일 경로로 변환 (찾지 못한 제목은 제외, 순서 유지)"""
+        paths = []
+        for title in titles:
+            file_path = self.network_store._find_file_by_title(title)
+            if file_path:
+                paths.append(file_path)
+        return paths
+
+    def _submit_loads(self, paths: Iterable[str], skip: Set[str]) -> Dict[str, Future]:
+        """여러 노트 로드를 스레드 풀에 제출 (경로별로 한 번만)
+
+        Args:
+            paths: 로드할 경로들 (중복 가능)
+            skip: 로드하지 않을 경로 (이미 로드했거나 제출한 경로)
+
+        Returns:
+            {경로: 노트 정보(로드 실패 시 None)를 돌려주는 Future} (입력 순서)
+        """
+        return {
+            path: self._executor.submit(self._get_note_by_path, path)
+            for path in dict.fromkeys(paths)
+            if path not in skip
+        }
+
+    def _rank_titles(self, titles: List[str]) -> List[str]:
+        """노트 제목들을 PageRank 내림차순으로 정렬 (동점은 원래 순서 유지)"""
+        scores = {}
+        for title in titles:
+            file_path = self.network_store._find_file_by_title(title)
+            scores[title] = self.graph_analytics.pagerank_of(file_path) if file_path else 0.0
+        return sorted(titles, key=lambda title: -scores[title])
+
     def _get_note_by_title(self, title: str) -> Optional[dict]:
         """노트 제목으로 노트 정보 가져오기
 
@@ -156,7 +445,8 @@ class ContextBuilder:
             노트 정보 (path, title, content, tags 등)
         """
         # network_store에서 파일 경로 찾기
-        file_path = self.network_store._find_file_by_title(title)
+        with self.store_lock:
+            file_path = self.network_store._find_file_by_title(title)
         if not file_path:
             return None
 
@@ -172,28 +462,34 @@ class ContextBuilder:
             노트 정보
         """
         try:
-            file_path = Path(path)
-            if not file_path.exists():
-                return None
-
-            # 파일 파싱
-            doc = self.parser.parse_file(file_path)
+            # 파싱 결과는 캐시 사용 (파일이 바뀌었으면 다시 파싱)
+            doc = self.note_cache.get(path)
             if not doc:
                 return None
 
-            # repomix_store에서 토큰 정보 가져오기
-            repomix_data = self.repomix_store.index.get("files", {}).get(path, {})
-            if repomix_data:
-                doc["token_count"] = repomix_data.get("size", {}).get(
-                    "estimated_tokens", 0
+            # 토큰 수와 요약 표현: 인덱싱 후 내용이 그대로면 repomix_store 값 사용,
+            # 바뀌었거나 앞부분만 읽은 대용량 노트는 실제 내용으로 계산 (토큰 수는 내용 해시로 캐시)
+            digest = content_hash(doc["content"])
+            indexed = False
+            representations = None
+            with self.store_lock:
+                repomix_data = self.repomix_store.index["files"].summary(path)
+                if repomix_data and repomix_data.get("content_hash") == digest:
+                    indexed = True
+                    doc["token_count"] = repomix_data["size"]["estimated_tokens"]
+                    representations = self.repomix_store.get_representations(path, digest)
+            if not indexed:
+                doc["token_count"] = self.repomix_store.token_counter.count(doc["content"])
+            if representations is None:
+                representations = build_representations(
+                    doc["content"], self.repomix_store.token_counter.count, digest
                 )
-            else:
-                doc["token_count"] = 0
+            doc["representations"] = representations
 
             return doc
 
         except Exception as e:
-            print(f"⚠️ 노트 로드 실패 ({path}): {e}")
+            print(f"⚠️ 노트 로드 실패 ({path}): {e}", file=sys.stderr)
             return None
 
 
@@ -203,47 +499,197 @@ class SmartPacker:
     토큰 제한 내에서 컨텍스트를 최적으로 패킹합니다.
     """
 
-    def __init__(self, max_tokens: int = 100000, tokenizer_encoding: str = "cl100k_base"):
+    def __init__(self, max_tokens: int = 100000, tokenizer_encoding: str = TOKENIZER_ENCODING):
         """
         Args:
-            max_tokens: 최대 토큰 수
+            max_tokens: 기본 토큰 예산 (pack()에서 호출마다 바꿀 수 있음)
             tokenizer_encoding: 토크나이저 인코딩
         """
         self.max_tokens = max_tokens
-        self.tokenizer = tiktoken.get_encoding(tokenizer_encoding)
+        # RepomixIndexStore와 같은 토크나이저/토큰 수 캐시 공유
+        self.tokenizer = get_tokenizer(tokenizer_encoding)
+        self.token_counter = get_token_counter(tokenizer_encoding)
 
     def pack(
         self,
         context: Dict[str, List[dict]],
         priorities: Optional[Dict[str, float]] = None,
+        mode: str = "greedy",
+        query: Optional[str] = None,
+        max_tokens: Optional[int] = None,
     ) -> Dict[str, List[dict]]:
         """컨텍스트를 토큰 제한 내에서 패킹
 
+        패킹된 노트의 토큰 수 합은 항상 토큰 예산 이하입니다.
+        예산은 호출마다 넘기고 인스턴스 상태를 바꾸지 않으므로 여러 스레드에서 동시에 호출해도 됩니다.
+
         Args:
             context: ContextBuilder.build_context() 결과
             priorities: 각 섹션의 우선순위 (기본값: primary=1.0, backlinks=0.8, ...)
+            mode: "greedy"면 우선순위 높은 섹션부터 순서대로 담고,
+                "optimal"이면 우선순위×관련도 합이 최대가 되도록 고름 (주 노트는 항상 포함)
+            query: 트리밍할 때 앞부분과 함께 남길 섹션을 고르는 검색어 (Optional)
+            max_tokens: 이번 호출의 토큰 예산 (None이면 self.max_tokens)
 
         Returns:
             패킹된 컨텍스트 (원본 구조 유지, 일부 노트는 트리밍되거나 제외됨)
         """
         if priorities is None:
-            priorities = {
-                "primary": 1.0,
-                "backlinks": 0.8,
-                "forward_links": 0.7,
-                "semantic_related": 0.6,
-                "tag_related": 0.5,
-            }
+            priorities = DEFAULT_PRIORITIES
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        if mode == "greedy":
+            return self._pack_greedy(context, priorities, budget, query)
+        if mode == "optimal":
+            return self._pack_optimal(context, priorities, budget, query)
+        raise ValueError(f"지원하지 않는 패킹 모드: {mode} (지원: {', '.join(PACK_MODES)})")
+
+    def pack_with_report(
+        self,
+        context: Dict[str, List[dict]],
+        priorities: Optional[Dict[str, float]] = None,
+        mode: str = "optimal",
+        query: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Tuple[Dict[str, List[dict]], dict]:
+        """패킹하고 달성한 효용/토큰 사용률을 greedy 패킹과 비교해서 보고
 
-        # 토큰 예산 초기화
-        remaining_tokens = self.max_tokens
-        packed_context = {
-            "primary": [],
-            "backlinks": [],
-            "forward_links": [],
-            "semantic_related": [],
-            "tag_related": [],
+        Args:
+            context: ContextBuilder.build_context() 결과
+            priorities: 각 섹션의 우선순위
+            mode: 패킹 모드
+            query: 트리밍 시 남길 섹션을 고르는 검색어
+            max_tokens: 이번 호출의 토큰 예산 (None이면 self.max_tokens)
+
+        Returns:
+            (패킹된 컨텍스트, 리포트)
+            리포트: {"mode", "max_tokens", "utility", "tokens", "utilization", "notes",
+                     "trimmed", "compact"(요약 표현으로 넣은 노트 수), "greedy": {같은 항목}}
+        """
+        if priorities is None:
+            priorities = DEFAULT_PRIORITIES
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        packed_context = self.pack(context, priorities, mode, query, budget)
+        report = {"mode": mode, "max_tokens": budget}
+        report.update(self._evaluate(context, packed_context, priorities, budget))
+        greedy = (
+            packed_context
+            if mode == "greedy"
+            else self._pack_greedy(context, priorities, budget, query)
+        )
+        report["greedy"] = self._evaluate(context, greedy, priorities, budget)
+        return packed_context, report
+
+    def _note_tokens(self, note: dict) -> int:
+        """노트의 토큰 수 (인덱스 값이 없으면 직접 계산, 내용 해시로 캐시)"""
+        token_count = note.get("token_count", 0)
+        if token_count == 0:
+            token_count = self.token_counter.count(note.get("content", ""))
+        return token_count
+
+    @staticmethod
+    def _relevance(note: dict) -> float:
+        """노트 관련도 (지정된 relevance, 시맨틱 유사 노트는 거리로 감쇠, 나머지는 1.0)"""
+        if "relevance" in note:
+            return note["relevance"]
+        distance = note.get("similarity_score")
+        if distance is None:
+            return 1.0
+        return 1.0 / (1.0 + max(distance, 0.0))
+
+    def _evaluate(
+        self,
+        context: Dict[str, List[dict]],
+        packed_context: Dict[str, List[dict]],
+        priorities: Dict[str, float],
+        max_tokens: int,
+    ) -> dict:
+        """패킹 결과의 효용 (섹션 우선순위 × 관련도 × 포함된 비율의 합)과 토큰 사용량"""
+        full_tokens = {
+            (section, note["path"]): self._note_tokens(note)
+            for section, notes in context.items()
+            for note in notes
         }
+        utility = 0.0
+        tokens = 0
+        notes = 0
+        trimmed = 0
+        compact = 0
+        for section, packed_notes in packed_context.items():
+            for note in packed_notes:
+                packed_tokens = self._note_tokens(note)
+                full = full_tokens.get((section, note["path"]), packed_tokens)
+                if note.get("representation"):
+                    fraction = PACK_REPRESENTATION_VALUES[note["representation"]]
+                else:
+                    fraction = min(1.0, packed_tokens / full) if full else 1.0
+                utility += priorities.get(section, 0.0) * self._relevance(note) * fraction
+                tokens += packed_tokens
+                notes += 1
+                trimmed += 1 if note.get("trimmed") else 0
+                compact += 1 if note.get("representation") else 0
+        return {
+            "utility": round(utility, 4),
+            "tokens": tokens,
+            "utilization": round(tokens / max_tokens, 4) if max_tokens else 0.0,
+            "notes": notes,
+            "trimmed": trimmed,
+            "compact": compact,
+        }
+
+    def _compact_note(self, note: dict, level: str) -> Optional[dict]:
+        """요약 표현으로 바꾼 노트
+
+        Args:
+            note: 노트 정보 (ContextBuilder가 넣은 "representations" 사용)
+            level: "digest"(첫 문단 + 핵심 줄) 또는 "outline"(제목 계층)
+
+        Returns:
+            content를 요약 표현으로 바꾼 노트 복사본 (표현이 없거나 원문보다 크면 None)
+        """
+        representations = note.get("representations")
+        if not representations:
+            return None
+        if level == "digest":
+            parts = [representations["lead"]["text"], representations["key_lines"]["text"]]
+        else:
+            parts = [representations["outline"]["text"]]
+        text = "\n\n".join(part for part in parts if part)
+        if not text:
+            return None
+
+        token_count = self.token_counter.count(text)
+        if token_count >= self._note_tokens(note):
+            return None
+        compact_note = note.copy()
+        compact_note["content"] = text
+        compact_note["token_count"] = token_count
+        compact_note["representation"] = level
+        return compact_note
+
+    def _note_options(self, note: dict) -> List[Tuple[dict, float]]:
+        """노트를 넣는 방법들 (노트, 가치 비율): 전체 노트, 요약 표현들 (큰 순서)"""
+        options = [(note, 1.0)]
+        for level, fraction in PACK_REPRESENTATION_VALUES.items():
+            compact_note = self._compact_note(note, level)
+            if compact_note:
+                options.append((compact_note, fraction))
+        return options
+
+    def _pack_greedy(
+        self,
+        context: Dict[str, List[dict]],
+        priorities: Dict[str, float],
+        max_tokens: int,
+        query: Optional[str] = None,
+    ) -> Dict[str, List[dict]]:
+        """우선순위 높은 섹션부터 순서대로 담기
+
+        넘치는 노트는 들어가는 요약 표현 중 가장 큰 것으로 바꾸고, 그것도 안 되면
+        남은 토큰만큼 트리밍합니다. (주 노트는 트리밍을 먼저 시도)
+        """
+        # 토큰 예산 초기화
+        remaining_tokens = max_tokens
+        packed_context = {section: [] for section in DEFAULT_PRIORITIES}
 
         # 섹션별 우선순위 순서로 처리
         section_order = sorted(priorities.keys(), key=lambda k: priorities[k], reverse=True)
@@ -254,36 +700,256 @@ class SmartPacker:
                 continue
 
             for note in notes:
-                token_count = note.get("token_count", 0)
-
-                # 토큰 카운트가 0이면 직접 계산
-                if token_count == 0:
-                    try:
-                        content = note.get("content", "")
-                        token_count = len(self.tokenizer.encode(content))
-                    except:
-                        token_count = len(note.get("content", "")) // 4
-
-                # 토큰이 남아있으면 추가
-                if token_count <= remaining_tokens:
-                    packed_context[section].append(note)
-                    remaining_tokens -= token_count
-                else:
-                    # 토큰이 부족하면 컨텐츠 트리밍 시도
-                    if remaining_tokens > 100:  # 최소 100 토큰 이상 남았을 때만
-                        trimmed_note = self._trim_note(note, remaining_tokens)
-                        if trimmed_note:
-                            packed_context[section].append(trimmed_note)
-                            remaining_tokens -= trimmed_note["token_count"]
+                packed_note = None
+                for option, _ in self._note_options(note):
+                    if self._note_tokens(option) <= remaining_tokens:
+                        packed_note = option
+                        break
+                    if section == "primary" and remaining_tokens > PACK_MIN_NOTE_TOKENS:
+                        # 주 노트는 요약보다 원문 앞부분 우선
+                        packed_note = self._trim_note(note, remaining_tokens, query)
+                        if packed_note:
+                            break
+
+                # 요약 표현도 들어가지 않으면 컨텐츠 트리밍 시도
+                if packed_note is None and remaining_tokens > PACK_MIN_NOTE_TOKENS:
+                    packed_note = self._trim_note(note, remaining_tokens, query)
+
+                if packed_note:
+                    packed_context.setdefault(section, []).append(packed_note)
+                    remaining_tokens -= self._note_tokens(packed_note)
+
+        return packed_context
+
+    def _pack_optimal(
+        self,
+        context: Dict[str, List[dict]],
+        priorities: Dict[str, float],
+        max_tokens: int,
+        query: Optional[str] = None,
+    ) -> Dict[str, List[dict]]:
+        """우선순위×관련도 합이 최대가 되도록 노트 고르기
+
+        1. 주 노트는 항상 포함 (넘치면 트리밍)
+        2. 나머지 노트는 노트마다 전체/요약 표현 중 하나를 고르는 배낭 문제로 풂:
+           가치 밀도(가치/토큰) 순 greedy 해와 토큰 예산을 PACK_DP_BUCKETS 칸으로 나눈
+           DP 해 중 더 나은 쪽 선택 (요약 표현의 가치는 PACK_REPRESENTATION_VALUES 비율)
+        3. 남은 토큰이 PACK_MIN_NOTE_TOKENS 이상이면 빠진 노트 중 밀도가 가장 높은 노트를 트리밍해서 추가
+
+        섹션 구조와 섹션 안의 원래 순서는 유지합니다.
+        """
+        remaining_tokens = max_tokens
+        chosen: Dict[Tuple[str, int], dict] = {}
+
+        # 1. 주 노트
+        for index, note in enumerate(context.get("primary", [])):
+            token_count = self._note_tokens(note)
+            if token_count <= remaining_tokens:
+                chosen[("primary", index)] = note
+                remaining_tokens -= token_count
+            elif remaining_tokens >= PACK_MIN_NOTE_TOKENS:
+                trimmed_note = self._trim_note(note, remaining_tokens, query)
+                if trimmed_note:
+                    chosen[("primary", index)] = trimmed_note
+                    remaining_tokens -= trimmed_note["token_count"]
+
+        # 2. 후보 (같은 노트가 여러 섹션에 있으면 우선순위 높은 섹션만)
+        candidates = []
+        seen_paths = {note["path"] for note in chosen.values()}
+        for section in sorted(priorities, key=lambda k: priorities[k], reverse=True):
+            if section == "primary":
+                continue
+            for index, note in enumerate(context.get(section, [])):
+                if note["path"] in seen_paths:
+                    continue
+                seen_paths.add(note["path"])
+                value = priorities[section] * self._relevance(note)
+                if value > 0:
+                    options = [
+                        (option, self._note_tokens(option), value * fraction)
+                        for option, fraction in self._note_options(note)
+                    ]
+                    candidates.append(((section, index), note, options))
+
+        selected = self._select_knapsack(
+            [[(tokens, value) for _, tokens, value in options] for _, _, options in candidates],
+            remaining_tokens,
+        )
+        for i, option_index in selected.items():
+            key, _, options = candidates[i]
+            option, tokens, _ = options[option_index]
+            chosen[key] = option
+            remaining_tokens -= tokens
+
+        # 3. 남은 토큰으로 트리밍한 노트 하나 추가
+        if remaining_tokens >= PACK_MIN_NOTE_TOKENS:
+            leftovers = [
+                (key, note, options[0][1], options[0][2])
+                for i, (key, note, options) in enumerate(candidates)
+                if i not in selected and options[0][1] > remaining_tokens
+            ]
+            for key, note, tokens, value in sorted(
+                leftovers, key=lambda candidate: -candidate[3] / max(candidate[2], 1)
+            ):
+                trimmed_note = self._trim_note(note, remaining_tokens, query)
+                if trimmed_note:
+                    chosen[key] = trimmed_note
+                    remaining_tokens -= trimmed_note["token_count"]
+                    break
 
+        # 섹션 안에서는 원래 순서 유지
+        packed_context = {section: [] for section in DEFAULT_PRIORITIES}
+        for section, index in sorted(chosen, key=lambda key: key[1]):
+            packed_context.setdefault(section, []).append(chosen[(section, index)])
         return packed_context
 
-    def _trim_note(self, note: dict, max_tokens: int) -> Optional[dict]:
+    @staticmethod
+    def _select_knapsack(
+        options: List[List[Tuple[int, float]]], budget: int
+    ) -> Dict[int, int]:
+        """후보마다 선택지 하나(또는 제외)를 고르는 배낭 문제 근사 해
+
+        가치 밀도 순 greedy 해와 DP 해 중 가치 합이 큰 쪽을 돌려줍니다.
+        DP는 토큰 예산을 최대 PACK_DP_BUCKETS 칸으로 나누고 무게를 올림해서 계산하므로
+        고른 노트의 실제 토큰 합은 항상 예산 이하입니다. (O(선택지 수 × 칸 수), numpy 벡터 연산)
+
+        Args:
+            options: 후보별 [(토큰 수, 가치), ...] 선택지
+            budget: 토큰 예산
+
+        Returns:
+            {후보 인덱스: 선택지 인덱스} (제외한 후보는 없음)
+        """
+        if budget <= 0 or not options:
+            return {}
+
+        # 가치 밀도 순 greedy (후보마다 처음 들어가는 선택지)
+        greedy: Dict[int, int] = {}
+        greedy_value = 0.0
+        remaining = budget
+        flat = [
+            (i, j, weight, value)
+            for i, choices in enumerate(options)
+            for j, (weight, value) in enumerate(choices)
+        ]
+        for i, j, weight, value in sorted(flat, key=lambda item: -item[3] / max(item[2], 1)):
+            if i not in greedy and weight <= remaining:
+                greedy[i] = j
+                greedy_value += value
+                remaining -= weight
+
+        # 예산 칸 단위 DP (무게는 올림)
+        bucket = max(1, math.ceil(budget / PACK_DP_BUCKETS))
+        capacity = budget // bucket
+        best = np.zeros(capacity + 1)
+        # 후보별로 칸마다 고른 선택지 (0이면 제외, j+1이면 j번째 선택지)
+        take = np.zeros((len(options), capacity + 1), dtype=np.int16)
+        scaled = [
+            [max(1, math.ceil(weight / bucket)) for weight, _ in choices] for choices in options
+        ]
+        for i, choices in enumerate(options):
+            updated = best.copy()
+            for j, (weight, (_, value)) in enumerate(zip(scaled[i], choices)):
+                if weight > capacity:
+                    continue
+                candidate = best[: capacity + 1 - weight] + value
+                improved = candidate > updated[weight:]
+                take[i, weight:][improved] = j + 1
+                updated[weight:] = np.where(improved, candidate, updated[weight:])
+            best = updated
+
+        if best[capacity] <= greedy_value:
+            return greedy
+
+        selected: Dict[int, int] = {}
+        cell = capacity
+        for i in range(len(options) - 1, -1, -1):
+            choice = int(take[i, cell])
+            if choice:
+                selected[i] = choice - 1
+                cell -= scaled[i][choice - 1]
+        return selected
+
+    def _encode(self, text: str) -> List[int]:
+        """텍스트 토큰화 (특수 토큰 문자열도 일반 텍스트로 취급)"""
+        return self.tokenizer.encode_ordinary(text)
+
+    def _decode_prefix(self, tokens: List[int], count: int) -> str:
+        """앞쪽 count개 토큰에 해당하는 텍스트 (토큰 경계에서 잘린 글자는 제외)
+
+        encode_ordinary() 토큰의 바이트를 이어 붙이면 원문 바이트와 같으므로,
+        결과는 항상 원문의 앞부분(접두사)입니다.
+        """
+        return self.tokenizer.decode_bytes(tokens[:count]).decode("utf-8", errors="ignore")
+
+    @staticmethod
+    def _cut_at_boundary(text: str) -> str:
+        """제목/문단/줄 경계에서 자르기 (경계가 너무 앞이면 그대로)"""
+        minimum = int(len(text) * TRIM_BOUNDARY_MIN_RATIO)
+        headings = [match.start() for match in HEADING_PATTERN.finditer(text)]
+        boundary = max([position for position in headings if position > 0] + [text.rfind("\n\n")])
+        if boundary < minimum:
+            boundary = text.rfind("\n")
+        if boundary < minimum:
+            return text
+        return text[:boundary]
+
+    def _select_sections(self, content: str, query: str, budget: int) -> Optional[str]:
+        """앞부분(첫 섹션)과 검색어와 관련된 섹션만 남기기
+
+        Args:
+            content: 노트 본문
+            query: 검색어
+            budget: 토큰 예산
+
+        Returns:
+            선택한 섹션을 원래 순서로 이은 텍스트 (제목 섹션이 없거나 앞부분이 예산을 넘으면 None)
+        """
+        sections = [section for section in HEADING_PATTERN.split(content) if section.strip()]
+        terms = {term.casefold() for term in re.findall(r"\w+", query) if len(term) > 1}
+        if len(sections) < 2 or not terms:
+            return None
+
+        sizes = [len(self._encode(section)) for section in sections]
+        used = sizes[0]
+        if used > budget:
+            return None
+        skip_tokens = len(self._encode(SKIP_MARKER))
+
+        scores = {
+            i: sum(section.casefold().count(term) for term in terms)
+            for i, section in enumerate(sections[1:], 1)
+        }
+        chosen = {0}
+        for i in sorted(scores, key=lambda i: (-scores[i], i)):
+            if scores[i] == 0:
+                break
+            if used + sizes[i] + skip_tokens <= budget:
+                chosen.add(i)
+                used += sizes[i] + skip_tokens
+
+        parts = []
+        previous = -1
+        for i in sorted(chosen):
+            if parts and i != previous + 1:
+                parts.append(SKIP_MARKER)
+            parts.append(sections[i])
+            previous = i
+        return "".join(parts)
+
+    def _trim_note(
+        self, note: dict, max_tokens: int, query: Optional[str] = None
+    ) -> Optional[dict]:
         """노트 컨텐츠를 토큰 제한에 맞게 트리밍
 
+        한 번 토큰화해서 정확한 토큰 경계에서 자르고, 가능하면 제목/문단 경계로 당겨서 자릅니다.
+        query가 있으면 앞부분과 함께 검색어가 많이 나오는 섹션을 남깁니다.
+        결과의 token_count(생략 표시 포함)는 항상 max_tokens 이하입니다.
+
         Args:
             note: 노트 정보
             max_tokens: 최대 토큰 수
+            query: 남길 섹션을 고르는 검색어 (Optional)
 
         Returns:
             트리밍된 노트 (None이면 트리밍 불가)
@@ -292,19 +958,40 @@ class SmartPacker:
         if not content:
             return None
 
-        # 토큰 제한에 맞게 문자 추정 (1 토큰 ≈ 4 문자)
-        max_chars = max_tokens * 4
+        tokens = self._encode(content)
+        if len(tokens) <= max_tokens:
+            if note.get("token_count") == len(tokens):
+                return note
+            fitted_note = note.copy()
+            fitted_note["token_count"] = len(tokens)
+            return fitted_note
+
+        budget = max_tokens - len(self._encode(TRIM_MARKER))
+        selected = self._select_sections(content, query, budget) if query else None
 
-        if len(content) <= max_chars:
-            return note
+        # 경계에서 BPE 병합이 달라져서 넘치는 드문 경우에는 예산을 줄여서 다시 자름
+        for _ in range(3):
+            if budget <= 0:
+                return None
+            body = selected if selected else self._cut_at_boundary(
+                self._decode_prefix(tokens, budget)
+            )
+            trimmed_content = body.rstrip() + TRIM_MARKER
+            token_count = len(self._encode(trimmed_content))
+            if token_count <= max_tokens:
+                break
+            budget -= token_count - max_tokens
+            selected = None
+        else:
+            return None
 
-        # 컨텐츠 트리밍
-        trimmed_content = content[:max_chars] + "\n\n... (내용이 생략되었습니다)"
+        if not body.strip():
+            return None
 
         # 새 노트 객체 생성
         trimmed_note = note.copy()
         trimmed_note["content"] = trimmed_content
-        trimmed_note["token_count"] = max_tokens
+        trimmed_note["token_count"] = token_count
         trimmed_note["trimmed"] = True
 
         return trimmed_note
@@ -321,6 +1008,7 @@ class PackageFormatter:
         packed_context: Dict[str, List[dict]],
         include_metadata: bool = True,
         include_links: bool = True,
+        query: Optional[str] = None,
     ) -> str:
         """패킹된 컨텍스트를 마크다운 형식으로 포맷팅
 
@@ -328,19 +1016,45 @@ class PackageFormatter:
             packed_context: SmartPacker.pack() 결과
             include_metadata: 메타데이터 포함 여부
             include_links: 링크 정보 포함 여부
+            query: 검색어 중심 패키지의 검색어 (헤더에 표시)
 
         Returns:
             포맷팅된 마크다운 텍스트
         """
-        output = []
+        return "".join(
+            self.iter_format(packed_context, include_metadata, include_links, query)
+        )
 
+    def iter_format(
+        self,
+        packed_context: Dict[str, List[dict]],
+        include_metadata: bool = True,
+        include_links: bool = True,
+        query: Optional[str] = None,
+    ) -> Iterator[str]:
+        """패킹된 컨텍스트를 마크다운 조각으로 차례대로 생성
+
+        노트 본문은 복사하지 않고 그대로 내보내므로, split_parts()와 함께 쓰면
+        전체 패키지를 하나의 큰 문자열로 만들지 않고 응답을 나눌 수 있습니다.
+
+        Args:
+            packed_context: SmartPacker.pack() 결과
+            include_metadata: 메타데이터 포함 여부
+            include_links: 링크 정보 포함 여부
+            query: 검색어 중심 패키지의 검색어 (헤더에 표시)
+
+        Yields:
+            마크다운 조각 (이어 붙이면 format()의 결과)
+        """
         # 헤더
-        output.append("# 📦 Obsidian Context Package\n")
+        yield "# 📦 Obsidian Context Package\n"
 
         # 통계
         total_notes = sum(len(notes) for notes in packed_context.values())
-        output.append(f"**Total Notes**: {total_notes}\n")
-        output.append("---\n")
+        if query:
+            yield f"**Query**: {query}  \n"
+        yield f"**Total Notes**: {total_notes}\n"
+        yield "---\n"
 
         # 섹션별 출력
         section_titles = {
@@ -349,6 +1063,8 @@ class PackageFormatter:
             "forward_links": "➡️ Forward Links",
             "semantic_related": "🔗 Semantically Related",
             "tag_related": "🏷️ Tag Related",
+            "seeds": "🔍 Search Results",
+            "linked": "🕸️ Linked Notes",
         }
 
         for section, title in section_titles.items():
@@ -356,34 +1072,39 @@ class PackageFormatter:
             if not notes:
                 continue
 
-            output.append(f"\n## {title} ({len(notes)} notes)\n")
+            yield f"\n## {title} ({len(notes)} notes)\n"
 
             for i, note in enumerate(notes, 1):
-                output.append(f"\n### {i}. {note['title']}\n")
+                yield f"\n### {i}. {note['title']}\n"
 
                 # 메타데이터
                 if include_metadata:
-                    output.append(f"**Path**: `{note['path']}`  \n")
-                    output.append(f"**Folder**: {note.get('para_folder', 'N/A')}  \n")
+                    yield f"**Path**: `{note['path']}`  \n"
+                    yield f"**Folder**: {note.get('para_folder', 'N/A')}  \n"
+
+                    if note.get("seed") and note["seed"] != note["title"]:
+                        yield f"**Via**: [[{note['seed']}]]  \n"
 
                     if note.get("tags"):
                         tags_str = ", ".join(f"#{tag}" for tag in note["tags"])
-                        output.append(f"**Tags**: {tags_str}  \n")
+                        yield f"**Tags**: {tags_str}  \n"
 
-                    if note.get("trimmed"):
-                        output.append("⚠️ **Note**: Content trimmed due to token limit  \n")
+                    if note.get("representation"):
+                        yield (
+                            f"📝 **Note**: Showing {note['representation']} only due to token limit  \n"
+                        )
+                    elif note.get("trimmed"):
+                        yield "⚠️ **Note**: Content trimmed due to token limit  \n"
 
                 # 링크 정보
                 if include_links and note.get("wiki_links"):
                     links_str = ", ".join(f"[[{link}]]" for link in note["wiki_links"][:5])
-                    output.append(f"**Links**: {links_str}  \n")
+                    yield f"**Links**: {links_str}  \n"
 
                 # 컨텐츠
-                output.append("\n---\n")
-                output.append(f"{note['content']}\n")
-                output.append("---\n")
-
-        return "".join(output)
+                yield "\n---\n"
+                yield note["content"]
+                yield "\n---\n"
 
 
 class ContextPacker:
@@ -398,6 +1119,11 @@ class ContextPacker:
         network_store: NetworkMetadataStore,
         repomix_store: RepomixIndexStore,
         max_tokens: int = 100000,
+        graph_analytics: Optional[GraphAnalytics] = None,
+        note_cache: Optional[NoteCache] = None,
+        pack_cache: Optional[PackCache] = None,
+        store_lock: Optional[threading.RLock] = None,
+        trace_memory: bool = PACK_TRACE_MEMORY,
     ):
         """
         Args:
@@ -405,10 +1131,35 @@ class ContextPacker:
             network_store: NetworkMetadataStore 인스턴스
             repomix_store: RepomixIndexStore 인스턴스
             max_tokens: 최대 토큰 수
+            graph_analytics: GraphAnalytics 인스턴스 (백링크 PageRank 정렬용)
+            note_cache: 파싱된 노트 캐시 (MCP 서버의 다른 도구와 공유)
+            pack_cache: 패킹 결과 캐시 (None이면 캐시 없이 매번 생성)
+            store_lock: 스토어 조회 구간만 잡는 락 (MCP 서버는 indexer.lock을 넘김)
+            trace_memory: True면 리포트에 패킹 최대 메모리("peak_memory_bytes")를 측정해 넣음
         """
-        self.context_builder = ContextBuilder(vector_store, network_store, repomix_store)
+        self.context_builder = ContextBuilder(
+            vector_store,
+            network_store,
+            repomix_store,
+            graph_analytics,
+            note_cache,
+            store_lock=store_lock,
+        )
         self.smart_packer = SmartPacker(max_tokens=max_tokens)
         self.formatter = PackageFormatter()
+        self.pack_cache = pack_cache
+        self.trace_memory = trace_memory
+
+    def _note_stamps(self, context: Dict[str, List[dict]]) -> Dict[str, Optional[tuple]]:
+        """후보 노트 경로 → 파싱할 때의 (mtime_ns, 크기) (캐시 무효화 기준)"""
+        note_cache = self.context_builder.note_cache
+        stamps = {}
+        for notes in context.values():
+            for note in notes:
+                path = note["path"]
+                if path not in stamps:
+                    stamps[path] = note_cache.stamp(path) or file_stamp(path)
+        return stamps
 
     def pack_note(
         self,
@@ -423,9 +1174,16 @@ class ContextPacker:
         max_tag_related: int = 5,
         include_metadata: bool = True,
         include_links: bool = True,
-    ) -> str:
+        pack_mode: str = "greedy",
+        return_report: bool = False,
+        max_tokens: Optional[int] = None,
+        part_chars: Optional[int] = None,
+    ):
         """노트와 관련 컨텍스트를 패키징
 
+        예산과 제한은 모두 호출마다 넘기고 공유 상태를 바꾸지 않으므로,
+        여러 스레드에서 서로 다른 예산으로 동시에 호출해도 됩니다.
+
         Args:
             note_title: 중심 노트 제목
             include_backlinks: 백링크 포함 여부
@@ -438,31 +1196,210 @@ class ContextPacker:
             max_tag_related: 최대 태그 관련 노트 수
             include_metadata: 메타데이터 포함 여부
             include_links: 링크 정보 포함 여부
+            pack_mode: 패킹 모드 ("greedy" 또는 "optimal", SmartPacker.pack() 참고)
+            return_report: True면 (텍스트, 패킹 리포트) 반환
+            max_tokens: 이번 호출의 토큰 예산 (None이면 생성 시 지정한 max_tokens)
+            part_chars: 주어지면 텍스트 대신 part_chars 이하로 나눈 부분 리스트 반환
+                (전체 패키지를 하나의 문자열로 합치지 않지만 부분은 모두 메모리에 올라감,
+                메모리 상한은 max_tokens, split_parts() 참고)
 
         Returns:
-            포맷팅된 마크다운 텍스트
+            포맷팅된 마크다운 텍스트 (part_chars가 있으면 부분 문자열 리스트)
+            (return_report=True면 (텍스트, SmartPacker.pack_with_report()의 리포트),
+            pack_cache에서 가져왔으면 리포트의 "cached"가 True)
         """
-        # 1. 컨텍스트 빌드
-        context = self.context_builder.build_context(
-            note_title=note_title,
-            include_backlinks=include_backlinks,
-            include_forward_links=include_forward_links,
-            include_semantic_related=include_semantic_related,
-            include_tag_related=include_tag_related,
-            max_backlinks=max_backlinks,
-            max_forward_links=max_forward_links,
-            max_semantic_related=max_semantic_related,
-            max_tag_related=max_tag_related,
+        budget = self.smart_packer.max_tokens if max_tokens is None else max_tokens
+        cache_key = (
+            "note",
+            note_title,
+            include_backlinks,
+            include_forward_links,
+            include_semantic_related,
+            include_tag_related,
+            max_backlinks,
+            max_forward_links,
+            max_semantic_related,
+            max_tag_related,
+        )
+        return self._pack_cached(
+            cache_key,
+            lambda: self.context_builder.build_context(
+                note_title=note_title,
+                include_backlinks=include_backlinks,
+                include_forward_links=include_forward_links,
+                include_semantic_related=include_semantic_related,
+                include_tag_related=include_tag_related,
+                max_backlinks=max_backlinks,
+                max_forward_links=max_forward_links,
+                max_semantic_related=max_semantic_related,
+                max_tag_related=max_tag_related,
+            ),
+            priorities=DEFAULT_PRIORITIES,
+            pack_mode=pack_mode,
+            budget=budget,
+            include_metadata=include_metadata,
+            include_links=include_links,
+            return_report=return_report,
+            part_chars=part_chars,
         )
 
-        # 2. 스마트 패킹
-        packed_context = self.smart_packer.pack(context)
+    def pack_query(
+        self,
+        query: str,
+        max_seeds: int = QUERY_SEED_COUNT,
+        max_links_per_seed: int = QUERY_LINKS_PER_SEED,
+        depth: int = QUERY_EXPANSION_DEPTH,
+        decay: float = QUERY_LINK_DECAY,
+        folder: Optional[str] = None,
+        include_metadata: bool = True,
+        include_links: bool = True,
+        pack_mode: str = "optimal",
+        return_report: bool = False,
+        max_tokens: Optional[int] = None,
+        part_chars: Optional[int] = None,
+    ):
+        """검색어로 찾은 여러 시드 노트와 링크 이웃을 하나의 토큰 예산으로 패키징
+
+        시드마다 pack_note()를 따로 부르면 겹치는 이웃 노트가 중복으로 들어가지만,
+        여기서는 모든 시드의 이웃을 합치고 중복을 제거한 뒤 관련도에 따라 한 번에 패킹합니다.
+        트리밍할 때는 검색어와 관련된 섹션을 남깁니다.
+
+        Args:
+            query: 검색어
+            max_seeds: 시드 노트 수
+            max_links_per_seed: 시드 하나에서 링크로 확장하는 최대 노트 수
+            depth: 링크 확장 홉 수
+            decay: 홉마다 곱하는 관련도 감쇠 비율
+            folder: 검색할 PARA 폴더 (None이면 전체)
+            include_metadata: 메타데이터 포함 여부
+            include_links: 링크 정보 포함 여부
+            pack_mode: 패킹 모드 ("greedy" 또는 "optimal")
+            return_report: True면 (텍스트, 패킹 리포트) 반환
+            max_tokens: 이번 호출의 토큰 예산 (None이면 생성 시 지정한 max_tokens)
+            part_chars: 주어지면 텍스트 대신 part_chars 이하로 나눈 부분 리스트 반환
 
-        # 3. 포맷팅
-        formatted_output = self.formatter.format(
-            packed_context,
+        Returns:
+            포맷팅된 마크다운 텍스트 (part_chars가 있으면 부분 문자열 리스트)
+            (return_report=True면 (텍스트, SmartPacker.pack_with_report()의 리포트),
+            pack_cache에서 가져왔으면 리포트의 "cached"가 True)
+        """
+        budget = self.smart_packer.max_tokens if max_tokens is None else max_tokens
+        cache_key = ("query", query, max_seeds, max_links_per_seed, depth, decay, folder)
+        return self._pack_cached(
+            cache_key,
+            lambda: self.context_builder.build_query_context(
+                query,
+                max_seeds=max_seeds,
+                max_links_per_seed=max_links_per_seed,
+                depth=depth,
+                decay=decay,
+                folder=folder,
+            ),
+            priorities=QUERY_PRIORITIES,
+            pack_mode=pack_mode,
+            budget=budget,
             include_metadata=include_metadata,
             include_links=include_links,
+            return_report=return_report,
+            part_chars=part_chars,
+            query=query,
+        )
+
+    def _pack_cached(
+        self,
+        context_key: tuple,
+        build: Callable[[], Dict[str, List[dict]]],
+        priorities: Dict[str, float],
+        pack_mode: str,
+        budget: int,
+        include_metadata: bool,
+        include_links: bool,
+        return_report: bool,
+        part_chars: Optional[int] = None,
+        query: Optional[str] = None,
+    ) -> Union[str, List[str], Tuple[Union[str, List[str]], dict]]:
+        """컨텍스트 빌드 → 스마트 패킹 → 포맷팅 (pack_cache가 있으면 캐시 사용)
+
+        포맷팅은 조각 단위로 만들지만 결과(문자열 또는 부분 튜플)는 캐시와 반환을 위해
+        한 번에 메모리에 올립니다. MCP 도구 응답은 하나의 메시지로 보내므로 스트리밍할
+        수 없고, 최대 메모리는 토큰 예산으로 제한됩니다 (MCP 서버는 예산을
+        PACK_MAX_TOKENS로 자름). part_chars는 응답 하나의 크기를 나눌 뿐 전체 패키지
+        크기를 줄이지 않습니다. return_report=True이고 trace_memory가 켜져 있으면
+        빌드부터 포맷팅까지의 최대 메모리를 리포트의 "peak_memory_bytes"에 넣습니다.
+
+        Args:
+            context_key: 컨텍스트를 결정하는 파라미터 튜플 (캐시 키의 앞부분)
+            build: 컨텍스트를 만드는 함수
+            priorities: 섹션 우선순위
+            pack_mode: 패킹 모드
+            budget: 토큰 예산
+            include_metadata: 메타데이터 포함 여부
+            include_links: 링크 정보 포함 여부
+            return_report: True면 (텍스트, 패킹 리포트) 반환
+            part_chars: 주어지면 part_chars 이하로 나눈 부분 리스트 반환
+            query: 트리밍 시 남길 섹션을 고르는 검색어 (헤더에도 표시)
+        """
+        # 0. 캐시 조회 (인덱스 세대가 같고 후보 노트 파일이 그대로면 재사용)
+        cache_key = context_key + (
+            include_metadata,
+            include_links,
+            pack_mode,
+            budget,
+            return_report,
+            part_chars,
         )
+        with self.context_builder.store_lock:
+            generation = self.context_builder.network_store.generation
+        if self.pack_cache is not None:
+            cached = self.pack_cache.get(cache_key, generation)
+            if cached is not None:
+                formatted_output, report = cached
+                if part_chars:
+                    formatted_output = list(formatted_output)
+                if return_report:
+                    report["cached"] = True
+                    return formatted_output, report
+                return formatted_output
+
+        # 리포트를 반환할 때는 빌드부터 포맷팅까지의 최대 메모리도 측정
+        measure = return_report and self.trace_memory
+        with (track_peak_memory() if measure else nullcontext({})) as memory:
+            # 1. 컨텍스트 빌드
+            context = build()
+
+            # 2. 스마트 패킹
+            report = None
+            if return_report:
+                packed_context, report = self.smart_packer.pack_with_report(
+                    context, priorities, mode=pack_mode, query=query, max_tokens=budget
+                )
+            else:
+                packed_context = self.smart_packer.pack(
+                    context, priorities, mode=pack_mode, query=query, max_tokens=budget
+                )
+
+            # 3. 포맷팅 (조각 단위로 생성해서 바로 이어 붙이거나 부분으로 나눔)
+            # 전체 패키지가 메모리에 올라가므로 크기 상한은 budget (호출자가 PACK_MAX_TOKENS로 제한)
+            pieces = self.formatter.iter_format(
+                packed_context,
+                include_metadata=include_metadata,
+                include_links=include_links,
+                query=query,
+            )
+            if part_chars:
+                parts = tuple(split_parts(pieces, part_chars))
+            else:
+                parts = "".join(pieces)
+        if return_report:
+            report["peak_memory_bytes"] = memory.get("peak_bytes") if measure else None
+
+        if self.pack_cache is not None:
+            self.pack_cache.put(
+                cache_key, generation, parts, report, self._note_stamps(context)
+            )
+        formatted_output = list(parts) if part_chars else parts
 
+        if return_report:
+            report["cached"] = False
+            return formatted_output, report
         return formatted_output
@@ -0,0 +1,215 @@
+"""노트 패싯 인덱스 (복합 조건 조회)
+
+노트마다 슬롯 번호를 부여하고, 패싯 값을 슬롯 순서의 numpy 열(column) 배열로 유지합니다.
+
+- 수정 시각(epoch), 토큰 수, 백링크/포워드링크 수, PARA 폴더 코드
+- 조건마다 불리언 마스크를 만들어 벡터 연산으로 교집합/합집합을 계산
+- 삭제된 슬롯은 비워 두고 다음 추가 때 재사용 (배열은 두 배씩 확장)
+
+태그 조건은 태그 역인덱스(TagIndex)가 돌려준 경로 집합을 슬롯 마스크로 바꿔서 결합합니다.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 정렬 기준 → 열 이름 (모두 큰 값이 먼저)
+SORT_COLUMNS = {
+    "modified": "modified",
+    "tokens": "tokens",
+    "backlinks": "backlinks",
+    "forward_links": "forward_links",
+}
+
+# 열 이름 → dtype
+COLUMNS = {
+    "modified": np.float64,
+    "tokens": np.int64,
+    "backlinks": np.int32,
+    "forward_links": np.int32,
+    "folder": np.int32,
+}
+
+
+class FacetIndex:
+    """노트 경로 → 패싯 열 배열 인덱스"""
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity: 초기 슬롯 수
+        """
+        self.clear(capacity)
+
+    def clear(self, capacity: int = 1024):
+        """인덱스 비우기"""
+        capacity = max(capacity, 1)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS.items()
+        }
+        self.alive = np.zeros(capacity, dtype=bool)
+        # 슬롯 → 경로 (빈 슬롯은 None)
+        self.paths: List[Optional[str]] = []
+        # 경로 → 슬롯
+        self.slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        # PARA 폴더 → 정수 코드
+        self.folder_codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _folder_code(self, folder: str) -> int:
+        """폴더 코드 (처음 보는 폴더면 새로 부여)"""
+        return self.folder_codes.setdefault(folder, len(self.folder_codes))
+
+    def _grow(self, size: int):
+        """슬롯 배열을 size 이상으로 확장"""
+        capacity = len(self.alive)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            self.columns[name] = grown
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: len(self.alive)] = self.alive
+        self.alive = alive
+
+    def rebuild(self, items: Iterable[Tuple[str, dict]]):
+        """전체 재구축 (경로 순서대로 슬롯 부여)
+
+        Args:
+            items: (노트 경로, 패싯 값) 목록
+                패싯 값: {"modified", "tokens", "backlinks", "forward_links", "folder"}
+        """
+        items = list(items)
+        self.clear(len(items) * 2)
+        values = {name: [] for name in COLUMNS}
+        for slot, (path, facets) in enumerate(items):
+            self.paths.append(path)
+            self.slots[path] = slot
+            for name in COLUMNS:
+                if name == "folder":
+                    values[name].append(self._folder_code(facets["folder"]))
+                else:
+                    values[name].append(facets[name])
+        count = len(items)
+        for name, column in self.columns.items():
+            column[:count] = values[name]
+        self.alive[:count] = True
+
+    def set(self, path: str, **facets):
+        """노트 추가 또는 패싯 값 갱신 (주어진 값만 변경)
+
+        Args:
+            path: 노트 경로
+            **facets: modified, tokens, backlinks, forward_links, folder 중 일부
+        """
+        slot = self.slots.get(path)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+                self.paths[slot] = path
+            else:
+                slot = len(self.paths)
+                self._grow(slot + 1)
+                self.paths.append(path)
+            self.slots[path] = slot
+            for column in self.columns.values():
+                column[slot] = 0
+            self.alive[slot] = True
+        for name, value in facets.items():
+            if name == "folder":
+                value = self._folder_code(value)
+            self.columns[name][slot] = value
+
+    def remove(self, path: str):
+        """노트 제거 (슬롯은 재사용 목록으로)
+
+        Args:
+            path: 노트 경로
+        """
+        slot = self.slots.pop(path, None)
+        if slot is None:
+            return
+        self.alive[slot] = False
+        self.paths[slot] = None
+        self._free.append(slot)
+
+    def mask_for(self, paths: Iterable[str]) -> np.ndarray:
+        """경로 집합에 해당하는 슬롯 마스크
+
+        Args:
+            paths: 노트 경로들 (인덱스에 없는 경로는 무시)
+
+        Returns:
+            슬롯 수 길이의 불리언 배열
+        """
+        mask = np.zeros(len(self.paths), dtype=bool)
+        slots = [self.slots[path] for path in paths if path in self.slots]
+        if slots:
+            mask[np.fromiter(slots, dtype=np.int64, count=len(slots))] = True
+        return mask
+
+    def query(
+        self,
+        folder: Optional[str] = None,
+        include: Iterable[np.ndarray] = (),
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        sort: str = "modified",
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, List[str]]:
+        """조건을 모두 만족하는 노트 조회
+
+        Args:
+            folder: PARA 폴더 (None이면 전체)
+            include: 추가로 AND할 슬롯 마스크들 (mask_for()의 결과)
+            ranges: {열 이름: (최솟값, 최댓값)} (양 끝 포함, None이면 제한 없음)
+            sort: 정렬 기준 (SORT_COLUMNS의 키, 큰 값이 먼저, 같으면 경로순)
+            offset: 건너뛸 개수
+            limit: 최대 개수 (None이면 전부)
+
+        Returns:
+            (조건을 만족하는 전체 노트 수, 현재 페이지의 경로 리스트)
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"지원하지 않는 정렬 기준: {sort}")
+
+        size = len(self.paths)
+        mask = self.alive[:size].copy()
+        if folder is not None:
+            code = self.folder_codes.get(folder)
+            if code is None:
+                return 0, []
+            mask &= self.columns["folder"][:size] == code
+        for other in include:
+            mask &= other[:size]
+        for name, (low, high) in (ranges or {}).items():
+            column = self.columns[name][:size]
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+
+        slots = np.flatnonzero(mask)
+        total = len(slots)
+        end = total if limit is None else min(total, offset + max(limit, 0))
+        if offset >= end:
+            return total, []
+
+        keys = self.columns[SORT_COLUMNS[sort]][slots]
+        if end < total:
+            # 상위 end개 후보만 남김 (경계값과 같은 값은 모두 포함해서 경로순 정렬)
+            threshold = np.partition(keys, total - end)[total - end]
+            candidates = keys >= threshold
+            slots, keys = slots[candidates], keys[candidates]
+
+        ordered = sorted(
+            zip(keys.tolist(), slots.tolist()),
+            key=lambda item: (-item[0], self.paths[item[1]]),
+        )
+        return total, [self.paths[slot] for _, slot in ordered[offset:end]]
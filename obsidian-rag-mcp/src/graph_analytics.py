@@ -0,0 +1,171 @@
+"""링크 그래프 분석
+
+CSR 링크 그래프(LinkGraph) 위에서 PageRank, 진입/진출 차수, 약한 연결 요소를 계산합니다.
+모든 계산은 numpy 벡터 연산으로 수행하고, 결과는 네트워크 저장소의 generation이
+바뀔 때까지 캐시합니다.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from link_graph import LinkGraph
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-8
+PAGERANK_MAX_ITER = 100
+
+
+def pagerank(
+    graph: LinkGraph,
+    damping: float = PAGERANK_DAMPING,
+    tol: float = PAGERANK_TOLERANCE,
+    max_iter: int = PAGERANK_MAX_ITER,
+) -> np.ndarray:
+    """희소 거듭제곱 반복(power iteration)으로 PageRank 계산
+
+    포워드링크가 없는 노트(dangling)의 점수는 전체 노트에 균등하게 분배합니다.
+
+    Args:
+        graph: LinkGraph
+        damping: 감쇠 계수
+        tol: 수렴 판정 기준 (L1 변화량)
+        max_iter: 최대 반복 횟수
+
+    Returns:
+        노드 ID 순서의 PageRank 배열 (합계 1.0)
+    """
+    num_nodes = graph.num_nodes
+    if num_nodes == 0:
+        return np.zeros(0)
+
+    out_degrees = graph.out_degrees()
+    sources = np.repeat(np.arange(num_nodes), out_degrees)
+    targets = graph.fwd_indices
+    dangling = out_degrees == 0
+    inv_out = np.zeros(num_nodes)
+    inv_out[~dangling] = 1.0 / out_degrees[~dangling]
+
+    rank = np.full(num_nodes, 1.0 / num_nodes)
+    for _ in range(max_iter):
+        contributions = (rank * inv_out)[sources]
+        spread = np.bincount(targets, weights=contributions, minlength=num_nodes)
+        new_rank = (1.0 - damping) / num_nodes + damping * (
+            spread + rank[dangling].sum() / num_nodes
+        )
+        delta = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < tol:
+            break
+    return rank
+
+
+def weakly_connected_components(graph: LinkGraph) -> np.ndarray:
+    """약한 연결 요소 레이블 계산 (링크 방향 무시)
+
+    최소 레이블 전파와 포인터 점프로 계산합니다.
+
+    Args:
+        graph: LinkGraph
+
+    Returns:
+        노드 ID 순서의 요소 레이블 배열 (요소 내 가장 작은 노드 ID)
+    """
+    num_nodes = graph.num_nodes
+    labels = np.arange(num_nodes)
+    sources = np.repeat(np.arange(num_nodes), graph.out_degrees())
+    targets = graph.fwd_indices
+
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, sources, labels[targets])
+        np.minimum.at(new_labels, targets, labels[sources])
+        # 포인터 점프: 레이블의 레이블을 따라가며 압축
+        while True:
+            jumped = new_labels[new_labels]
+            if np.array_equal(jumped, new_labels):
+                break
+            new_labels = jumped
+        if np.array_equal(new_labels, labels):
+            return labels
+        labels = new_labels
+
+
+class GraphAnalytics:
+    """네트워크 저장소의 그래프 분석 결과 캐시
+
+    PageRank/차수/연결 요소를 한 번에 계산하고 저장소 generation이 바뀔 때까지 재사용합니다.
+    """
+
+    def __init__(self, network_store):
+        """
+        Args:
+            network_store: NetworkMetadataStore 인스턴스
+        """
+        self.network_store = network_store
+        self._lock = threading.Lock()
+        self._cache: Optional[dict] = None
+
+    def _compute(self) -> dict:
+        """현재 generation의 분석 결과 (캐시 없으면 계산)"""
+        with self._lock:
+            graph = self.network_store.graph
+            if self._cache is None or self._cache["generation"] != graph.generation:
+                self._cache = {
+                    "generation": graph.generation,
+                    "graph": graph,
+                    "pagerank": pagerank(graph),
+                    "in_degrees": graph.in_degrees(),
+                    "out_degrees": graph.out_degrees(),
+                    "components": weakly_connected_components(graph),
+                }
+            return self._cache
+
+    def pagerank_of(self, path: str) -> float:
+        """노트 경로의 PageRank (없으면 0.0)"""
+        result = self._compute()
+        node = result["graph"].node_id(path)
+        return float(result["pagerank"][node]) if node is not None else 0.0
+
+    def _top(self, scores: np.ndarray, graph: LinkGraph, limit: int) -> List[dict]:
+        """점수 상위 노트 (동점은 경로 순)"""
+        if limit <= 0 or len(scores) == 0:
+            return []
+        order = np.lexsort((np.arange(len(scores)), -scores))[:limit]
+        return [
+            {"title": graph.titles[i], "path": graph.paths[i], "score": scores[i].item()}
+            for i in order
+        ]
+
+    def summary(self, limit: int = 10) -> Dict:
+        """그래프 인사이트 요약
+
+        Args:
+            limit: 각 순위 목록의 최대 항목 수
+
+        Returns:
+            {
+                "generation", "total_notes", "total_links",
+                "components", "largest_component", "isolated_notes",
+                "top_pagerank", "top_backlinked", "top_linking"
+            }
+        """
+        result = self._compute()
+        graph = result["graph"]
+        in_degrees, out_degrees = result["in_degrees"], result["out_degrees"]
+
+        component_sizes = np.bincount(result["components"])
+        component_sizes = component_sizes[component_sizes > 0]
+
+        return {
+            "generation": result["generation"],
+            "total_notes": graph.num_nodes,
+            "total_links": graph.num_edges,
+            "components": int(len(component_sizes)),
+            "largest_component": int(component_sizes.max()) if len(component_sizes) else 0,
+            "isolated_notes": int(np.count_nonzero((in_degrees + out_degrees) == 0)),
+            "top_pagerank": self._top(result["pagerank"], graph, limit),
+            "top_backlinked": self._top(in_degrees, graph, limit),
+            "top_linking": self._top(out_degrees, graph, limit),
+        }
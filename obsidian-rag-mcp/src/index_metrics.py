@@ -0,0 +1,193 @@
+"""
+Index Metrics
+
+인덱싱 실행 단위(run)의 단계별 소요 시간과 카운터를 수집하고,
+JSONL 리포트 및 (선택) Prometheus textfile로 기록합니다.
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import METRICS_FILE, PROMETHEUS_TEXTFILE
+
+# 리포트에 항상 포함되는 단계 (실행되지 않은 단계는 0.0초)
+STAGES = (
+    "walk",
+    "backup",
+    "parse",
+    "embed",
+    "chroma_write",
+    "network_update",
+    "repomix_update",
+    "save",
+)
+
+
+class IndexRunMetrics:
+    """인덱싱 1회 실행의 계측 데이터
+
+    단계별 소요 시간(초)과 카운터(파일 수, 청크 수 등)를 누적합니다.
+    """
+
+    def __init__(self, source: str = "manual"):
+        """
+        Args:
+            source: 실행 주체 (manual, auto_update, server_start, 스크립트 이름 등)
+        """
+        self.source = source
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now().isoformat()
+        self._start = time.perf_counter()
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def stage(self, name: str):
+        """단계 소요 시간 측정 컨텍스트
+
+        Args:
+            name: 단계 이름 (STAGES 참고)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+
+    def add_time(self, name: str, seconds: float):
+        """외부에서 측정한 시간을 단계에 누적"""
+        self.timings[name] += seconds
+
+    def incr(self, name: str, value: int = 1):
+        """카운터 증가"""
+        self.counters[name] += value
+
+    def record_vector_write(self, write_stats):
+        """VectorStore 쓰기 통계 누적
+
+        Args:
+            write_stats: VectorStore.add_document()/delete_document()의 반환값
+        """
+        if not isinstance(write_stats, dict):
+            return
+        self.add_time("embed", write_stats.get("embed_seconds", 0.0))
+        self.add_time("chroma_write", write_stats.get("write_seconds", 0.0))
+        self.incr("chunks", write_stats.get("chunks", 0))
+        self.incr("embedding_batches", write_stats.get("embedding_batches", 0))
+
+    def to_report(self, status: str = "ok", error: Optional[str] = None) -> dict:
+        """리포트 딕셔너리 생성
+
+        Args:
+            status: 실행 결과 (ok, noop, failed)
+            error: 실패 시 에러 메시지
+
+        Returns:
+            JSON 직렬화 가능한 리포트
+        """
+        timings = {name: 0.0 for name in STAGES}
+        timings.update(self.timings)
+
+        embed_seconds = timings["embed"]
+        chunks = self.counters.get("chunks", 0)
+
+        return {
+            "run_id": self.run_id,
+            "source": self.source,
+            "status": status,
+            "error": error,
+            "started_at": self.started_at,
+            "finished_at": datetime.now().isoformat(),
+            "duration_seconds": round(time.perf_counter() - self._start, 6),
+            "timings_seconds": {k: round(v, 6) for k, v in timings.items()},
+            "counters": dict(self.counters),
+            "embedding_chunks_per_second": (
+                round(chunks / embed_seconds, 3) if embed_seconds > 0 else 0.0
+            ),
+        }
+
+
+def write_run_report(
+    report: dict,
+    metrics_file: Optional[Path] = None,
+    prometheus_file: Optional[Path] = None,
+):
+    """실행 리포트를 JSONL 파일에 추가하고, 설정 시 Prometheus textfile 갱신
+
+    Args:
+        report: IndexRunMetrics.to_report()의 반환값
+        metrics_file: JSONL 파일 경로 (기본값: config.METRICS_FILE)
+        prometheus_file: Prometheus textfile 경로 (기본값: config.PROMETHEUS_TEXTFILE)
+    """
+    metrics_file = metrics_file if metrics_file else METRICS_FILE
+    prometheus_file = prometheus_file if prometheus_file else PROMETHEUS_TEXTFILE
+
+    try:
+        metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(metrics_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print(f"⚠️ 메트릭 기록 실패: {e}", file=sys.stderr)
+
+    if prometheus_file:
+        try:
+            _write_prometheus_textfile(report, Path(prometheus_file))
+        except Exception as e:
+            print(f"⚠️ Prometheus textfile 기록 실패: {e}", file=sys.stderr)
+
+
+def _write_prometheus_textfile(report: dict, path: Path):
+    """node_exporter textfile collector 형식으로 마지막 실행 지표 기록
+
+    수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 rename 합니다.
+    """
+    labels = f'source="{report["source"]}"'
+    lines = [
+        "# HELP obsidian_rag_index_stage_seconds Duration of each indexing stage in the last run.",
+        "# TYPE obsidian_rag_index_stage_seconds gauge",
+    ]
+    for stage, seconds in report["timings_seconds"].items():
+        lines.append(
+            f'obsidian_rag_index_stage_seconds{{{labels},stage="{stage}"}} {seconds}'
+        )
+
+    lines += [
+        "# HELP obsidian_rag_index_count Counters of the last indexing run.",
+        "# TYPE obsidian_rag_index_count gauge",
+    ]
+    for name, value in sorted(report["counters"].items()):
+        lines.append(f'obsidian_rag_index_count{{{labels},name="{name}"}} {value}')
+
+    success = 1 if report["status"] != "failed" else 0
+    lines += [
+        "# HELP obsidian_rag_index_duration_seconds Total duration of the last indexing run.",
+        "# TYPE obsidian_rag_index_duration_seconds gauge",
+        f"obsidian_rag_index_duration_seconds{{{labels}}} {report['duration_seconds']}",
+        "# HELP obsidian_rag_index_embedding_chunks_per_second Embedding throughput of the last run.",
+        "# TYPE obsidian_rag_index_embedding_chunks_per_second gauge",
+        f"obsidian_rag_index_embedding_chunks_per_second{{{labels}}} "
+        f"{report['embedding_chunks_per_second']}",
+        "# HELP obsidian_rag_index_last_success Whether the last indexing run succeeded.",
+        "# TYPE obsidian_rag_index_last_success gauge",
+        f"obsidian_rag_index_last_success{{{labels}}} {success}",
+        "# HELP obsidian_rag_index_last_run_timestamp_seconds Unix time of the last run.",
+        "# TYPE obsidian_rag_index_last_run_timestamp_seconds gauge",
+        f"obsidian_rag_index_last_run_timestamp_seconds{{{labels}}} {int(time.time())}",
+    ]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
@@ -1,17 +1,53 @@
 import json
 import hashlib
 import shutil
+import sys
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Set
+from typing import List, Dict, Iterator, Optional, Set
 from config import (
     VAULT_PATH,
     METADATA_FILE,
     EXCLUDE_PATTERNS,
     BACKUP_DIR,
     MAX_BACKUPS,
+    TOKENIZE_BATCH_SIZE,
+    TOKENIZE_BATCH_BYTES,
 )
 from obsidian_parser import ObsidianParser
+from index_metrics import IndexRunMetrics, write_run_report
+
+
+def iter_batches(
+    files: List[Path],
+    max_files: int = TOKENIZE_BATCH_SIZE,
+    max_bytes: int = TOKENIZE_BATCH_BYTES,
+) -> Iterator[List[Path]]:
+    """파일을 문서 수와 파일 크기 합계 상한으로 나눈 배치로 반환 (순서 유지)
+
+    Args:
+        files: 파일 경로 리스트
+        max_files: 배치당 최대 파일 수
+        max_bytes: 배치당 파일 크기 합계 상한 (한 파일이 더 크면 단독 배치)
+
+    Returns:
+        파일 경로 배치 이터레이터
+    """
+    batch: List[Path] = []
+    size = 0
+    for file in files:
+        try:
+            file_size = file.stat().st_size
+        except OSError:
+            file_size = 0
+        if batch and (len(batch) >= max_files or size + file_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(file)
+        size += file_size
+    if batch:
+        yield batch
 
 
 class IncrementalIndexer:
@@ -24,6 +60,7 @@ class IncrementalIndexer:
         self.metadata = self.load_metadata()
         self.network_store = None  # UnifiedIndexer에서 사용
         self.repomix_store = None  # UnifiedIndexer에서 사용
+        self.last_scan_count = 0  # 마지막 check_updates()에서 스캔한 파일 수
 
     def load_metadata(self) -> Dict:
         """메타데이터 로드"""
@@ -79,6 +116,7 @@ class IncrementalIndexer:
     def check_updates(self) -> Dict[str, List[Path]]:
         """변경사항 확인"""
         current_files = self.get_md_files()
+        self.last_scan_count = len(current_files)
         indexed_files = set(Path(p) for p in self.metadata["indexed_files"].keys())
 
         # 새 파일
@@ -106,39 +144,40 @@ class IncrementalIndexer:
 
         total_changes = sum(len(v) for v in changes.values())
         if total_changes == 0:
-            print("✅ 인덱스가 최신 상태입니다.")
+            print("✅ 인덱스가 최신 상태입니다.", file=sys.stderr)
             return
 
         print(
             f"📊 변경사항 감지: 새 파일 {len(changes['new'])}, "
-            f"수정 {len(changes['modified'])}, 삭제 {len(changes['deleted'])}"
+            f"수정 {len(changes['modified'])}, 삭제 {len(changes['deleted'])}",
+            file=sys.stderr,
         )
 
         # 삭제된 파일 처리
         for file in changes["deleted"]:
             self.vector_store.delete_document(str(file))
             del self.metadata["indexed_files"][str(file)]
-            print(f"  ❌ 삭제: {file.name}")
+            print(f"  ❌ 삭제: {file.name}", file=sys.stderr)
 
         # 수정된 파일 처리
         for file in changes["modified"]:
             doc = self.parser.parse_file(file)
             self.vector_store.update_document(doc)
             self.metadata["indexed_files"][str(file)] = self.get_file_hash(file)
-            print(f"  ♻️ 업데이트: {file.name}")
+            print(f"  ♻️ 업데이트: {file.name}", file=sys.stderr)
 
         # 새 파일 처리
         for file in changes["new"]:
             doc = self.parser.parse_file(file)
             self.vector_store.add_document(doc)
             self.metadata["indexed_files"][str(file)] = self.get_file_hash(file)
-            print(f"  ➕ 추가: {file.name}")
+            print(f"  ➕ 추가: {file.name}", file=sys.stderr)
 
         # 메타데이터 업데이트
         self.metadata["last_update"] = datetime.now().isoformat()
         self.save_metadata()
 
-        print("✅ 인덱스 업데이트 완료!")
+        print("✅ 인덱스 업데이트 완료!", file=sys.stderr)
 
 
 class UnifiedIndexer(IncrementalIndexer):
@@ -154,6 +193,50 @@ class UnifiedIndexer(IncrementalIndexer):
         super().__init__(vector_store)
         self.network_store = network_store
         self.repomix_store = repomix_store
+        # 백그라운드 백필과 자동 업데이트가 동시에 DB를 갱신하지 않도록 실행 단위로 직렬화
+        self.write_lock = threading.RLock()
+        # 스토어 변경 구간(파일 1개 반영, 저장, 롤백)만 잡는 짧은 락
+        # 읽기 쪽(MCP 핸들러)은 이 락만 잡으므로 인덱싱 도중에도 오래 기다리지 않음
+        self.lock = threading.RLock()
+
+        # 네트워크/Repomix 파일을 읽지 못해 빈 저장소로 시작했으면 전체 재인덱싱
+        load_errors = [
+            error
+            for error in (
+                getattr(network_store, "load_error", None),
+                getattr(repomix_store, "load_error", None),
+            )
+            if isinstance(error, str)
+        ]
+        if load_errors:
+            self._force_reindex(load_errors)
+
+    def _force_reindex(self, reasons: List[str]):
+        """저장소를 다시 채우도록 인덱싱 기록을 비움
+
+        아직 vault에 있는 파일은 indexed_files에서 빼서 다시 인덱싱하게 하고,
+        사라진 파일은 남겨서 다음 업데이트에서 삭제로 처리합니다.
+        ChromaDB에는 이전 청크가 남아 있으므로 metadata["reindex_paths"]에 기록해 두고
+        다시 인덱싱할 때 추가 대신 교체합니다.
+
+        Args:
+            reasons: 저장소를 읽지 못한 원인
+        """
+        indexed_files = self.metadata["indexed_files"]
+        existing = {path for path in indexed_files if Path(path).exists()}
+        reindex = set(self.metadata.get("reindex_paths", [])) | existing
+        self.metadata["reindex_paths"] = sorted(reindex)
+        self.metadata["indexed_files"] = {
+            path: file_hash
+            for path, file_hash in indexed_files.items()
+            if path not in reindex
+        }
+        self.save_metadata()
+        print(
+            f"⚠️ 저장소를 읽지 못해 {len(reindex)}개 파일을 다시 인덱싱합니다: "
+            + "; ".join(reasons),
+            file=sys.stderr,
+        )
 
     def _create_backup(self) -> Path:
         """업데이트 전 백업 스냅샷 생성
@@ -169,19 +252,31 @@ class UnifiedIndexer(IncrementalIndexer):
         if METADATA_FILE.exists():
             shutil.copy(METADATA_FILE, backup_dir / "index_metadata.json")
 
-        if self.network_store.metadata_file.exists():
-            shutil.copy(
-                self.network_store.metadata_file, backup_dir / "network_metadata.json"
-            )
+        # 저장 형식(.db/.json)에 따라 파일 이름 유지
+        network_file = self.network_store.metadata_file
+        if network_file.exists():
+            shutil.copy(network_file, backup_dir / network_file.name)
 
-        if self.repomix_store.index_file.exists():
-            shutil.copy(
-                self.repomix_store.index_file, backup_dir / "repomix_index.json"
-            )
+        repomix_file = self.repomix_store.index_file
+        if repomix_file.exists():
+            shutil.copy(repomix_file, backup_dir / repomix_file.name)
 
-        print(f"📦 백업 생성: {backup_dir.name}")
+        print(f"📦 백업 생성: {backup_dir.name}", file=sys.stderr)
         return backup_dir
 
+    def create_backup(self) -> Path:
+        """여러 번의 index_files() 호출이 함께 쓸 백업 스냅샷 생성
+
+        초기 백필처럼 배치를 나눠 인덱싱할 때 실행 시작 시점에 한 번만 백업하고,
+        반환된 경로를 index_files(backup_dir=...)로 넘겨 배치마다 DB 전체를
+        복사하지 않도록 합니다.
+
+        Returns:
+            backup_dir: 백업 디렉토리 경로
+        """
+        with self.write_lock:
+            return self._create_backup()
+
     def _rollback(self, backup_dir: Path):
         """백업에서 복원
 
@@ -189,32 +284,29 @@ class UnifiedIndexer(IncrementalIndexer):
             backup_dir: 복원할 백업 디렉토리
         """
         try:
-            print(f"🔄 롤백 시작: {backup_dir.name}")
+            print(f"🔄 롤백 시작: {backup_dir.name}", file=sys.stderr)
 
             # 메타데이터 파일 복원
             if (backup_dir / "index_metadata.json").exists():
                 shutil.copy(backup_dir / "index_metadata.json", METADATA_FILE)
 
-            if (backup_dir / "network_metadata.json").exists():
-                shutil.copy(
-                    backup_dir / "network_metadata.json",
-                    self.network_store.metadata_file,
-                )
+            network_file = self.network_store.metadata_file
+            if (backup_dir / network_file.name).exists():
+                shutil.copy(backup_dir / network_file.name, network_file)
 
-            if (backup_dir / "repomix_index.json").exists():
-                shutil.copy(
-                    backup_dir / "repomix_index.json", self.repomix_store.index_file
-                )
+            repomix_file = self.repomix_store.index_file
+            if (backup_dir / repomix_file.name).exists():
+                shutil.copy(backup_dir / repomix_file.name, repomix_file)
 
             # 메타데이터 재로드
             self.metadata = self.load_metadata()
             self.network_store.metadata = self.network_store.load_metadata()
             self.repomix_store.index = self.repomix_store.load_index()
 
-            print("✅ 롤백 완료")
+            print("✅ 롤백 완료", file=sys.stderr)
 
         except Exception as e:
-            print(f"❌ 롤백 실패: {e}")
+            print(f"❌ 롤백 실패: {e}", file=sys.stderr)
             raise
 
     def _cleanup_old_backups(self, max_backups: int = MAX_BACKUPS):
@@ -232,112 +324,213 @@ class UnifiedIndexer(IncrementalIndexer):
         for old_backup in backups[max_backups:]:
             if old_backup.is_dir():
                 shutil.rmtree(old_backup)
-                print(f"🗑️ 오래된 백업 삭제: {old_backup.name}")
+                print(f"🗑️ 오래된 백업 삭제: {old_backup.name}", file=sys.stderr)
 
-    def update_index(self):
-        """3개 DB 통합 업데이트 (트랜잭션 지원)"""
-        changes = self.check_updates()
+    def update_index(self, metrics: Optional[IndexRunMetrics] = None):
+        """3개 DB 통합 업데이트 (트랜잭션 지원)
+
+        실행이 끝나면 단계별 계측 리포트를 METRICS_FILE에 기록합니다.
+
+        Args:
+            metrics: 호출자가 미리 만든 계측 객체 (없으면 source="manual"로 생성)
+        """
+        metrics = metrics if metrics else IndexRunMetrics(source="manual")
+
+        with self.write_lock:
+            with metrics.stage("walk"):
+                changes = self.check_updates()
+            metrics.incr("files_scanned", self.last_scan_count)
+
+            self._apply_changes(changes, metrics)
 
+    def index_files(
+        self,
+        files: List[Path],
+        metrics: Optional[IndexRunMetrics] = None,
+        backup_dir: Optional[Path] = None,
+    ):
+        """지정한 파일들만 인덱싱 (vault 전체 스캔 없음)
+
+        초기 백필처럼 파일을 나눠서 순서대로 인덱싱할 때 사용합니다.
+        이미 최신 상태인 파일과 사라진 파일은 건너뜁니다.
+
+        Args:
+            files: 인덱싱할 파일 경로 리스트
+            metrics: 계측 객체 (없으면 source="manual"로 생성)
+            backup_dir: create_backup()으로 미리 만든 백업 (주어지면 새로 백업하지 않고
+                실패 시 이 스냅샷으로 롤백)
+        """
+        metrics = metrics if metrics else IndexRunMetrics(source="manual")
+
+        with self.write_lock:
+            indexed_files = self.metadata["indexed_files"]
+            changes = {"new": [], "modified": [], "deleted": []}
+            for file in files:
+                if not file.exists():
+                    continue
+                if str(file) not in indexed_files:
+                    changes["new"].append(file)
+                elif indexed_files[str(file)] != self.get_file_hash(file):
+                    changes["modified"].append(file)
+            metrics.incr("files_scanned", len(files))
+
+            self._apply_changes(changes, metrics, backup_dir=backup_dir)
+
+    def _apply_changes(
+        self,
+        changes: Dict[str, List[Path]],
+        metrics: IndexRunMetrics,
+        backup_dir: Optional[Path] = None,
+    ):
+        """변경사항을 3개 DB에 트랜잭션으로 반영하고 계측 리포트 기록
+
+        파싱과 임베딩은 self.lock 밖에서 하고, 스토어 변경은 파일 하나 단위로만
+        self.lock을 잡습니다. 호출자는 write_lock을 잡고 있어야 합니다.
+
+        Args:
+            changes: {"new": [...], "modified": [...], "deleted": [...]}
+            metrics: 계측 객체
+            backup_dir: 호출자가 관리하는 백업 (없으면 새로 만들고 성공 시 오래된 백업 정리)
+        """
         if not changes["new"] and not changes["modified"] and not changes["deleted"]:
-            print("✅ 인덱스가 최신 상태입니다.")
+            print("✅ 인덱스가 최신 상태입니다.", file=sys.stderr)
+            write_run_report(metrics.to_report(status="noop"))
             return
 
+        metrics.incr("files_new", len(changes["new"]))
+        metrics.incr("files_modified", len(changes["modified"]))
+        metrics.incr("files_deleted", len(changes["deleted"]))
+
         print(
             f"📊 변경사항 감지: 새 파일 {len(changes['new'])}, "
-            f"수정 {len(changes['modified'])}, 삭제 {len(changes['deleted'])}"
+            f"수정 {len(changes['modified'])}, 삭제 {len(changes['deleted'])}",
+            file=sys.stderr,
         )
 
-        # 백업 생성
-        backup_dir = self._create_backup()
+        # 백업 생성 (호출자가 실행 단위 백업을 넘기면 생략)
+        owns_backup = backup_dir is None
+        if owns_backup:
+            with metrics.stage("backup"):
+                backup_dir = self._create_backup()
 
         try:
-            # Phase 1: Prepare updates for all 3 DBs
-            updates = {"chroma": [], "network": [], "repomix": []}
-
-            for file in changes["new"] + changes["modified"]:
-                doc = self.parser.parse_file(file)
-
-                # ChromaDB: full document
-                updates["chroma"].append({"file": file, "doc": doc})
-
-                # Network: extract links and tags
-                updates["network"].append(
-                    {
-                        "path": str(file),
-                        "title": doc["title"],
-                        "para_folder": doc["para_folder"],
-                        "forward_links": doc["wiki_links"],
-                        "tags": doc["tags"],
-                        "metadata": doc.get("metadata", {}),
-                        "content": doc["content"],
-                    }
+            # 삭제된 파일 처리 (3개 DB)
+            for file in changes["deleted"]:
+                metrics.record_vector_write(
+                    self.vector_store.delete_document(str(file))
                 )
+                with self.lock:
+                    del self.metadata["indexed_files"][str(file)]
+                print(f"  ❌ 삭제: {file.name}", file=sys.stderr)
 
-                # Repomix: extract file stats
-                updates["repomix"].append(
-                    {
-                        "doc": doc,
-                        "file": file,
-                    }
-                )
+            with metrics.stage("network_update"):
+                for file in changes["deleted"]:
+                    with self.lock:
+                        self.network_store.delete_metadata(str(file))
 
-            # Phase 2: Apply updates to all 3 DBs
-            # Update ChromaDB (기존 로직 재사용)
-            for file in changes["deleted"]:
-                self.vector_store.delete_document(str(file))
-                del self.metadata["indexed_files"][str(file)]
-                print(f"  ❌ 삭제: {file.name}")
+            with metrics.stage("repomix_update"):
+                for file in changes["deleted"]:
+                    with self.lock:
+                        self.repomix_store.delete_index(str(file))
 
             # 수정된 파일과 새 파일 처리
-            for i, file in enumerate(changes["modified"] + changes["new"]):
-                chroma_data = updates["chroma"][i]
-                doc = chroma_data["doc"]
-
-                if file in changes["modified"]:
-                    self.vector_store.update_document(doc)
-                    print(f"  ♻️ 업데이트: {file.name}")
-                else:
-                    self.vector_store.add_document(doc)
-                    print(f"  ➕ 추가: {file.name}")
-
-                self.metadata["indexed_files"][str(file)] = self.get_file_hash(file)
-
-            # Update NetworkMetadataStore
-            print("  🔗 네트워크 메타데이터 업데이트 중...")
-            for network_doc in updates["network"]:
-                self.network_store.update_metadata(network_doc)
-
-            for file in changes["deleted"]:
-                self.network_store.delete_metadata(str(file))
-
-            # Update RepomixIndexStore
-            print("  📦 Repomix 인덱스 업데이트 중...")
-            for repomix_data in updates["repomix"]:
-                doc = repomix_data["doc"]
-                file = repomix_data["file"]
-                self.repomix_store.update_index(doc, file)
-
-            for file in changes["deleted"]:
-                self.repomix_store.delete_index(str(file))
+            # TOKENIZE_BATCH_SIZE개(또는 TOKENIZE_BATCH_BYTES)씩 파싱 → 토큰 수 배치 계산 → 3개 DB 반영 후 버려서
+            # 변경 문서 전체를 메모리에 들고 있지 않음 (실패 시에는 백업으로 롤백)
+            modified_files = set(changes["modified"])
+            # 저장소 재구축 중이면 ChromaDB의 이전 청크를 교체하도록 수정으로 처리
+            reindex_paths = set(self.metadata.get("reindex_paths", ()))
+            pending = changes["modified"] + changes["new"]
+            for chunk in iter_batches(pending):
+                with metrics.stage("parse"):
+                    docs = [self.parser.parse_file(file) for file in chunk]
+                with metrics.stage("repomix_update"):
+                    self.repomix_store.prefetch_token_counts(docs)
+                for file, doc in zip(chunk, docs):
+                    if doc.get("streamed"):
+                        metrics.incr("files_streamed")
+                    if doc.get("oversize"):
+                        metrics.incr("files_oversize")
+
+                    # ChromaDB: full document
+                    if file in modified_files or str(file) in reindex_paths:
+                        write_stats = self.vector_store.update_document(doc)
+                        print(f"  ♻️ 업데이트: {file.name}", file=sys.stderr)
+                    else:
+                        write_stats = self.vector_store.add_document(doc)
+                        print(f"  ➕ 추가: {file.name}", file=sys.stderr)
+                    metrics.record_vector_write(write_stats)
+
+                    file_hash = self.get_file_hash(file)
+                    # 파일 하나 단위로만 스토어 락을 잡아 읽기 쪽이 오래 막히지 않게 함
+                    with self.lock:
+                        # Network: links and tags
+                        with metrics.stage("network_update"):
+                            self.network_store.update_metadata(
+                                {
+                                    "path": str(file),
+                                    "title": doc["title"],
+                                    "para_folder": doc["para_folder"],
+                                    "forward_links": doc["wiki_links"],
+                                    "tags": doc["tags"],
+                                    "metadata": doc.get("metadata", {}),
+                                    "content": doc["content"],
+                                    "streamed": doc.get("streamed", False),
+                                }
+                            )
+
+                        # Repomix: file stats
+                        with metrics.stage("repomix_update"):
+                            self.repomix_store.update_index(doc, file)
+
+                        self.metadata["indexed_files"][str(file)] = file_hash
+                        reindex_paths.discard(str(file))
+
+            # Repomix: network_store가 다시 계산한 백링크 동기화
+            # (변경된 파일이 링크하는 다른 노트의 백링크도 포함)
+            with metrics.stage("repomix_update"), self.lock:
+                self.repomix_store.update_backlinks(self.network_store.pop_dirty_backlinks())
 
             # Save all metadata
-            self.metadata["last_update"] = datetime.now().isoformat()
-            self.save_metadata()
-            self.network_store.save_metadata()
-            self.repomix_store.save_index()
+            with metrics.stage("save"), self.lock:
+                if reindex_paths:
+                    self.metadata["reindex_paths"] = sorted(reindex_paths)
+                else:
+                    self.metadata.pop("reindex_paths", None)
+                self.metadata["last_update"] = datetime.now().isoformat()
+                self.save_metadata()
+                self.network_store.save_metadata()
+                self.repomix_store.save_index()
 
-            print("✅ 통합 인덱스 업데이트 완료!")
+            print("✅ 통합 인덱스 업데이트 완료!", file=sys.stderr)
             print(
-                f"  - ChromaDB: {len(changes['new']) + len(changes['modified'])} 문서 업데이트"
+                f"  - ChromaDB: {len(changes['new']) + len(changes['modified'])} 문서 업데이트",
+                file=sys.stderr,
+            )
+            print(
+                f"  - Network: {len(changes['new']) + len(changes['modified'])} 메타데이터 업데이트",
+                file=sys.stderr,
+            )
+            print(
+                f"  - Repomix: {len(changes['new']) + len(changes['modified'])} 인덱스 업데이트",
+                file=sys.stderr,
             )
-            print(f"  - Network: {len(updates['network'])} 메타데이터 업데이트")
-            print(f"  - Repomix: {len(updates['repomix'])} 인덱스 업데이트")
 
-            # 오래된 백업 정리
-            self._cleanup_old_backups()
+            # 오래된 백업 정리 (호출자 백업은 실행이 끝날 때까지 유지)
+            if owns_backup:
+                with metrics.stage("backup"):
+                    self._cleanup_old_backups()
 
         except Exception as e:
-            print(f"❌ 업데이트 실패: {e}")
-            print("🔄 롤백 시도 중...")
-            self._rollback(backup_dir)
+            print(f"❌ 업데이트 실패: {e}", file=sys.stderr)
+            print("🔄 롤백 시도 중...", file=sys.stderr)
+            write_run_report(metrics.to_report(status="failed", error=str(e)))
+            with self.lock:
+                self._rollback(backup_dir)
             raise
+
+        report = metrics.to_report()
+        write_run_report(report)
+        print(
+            f"  ⏱️ 소요 시간: {report['duration_seconds']:.2f}초 (run_id={report['run_id']})",
+            file=sys.stderr,
+        )
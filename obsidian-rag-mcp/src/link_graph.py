@@ -0,0 +1,279 @@
+"""정수 ID 기반 CSR 링크 그래프
+
+NetworkMetadataStore의 딕셔너리(경로 문자열 → 제목 리스트)를 순회용 압축 구조로 변환합니다.
+
+- 노트 경로를 오름차순 정렬해서 0..N-1 정수 ID를 부여
+- 포워드/백워드 인접 리스트를 CSR(indptr + indices) int32 배열로 저장
+- 링크는 제목 인덱스로 해석된 노트 사이의 간선만 포함 (중복 간선 제거)
+
+그래프는 읽기 전용 스냅샷이며, 저장소의 generation이 바뀌면 다시 구축합니다.
+"""
+
+import sys
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class LinkGraph:
+    """노트 링크 그래프의 CSR 스냅샷"""
+
+    def __init__(
+        self,
+        paths: List[str],
+        titles: List[str],
+        sources: np.ndarray,
+        targets: np.ndarray,
+        generation: int = 0,
+    ):
+        """
+        Args:
+            paths: 노드 ID 순서의 파일 경로 리스트
+            titles: 노드 ID 순서의 노트 제목 리스트
+            sources: 간선 시작 노드 ID 배열
+            targets: 간선 끝 노드 ID 배열
+            generation: 그래프를 만든 시점의 저장소 generation
+        """
+        self.paths = paths
+        self.titles = titles
+        self.path_ids: Dict[str, int] = {path: i for i, path in enumerate(paths)}
+        self.generation = generation
+
+        num_nodes = len(paths)
+        # 중복 간선 제거 후 (source, target) 순으로 정렬
+        if len(sources):
+            edges = np.unique(sources.astype(np.int64) * num_nodes + targets)
+            sources = (edges // num_nodes).astype(np.int32)
+            targets = (edges % num_nodes).astype(np.int32)
+
+        self.fwd_indptr, self.fwd_indices = self._to_csr(sources, targets, num_nodes)
+        self.bwd_indptr, self.bwd_indices = self._to_csr(targets, sources, num_nodes)
+
+    @classmethod
+    def from_store(cls, store) -> "LinkGraph":
+        """NetworkMetadataStore에서 그래프 구축
+
+        Args:
+            store: NetworkMetadataStore 인스턴스
+
+        Returns:
+            LinkGraph
+        """
+        files = store.metadata["files"]
+        paths = sorted(files)
+        path_ids = {path: i for i, path in enumerate(paths)}
+        # 전체 메타데이터를 로드하지 않도록 요약만 사용
+        summaries = [files.summary(path) for path in paths]
+        titles = [sys.intern(summary["title"]) for summary in summaries]
+
+        # 링크 텍스트는 노트마다 반복되므로 해석 결과를 캐시
+        resolved: Dict[str, Optional[int]] = {}
+        sources: List[int] = []
+        targets: List[int] = []
+        for source_id, summary in enumerate(summaries):
+            for link in summary["forward_links"]:
+                if link not in resolved:
+                    target_path = store._find_file_by_title(link)
+                    resolved[link] = path_ids.get(target_path) if target_path else None
+                target_id = resolved[link]
+                if target_id is not None:
+                    sources.append(source_id)
+                    targets.append(target_id)
+
+        return cls(
+            paths,
+            titles,
+            np.asarray(sources, dtype=np.int32),
+            np.asarray(targets, dtype=np.int32),
+            generation=getattr(store, "generation", 0),
+        )
+
+    @staticmethod
+    def _to_csr(rows: np.ndarray, cols: np.ndarray, num_nodes: int):
+        """간선 배열을 CSR(indptr, indices)로 변환"""
+        order = np.argsort(rows, kind="stable")
+        indices = np.ascontiguousarray(cols[order], dtype=np.int32)
+        counts = np.bincount(rows, minlength=num_nodes)
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr, indices
+
+    @property
+    def num_nodes(self) -> int:
+        """노드 수"""
+        return len(self.paths)
+
+    @property
+    def num_edges(self) -> int:
+        """간선 수 (중복 제거)"""
+        return len(self.fwd_indices)
+
+    def node_id(self, path: str) -> Optional[int]:
+        """파일 경로 → 노드 ID"""
+        return self.path_ids.get(path)
+
+    def successors(self, node: int) -> np.ndarray:
+        """노드가 링크하는 노드 ID 배열 (포워드링크)"""
+        return self.fwd_indices[self.fwd_indptr[node]:self.fwd_indptr[node + 1]]
+
+    def predecessors(self, node: int) -> np.ndarray:
+        """노드를 링크하는 노드 ID 배열 (백링크)"""
+        return self.bwd_indices[self.bwd_indptr[node]:self.bwd_indptr[node + 1]]
+
+    def neighbors(self, node: int, direction: str = "both") -> np.ndarray:
+        """방향에 따른 이웃 노드 ID 배열
+
+        Args:
+            node: 노드 ID
+            direction: "out"(포워드링크), "in"(백링크), "both"(양방향)
+        """
+        if direction == "out":
+            return self.successors(node)
+        if direction == "in":
+            return self.predecessors(node)
+        if direction == "both":
+            return np.concatenate((self.successors(node), self.predecessors(node)))
+        raise ValueError(f"알 수 없는 방향: {direction}")
+
+    def neighborhood(
+        self,
+        start: int,
+        depth: int = 1,
+        direction: str = "both",
+        max_nodes: Optional[int] = None,
+    ) -> List[Tuple[int, int]]:
+        """시작 노드에서 k-hop 이내의 노드를 BFS 순서로 수집
+
+        Args:
+            start: 시작 노드 ID
+            depth: 최대 홉 수
+            direction: "out", "in", "both"
+            max_nodes: 최대 노드 수 (시작 노드 포함, 도달하면 즉시 중단)
+
+        Returns:
+            [(노드 ID, 거리), ...] (시작 노드가 거리 0으로 첫 번째)
+        """
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        visited[start] = True
+        result = [(start, 0)]
+        queue = deque(result)
+
+        while queue:
+            if max_nodes is not None and len(result) >= max_nodes:
+                break
+            node, distance = queue.popleft()
+            if distance >= depth:
+                continue
+            for neighbor in self.neighbors(node, direction).tolist():
+                if visited[neighbor]:
+                    continue
+                visited[neighbor] = True
+                result.append((neighbor, distance + 1))
+                if max_nodes is not None and len(result) >= max_nodes:
+                    break
+                queue.append((neighbor, distance + 1))
+        return result
+
+    def shortest_path(
+        self,
+        source: int,
+        target: int,
+        direction: str = "both",
+        max_depth: Optional[int] = None,
+    ) -> Optional[List[int]]:
+        """양방향 BFS 최단 경로
+
+        시작/도착 양쪽에서 작은 프론티어부터 한 단계씩 넓히고, 두 탐색이 만나면 즉시 중단합니다.
+
+        Args:
+            source: 시작 노드 ID
+            target: 도착 노드 ID
+            direction: "out"(포워드링크만 따라감), "in", "both"(방향 무시)
+            max_depth: 최대 홉 수 (None이면 제한 없음)
+
+        Returns:
+            시작부터 도착까지의 노드 ID 리스트 (연결되지 않았으면 None)
+        """
+        if source == target:
+            return [source]
+
+        reverse = {"out": "in", "in": "out", "both": "both"}[direction]
+        # 각 방향의 부모 노드(-1: 미방문)와 거리
+        parents = {
+            "fwd": np.full(self.num_nodes, -1, dtype=np.int64),
+            "bwd": np.full(self.num_nodes, -1, dtype=np.int64),
+        }
+        distances = {
+            "fwd": np.zeros(self.num_nodes, dtype=np.int64),
+            "bwd": np.zeros(self.num_nodes, dtype=np.int64),
+        }
+        parents["fwd"][source] = source
+        parents["bwd"][target] = target
+        frontiers = {"fwd": [source], "bwd": [target]}
+        steps = {"fwd": direction, "bwd": reverse}
+        depth = 0
+
+        while frontiers["fwd"] and frontiers["bwd"]:
+            if max_depth is not None and depth >= max_depth:
+                return None
+            side = "fwd" if len(frontiers["fwd"]) <= len(frontiers["bwd"]) else "bwd"
+            other = "bwd" if side == "fwd" else "fwd"
+            own_parents, other_parents = parents[side], parents[other]
+
+            # 한 단계를 끝까지 넓힌 뒤 만난 노드 중 전체 거리가 가장 짧은 것을 선택
+            next_frontier = []
+            meetings = []
+            for node in frontiers[side]:
+                for neighbor in self.neighbors(node, steps[side]).tolist():
+                    if own_parents[neighbor] != -1:
+                        continue
+                    own_parents[neighbor] = node
+                    distances[side][neighbor] = distances[side][node] + 1
+                    if other_parents[neighbor] != -1:
+                        meetings.append(neighbor)
+                    next_frontier.append(neighbor)
+            if meetings:
+                meeting = min(meetings, key=lambda n: distances["fwd"][n] + distances["bwd"][n])
+                return self._join_path(parents, meeting)
+            frontiers[side] = next_frontier
+            depth += 1
+        return None
+
+    @staticmethod
+    def _join_path(parents: Dict[str, np.ndarray], meeting: int) -> List[int]:
+        """양방향 탐색의 부모 배열을 만난 노드에서 이어 붙이기"""
+        path = [meeting]
+        while parents["fwd"][path[-1]] != path[-1]:
+            path.append(int(parents["fwd"][path[-1]]))
+        path.reverse()
+        while parents["bwd"][path[-1]] != path[-1]:
+            path.append(int(parents["bwd"][path[-1]]))
+        return path
+
+    def has_edge(self, source: int, target: int) -> bool:
+        """source → target 링크 존재 여부"""
+        successors = self.successors(source)
+        position = np.searchsorted(successors, target)
+        return bool(position < len(successors) and successors[position] == target)
+
+    def out_degrees(self) -> np.ndarray:
+        """모든 노드의 포워드링크 수"""
+        return np.diff(self.fwd_indptr)
+
+    def in_degrees(self) -> np.ndarray:
+        """모든 노드의 백링크 수"""
+        return np.diff(self.bwd_indptr)
+
+    def edges(self) -> Iterator[tuple]:
+        """(source_id, target_id) 간선 순회"""
+        for node in range(self.num_nodes):
+            for target in self.successors(node):
+                yield node, int(target)
+
+    def memory_bytes(self) -> int:
+        """CSR 배열이 차지하는 바이트 수 (경로/제목 문자열 제외)"""
+        return sum(
+            array.nbytes
+            for array in (self.fwd_indptr, self.fwd_indices, self.bwd_indptr, self.bwd_indices)
+        )
@@ -1,5 +1,7 @@
 import asyncio
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, List
 from mcp.server import Server, NotificationOptions
@@ -17,15 +19,42 @@ from network_store import NetworkMetadataStore
 from repomix_store import RepomixIndexStore
 from obsidian_parser import ObsidianParser
 from auto_update_service import AutoUpdateService
+from backfill_service import BackfillService
 from context_packer import ContextPacker
+from graph_analytics import GraphAnalytics
+from note_cache import NoteCache
+from pack_cache import PackCache
 
 # 서버 초기화
 server = Server("obsidian-rag")
 vector_store = None
 indexer = None
 parser = ObsidianParser()
+# 파싱된 노트 캐시 (find_related와 ContextPacker가 공유)
+note_cache = NoteCache(parser)
+# 패킹 결과 캐시 (같은 노트를 반복 요청할 때 재사용)
+pack_cache = PackCache()
 auto_update_service = None
+backfill_service = None
 context_packer = None
+graph_analytics = None
+
+def backfill_notice() -> str:
+    """초기 인덱싱 백필 중이면 진행률 안내 문구 반환"""
+    if backfill_service is None:
+        return ""
+    return backfill_service.progress.describe()
+
+async def run_locked(func, *args, **kwargs):
+    """인덱서 스토어 락을 잡고 func를 워커 스레드에서 실행
+
+    인덱싱 중 락 대기가 이벤트 루프를 막지 않도록 asyncio.to_thread로 넘깁니다.
+    """
+    def call():
+        with indexer.lock:
+            return func(*args, **kwargs)
+
+    return await asyncio.to_thread(call)
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
@@ -69,7 +98,7 @@ async def handle_list_tools() -> list[types.Tool]:
         ),
         types.Tool(
             name="search_by_tag",
-            description="태그로 노트를 검색합니다",
+            description="태그로 노트를 검색합니다 (#project는 #project/alpha 같은 하위 태그도 포함)",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -105,6 +134,111 @@ async def handle_list_tools() -> list[types.Tool]:
                 "properties": {}
             }
         ),
+        types.Tool(
+            name="get_graph_insights",
+            description="링크 네트워크에서 중심 노트(PageRank), 백링크/포워드링크가 많은 노트, 연결 요소 통계를 보여줍니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {"type": "integer", "description": "순위별 노트 개수", "default": 10}
+                }
+            }
+        ),
+        types.Tool(
+            name="get_link_health",
+            description="깨진 링크(존재하지 않는 노트를 가리키는 링크)를 참조 수 순으로, 고립된 노트와 함께 보여줍니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {"type": "integer", "description": "목록별 최대 항목 수", "default": 20}
+                }
+            }
+        ),
+        types.Tool(
+            name="get_note_neighborhood",
+            description="노트에서 링크로 N단계 이내에 연결된 노트들을 보여줍니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "note_title": {"type": "string", "description": "시작 노트 제목"},
+                    "depth": {"type": "integer", "description": "최대 링크 단계", "default": 2},
+                    "direction": {
+                        "type": "string",
+                        "enum": ["both", "out", "in"],
+                        "description": "both: 양방향, out: 포워드링크만, in: 백링크만",
+                        "default": "both"
+                    },
+                    "max_nodes": {"type": "integer", "description": "최대 노트 수", "default": 50}
+                },
+                "required": ["note_title"]
+            }
+        ),
+        types.Tool(
+            name="find_connection",
+            description="두 노트가 링크로 어떻게 연결되어 있는지 최단 경로를 찾습니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "source_title": {"type": "string", "description": "시작 노트 제목"},
+                    "target_title": {"type": "string", "description": "도착 노트 제목"},
+                    "direction": {
+                        "type": "string",
+                        "enum": ["both", "out", "in"],
+                        "description": "both: 링크 방향 무시, out: 포워드링크만 따라감, in: 백링크만 따라감",
+                        "default": "both"
+                    }
+                },
+                "required": ["source_title", "target_title"]
+            }
+        ),
+        types.Tool(
+            name="recent_notes",
+            description="최근 N일 이내에 수정된 노트를 최신순으로 보여줍니다",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "days": {"type": "integer", "description": "최근 N일", "default": 7},
+                    "folder": {"type": "string", "description": "PARA 폴더 필터"},
+                    "limit": {"type": "integer", "description": "최대 노트 수", "default": 20}
+                }
+            }
+        ),
+        types.Tool(
+            name="query_notes",
+            description="폴더, 태그, 수정 시각, 토큰 수, 링크 수 조건을 한 번에 결합해서 노트를 찾습니다 (전체 개수와 페이지 단위 결과)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "folder": {"type": "string", "description": "PARA 폴더"},
+                    "tags": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "태그 리스트 (중첩 태그 포함)"
+                    },
+                    "tag_mode": {
+                        "type": "string",
+                        "enum": ["all", "any"],
+                        "description": "all: 모든 태그, any: 하나 이상의 태그",
+                        "default": "all"
+                    },
+                    "days": {"type": "integer", "description": "최근 N일 이내 수정"},
+                    "modified_after": {"type": "string", "description": "이 날짜/시각 이후 수정 (ISO 형식, 예: 2024-05-01)"},
+                    "modified_before": {"type": "string", "description": "이 날짜/시각 이전 수정 (ISO 형식)"},
+                    "min_tokens": {"type": "integer", "description": "최소 토큰 수"},
+                    "max_tokens": {"type": "integer", "description": "최대 토큰 수"},
+                    "min_backlinks": {"type": "integer", "description": "최소 백링크 수"},
+                    "min_forward_links": {"type": "integer", "description": "최소 포워드링크 수"},
+                    "sort": {
+                        "type": "string",
+                        "enum": ["modified", "tokens", "backlinks", "forward_links"],
+                        "description": "정렬 기준 (큰 값이 먼저)",
+                        "default": "modified"
+                    },
+                    "offset": {"type": "integer", "description": "건너뛸 개수 (페이지 시작 위치)", "default": 0},
+                    "limit": {"type": "integer", "description": "최대 노트 수", "default": 20}
+                }
+            }
+        ),
         types.Tool(
             name="pack_note_context",
             description="노트와 관련된 모든 컨텍스트를 LLM에 최적화된 형태로 패키징합니다 (백링크, 포워드링크, 시맨틱 유사 노트 포함)",
@@ -112,16 +246,55 @@ async def handle_list_tools() -> list[types.Tool]:
                 "type": "object",
                 "properties": {
                     "note_title": {"type": "string", "description": "패키징할 노트 제목"},
-                    "max_tokens": {"type": "integer", "description": "최대 토큰 수", "default": 100000},
+                    "max_tokens": {
+                        "type": "integer",
+                        "description": f"최대 토큰 수 (최대 {PACK_MAX_TOKENS:,}, 더 크면 잘라서 사용)",
+                        "default": 100000,
+                        "maximum": PACK_MAX_TOKENS,
+                    },
                     "include_backlinks": {"type": "boolean", "description": "백링크 포함", "default": True},
                     "include_forward_links": {"type": "boolean", "description": "포워드링크 포함", "default": True},
                     "include_semantic_related": {"type": "boolean", "description": "시맨틱 유사 노트 포함", "default": True},
                     "max_backlinks": {"type": "integer", "description": "최대 백링크 수", "default": 10},
                     "max_forward_links": {"type": "integer", "description": "최대 포워드링크 수", "default": 10},
-                    "max_semantic_related": {"type": "integer", "description": "최대 시맨틱 유사 노트 수", "default": 5}
+                    "max_semantic_related": {"type": "integer", "description": "최대 시맨틱 유사 노트 수", "default": 5},
+                    "pack_mode": {
+                        "type": "string",
+                        "enum": ["optimal", "greedy"],
+                        "description": "optimal: 우선순위×관련도 합이 최대가 되도록 노트 선택, greedy: 섹션 순서대로 채움",
+                        "default": "optimal"
+                    }
                 },
                 "required": ["note_title"]
             }
+        ),
+        types.Tool(
+            name="pack_query_context",
+            description="검색어로 찾은 여러 노트와 그 링크 이웃을 중복 없이 하나의 토큰 예산으로 패키징합니다 (검색 후 여러 번 pack_note_context를 부르는 대신 사용)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "검색어"},
+                    "max_tokens": {
+                        "type": "integer",
+                        "description": f"최대 토큰 수 (최대 {PACK_MAX_TOKENS:,}, 더 크면 잘라서 사용)",
+                        "default": 100000,
+                        "maximum": PACK_MAX_TOKENS,
+                    },
+                    "top_k": {"type": "integer", "description": "시드로 쓰는 검색 결과 노트 수", "default": QUERY_SEED_COUNT},
+                    "max_links_per_seed": {"type": "integer", "description": "시드 하나에서 링크로 확장하는 최대 노트 수", "default": QUERY_LINKS_PER_SEED},
+                    "depth": {"type": "integer", "description": "링크 확장 홉 수 (0이면 검색 결과만)", "default": QUERY_EXPANSION_DEPTH},
+                    "decay": {"type": "number", "description": "홉마다 관련도에 곱하는 감쇠 비율", "default": QUERY_LINK_DECAY},
+                    "folder": {"type": "string", "description": "검색할 PARA 폴더 (선택)"},
+                    "pack_mode": {
+                        "type": "string",
+                        "enum": ["optimal", "greedy"],
+                        "description": "optimal: 관련도 합이 최대가 되도록 노트 선택, greedy: 관련도 순서대로 채움",
+                        "default": "optimal"
+                    }
+                },
+                "required": ["query"]
+            }
         )
     ]
 
@@ -139,7 +312,8 @@ async def handle_call_tool(
             folder=arguments.get("folder")
         )
 
-        response = f"🔍 '{arguments['query']}' 검색 결과:\n\n"
+        response = backfill_notice()
+        response += f"🔍 '{arguments['query']}' 검색 결과:\n\n"
         for i, result in enumerate(results, 1):
             response += f"{i}. **{result['title']}**\n"
             response += f"   📁 {result['metadata']['para_folder']}\n"
@@ -172,7 +346,8 @@ async def handle_call_tool(
             full_content = '\n'.join([chunk[1] for chunk in chunks_with_index])
             metadata = chunks_with_index[0][0]
 
-            response = f"📄 **{title}**\n\n"
+            response = backfill_notice()
+            response += f"📄 **{title}**\n\n"
             response += f"📁 폴더: {metadata['para_folder']}\n"
             response += f"🏷️ 태그: {metadata.get('tags', '없음')}\n"
             response += f"🔗 위키링크: {metadata.get('wiki_links', '없음')}\n\n"
@@ -180,25 +355,25 @@ async def handle_call_tool(
 
             return [types.TextContent(type="text", text=response)]
         else:
-            return [types.TextContent(type="text", text=f"'{title}' 노트를 찾을 수 없습니다.")]
+            return [types.TextContent(type="text", text=f"{backfill_notice()}'{title}' 노트를 찾을 수 없습니다.")]
 
     elif name == "find_related":
         # 연관 노트 찾기
         note_path = arguments["note_path"]
-        # 현재 노트 읽기
-        note_file = Path(note_path)
-        if note_file.exists():
-            doc = parser.parse_file(note_file)
+        # 현재 노트 읽기 (파싱 결과 캐시 사용)
+        doc = note_cache.get(note_path)
+        if doc:
             # 노트 내용으로 유사 검색
             results = vector_store.search(
-                query=doc['content'][:500],  # 앞부분만 사용
+                query=doc["content"][:500],  # 앞부분만 사용
                 top_k=arguments.get("top_k", 5) + 1  # 자기 자신 제외
             )
 
             # 자기 자신 제외
             results = [r for r in results if r['path'] != note_path][:arguments.get("top_k", 5)]
 
-            response = f"🔗 '{doc['title']}'와 연관된 노트:\n\n"
+            response = backfill_notice()
+            response += f"🔗 '{doc['title']}'와 연관된 노트:\n\n"
             for i, result in enumerate(results, 1):
                 response += f"{i}. **{result['title']}**\n"
                 response += f"   📁 {result['metadata']['para_folder']}\n"
@@ -210,27 +385,26 @@ async def handle_call_tool(
 
     elif name == "search_by_tag":
         # 태그 검색
-        tag = arguments["tag"]
-        results = vector_store.collection.get(
-            where_document={"$contains": f"#{tag}"}
-        )
+        tag = arguments["tag"].lstrip("#")
 
-        # 중복 제거 (path 기준)
-        unique_notes = {}
-        for i, metadata in enumerate(results['metadatas']):
-            path = metadata['path']
-            if path not in unique_notes:
-                unique_notes[path] = {
-                    'title': metadata['title'],
-                    'para_folder': metadata['para_folder'],
-                    'tags': metadata.get('tags', '')
-                }
+        # 태그 역인덱스 조회 (인라인 + YAML 태그, #tag/... 중첩 태그 포함)
+        network_store = indexer.network_store
 
-        response = f"🏷️ '#{tag}' 태그가 있는 노트 ({len(unique_notes)}개):\n\n"
-        for i, (path, note) in enumerate(unique_notes.items(), 1):
+        def collect_notes():
+            files = network_store.metadata["files"]
+            return [
+                (path, files.summary(path))
+                for path in network_store.get_paths_by_tag(tag)
+            ]
+
+        notes = await run_locked(collect_notes)
+
+        response = backfill_notice()
+        response += f"🏷️ '#{tag}' 태그가 있는 노트 ({len(notes)}개):\n\n"
+        for i, (path, note) in enumerate(notes, 1):
             response += f"{i}. **{note['title']}**\n"
             response += f"   📁 {note['para_folder']}\n"
-            response += f"   🏷️ {note['tags']}\n\n"
+            response += f"   🏷️ {', '.join(sorted(note['tags']))}\n\n"
 
         return [types.TextContent(type="text", text=response)]
 
@@ -238,16 +412,25 @@ async def handle_call_tool(
         # 백링크 찾기
         note_title = arguments["note_title"]
 
-        # 모든 노트에서 위키링크 검색
-        results = vector_store.collection.get()
-
-        backlinks = set()
-        for metadata in results['metadatas']:
-            wiki_links = metadata.get('wiki_links', '').split(',')
-            if note_title in wiki_links:
-                backlinks.add((metadata['path'], metadata['title'], metadata['para_folder']))
-
-        response = f"⬅️ '{note_title}'를 참조하는 노트 ({len(backlinks)}개):\n\n"
+        # network_store의 백링크 사용 (별칭, [[폴더/노트]], [[노트#헤딩]] 링크 포함)
+        network_store = indexer.network_store
+
+        def collect_backlinks():
+            target_path = network_store._find_file_by_title(note_title)
+            backlinks = set()
+            if target_path:
+                graph = network_store.graph
+                files = network_store.metadata["files"]
+                for source in graph.predecessors(graph.node_id(target_path)).tolist():
+                    source_path = graph.paths[source]
+                    file_data = files.summary(source_path)
+                    backlinks.add((source_path, file_data["title"], file_data["para_folder"]))
+            return backlinks
+
+        backlinks = await run_locked(collect_backlinks)
+
+        response = backfill_notice()
+        response += f"⬅️ '{note_title}'를 참조하는 노트 ({len(backlinks)}개):\n\n"
         for i, (path, title, folder) in enumerate(sorted(backlinks), 1):
             response += f"{i}. **{title}**\n"
             response += f"   📁 {folder}\n"
@@ -256,32 +439,232 @@ async def handle_call_tool(
         return [types.TextContent(type="text", text=response)]
 
     elif name == "get_vault_stats":
-        # 통계 생성
-        total_notes = len(indexer.metadata['indexed_files'])
-
-        # PARA 폴더별 분포
-        para_distribution = {}
-        for file_path in indexer.metadata['indexed_files'].keys():
-            path = Path(file_path)
-            try:
-                para_folder = path.relative_to(VAULT_PATH).parts[0]
-                para_distribution[para_folder] = para_distribution.get(para_folder, 0) + 1
-            except:
-                pass
-
-        response = "📊 **Vault 통계**\n\n"
+        # 통계 조회 (델타로 유지되는 집계, 백필 배치와 겹치지 않도록 잠금)
+        def collect_stats():
+            return (
+                indexer.repomix_store.get_stats(),
+                len(indexer.metadata['indexed_files']),
+                indexer.metadata.get('last_update', 'Never'),
+            )
+
+        stats, total_notes, last_update = await run_locked(collect_stats)
+
+        response = backfill_notice()
+        response += "📊 **Vault 통계**\n\n"
         response += f"📝 전체 노트 수: {total_notes}개\n"
-        response += f"⏰ 마지막 업데이트: {indexer.metadata.get('last_update', 'Never')}\n\n"
+        response += f"✍️ 전체 단어 수: {stats['total_words']:,}개\n"
+        response += f"🔢 전체 토큰 수 (추정): {stats['total_tokens_estimated']:,}개\n"
+        response += f"🏷️ 태그 종류: {stats['total_tags']}개\n"
+        response += f"⏰ 마지막 업데이트: {last_update}\n\n"
         response += "**PARA 폴더별 분포:**\n"
-        for folder, count in sorted(para_distribution.items()):
-            response += f"  - {folder}: {count}개\n"
+        for folder, folder_stats in stats['by_folder'].items():
+            response += (
+                f"  - {folder}: {folder_stats['files']}개 "
+                f"(단어 {folder_stats['words']:,}개, 토큰 {folder_stats['tokens']:,}개)\n"
+            )
+        if stats['top_tags']:
+            response += "\n**자주 쓰는 태그:**\n"
+            for tag, count in stats['top_tags'].items():
+                response += f"  - #{tag}: {count}개\n"
+
+        return [types.TextContent(type="text", text=response)]
+
+    elif name == "get_graph_insights":
+        # 그래프 분석 (generation이 바뀌지 않았으면 캐시 사용)
+        limit = arguments.get("limit", 10) if arguments else 10
+        insights = await run_locked(graph_analytics.summary, limit=limit)
+
+        response = backfill_notice()
+        response += "🕸️ **링크 네트워크 인사이트**\n\n"
+        response += f"📝 노트: {insights['total_notes']}개 / 🔗 링크: {insights['total_links']}개\n"
+        response += f"🧩 연결 요소: {insights['components']}개 (최대 {insights['largest_component']}개 노트)\n"
+        response += f"🏝️ 링크 없는 노트: {insights['isolated_notes']}개\n\n"
+
+        sections = [
+            ("⭐ 중심 노트 (PageRank)", "top_pagerank", "{:.4f}"),
+            ("⬅️ 백링크가 많은 노트", "top_backlinked", "{}개"),
+            ("➡️ 링크를 많이 거는 노트", "top_linking", "{}개"),
+        ]
+        for heading, key, score_format in sections:
+            response += f"**{heading}:**\n"
+            for i, note in enumerate(insights[key], 1):
+                response += f"{i}. **{note['title']}** ({score_format.format(note['score'])})\n"
+            response += "\n"
+
+        return [types.TextContent(type="text", text=response)]
+
+    elif name == "get_link_health":
+        # 링크 상태 (델타로 유지되는 인덱스에서 조회)
+        limit = arguments.get("limit", 20) if arguments else 20
+        health = await run_locked(indexer.network_store.get_link_health, limit=limit)
+
+        response = backfill_notice()
+        response += "🩺 **링크 상태**\n\n"
+        response += f"📝 전체 노트: {health['total_files']}개 / ⬅️ 백링크: {health['total_backlinks']}개\n"
+        response += f"💔 깨진 링크 대상: {health['unresolved_links']}개 (참조 {health['unresolved_references']}회)\n"
+        response += f"🏝️ 고립된 노트: {health['orphaned_notes']}개\n\n"
+
+        if health["unresolved"]:
+            response += "**💔 깨진 링크 (참조 수 순):**\n"
+            for i, link in enumerate(health["unresolved"], 1):
+                sources = ", ".join(link["sources"])
+                response += f"{i}. [[{link['target']}]] - {link['references']}개 노트에서 참조 ({sources})\n"
+            response += "\n"
+
+        if health["orphans"]:
+            response += "**🏝️ 고립된 노트:**\n"
+            for title in health["orphans"]:
+                response += f"- {title}\n"
+
+        return [types.TextContent(type="text", text=response)]
+
+    elif name == "get_note_neighborhood":
+        # k-hop 이웃 노트 (CSR 그래프 BFS)
+        note_title = arguments["note_title"]
+        depth = arguments.get("depth", 2)
+        neighbors = await run_locked(
+            indexer.network_store.get_neighborhood,
+            note_title,
+            depth=depth,
+            direction=arguments.get("direction", "both"),
+            max_nodes=arguments.get("max_nodes", 50),
+        )
+
+        if not neighbors:
+            return [types.TextContent(
+                type="text",
+                text=backfill_notice() + f"❌ '{note_title}' 노트를 찾을 수 없습니다."
+            )]
+
+        response = backfill_notice()
+        response += f"🕸️ '{note_title}'에서 {depth}단계 이내로 연결된 노트 ({len(neighbors) - 1}개):\n\n"
+        for neighbor in neighbors[1:]:
+            response += f"- [{neighbor['distance']}단계] **{neighbor['title']}**\n"
+
+        return [types.TextContent(type="text", text=response)]
+
+    elif name == "find_connection":
+        # 두 노트 사이 최단 링크 경로 (CSR 그래프 BFS)
+        source_title = arguments["source_title"]
+        target_title = arguments["target_title"]
+        path = await run_locked(
+            indexer.network_store.find_path,
+            source_title,
+            target_title,
+            direction=arguments.get("direction", "both"),
+        )
+
+        response = backfill_notice()
+        if path is None:
+            response += f"❌ '{source_title}'와 '{target_title}'는 링크로 연결되어 있지 않습니다."
+            return [types.TextContent(type="text", text=response)]
+
+        response += f"🔗 '{source_title}' → '{target_title}' 연결 경로 ({len(path) - 1}단계):\n\n"
+        response += f"**{path[0]['title']}**"
+        for step in path[1:]:
+            response += f" {step['link']} **{step['title']}**"
+        response += "\n\n(→: 앞 노트가 뒤 노트를 링크, ←: 뒤 노트가 앞 노트를 링크)"
+
+        return [types.TextContent(type="text", text=response)]
+
+    elif name == "recent_notes":
+        # 최근 수정 노트 (수정 시각 정렬 인덱스 구간 조회)
+        arguments = arguments or {}
+        days = arguments.get("days", 7)
+        folder = arguments.get("folder")
+        repomix_store = indexer.repomix_store
+
+        def collect_recent():
+            total = repomix_store.count_by_timeframe(days, folder=folder)
+            notes = repomix_store.query_by_timeframe(
+                days, folder=folder, limit=arguments.get("limit", 20)
+            )
+            return total, notes
+
+        total, notes = await run_locked(collect_recent)
+
+        response = backfill_notice()
+        scope = f"'{folder}' 폴더에서 " if folder else ""
+        response += f"🕒 {scope}최근 {days}일 이내 수정된 노트 ({total}개 중 {len(notes)}개):\n\n"
+        for i, note in enumerate(notes, 1):
+            modified = note["timestamps"]["modified"][:16].replace("T", " ")
+            response += f"{i}. **{note['title']}** ({modified})\n"
+            response += f"   📁 {note['para_folder']} / 📊 {note['size']['words']}단어\n"
+
+        return [types.TextContent(type="text", text=response)]
+
+    elif name == "query_notes":
+        # 복합 조건 조회 (패싯 열 인덱스의 마스크 교집합)
+        arguments = arguments or {}
+        offset = arguments.get("offset", 0)
+        try:
+            since = None
+            if arguments.get("days") is not None:
+                since = time.time() - arguments["days"] * 86400
+            if arguments.get("modified_after"):
+                after = datetime.fromisoformat(arguments["modified_after"]).timestamp()
+                since = after if since is None else max(since, after)
+            until = None
+            if arguments.get("modified_before"):
+                until = datetime.fromisoformat(arguments["modified_before"]).timestamp()
+
+            result = await run_locked(
+                indexer.repomix_store.query_notes,
+                folder=arguments.get("folder"),
+                tags=arguments.get("tags"),
+                tag_mode=arguments.get("tag_mode", "all"),
+                since=since,
+                until=until,
+                min_tokens=arguments.get("min_tokens"),
+                max_tokens=arguments.get("max_tokens"),
+                min_backlinks=arguments.get("min_backlinks"),
+                min_forward_links=arguments.get("min_forward_links"),
+                sort=arguments.get("sort", "modified"),
+                offset=offset,
+                limit=arguments.get("limit", 20),
+            )
+        except ValueError as e:
+            return [types.TextContent(type="text", text=f"❌ 잘못된 조건: {e}")]
+
+        notes = result["results"]
+        response = backfill_notice()
+        response += f"🔎 조건에 맞는 노트 {result['total']}개"
+        if notes:
+            response += f" 중 {offset + 1}-{offset + len(notes)}번째:\n\n"
+        else:
+            response += ".\n"
+        for i, note in enumerate(notes, offset + 1):
+            modified = note["timestamps"]["modified"][:16].replace("T", " ")
+            metadata = note["metadata"]
+            response += f"{i}. **{note['title']}** ({modified})\n"
+            response += (
+                f"   📁 {note['para_folder']} / 🔢 {note['size']['estimated_tokens']}토큰"
+                f" / ⬅️ {metadata['backlink_count']} ➡️ {metadata['forward_link_count']}\n"
+            )
+            if metadata["tags"]:
+                response += f"   🏷️ {', '.join(metadata['tags'])}\n"
+        if offset + len(notes) < result["total"]:
+            response += f"\n(다음 페이지: offset={offset + len(notes)})"
 
         return [types.TextContent(type="text", text=response)]
 
     elif name == "update_index":
         # 인덱스 수동 업데이트
+        if backfill_service is not None and backfill_service.running:
+            return [types.TextContent(
+                type="text",
+                text=backfill_notice() + "초기 인덱싱이 끝나면 변경사항이 자동으로 반영됩니다."
+            )]
+        if backfill_service is not None and backfill_service.failed:
+            # 실패한 백필을 남은 파일부터 다시 실행 (성공하면 Auto-Update Service 시작)
+            backfill_service.start()
+            return [types.TextContent(
+                type="text",
+                text="🔄 초기 인덱싱을 남은 파일부터 다시 시작했습니다."
+            )]
+
         print("📊 인덱스 업데이트 시작...", file=sys.stderr)
-        updates = indexer.check_updates()
+        updates = await asyncio.to_thread(indexer.check_updates)
 
         response = "🔄 **인덱스 업데이트**\n\n"
         response += f"📥 새 파일: {len(updates['new'])}개\n"
@@ -289,7 +672,7 @@ async def handle_call_tool(
         response += f"🗑️ 삭제된 파일: {len(updates['deleted'])}개\n\n"
 
         if any(updates.values()):
-            indexer.update_index()
+            await asyncio.to_thread(indexer.update_index)
             response += "✅ 인덱스 업데이트 완료!"
         else:
             response += "✅ 변경사항 없음. 인덱스가 최신 상태입니다."
@@ -300,16 +683,15 @@ async def handle_call_tool(
     elif name == "pack_note_context":
         # 노트 컨텍스트 패키징
         note_title = arguments["note_title"]
-        max_tokens = arguments.get("max_tokens", 100000)
+        # 응답 메모리 상한 (PACK_MAX_TOKENS, 잘렸으면 응답 앞에 안내)
+        max_tokens, budget_notice = clamp_pack_budget(arguments.get("max_tokens", 100000))
 
         print(f"📦 '{note_title}' 컨텍스트 패키징 시작...", file=sys.stderr)
 
         try:
-            # ContextPacker에 max_tokens 설정 적용
-            context_packer.smart_packer.max_tokens = max_tokens
-
-            # 노트 패키징
-            packed_content = context_packer.pack_note(
+            # 노트 패키징 (워커 스레드에서 실행, 스토어 조회만 indexer.lock으로 잠금)
+            packed_parts, report = await asyncio.to_thread(
+                context_packer.pack_note,
                 note_title=note_title,
                 include_backlinks=arguments.get("include_backlinks", True),
                 include_forward_links=arguments.get("include_forward_links", True),
@@ -318,10 +700,47 @@ async def handle_call_tool(
                 max_backlinks=arguments.get("max_backlinks", 10),
                 max_forward_links=arguments.get("max_forward_links", 10),
                 max_semantic_related=arguments.get("max_semantic_related", 5),
+                pack_mode=arguments.get("pack_mode", "optimal"),
+                return_report=True,
+                max_tokens=max_tokens,
+                part_chars=PACK_RESPONSE_PART_CHARS,
+            )
+
+            report["requested_max_tokens"] = arguments.get("max_tokens", 100000)
+            log_pack_report(report, packed_parts)
+            return pack_response(packed_parts, budget_notice)
+
+        except Exception as e:
+            error_msg = f"❌ 패키징 실패: {str(e)}"
+            print(error_msg, file=sys.stderr)
+            return [types.TextContent(type="text", text=error_msg)]
+
+    elif name == "pack_query_context":
+        # 검색어 중심 컨텍스트 패키징
+        query = arguments["query"]
+        # 응답 메모리 상한 (PACK_MAX_TOKENS, 잘렸으면 응답 앞에 안내)
+        max_tokens, budget_notice = clamp_pack_budget(arguments.get("max_tokens", 100000))
+
+        print(f"📦 '{query}' 검색 컨텍스트 패키징 시작...", file=sys.stderr)
+
+        try:
+            packed_parts, report = await asyncio.to_thread(
+                context_packer.pack_query,
+                query,
+                max_seeds=arguments.get("top_k", QUERY_SEED_COUNT),
+                max_links_per_seed=arguments.get("max_links_per_seed", QUERY_LINKS_PER_SEED),
+                depth=arguments.get("depth", QUERY_EXPANSION_DEPTH),
+                decay=arguments.get("decay", QUERY_LINK_DECAY),
+                folder=arguments.get("folder"),
+                pack_mode=arguments.get("pack_mode", "optimal"),
+                return_report=True,
+                max_tokens=max_tokens,
+                part_chars=PACK_RESPONSE_PART_CHARS,
             )
 
-            print("✅ 컨텍스트 패키징 완료", file=sys.stderr)
-            return [types.TextContent(type="text", text=packed_content)]
+            report["requested_max_tokens"] = arguments.get("max_tokens", 100000)
+            log_pack_report(report, packed_parts)
+            return pack_response(packed_parts, budget_notice)
 
         except Exception as e:
             error_msg = f"❌ 패키징 실패: {str(e)}"
@@ -330,9 +749,62 @@ async def handle_call_tool(
 
     return [types.TextContent(type="text", text="도구 실행 완료")]
 
+def clamp_pack_budget(requested: int) -> tuple[int, str]:
+    """패킹 토큰 예산을 PACK_MAX_TOKENS 이하로 자르기
+
+    Returns:
+        (사용할 예산, 잘렸으면 안내 문구 아니면 "")
+    """
+    if requested <= PACK_MAX_TOKENS:
+        return requested, ""
+    print(f"⚠️ 토큰 예산 {requested:,}개 → {PACK_MAX_TOKENS:,}개로 제한", file=sys.stderr)
+    return PACK_MAX_TOKENS, (
+        f"⚠️ 요청한 토큰 예산 {requested:,}개가 최대값 {PACK_MAX_TOKENS:,}개를 넘어 "
+        f"{PACK_MAX_TOKENS:,}개로 패키징했습니다.\n\n"
+    )
+
+def pack_response(parts: list[str], budget_notice: str = "") -> list[types.TextContent]:
+    """나눠진 패키지를 TextContent 목록으로 (백필/예산 제한 안내는 별도 부분으로 앞에)"""
+    notice = backfill_notice() + budget_notice
+    response = [types.TextContent(type="text", text=notice)] if notice else []
+    response.extend(types.TextContent(type="text", text=part) for part in parts)
+    return response
+
+def log_pack_report(report: dict, parts: list[str]):
+    """패킹 리포트, 응답 크기, 캐시 통계를 stderr에 출력"""
+    print(
+        f"📊 패킹 ({report['mode']}): 효용 {report['utility']} / "
+        f"토큰 {report['tokens']:,}개 ({report['utilization']:.1%}), "
+        f"greedy 효용 {report['greedy']['utility']} / "
+        f"토큰 {report['greedy']['tokens']:,}개 ({report['greedy']['utilization']:.1%})",
+        file=sys.stderr,
+    )
+    print(
+        f"📤 응답 {sum(len(part) for part in parts):,}자 / {len(parts)}개 부분",
+        file=sys.stderr,
+    )
+    peak_bytes = report.get("peak_memory_bytes")
+    if peak_bytes is not None and not report["cached"]:
+        warning = "⚠️" if peak_bytes > PACK_PEAK_MEMORY_WARN_BYTES else "🧠"
+        print(
+            f"{warning} 패킹 최대 메모리 {peak_bytes / 1024 / 1024:.1f}MB "
+            f"(경고 기준 {PACK_PEAK_MEMORY_WARN_BYTES / 1024 / 1024:.0f}MB, "
+            f"토큰 예산 {report['max_tokens']:,}개)",
+            file=sys.stderr,
+        )
+    cache_stats = note_cache.stats()
+    pack_cache_stats = pack_cache.stats()
+    print(
+        f"✅ 컨텍스트 패키징 완료{' (캐시 사용)' if report['cached'] else ''} "
+        f"(노트 캐시 적중 {cache_stats['hits']}회 / 미스 {cache_stats['misses']}회, "
+        f"패킹 캐시 {pack_cache_stats['entries']}개 / "
+        f"{pack_cache_stats['bytes'] / 1024 / 1024:.1f}MB)",
+        file=sys.stderr,
+    )
+
 async def main():
     """메인 실행"""
-    global vector_store, indexer, auto_update_service, context_packer
+    global vector_store, indexer, auto_update_service, backfill_service, context_packer, graph_analytics
 
     print("🚀 Obsidian RAG MCP 서버 시작...", file=sys.stderr)
     print(f"📁 Vault 경로: {VAULT_PATH}", file=sys.stderr)
@@ -346,21 +818,30 @@ async def main():
     # UnifiedIndexer 초기화 (3개 DB 통합 관리)
     indexer = UnifiedIndexer(vector_store, network_store, repomix_store)
 
-    # 인덱스가 없을 때만 초기 인덱싱
-    if not indexer.metadata.get('indexed_files'):
-        print("📊 초기 인덱싱 중... (최초 실행시에만)", file=sys.stderr)
-        indexer.update_index()
-    else:
-        print(f"✅ 기존 인덱스 로드 완료 ({len(indexer.metadata['indexed_files'])}개 파일)", file=sys.stderr)
-
     # ContextPacker 초기화
     print("📦 ContextPacker 초기화 중...", file=sys.stderr)
-    context_packer = ContextPacker(vector_store, network_store, repomix_store, max_tokens=100000)
+    graph_analytics = GraphAnalytics(network_store)
+    # 패킹은 스토어 조회 구간에서만 indexer.lock을 잡음 (패킹끼리, 인덱싱과 동시에 실행 가능)
+    context_packer = ContextPacker(
+        vector_store, network_store, repomix_store, max_tokens=100000, graph_analytics=graph_analytics,
+        note_cache=note_cache, pack_cache=pack_cache, store_lock=indexer.lock
+    )
 
-    # Auto-Update Service 시작
-    print("🔄 Auto-Update Service 시작 중...", file=sys.stderr)
     auto_update_service = AutoUpdateService(indexer, debounce_seconds=5.0)
-    auto_update_service.start()
+
+    def start_auto_update():
+        print("🔄 Auto-Update Service 시작 중...", file=sys.stderr)
+        auto_update_service.start()
+
+    # 서버를 먼저 띄우고 인덱싱되지 않은 파일은 백그라운드에서 인덱싱
+    # (이전 백필이 중단되거나 실패했어도 남은 파일부터 이어서 처리,
+    # 백필이 성공적으로 끝나면 Auto-Update Service 시작)
+    if indexer.metadata.get('indexed_files'):
+        print(f"✅ 기존 인덱스 로드 완료 ({len(indexer.metadata['indexed_files'])}개 파일)", file=sys.stderr)
+    else:
+        print("📊 초기 인덱싱을 백그라운드에서 시작합니다", file=sys.stderr)
+    backfill_service = BackfillService(indexer, on_complete=start_auto_update)
+    backfill_service.start()
 
     print("🎉 MCP 서버 준비 완료!", file=sys.stderr)
 
@@ -380,7 +861,9 @@ async def main():
                 )
             )
     finally:
-        # 서버 종료 시 Auto-Update Service도 중지
+        # 서버 종료 시 백필과 Auto-Update Service도 중지
+        if backfill_service:
+            backfill_service.stop()
         if auto_update_service:
             print("⏹️ Auto-Update Service 중지 중...", file=sys.stderr)
             auto_update_service.stop()
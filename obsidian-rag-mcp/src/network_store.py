@@ -1,19 +1,70 @@
-import json
+import bisect
+import heapq
 import re
-from datetime import date, datetime
+import sys
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from config import PROJECT_ROOT
+from config import PROJECT_ROOT, VAULT_PATH
+from link_graph import LinkGraph
+from persistence import LazyRecordMap, RecordFile, UnreadableRecordFile
+from tag_index import TagIndex
 
+# 링크 해석 우선순위 (같은 키면 낮을수록 우선): 파일명 → 경로 → 별칭
+RESOLVE_STEM = 0
+RESOLVE_PATH = 1
+RESOLVE_ALIAS = 2
 
-class DateTimeEncoder(json.JSONEncoder):
-    """날짜/시간 객체를 JSON으로 직렬화하는 커스텀 인코더"""
 
-    def default(self, obj):
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        return super().default(obj)
+def normalize_link(link: str) -> str:
+    """위키링크 텍스트를 해석용 키로 정규화
+
+    [[Note|표시]], [[Note#Heading]], [[Note#^block]], [[Note^block]], [[folder/Note.md]]를
+    모두 대소문자 구분 없는 노트 키("note", "folder/note")로 바꿉니다.
+
+    Args:
+        link: 위키링크 텍스트 ([[ ]] 안쪽)
+
+    Returns:
+        정규화된 키 (같은 노트 안의 헤딩 링크처럼 대상이 없으면 빈 문자열)
+    """
+    link = link.split("|", 1)[0].split("#", 1)[0].split("^", 1)[0]
+    link = link.strip().replace("\\", "/").strip("/")
+    if link.lower().endswith(".md"):
+        link = link[:-3]
+    return link.casefold()
+
+
+def sorted_add(items: list, value):
+    """정렬된 리스트에 값 추가 (이미 있으면 무시)"""
+    position = bisect.bisect_left(items, value)
+    if position == len(items) or items[position] != value:
+        items.insert(position, value)
+
+
+def sorted_remove(items: list, value):
+    """정렬된 리스트에서 값 제거 (없으면 무시)"""
+    position = bisect.bisect_left(items, value)
+    if position < len(items) and items[position] == value:
+        del items[position]
+
+
+def summarize_note(file_data: dict) -> dict:
+    """노트 메타데이터의 요약 (인덱스 구축에 필요한 필드만)
+
+    frontmatter는 링크 해석에 쓰는 별칭만 남기고 나머지는 노트를 읽을 때 로드합니다.
+    """
+    summary = {
+        key: file_data[key]
+        for key in ("title", "para_folder", "backlinks", "forward_links", "tags")
+    }
+    frontmatter = file_data.get("yaml_frontmatter") or {}
+    summary["yaml_frontmatter"] = {
+        key: frontmatter[key] for key in ("aliases", "alias") if key in frontmatter
+    }
+    return summary
 
 
 class NetworkMetadataStore:
@@ -25,33 +76,251 @@ class NetworkMetadataStore:
     def __init__(self, metadata_file: Optional[Path] = None):
         """
         Args:
-            metadata_file: 메타데이터 JSON 파일 경로 (기본값: data/network_metadata.json)
+            metadata_file: 메타데이터 파일 경로 (기본값: data/network_metadata.db)
+                .db/.sqlite면 SQLite(노트 단위 지연 로드), .json이면 JSON으로 저장
         """
         self.metadata_file = (
             metadata_file
             if metadata_file
-            else PROJECT_ROOT / "data" / "network_metadata.json"
+            else PROJECT_ROOT / "data" / "network_metadata.db"
         )
         self.wiki_link_pattern = r"\[\[([^\]]+)\]\]"
-        self.tag_pattern = r"#([\w가-힣][\w가-힣-]*)"
+        # 중첩 태그(#project/alpha) 포함
+        self.tag_pattern = r"#([\w가-힣][\w가-힣/-]*)"
+        # 제목 → 파일 경로 리스트 (경로 오름차순, 중복 제목은 첫 번째 경로가 대표)
+        self.title_index: Dict[str, List[str]] = {}
+        # 정규화 키 → [(우선순위, 파일 경로), ...] (파일명/경로/별칭, 정렬 유지, 첫 번째가 대표)
+        self.resolve_index: Dict[str, List[Tuple[int, str]]] = {}
+        # 정규화된 링크 키 → 그 링크를 가진 소스 파일 경로 집합 (백링크 역인덱스)
+        self.link_sources: Dict[str, Set[str]] = {}
+        # 태그 → 노트 경로 역인덱스 (중첩 태그 접두사 조회)
+        self.tag_index = TagIndex()
+        # 정규화된 링크 키 → 표시용 원본 링크 텍스트
+        self.link_labels: Dict[str, str] = {}
+        # 링크 상태 인덱스 (델타 갱신)
+        # - 해석되지 않는 링크 키 → 참조하는 노트 수, 참조 수 → 정렬된 링크 키 리스트와
+        #   정렬된 참조 수 목록 (순위 조회 시 limit개만 순회)
+        # - 고립된 노트 경로 정렬 리스트, 노트별 백링크 수와 전체 합계
+        self.dangling: Dict[str, int] = {}
+        self._dangling_buckets: Dict[int, List[str]] = {}
+        self._dangling_counts: List[int] = []
+        self._dangling_references = 0
+        self.orphans: List[str] = []
+        self._backlink_counts: Dict[str, int] = {}
+        self._total_backlinks = 0
+        # batch() 중첩 깊이 (0보다 크면 백링크 계산을 배치 종료 시점으로 미룸)
+        self._batch_depth = 0
+        # 변경될 때마다 증가하는 세대 번호 (파생 캐시 무효화용)
+        self.generation = 0
+        self._graph: Optional[LinkGraph] = None
+        # 백링크가 다시 계산된 파일 경로 (다른 저장소에 동기화할 대상)
+        self.dirty_backlinks: Set[str] = set()
+        # 기존 파일을 읽지 못해 빈 메타데이터로 시작했으면 그 원인 (재인덱싱 필요)
+        self.load_error: Optional[str] = None
         self.metadata = self.load_metadata()
 
+    @property
+    def metadata(self) -> dict:
+        """메타데이터 딕셔너리"""
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: dict):
+        """메타데이터 교체 (롤백 등) 시 파생 인덱스 재구축"""
+        value["files"] = LazyRecordMap.wrap(value.get("files", {}), summarize_note)
+        self._metadata = value
+        self._rebuild_title_index()
+        self._rebuild_link_sources()
+        self._rebuild_health()
+        self.generation += 1
+
+    @property
+    def graph(self) -> LinkGraph:
+        """현재 generation의 CSR 링크 그래프 (변경 후 첫 접근 시 재구축)"""
+        if self._graph is None or self._graph.generation != self.generation:
+            self._graph = LinkGraph.from_store(self)
+        return self._graph
+
+    def _rebuild_title_index(self):
+        """제목/링크 해석/태그 인덱스 전체 재구축"""
+        self.title_index = {}
+        self.resolve_index = {}
+        self.tag_index.clear()
+        files = self._metadata["files"]
+        for file_path in sorted(files):
+            file_data = files.summary(file_path)
+            self.title_index.setdefault(file_data["title"], []).append(file_path)
+            self.tag_index.add(file_path, file_data["tags"])
+            for entry in self._resolve_entries(file_path, file_data):
+                self.resolve_index.setdefault(entry[1], []).append((entry[0], file_path))
+        for entries in self.resolve_index.values():
+            entries.sort()
+
+    def _rebuild_link_sources(self):
+        """링크 역인덱스 전체 재구축"""
+        self.link_sources = {}
+        self.link_labels = {}
+        files = self._metadata["files"]
+        for file_path in sorted(files):
+            links = self._link_keys(files.summary(file_path)["forward_links"])
+            for key, label in links.items():
+                self.link_sources.setdefault(key, set()).add(file_path)
+                self.link_labels.setdefault(key, label)
+
+    def _rebuild_health(self):
+        """링크 상태 인덱스(고립 노트, 백링크 수, 해석되지 않는 링크) 전체 재구축"""
+        self.orphans = []
+        self._backlink_counts = {}
+        self._total_backlinks = 0
+        # 정렬된 순서로 넣어 정렬 리스트 삽입이 끝에 붙도록
+        for file_path in sorted(self._metadata["files"]):
+            self._update_note_health(file_path)
+
+        self.dangling = {}
+        self._dangling_buckets = {}
+        self._dangling_counts = []
+        self._dangling_references = 0
+        for key in sorted(self.link_sources):
+            self._update_dangling(key)
+
+    def _update_note_health(self, file_path: str):
+        """노트 하나의 백링크 수와 고립 여부 갱신 (삭제된 노트는 제거)"""
+        self._total_backlinks -= self._backlink_counts.pop(file_path, 0)
+        sorted_remove(self.orphans, file_path)
+
+        file_data = self._metadata["files"].summary(file_path)
+        if file_data is None:
+            return
+        count = len(file_data["backlinks"])
+        self._backlink_counts[file_path] = count
+        self._total_backlinks += count
+        if count == 0 and len(file_data["forward_links"]) == 0:
+            sorted_add(self.orphans, file_path)
+
+    def _update_dangling(self, key: str):
+        """링크 키 하나의 해석 여부와 참조 수 갱신"""
+        previous = self.dangling.pop(key, 0)
+        if previous:
+            self._dangling_references -= previous
+            bucket = self._dangling_buckets[previous]
+            sorted_remove(bucket, key)
+            if not bucket:
+                del self._dangling_buckets[previous]
+                sorted_remove(self._dangling_counts, previous)
+
+        sources = self.link_sources.get(key)
+        if sources and self._resolve_key(key) is None:
+            count = len(sources)
+            self.dangling[key] = count
+            self._dangling_references += count
+            if count not in self._dangling_buckets:
+                sorted_add(self._dangling_counts, count)
+            sorted_add(self._dangling_buckets.setdefault(count, []), key)
+
+    @staticmethod
+    def _link_keys(links: Iterable[str]) -> Dict[str, str]:
+        """포워드링크 텍스트들의 정규화 키 → 원본 텍스트 (빈 키 제외, 첫 번째 텍스트 유지)"""
+        keys = {}
+        for link in links:
+            key = normalize_link(link)
+            if key:
+                keys.setdefault(key, link)
+        return keys
+
+    @staticmethod
+    def _resolve_entries(file_path: str, file_data: dict) -> Set[Tuple[int, str]]:
+        """이 파일로 해석될 수 있는 (우선순위, 키) 집합
+
+        - 파일명(제목): "note"
+        - Vault 기준 상대 경로의 뒷부분들: "folder/note", "area/folder/note"
+        - frontmatter aliases/alias
+        """
+        entries = set()
+        title_key = normalize_link(file_data["title"])
+        if title_key:
+            entries.add((RESOLVE_STEM, title_key))
+
+        path = Path(file_path)
+        try:
+            parts = path.relative_to(VAULT_PATH).with_suffix("").parts
+        except ValueError:
+            parts = path.with_suffix("").parts[1:]
+        for start in range(len(parts) - 1):
+            key = normalize_link("/".join(parts[start:]))
+            if key:
+                entries.add((RESOLVE_PATH, key))
+
+        frontmatter = file_data.get("yaml_frontmatter") or {}
+        aliases = frontmatter.get("aliases", frontmatter.get("alias", []))
+        if isinstance(aliases, str):
+            aliases = [aliases]
+        if isinstance(aliases, list):
+            for alias in aliases:
+                key = normalize_link(str(alias)) if alias is not None else ""
+                if key:
+                    entries.add((RESOLVE_ALIAS, key))
+        return entries
+
+    def _index_resolve(self, file_path: str, file_data: dict):
+        """링크 해석 인덱스에 파일의 키 추가"""
+        for priority, key in self._resolve_entries(file_path, file_data):
+            bisect.insort(self.resolve_index.setdefault(key, []), (priority, file_path))
+
+    def _unindex_resolve(self, file_path: str, file_data: dict):
+        """링크 해석 인덱스에서 파일의 키 제거"""
+        for priority, key in self._resolve_entries(file_path, file_data):
+            entries = self.resolve_index.get(key)
+            if not entries:
+                continue
+            position = bisect.bisect_left(entries, (priority, file_path))
+            if position < len(entries) and entries[position] == (priority, file_path):
+                del entries[position]
+            if not entries:
+                del self.resolve_index[key]
+
+    def _index_title(self, title: str, file_path: str):
+        """제목 인덱스에 경로 추가 (정렬 유지)"""
+        paths = self.title_index.setdefault(title, [])
+        position = bisect.bisect_left(paths, file_path)
+        if position == len(paths) or paths[position] != file_path:
+            paths.insert(position, file_path)
+
+    def _unindex_title(self, title: str, file_path: str):
+        """제목 인덱스에서 경로 제거"""
+        paths = self.title_index.get(title)
+        if not paths:
+            return
+        position = bisect.bisect_left(paths, file_path)
+        if position < len(paths) and paths[position] == file_path:
+            del paths[position]
+        if not paths:
+            del self.title_index[title]
+
+    def _record_file(self) -> RecordFile:
+        """메타데이터 파일 (확장자로 SQLite/JSON 선택)"""
+        return RecordFile(self.metadata_file, summarize_note)
+
     def load_metadata(self) -> dict:
         """메타데이터 파일 로드
 
+        SQLite 파일은 헤더와 노트 요약만 읽고, 전체 노트 메타데이터는 처음 접근할 때 로드합니다.
+        SQLite 파일이 없고 같은 이름의 JSON 파일이 있으면 자동으로 마이그레이션합니다.
+
         Returns:
             메타데이터 딕셔너리. 파일이 없으면 초기 구조 반환
+            (형식 버전이 다르거나 손상된 파일은 옮겨 두고 초기 구조 반환, 원인은 load_error)
         """
-        if self.metadata_file.exists():
-            try:
-                with open(self.metadata_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"⚠️ 메타데이터 로드 실패: {e}")
-                return self._create_empty_metadata()
-        else:
-            # 파일이 없으면 초기 구조 생성
+        record_file = self._record_file()
+        try:
+            metadata = record_file.load()
+        except UnreadableRecordFile as e:
+            # 빈 저장소로 시작하되 기존 파일은 덮어쓰지 않도록 옮기고 재인덱싱 필요 표시
+            print(f"⚠️ 메타데이터 로드 실패: {e}", file=sys.stderr)
+            record_file.quarantine()
+            self.load_error = str(e)
             return self._create_empty_metadata()
+        # 파일이 없으면 초기 구조 생성
+        return metadata if metadata is not None else self._create_empty_metadata()
 
     def _create_empty_metadata(self) -> dict:
         """초기 메타데이터 구조 생성"""
@@ -63,23 +332,21 @@ class NetworkMetadataStore:
         }
 
     def save_metadata(self):
-        """메타데이터를 파일에 저장"""
-        # 디렉토리가 없으면 생성
-        self.metadata_file.parent.mkdir(parents=True, exist_ok=True)
+        """메타데이터를 파일에 저장
 
+        SQLite 파일은 로드/변경된 노트와 삭제된 노트만 한 트랜잭션으로 반영하고,
+        새 파일은 임시 파일에 쓴 뒤 이름을 바꿔서 교체합니다.
+        """
         # last_update 갱신
         self.metadata["last_update"] = datetime.now().isoformat()
 
-        # 통계 갱신
+        # 통계 갱신 (헤더에 저장)
         self._update_stats()
 
         try:
-            with open(self.metadata_file, "w", encoding="utf-8") as f:
-                json.dump(
-                    self.metadata, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder
-                )
+            self._record_file().save(self.metadata)
         except Exception as e:
-            print(f"⚠️ 메타데이터 저장 실패: {e}")
+            print(f"⚠️ 메타데이터 저장 실패: {e}", file=sys.stderr)
 
     def extract_links(self, content: str) -> dict:
         """컨텐츠에서 위키링크 추출
@@ -127,6 +394,9 @@ class NetworkMetadataStore:
     def update_metadata(self, doc: dict):
         """문서의 메타데이터 업데이트
 
+        변경된 노트의 이전/새 포워드링크를 비교해서 영향받는 대상 노트의
+        백링크만 갱신합니다. batch() 안에서는 배치 종료 시 한 번에 계산합니다.
+
         Args:
             doc: ObsidianParser.parse_file()의 반환값
                  - path: 파일 경로
@@ -136,16 +406,25 @@ class NetworkMetadataStore:
                  - wiki_links: 위키링크 리스트
                  - tags: 태그 리스트
                  - para_folder: PARA 폴더
+                 - streamed: 대용량 파일 여부 (True면 content 대신 링크/태그 리스트 사용)
         """
         file_path = doc["path"]
         title = doc["title"]
 
-        # 링크 추출
-        link_data = self.extract_links(doc["content"])
-        forward_links = link_data["links"]
+        if doc.get("streamed"):
+            # 대용량 파일: 본문 대신 파서가 스트리밍으로 추출한 링크/태그 사용
+            forward_links = list(
+                set(doc.get("forward_links", doc.get("wiki_links", [])))
+            )
+            tags = list(doc.get("tags", []))
+        else:
+            # 링크 추출
+            link_data = self.extract_links(doc["content"])
+            forward_links = link_data["links"]
+
+            # 태그 추출 (인라인 + YAML)
+            tags = self.extract_tags(doc["content"])
 
-        # 태그 추출 (인라인 + YAML)
-        tags = self.extract_tags(doc["content"])
         yaml_tags = doc.get("metadata", {}).get("tags", [])
         if yaml_tags:
             if isinstance(yaml_tags, list):
@@ -154,55 +433,220 @@ class NetworkMetadataStore:
                 tags.append(yaml_tags)
         tags = list(set(tags))
 
-        # 파일 메타데이터 저장
-        self.metadata["files"][file_path] = {
+        entry = {
             "title": title,
             "para_folder": doc.get("para_folder", "root"),
-            "backlinks": [],  # 백링크는 나중에 계산
+            "backlinks": [],  # 백링크는 _refresh_backlinks에서 계산
             "forward_links": forward_links,
             "tags": tags,
             "yaml_frontmatter": doc.get("metadata", {}),
         }
+        self._apply_entry(file_path, entry)
+
+    def update_many(self, docs: Iterable[dict]):
+        """여러 문서를 한 번에 업데이트
+
+        백링크 계산은 모든 문서를 반영한 뒤 한 번만 수행합니다.
+        docs는 제너레이터여도 되므로 문서를 하나씩 파싱하면서 넘길 수 있습니다.
+
+        Args:
+            docs: update_metadata()에 넘기는 문서들
+        """
+        with self.batch():
+            for doc in docs:
+                self.update_metadata(doc)
+
+    @contextmanager
+    def batch(self):
+        """백링크 계산을 미루는 배치 컨텍스트
+
+        배치 안의 update_metadata()/delete_metadata()는 파일 정보만 갱신하고,
+        가장 바깥 배치가 끝날 때 _rebuild_backlinks()를 한 번 실행합니다.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._rebuild_backlinks()
 
-        # 백링크 역인덱스 업데이트
-        self._rebuild_backlinks()
+    def _apply_entry(self, file_path: str, entry: Optional[dict]):
+        """파일 메타데이터 교체/삭제와 백링크 델타 갱신
+
+        Args:
+            file_path: 파일 경로
+            entry: 새 파일 메타데이터 (None이면 삭제)
+        """
+        files = self.metadata["files"]
+        previous = files.summary(file_path)
+        self.generation += 1
+
+        if self._batch_depth:
+            # 배치 중: 파일 정보와 제목/해석 인덱스만 갱신
+            self._set_entry(file_path, previous, entry)
+            return
+
+        old_title = previous["title"] if previous else None
+        new_title = entry["title"] if entry else None
+        old_links = self._link_keys(previous["forward_links"]) if previous else {}
+        new_links = self._link_keys(entry["forward_links"]) if entry else {}
+
+        # 해석 결과가 바뀔 수 있는 링크 키
+        # - 추가/삭제된 링크
+        # - 이 노트의 이전/새 해석 키 (파일명/경로/별칭 - 생성·삭제·이름/별칭 변경 시 대표 경로가 바뀜)
+        # - 제목이 바뀌면 이 노트가 가리키는 모든 대상의 백링크 표시 이름도 바뀜
+        changed_keys = old_links.keys() ^ new_links.keys()
+        for file_data in (previous, entry):
+            if file_data:
+                changed_keys.update(key for _, key in self._resolve_entries(file_path, file_data))
+        if old_title != new_title:
+            changed_keys |= old_links.keys() | new_links.keys()
+
+        affected = {self._resolve_key(key) for key in changed_keys}
+
+        self._set_entry(file_path, previous, entry)
+        for key in old_links.keys() - new_links.keys():
+            sources = self.link_sources.get(key)
+            if sources:
+                sources.discard(file_path)
+                if not sources:
+                    del self.link_sources[key]
+                    self.link_labels.pop(key, None)
+        for key in new_links.keys() - old_links.keys():
+            self.link_sources.setdefault(key, set()).add(file_path)
+            self.link_labels.setdefault(key, new_links[key])
+
+        affected.update(self._resolve_key(key) for key in changed_keys)
+        affected.add(file_path)
+
+        for target_path in affected:
+            if target_path and target_path in files:
+                self._refresh_backlinks(target_path)
+        self._update_note_health(file_path)
+        for key in changed_keys:
+            self._update_dangling(key)
+
+    def _set_entry(self, file_path: str, previous: Optional[dict], entry: Optional[dict]):
+        """파일 메타데이터와 제목/해석/태그 인덱스 갱신 (백링크 계산 없음)"""
+        if previous:
+            self._unindex_resolve(file_path, previous)
+            self.tag_index.remove(file_path, previous["tags"])
+            if entry is None or previous["title"] != entry["title"]:
+                self._unindex_title(previous["title"], file_path)
+
+        if entry is None:
+            del self.metadata["files"][file_path]
+            return
+
+        if previous:
+            # 델타 갱신 전까지 기존 백링크 유지
+            entry["backlinks"] = previous["backlinks"]
+        self._index_title(entry["title"], file_path)
+        self._index_resolve(file_path, entry)
+        self.tag_index.add(file_path, entry["tags"])
+        self.metadata["files"][file_path] = entry
+
+    def _link_keys_for(self, file_path: str) -> List[str]:
+        """이 파일로 해석되는 (이 파일이 대표인) 링크 키 목록"""
+        file_data = self.metadata["files"].summary(file_path)
+        return [
+            key
+            for _, key in self._resolve_entries(file_path, file_data)
+            if self._resolve_key(key) == file_path
+        ]
+
+    def _refresh_backlinks(self, target_path: str):
+        """대상 노트 하나의 백링크 재계산
+
+        백링크는 소스 경로 오름차순으로 정렬된 소스 제목 리스트(중복 제거)입니다.
+        """
+        sources: Set[str] = set()
+        for key in self._link_keys_for(target_path):
+            sources |= self.link_sources.get(key, set())
+        files = self.metadata["files"]
+        backlinks = self._backlink_titles(sources)
+        if backlinks != files.summary(target_path)["backlinks"]:
+            files[target_path]["backlinks"] = backlinks
+        self.dirty_backlinks.add(target_path)
+        self._update_note_health(target_path)
+
+    def _backlink_titles(self, sources: Iterable[str]) -> List[str]:
+        """소스 경로들을 경로 오름차순의 중복 없는 소스 제목 리스트로 변환"""
+        files = self.metadata["files"]
+        titles = {}
+        for source_path in sorted(sources):
+            titles.setdefault(files.summary(source_path)["title"], None)
+        return list(titles)
 
     def _rebuild_backlinks(self):
         """모든 파일의 백링크를 재계산
 
-        포워드링크를 기반으로 역인덱스를 구축합니다.
+        포워드링크를 기반으로 링크 역인덱스와 백링크를 한 번에 구축합니다. O(N·L)
         """
-        # 백링크 초기화
-        for file_path in self.metadata["files"]:
-            self.metadata["files"][file_path]["backlinks"] = []
-
-        # 포워드링크를 순회하며 백링크 구축
-        for source_path, file_data in self.metadata["files"].items():
-            source_title = file_data["title"]
-            forward_links = file_data["forward_links"]
-
-            for target_title in forward_links:
-                # target_title을 가진 파일 찾기
-                target_path = self._find_file_by_title(target_title)
-                if target_path and target_path in self.metadata["files"]:
-                    # 백링크 추가 (중복 제거)
-                    backlinks = self.metadata["files"][target_path]["backlinks"]
-                    if source_title not in backlinks:
-                        backlinks.append(source_title)
+        files = self.metadata["files"]
+        self._rebuild_link_sources()
+
+        sources_by_target: Dict[str, Set[str]] = {}
+        for key, sources in self.link_sources.items():
+            target_path = self._resolve_key(key)
+            if target_path:
+                sources_by_target.setdefault(target_path, set()).update(sources)
+
+        for target_path, file_data in files.summaries():
+            backlinks = self._backlink_titles(sources_by_target.get(target_path, ()))
+            # 바뀐 노트만 전체 메타데이터를 로드해서 갱신
+            if backlinks != file_data["backlinks"]:
+                files[target_path]["backlinks"] = backlinks
+        self.dirty_backlinks.update(files)
+        self._rebuild_health()
+
+    def pop_dirty_backlinks(self) -> Dict[str, List[str]]:
+        """마지막 호출 이후 백링크가 다시 계산된 파일의 백링크를 꺼내기
+
+        Returns:
+            {파일 경로: 백링크 제목 리스트} (삭제된 파일은 제외)
+        """
+        files = self.metadata["files"]
+        dirty = {
+            path: files.summary(path)["backlinks"]
+            for path in self.dirty_backlinks
+            if path in files
+        }
+        self.dirty_backlinks = set()
+        return dirty
+
+    def _resolve_key(self, key: str) -> Optional[str]:
+        """정규화된 키로 파일 경로 찾기 (O(1))"""
+        entries = self.resolve_index.get(key)
+        return entries[0][1] if entries else None
 
     def _find_file_by_title(self, title: str) -> Optional[str]:
-        """노트 제목으로 파일 경로 찾기
+        """노트 제목 또는 위키링크로 파일 경로 찾기 (O(1))
+
+        정규화된 링크 키로 해석하므로 [[folder/Note]], [[Note#Heading]], [[Note^block]],
+        대소문자 차이, frontmatter 별칭도 찾습니다. 같은 키에 여러 노트가 있으면
+        파일명 → 경로 → 별칭 순, 그 안에서는 경로 오름차순으로 첫 번째를 반환합니다.
+        (백링크 계산과 같은 규칙)
 
         Args:
-            title: 노트 제목
+            title: 노트 제목 또는 위키링크 텍스트
 
         Returns:
             파일 경로 (없으면 None)
         """
-        for file_path, file_data in self.metadata["files"].items():
-            if file_data["title"] == title:
-                return file_path
-        return None
+        return self._resolve_key(normalize_link(title))
+
+    def find_files_by_title(self, title: str) -> List[str]:
+        """노트 제목이 같은 모든 파일 경로 조회
+
+        Args:
+            title: 노트 제목
+
+        Returns:
+            파일 경로 리스트 (경로 오름차순)
+        """
+        return list(self.title_index.get(title, []))
 
     def delete_metadata(self, path: str):
         """파일의 메타데이터 삭제
@@ -211,9 +655,7 @@ class NetworkMetadataStore:
             path: 파일 경로
         """
         if path in self.metadata["files"]:
-            del self.metadata["files"][path]
-            # 백링크 재계산
-            self._rebuild_backlinks()
+            self._apply_entry(path, None)
 
     def get_backlinks(self, note_title: str) -> list:
         """특정 노트의 백링크 조회
@@ -226,7 +668,7 @@ class NetworkMetadataStore:
         """
         file_path = self._find_file_by_title(note_title)
         if file_path and file_path in self.metadata["files"]:
-            return self.metadata["files"][file_path]["backlinks"]
+            return self.metadata["files"].summary(file_path)["backlinks"]
         return []
 
     def get_forward_links(self, note_title: str) -> list:
@@ -240,80 +682,185 @@ class NetworkMetadataStore:
         """
         file_path = self._find_file_by_title(note_title)
         if file_path and file_path in self.metadata["files"]:
-            return self.metadata["files"][file_path]["forward_links"]
+            return self.metadata["files"].summary(file_path)["forward_links"]
         return []
 
+    def get_neighborhood(
+        self,
+        note_title: str,
+        depth: int = 1,
+        direction: str = "both",
+        max_nodes: int = 100,
+    ) -> List[dict]:
+        """노트에서 k-hop 이내로 연결된 노트 조회
+
+        Args:
+            note_title: 시작 노트 제목
+            depth: 최대 홉 수
+            direction: "out"(포워드링크), "in"(백링크), "both"(양방향)
+            max_nodes: 최대 노트 수 (시작 노트 포함)
+
+        Returns:
+            [{"title", "path", "distance"}, ...] (거리순, 시작 노트 포함)
+        """
+        file_path = self._find_file_by_title(note_title)
+        if not file_path:
+            return []
+
+        graph = self.graph
+        return [
+            {"title": graph.titles[node], "path": graph.paths[node], "distance": distance}
+            for node, distance in graph.neighborhood(
+                graph.node_id(file_path), depth, direction, max_nodes
+            )
+        ]
+
+    def find_path(
+        self,
+        source_title: str,
+        target_title: str,
+        direction: str = "both",
+        max_depth: Optional[int] = None,
+    ) -> Optional[List[dict]]:
+        """두 노트 사이의 최단 링크 경로
+
+        Args:
+            source_title: 시작 노트 제목
+            target_title: 도착 노트 제목
+            direction: "out"(포워드링크만), "in"(백링크만), "both"(방향 무시)
+            max_depth: 최대 홉 수
+
+        Returns:
+            [{"title", "path", "link"}, ...] 경로 순서 리스트 (연결되지 않으면 None)
+            link는 이전 노트와의 관계: "→"(이전 노트가 링크), "←"(이 노트가 링크), 시작 노트는 None
+        """
+        source_path = self._find_file_by_title(source_title)
+        target_path = self._find_file_by_title(target_title)
+        if not source_path or not target_path:
+            return None
+
+        graph = self.graph
+        nodes = graph.shortest_path(
+            graph.node_id(source_path), graph.node_id(target_path), direction, max_depth
+        )
+        if nodes is None:
+            return None
+
+        steps = []
+        for i, node in enumerate(nodes):
+            link = None
+            if i > 0:
+                link = "→" if graph.has_edge(nodes[i - 1], node) else "←"
+            steps.append({"title": graph.titles[node], "path": graph.paths[node], "link": link})
+        return steps
+
     def get_network_stats(self) -> dict:
-        """네트워크 통계 계산
+        """네트워크 통계 (델타로 유지되는 카운터에서 O(1) 조회)
 
         Returns:
             통계 딕셔너리
             - total_files: 전체 파일 수
             - total_backlinks: 전체 백링크 수
             - orphaned_notes: 고립된 노트 수 (백링크/포워드링크 없음)
+            - unresolved_links: 해석되지 않는 링크 대상 수
+            - unresolved_references: 해석되지 않는 링크를 가진 (노트, 대상) 쌍의 수
         """
-        total_files = len(self.metadata["files"])
-        total_backlinks = sum(
-            len(file_data["backlinks"]) for file_data in self.metadata["files"].values()
-        )
-
-        # 고립된 노트 계산 (백링크도 없고 포워드링크도 없는 노트)
-        orphaned_notes = 0
-        for file_data in self.metadata["files"].values():
-            if (
-                len(file_data["backlinks"]) == 0
-                and len(file_data["forward_links"]) == 0
-            ):
-                orphaned_notes += 1
-
         return {
-            "total_files": total_files,
-            "total_backlinks": total_backlinks,
-            "orphaned_notes": orphaned_notes,
+            "total_files": len(self.metadata["files"]),
+            "total_backlinks": self._total_backlinks,
+            "orphaned_notes": len(self.orphans),
+            "unresolved_links": len(self.dangling),
+            "unresolved_references": self._dangling_references,
         }
 
+    def get_unresolved_links(self, limit: int = 20, max_sources: int = 5) -> List[dict]:
+        """해석되지 않는 링크 대상을 참조 수 내림차순으로 조회
+
+        참조 수 목록과 버킷 안의 링크 키를 정렬된 상태로 유지하므로 큰 수부터 limit개만 순회하고,
+        대상마다 소스 노트는 heapq.nsmallest로 max_sources개만 고릅니다
+        (해석되지 않는 링크 전체를 정렬하지 않음).
+
+        Args:
+            limit: 최대 대상 수
+            max_sources: 대상마다 보여줄 최대 소스 노트 수
+
+        Returns:
+            [{"target": 링크 텍스트, "references": 참조 노트 수, "sources": [노트 제목, ...]}, ...]
+        """
+        files = self.metadata["files"]
+        results = []
+        for count in reversed(self._dangling_counts):
+            for key in self._dangling_buckets[count]:
+                if len(results) >= limit:
+                    return results
+                sources = heapq.nsmallest(max_sources, self.link_sources[key])
+                results.append(
+                    {
+                        "target": self.link_labels.get(key, key),
+                        "references": count,
+                        "sources": [files.summary(path)["title"] for path in sources],
+                    }
+                )
+        return results
+
+    def get_link_health(self, limit: int = 20) -> dict:
+        """링크 상태 요약 (목록은 정렬된 인덱스에서 앞의 limit개만 조회)
+
+        Args:
+            limit: 해석되지 않는 링크/고립 노트 목록의 최대 항목 수
+
+        Returns:
+            get_network_stats() 통계 + "unresolved"(참조 수 순위) + "orphans"(노트 제목)
+        """
+        files = self.metadata["files"]
+        health = self.get_network_stats()
+        health["unresolved"] = self.get_unresolved_links(limit=limit)
+        health["orphans"] = [
+            files.summary(path)["title"] for path in self.orphans[:limit]
+        ]
+        return health
+
     def _update_stats(self):
         """통계 업데이트 (save_metadata 호출 시 자동 실행)"""
         self.metadata["stats"] = self.get_network_stats()
 
     def get_all_tags(self) -> Dict[str, int]:
-        """모든 태그와 사용 빈도 반환
+        """모든 태그와 사용 빈도 반환 (태그는 소문자로 정규화)
 
         Returns:
             {"tag_name": count, ...}
         """
-        tag_counts = {}
-        for file_data in self.metadata["files"].values():
-            for tag in file_data["tags"]:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-        return dict(sorted(tag_counts.items(), key=lambda x: x[1], reverse=True))
+        return self.tag_index.counts()
+
+    def get_paths_by_tag(self, tag: str, include_nested: bool = True) -> List[str]:
+        """특정 태그를 가진 노트 경로 조회 (태그 역인덱스)
+
+        Args:
+            tag: 태그 이름 (# 유무, 대소문자 무관)
+            include_nested: 중첩 태그(tag/...)가 붙은 노트 포함 여부
+
+        Returns:
+            노트 경로 리스트 (경로 오름차순)
+        """
+        return sorted(self.tag_index.paths(tag, include_nested))
 
     def get_notes_by_tag(self, tag: str) -> List[str]:
-        """특정 태그를 가진 노트들 조회
+        """특정 태그를 가진 노트들 조회 (중첩 태그 포함)
 
         Args:
             tag: 태그 이름 (#는 제외)
 
         Returns:
-            노트 제목 리스트
+            노트 제목 리스트 (경로 오름차순)
         """
-        notes = []
-        for file_data in self.metadata["files"].values():
-            if tag in file_data["tags"]:
-                notes.append(file_data["title"])
-        return notes
+        files = self.metadata["files"]
+        return [files.summary(path)["title"] for path in self.get_paths_by_tag(tag)]
 
     def get_orphaned_notes(self) -> List[str]:
         """고립된 노트들 조회
 
         Returns:
-            고립된 노트 제목 리스트
+            고립된 노트 제목 리스트 (경로 오름차순)
         """
-        orphaned = []
-        for file_data in self.metadata["files"].values():
-            if (
-                len(file_data["backlinks"]) == 0
-                and len(file_data["forward_links"]) == 0
-            ):
-                orphaned.append(file_data["title"])
-        return orphaned
+        files = self.metadata["files"]
+        return [files.summary(path)["title"] for path in self.orphans]
@@ -0,0 +1,126 @@
+"""파싱된 노트 캐시
+
+ContextBuilder와 MCP 서버(find_related)가 같이 사용하는 LRU 캐시입니다.
+노트 경로를 키로 파싱 결과(frontmatter, 본문, 링크, 태그)를 보관하고,
+조회할 때마다 stat()의 (mtime_ns, 크기)를 비교해서 파일이 바뀌었으면 다시 파싱합니다.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import NOTE_CACHE_SIZE
+from obsidian_parser import ObsidianParser
+
+
+class NoteCache:
+    """경로 → 파싱된 노트 LRU 캐시 (stat으로 검증, 스레드 안전)"""
+
+    def __init__(
+        self, parser: Optional[ObsidianParser] = None, max_entries: int = NOTE_CACHE_SIZE
+    ):
+        """
+        Args:
+            parser: ObsidianParser 인스턴스 (기본값: 새로 생성)
+            max_entries: 최대 캐시 항목 수
+        """
+        self.parser = parser if parser else ObsidianParser()
+        self.max_entries = max_entries
+        # 경로 → ((mtime_ns, 크기), 파싱된 노트)
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, int], dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, path: str) -> Optional[dict]:
+        """파싱된 노트 (캐시가 없거나 파일이 바뀌었으면 다시 파싱)
+
+        대용량(스트리밍) 노트는 앞부분만 읽어서 content에 넣고 trimmed=True로 표시합니다.
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            파싱된 노트의 얕은 복사본 (호출자가 키를 추가해도 캐시에 영향 없음).
+            파일이 없으면 None
+        """
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            self.invalidate(path)
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is not None and entry[0] == key:
+                self._cache.move_to_end(path)
+                self.hits += 1
+                return dict(entry[1])
+            self.misses += 1
+
+        # 파싱은 잠금 밖에서 (다른 노트 조회를 막지 않도록)
+        doc = self.parser.parse_file(Path(path))
+        if not doc:
+            return None
+        if doc.get("streamed"):
+            doc["content"] = self.parser.load_content(doc)
+            doc["trimmed"] = True
+
+        with self._lock:
+            self._cache[path] = (key, doc)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return dict(doc)
+
+    def stamp(self, path: str) -> Optional[Tuple[int, int]]:
+        """캐시된 파싱 결과를 만들 때의 (mtime_ns, 크기) (stat 호출 없음)
+
+        Args:
+            path: 파일 경로
+
+        Returns:
+            (mtime_ns, 크기) (캐시에 없으면 None)
+        """
+        with self._lock:
+            entry = self._cache.get(path)
+            return entry[0] if entry is not None else None
+
+    def invalidate(self, path: str):
+        """노트 하나의 캐시 제거
+
+        Args:
+            path: 파일 경로
+        """
+        with self._lock:
+            self._cache.pop(path, None)
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        """캐시 통계
+
+        Returns:
+            {"entries", "max_entries", "hits", "misses", "hit_rate"}
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,168 @@
+"""노트 요약 표현 (다중 해상도)
+
+노트 본문에서 LLM 없이 규칙 기반으로 작은 표현을 뽑습니다.
+
+- outline: 제목 계층 (들여쓰기 목록)
+- lead: 첫 문단
+- key_lines: 목록/체크박스/굵은 글씨/링크/태그/정의가 있는 줄 중 점수가 높은 줄 (원래 순서)
+
+RepomixIndexStore가 인덱싱할 때 계산해서 내용 해시와 함께 저장하고,
+SmartPacker는 토큰 예산이 부족하면 전체 노트 대신 이 표현을 넣습니다.
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import (
+    REPRESENTATION_KEY_LINES,
+    REPRESENTATION_LEAD_CHARS,
+    REPRESENTATION_MAX_HEADINGS,
+)
+
+HEADING_LINE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+CHECKBOX = re.compile(r"^\s*[-*+]\s+\[[ xX]\]\s+")
+WIKI_LINK = re.compile(r"\[\[[^\]]+\]\]")
+TAG = re.compile(r"(?:^|\s)#[^\s#]+")
+DEFINITION = re.compile(r"^[^:：]{2,40}[:：]\s+\S|->|=>|→")
+
+# 핵심 줄 하나의 최대 문자 수
+KEY_LINE_MAX_CHARS = 200
+
+
+def _body_lines(content: str) -> List[Tuple[str, bool]]:
+    """(줄, 코드 블록 안인지) 목록"""
+    lines = []
+    in_code = False
+    for line in content.split("\n"):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_code = not in_code
+            lines.append((line, True))
+            continue
+        lines.append((line, in_code))
+    return lines
+
+
+def build_outline(content: str) -> str:
+    """제목 계층 (코드 블록 안의 '#'은 제외)
+
+    Args:
+        content: 노트 본문
+
+    Returns:
+        "- 제목" 형식의 들여쓰기 목록 (제목이 없으면 빈 문자열)
+    """
+    headings = []
+    for line, in_code in _body_lines(content):
+        if in_code:
+            continue
+        match = HEADING_LINE.match(line)
+        if match:
+            level = len(match.group(1))
+            headings.append("  " * (level - 1) + "- " + match.group(2))
+            if len(headings) >= REPRESENTATION_MAX_HEADINGS:
+                break
+    return "\n".join(headings)
+
+
+def build_lead(content: str) -> str:
+    """첫 문단 (제목/코드 블록 제외, REPRESENTATION_LEAD_CHARS에서 단어 경계로 자름)
+
+    Args:
+        content: 노트 본문
+
+    Returns:
+        첫 문단 (없으면 빈 문자열)
+    """
+    paragraph: List[str] = []
+    for line, in_code in _body_lines(content):
+        stripped = line.strip()
+        if in_code or HEADING_LINE.match(line) or not stripped:
+            if paragraph:
+                break
+            continue
+        paragraph.append(stripped)
+
+    lead = " ".join(paragraph)
+    if len(lead) <= REPRESENTATION_LEAD_CHARS:
+        return lead
+    cut = lead[:REPRESENTATION_LEAD_CHARS]
+    space = cut.rfind(" ")
+    if space > REPRESENTATION_LEAD_CHARS // 2:
+        cut = cut[:space]
+    return cut + " …"
+
+
+def _line_score(line: str) -> int:
+    """핵심 줄 점수 (0이면 후보 아님)"""
+    score = 0
+    if CHECKBOX.match(line):
+        score += 3
+    elif LIST_ITEM.match(line):
+        score += 1
+    if "**" in line or "__" in line:
+        score += 2
+    score += min(len(WIKI_LINK.findall(line)), 2)
+    if TAG.search(line):
+        score += 1
+    if DEFINITION.search(line):
+        score += 1
+    if line.lstrip().startswith(">"):
+        score += 1
+    return score
+
+
+def build_key_lines(content: str) -> str:
+    """핵심 줄 (점수 상위 REPRESENTATION_KEY_LINES개, 원래 순서)
+
+    Args:
+        content: 노트 본문
+
+    Returns:
+        줄바꿈으로 이은 핵심 줄 (없으면 빈 문자열)
+    """
+    candidates = []
+    for position, (line, in_code) in enumerate(_body_lines(content)):
+        stripped = line.strip()
+        if in_code or len(stripped) < 8 or HEADING_LINE.match(line):
+            continue
+        score = _line_score(line)
+        if score > 0:
+            candidates.append((score, position, stripped[:KEY_LINE_MAX_CHARS]))
+
+    top = sorted(candidates, key=lambda item: (-item[0], item[1]))[:REPRESENTATION_KEY_LINES]
+    return "\n".join(text for _, _, text in sorted(top, key=lambda item: item[1]))
+
+
+def build_representations(
+    content: str, count_tokens: Callable[[str], int], digest: str
+) -> Dict[str, object]:
+    """노트의 요약 표현 전체
+
+    Args:
+        content: 노트 본문
+        count_tokens: 토큰 수 계산 함수 (TokenCounter.count)
+        digest: 본문의 content_hash (저장된 표현의 유효성 확인용)
+
+    Returns:
+        {
+            "content_hash": digest,
+            "outline": {"text", "tokens"},
+            "lead": {"text", "tokens"},
+            "key_lines": {"text", "tokens"},
+        }
+    """
+    representations: Dict[str, object] = {"content_hash": digest}
+    for name, build in (
+        ("outline", build_outline),
+        ("lead", build_lead),
+        ("key_lines", build_key_lines),
+    ):
+        text = build(content)
+        representations[name] = {"text": text, "tokens": count_tokens(text) if text else 0}
+    return representations
@@ -1,8 +1,83 @@
+import codecs
 import re
+import sys
 import frontmatter
+import yaml
 from pathlib import Path
-from typing import Dict, List
-from config import VAULT_PATH
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import (
+    VAULT_PATH,
+    LARGE_FILE_THRESHOLD_BYTES,
+    MAX_FILE_BYTES,
+    OVERSIZE_POLICY,
+)
+
+# 스트리밍 파싱 시 frontmatter로 인정하는 최대 크기
+MAX_FRONTMATTER_BYTES = 64 * 1024
+# 스트리밍 시 한 번에 읽는 최대 줄 길이 (줄바꿈 없는 거대한 줄은 나눠서 읽음)
+MAX_LINE_BYTES = 64 * 1024
+
+
+def iter_body_lines(doc: Dict) -> Iterator[str]:
+    """문서 본문을 줄 단위로 순회
+
+    일반 문서는 메모리의 content를, 스트리밍 문서는 파일을 다시 열어
+    본문 시작 위치부터 읽기 제한까지 읽습니다. (줄바꿈 문자 제외)
+    긴 줄을 나눠 읽거나 읽기 제한에서 자를 때 UTF-8 문자가 바이트 중간에서
+    끊기지 않도록 증분 디코더로 다음 읽기까지 이어서 디코딩합니다.
+
+    Args:
+        doc: ObsidianParser.parse_file()의 반환값
+    """
+    if not doc.get("streamed"):
+        yield from doc.get("content", "").split("\n")
+        return
+
+    stream = doc["stream"]
+    remaining = stream["limit"] - stream["offset"]
+    if remaining <= 0:
+        return
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    with open(doc["path"], "rb") as f:
+        f.seek(stream["offset"])
+        while remaining > 0:
+            raw_line = f.readline(min(MAX_LINE_BYTES, remaining))
+            if not raw_line:
+                break
+            remaining -= len(raw_line)
+            if remaining <= 0:
+                # 읽기 제한이 문자 중간이면 그 문자의 나머지 바이트까지 읽음
+                raw_line += _read_char_tail(f, raw_line)
+            yield decoder.decode(raw_line).rstrip("\r\n")
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def _read_char_tail(f, data: bytes) -> bytes:
+    """data 끝에서 끊긴 UTF-8 문자의 나머지 연속 바이트 (최대 3바이트)"""
+    # 끝에서부터 연속 바이트(10xxxxxx)를 건너뛰어 마지막 문자의 시작 바이트 찾기
+    start = len(data) - 1
+    while start > 0 and len(data) - start < 4 and data[start] & 0xC0 == 0x80:
+        start -= 1
+    lead = data[start] if data else 0
+    if lead >= 0xF0:
+        width = 4
+    elif lead >= 0xE0:
+        width = 3
+    elif lead >= 0xC0:
+        width = 2
+    else:
+        return b""
+    missing = width - (len(data) - start)
+    if missing <= 0:
+        return b""
+    tail = f.read(missing)
+    # 연속 바이트가 아니면 (깨진 파일) 붙이지 않음
+    if any(byte & 0xC0 != 0x80 for byte in tail):
+        return b""
+    return tail
 
 
 class ObsidianParser:
@@ -13,7 +88,15 @@ class ObsidianParser:
         self.tag_pattern = r"#([^\s#]+)"
 
     def parse_file(self, file_path: Path) -> Dict:
-        """마크다운 파일 파싱"""
+        """마크다운 파일 파싱
+
+        LARGE_FILE_THRESHOLD_BYTES를 넘는 파일은 본문을 메모리에 올리지 않는
+        스트리밍 경로로 처리합니다. (content는 빈 문자열, streamed=True)
+        """
+        size = file_path.stat().st_size
+        if size > LARGE_FILE_THRESHOLD_BYTES:
+            return self._parse_large_file(file_path, size)
+
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 post = frontmatter.load(f)
@@ -21,7 +104,9 @@ class ObsidianParser:
             metadata = post.metadata or {}
         except Exception:
             # 파싱 에러 시 일반 텍스트로 처리
-            print(f"  ⚠️ 파싱 에러 (일반 텍스트로 처리): {file_path.name}")
+            print(
+                f"  ⚠️ 파싱 에러 (일반 텍스트로 처리): {file_path.name}", file=sys.stderr
+            )
             with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                 content = f.read()
             metadata = {}
@@ -31,6 +116,18 @@ class ObsidianParser:
 
         # 태그 추출
         tags = self.extract_tags(content)
+
+        return self._build_doc(file_path, content, metadata, wiki_links, tags)
+
+    def _build_doc(
+        self,
+        file_path: Path,
+        content: str,
+        metadata: Dict,
+        wiki_links: List[str],
+        tags: List[str],
+    ) -> Dict:
+        """파싱 결과 딕셔너리 구성 (YAML 태그 병합, PARA 폴더 식별)"""
         metadata_tags = metadata.get("tags", [])
         if metadata_tags:
             if isinstance(metadata_tags, list):
@@ -47,11 +144,101 @@ class ObsidianParser:
             "content": content,
             "metadata": metadata,
             "wiki_links": wiki_links,
-            "tags": list(set(tags)),
+            "tags": list(dict.fromkeys(tags)),
             "para_folder": para_folder,
             "modified_time": file_path.stat().st_mtime,
         }
 
+    def _parse_large_file(self, file_path: Path, size: int) -> Dict:
+        """대용량 파일 스트리밍 파싱
+
+        frontmatter와 링크/태그만 줄 단위로 추출하고 본문은 보관하지 않습니다.
+        본문은 iter_body_lines()로 필요할 때 다시 읽습니다.
+        MAX_FILE_BYTES를 넘으면 OVERSIZE_POLICY에 따라 잘라내거나 본문을 건너뜁니다.
+        """
+        oversize = None
+        limit = size
+        if size > MAX_FILE_BYTES:
+            action = "skipped" if OVERSIZE_POLICY == "skip" else "truncated"
+            limit = 0 if action == "skipped" else MAX_FILE_BYTES
+            oversize = {"action": action, "bytes": size, "limit": MAX_FILE_BYTES}
+            print(
+                f"  ⚠️ 대용량 파일 ({size:,} bytes, {action}): {file_path.name}",
+                file=sys.stderr,
+            )
+
+        metadata, offset = self._read_frontmatter(file_path)
+        doc = self._build_doc(file_path, "", metadata, [], [])
+        doc["streamed"] = True
+        doc["stream"] = {"offset": offset, "limit": max(limit, offset)}
+        doc["size_bytes"] = size
+        doc["oversize"] = oversize
+
+        wiki_links = []
+        # 처음 나온 순서를 유지하는 중복 제거 (실행마다 순서가 같도록)
+        tags = dict.fromkeys(doc["tags"])
+        for line in iter_body_lines(doc):
+            wiki_links.extend(self.extract_wiki_links(line))
+            tags.update(dict.fromkeys(self.extract_tags(line)))
+
+        doc["wiki_links"] = wiki_links
+        doc["tags"] = list(tags)
+        return doc
+
+    def _read_frontmatter(self, file_path: Path) -> Tuple[Dict, int]:
+        """파일 앞부분의 YAML frontmatter만 읽기
+
+        Returns:
+            (metadata, 본문 시작 바이트 오프셋)
+        """
+        with open(file_path, "rb") as f:
+            first_line = f.readline()
+            if first_line.rstrip(b"\r\n") != b"---":
+                return {}, 0
+
+            lines = []
+            consumed = len(first_line)
+            for raw_line in f:
+                consumed += len(raw_line)
+                if consumed > MAX_FRONTMATTER_BYTES:
+                    return {}, 0
+                if raw_line.rstrip(b"\r\n") == b"---":
+                    break
+                lines.append(raw_line)
+            else:
+                return {}, 0
+
+        try:
+            metadata = yaml.safe_load(b"".join(lines).decode("utf-8", errors="ignore"))
+        except yaml.YAMLError:
+            print(f"  ⚠️ frontmatter 파싱 에러 (무시): {file_path.name}", file=sys.stderr)
+            return {}, consumed
+        return (metadata if isinstance(metadata, dict) else {}), consumed
+
+    def load_content(self, doc: Dict, max_chars: Optional[int] = None) -> str:
+        """문서 본문 가져오기 (스트리밍 문서는 앞부분만 읽기)
+
+        Args:
+            doc: parse_file()의 반환값
+            max_chars: 최대 문자 수 (스트리밍 문서 기본값: LARGE_FILE_THRESHOLD_BYTES)
+
+        Returns:
+            본문 문자열
+        """
+        if not doc.get("streamed"):
+            content = doc.get("content", "")
+            return content[:max_chars] if max_chars else content
+
+        max_chars = max_chars if max_chars else LARGE_FILE_THRESHOLD_BYTES
+        parts = []
+        total = 0
+        for line in iter_body_lines(doc):
+            parts.append(line)
+            total += len(line) + 1
+            if total >= max_chars:
+                break
+        return "\n".join(parts)[:max_chars]
+
     def extract_wiki_links(self, content: str) -> List[str]:
         """[[위키링크]] 추출"""
         matches = re.findall(self.wiki_link_pattern, content)
@@ -0,0 +1,171 @@
+"""패킹 결과 캐시
+
+pack_note_context가 같은 허브 노트를 반복해서 요청할 때 그래프 조회, 파일 파싱,
+벡터 검색, 토큰화, 포맷팅을 다시 하지 않도록 포맷팅된 패키지를 보관합니다.
+
+- 키: (노트 제목, 패킹 파라미터) + 인덱스 세대(NetworkMetadataStore.generation)
+- 인덱스 세대가 바뀌면 (노트 추가/수정/삭제, 롤백) 이전 세대 항목 전체 제거
+- 항목마다 후보 노트들의 (mtime_ns, 크기)를 기록해서, 인덱싱 전에 파일이 바뀌어도 조회 시 무효화
+- 항목 수와 패키지 문자열의 메모리 합계를 모두 제한 (오래 쓰지 않은 항목부터 제거)
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple, Union
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import PACK_CACHE_MAX_BYTES, PACK_CACHE_SIZE
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """파일의 (mtime_ns, 크기) (없으면 None)"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class PackCache:
+    """(노트, 파라미터, 인덱스 세대) → 포맷팅된 패키지 LRU 캐시 (메모리 상한, 스레드 안전)"""
+
+    def __init__(
+        self, max_entries: int = PACK_CACHE_SIZE, max_bytes: int = PACK_CACHE_MAX_BYTES
+    ):
+        """
+        Args:
+            max_entries: 최대 항목 수
+            max_bytes: 캐시된 패키지 문자열의 최대 메모리 합계 (바이트)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # 키 → (패키지, 리포트, {경로: (mtime_ns, 크기)}, 문자열 메모리 크기)
+        # (패키지는 문자열 또는 나눈 부분 문자열 튜플)
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _check_generation(self, generation: int):
+        """인덱스 세대가 바뀌었으면 전체 비우기 (잠금 안에서 호출)"""
+        if generation != self._generation:
+            self._cache.clear()
+            self._bytes = 0
+            self._generation = generation
+
+    def _pop(self, key: Hashable):
+        """항목 제거 (잠금 안에서 호출)"""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def get(
+        self, key: Hashable, generation: int
+    ) -> Optional[Tuple[Union[str, Tuple[str, ...]], Optional[dict]]]:
+        """캐시된 패키지 (후보 노트 파일이 바뀌었으면 제거하고 None)
+
+        Args:
+            key: (노트 제목, 패킹 파라미터) 튜플
+            generation: 현재 인덱스 세대
+
+        Returns:
+            (패키지, 리포트 복사본) 또는 None
+        """
+        with self._lock:
+            self._check_generation(generation)
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stamps = entry[2]
+
+        # 파일 stat은 잠금 밖에서
+        if any(file_stamp(path) != stamp for path, stamp in stamps.items()):
+            with self._lock:
+                if self._cache.get(key) is entry:
+                    self._pop(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            self.hits += 1
+        text, report = entry[0], entry[1]
+        return text, dict(report) if report is not None else None
+
+    def put(
+        self,
+        key: Hashable,
+        generation: int,
+        text: Union[str, Tuple[str, ...]],
+        report: Optional[dict],
+        stamps: Dict[str, Optional[Tuple[int, int]]],
+    ):
+        """패키지 저장 (메모리 상한을 넘으면 오래 쓰지 않은 항목부터 제거)
+
+        Args:
+            key: (노트 제목, 패킹 파라미터) 튜플
+            generation: 패키지를 만들 때의 인덱스 세대
+            text: 포맷팅된 패키지 (문자열 또는 나눈 부분 문자열 튜플)
+            report: 패킹 리포트 (없으면 None)
+            stamps: 후보 노트 경로 → 읽었을 때의 (mtime_ns, 크기)
+        """
+        if isinstance(text, str):
+            size = sys.getsizeof(text)
+        else:
+            size = sum(sys.getsizeof(part) for part in text)
+        if size > self.max_bytes:
+            # 상한보다 큰 패키지는 저장하지 않음 (다른 항목을 모두 밀어내지 않도록)
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                # 만드는 동안 세대가 바뀌었으면 이미 낡은 결과
+                if self._generation is not None and generation < self._generation:
+                    return
+                self._check_generation(generation)
+            self._pop(key)
+            saved_report = dict(report) if report is not None else None
+            self._cache[key] = (text, saved_report, dict(stamps), size)
+            self._bytes += size
+            while len(self._cache) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._cache))
+                self._pop(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """캐시 통계
+
+        Returns:
+            {"entries", "max_entries", "bytes", "max_bytes", "hits", "misses",
+             "hit_rate", "evictions"}
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
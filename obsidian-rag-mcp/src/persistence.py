@@ -0,0 +1,413 @@
+"""메타데이터 파일 저장/로드
+
+NetworkMetadataStore와 RepomixIndexStore가 공유하는 영속화 계층입니다.
+
+- 확장자가 .db/.sqlite면 SQLite 파일 하나에 헤더(버전, 통계)와 노트별 레코드를 저장
+  - 시작할 때는 헤더와 노트별 요약(인덱스 구축에 필요한 가벼운 필드)만 읽고,
+    전체 레코드는 처음 접근할 때 노트 단위로 로드
+  - 저장할 때는 로드/변경된 레코드와 삭제된 경로만 한 트랜잭션으로 반영
+- 그 외 확장자(.json)는 기존 JSON 형식을 유지 (공백 없이 직렬화)
+- 새 파일 쓰기는 같은 디렉토리의 임시 파일에 쓴 뒤 이름을 바꿔서 원자적으로 교체
+- SQLite 파일이 없고 같은 이름의 .json 파일이 있으면 자동으로 마이그레이션
+- 형식 버전이 다르거나 손상된 파일은 UnreadableRecordFile을 일으키고, 저장소가
+  quarantine()으로 옆으로 옮긴 뒤 재인덱싱 (다음 저장이 기존 파일을 덮어쓰지 않도록)
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from collections.abc import MutableMapping
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Set
+
+# SQLite 파일 형식 버전 (헤더의 format_version)
+FORMAT_VERSION = 1
+
+SQLITE_SUFFIXES = (".db", ".sqlite")
+
+
+class UnreadableRecordFile(ValueError):
+    """형식 버전이 다르거나 손상되어 읽을 수 없는 메타데이터 파일
+
+    잠긴 파일처럼 다시 시도하면 읽을 수 있는 오류는 그대로 전파합니다.
+    """
+
+
+class DateTimeEncoder(json.JSONEncoder):
+    """날짜/시간 객체를 JSON으로 직렬화하는 커스텀 인코더"""
+
+    def default(self, obj):
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+def dumps(value) -> str:
+    """공백 없는 JSON 직렬화 (한글은 그대로 유지)"""
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), cls=DateTimeEncoder
+    )
+
+
+def atomic_write_json(path: Path, data: dict):
+    """임시 파일에 JSON을 쓴 뒤 이름을 바꿔서 원자적으로 교체
+
+    Args:
+        path: 저장할 파일 경로
+        data: 저장할 데이터
+    """
+    _atomic_replace(path, lambda tmp: tmp.write_text(dumps(data), encoding="utf-8"))
+
+
+def _atomic_replace(path: Path, write: Callable[[Path], None]):
+    """같은 디렉토리의 임시 파일에 write()로 쓴 뒤 path로 교체"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class LazyRecordMap(MutableMapping):
+    """노트 경로 → 레코드 매핑 (전체 레코드는 처음 접근할 때 로드)
+
+    로드되지 않은 노트는 요약만 메모리에 유지합니다. 인덱스 구축처럼 가벼운 필드만 필요한
+    곳에서는 summary()를 쓰면 전체 레코드를 로드하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        records: Optional[Dict[str, dict]] = None,
+        summaries: Optional[Dict[str, dict]] = None,
+        loader: Optional[Callable[[str], dict]] = None,
+        summarize: Optional[Callable[[dict], dict]] = None,
+    ):
+        """
+        Args:
+            records: 로드된 전체 레코드
+            summaries: 로드되지 않은 노트의 요약
+            loader: 경로로 전체 레코드를 읽는 함수
+            summarize: 레코드 → 요약 변환 함수 (저장 후 레코드를 내릴 때 사용)
+        """
+        self._records: Dict[str, dict] = dict(records or {})
+        self._summaries: Dict[str, dict] = dict(summaries or {})
+        self._loader = loader
+        self._summarize = summarize
+        # 마지막 저장 이후 삭제된 경로
+        self.deleted: Set[str] = set()
+        # 레코드를 읽어 오는 SQLite 파일 (None이면 모든 레코드가 메모리에 있음)
+        self.source: Optional[Path] = None
+
+    @classmethod
+    def wrap(
+        cls, files, summarize: Optional[Callable[[dict], dict]] = None
+    ) -> "LazyRecordMap":
+        """일반 딕셔너리를 LazyRecordMap으로 감싸기 (이미 LazyRecordMap이면 그대로)"""
+        if isinstance(files, LazyRecordMap):
+            return files
+        return cls(records=files, summarize=summarize)
+
+    def __getitem__(self, path: str) -> dict:
+        record = self._records.get(path)
+        if record is not None:
+            return record
+        if path not in self._summaries:
+            # 다른 스레드가 방금 로드해서 요약을 지웠을 수 있음
+            record = self._records.get(path)
+            if record is not None:
+                return record
+            raise KeyError(path)
+        record = self._loader(path)
+        # 다른 스레드가 먼저 로드했으면 그 레코드를 사용
+        record = self._records.setdefault(path, record)
+        self._summaries.pop(path, None)
+        return record
+
+    def __setitem__(self, path: str, record: dict):
+        self._summaries.pop(path, None)
+        self._records[path] = record
+        self.deleted.discard(path)
+
+    def __delitem__(self, path: str):
+        if path in self._records:
+            del self._records[path]
+        elif path in self._summaries:
+            del self._summaries[path]
+        else:
+            raise KeyError(path)
+        self.deleted.add(path)
+
+    def __contains__(self, path) -> bool:
+        return path in self._records or path in self._summaries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._records) + list(self._summaries))
+
+    def __len__(self) -> int:
+        return len(self._records) + len(self._summaries)
+
+    def __repr__(self) -> str:
+        return f"LazyRecordMap(loaded={len(self._records)}, lazy={len(self._summaries)})"
+
+    def summary(self, path: str, default=None) -> Optional[dict]:
+        """노트 요약 (로드된 노트는 전체 레코드) - 읽기 전용으로만 사용
+
+        Args:
+            path: 노트 경로
+            default: 노트가 없을 때 반환값
+
+        Returns:
+            요약 또는 전체 레코드
+        """
+        record = self._records.get(path)
+        if record is not None:
+            return record
+        return self._summaries.get(path, default)
+
+    def summaries(self) -> Iterator[tuple]:
+        """(경로, 요약) 순회 (전체 레코드를 로드하지 않음)"""
+        return iter(list(self._records.items()) + list(self._summaries.items()))
+
+    def loaded(self) -> Dict[str, dict]:
+        """메모리에 로드된 전체 레코드"""
+        return self._records
+
+    def bind(self, source: Path, loader: Callable[[str], dict]):
+        """저장 완료 후 SQLite 파일에 연결하고 로드된 레코드를 요약으로 내리기"""
+        self.source = source
+        self._loader = loader
+        if self._summarize is not None:
+            for path, record in self._records.items():
+                self._summaries[path] = self._summarize(record)
+            self._records = {}
+        self.deleted = set()
+
+
+class RecordFile:
+    """헤더 + 노트별 레코드 구조의 메타데이터 파일
+
+    데이터 형식: {"version", "last_update", "stats", ..., "files": {경로: 레코드}}
+    "files" 외의 키는 헤더에 저장됩니다.
+    """
+
+    def __init__(self, path: Path, summarize: Callable[[dict], dict]):
+        """
+        Args:
+            path: 파일 경로 (.db/.sqlite면 SQLite, 그 외는 JSON)
+            summarize: 레코드 → 요약 변환 함수
+        """
+        self.path = Path(path)
+        self.summarize = summarize
+
+    @property
+    def is_sqlite(self) -> bool:
+        """SQLite 형식 여부"""
+        return self.path.suffix.lower() in SQLITE_SUFFIXES
+
+    @property
+    def legacy_path(self) -> Path:
+        """마이그레이션 대상 JSON 파일 경로"""
+        return self.path.with_suffix(".json")
+
+    def load(self) -> Optional[dict]:
+        """파일 로드 (필요하면 JSON에서 마이그레이션)
+
+        Returns:
+            데이터 딕셔너리 ("files"는 LazyRecordMap). 파일이 없으면 None
+        """
+        if not self.is_sqlite:
+            if not self.path.exists():
+                return None
+            return self._from_json(self.path)
+
+        if not self.path.exists():
+            if not self.legacy_path.exists():
+                return None
+            self.migrate()
+        try:
+            return self._load_sqlite()
+        except sqlite3.OperationalError as e:
+            if "locked" in str(e) or "busy" in str(e):
+                raise
+            raise UnreadableRecordFile(f"{self.path.name}: {e}") from e
+        except (sqlite3.DatabaseError, ValueError) as e:
+            raise UnreadableRecordFile(f"{self.path.name}: {e}") from e
+
+    def quarantine(self) -> Optional[Path]:
+        """읽을 수 없는 파일을 같은 디렉토리에 다른 이름으로 옮김 (다음 저장이 덮어쓰지 않도록)
+
+        Returns:
+            옮긴 파일 경로 (파일이 없으면 None)
+        """
+        if not self.path.exists():
+            return None
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        target = self.path.with_name(f"{self.path.name}.unreadable-{timestamp}")
+        os.replace(self.path, target)
+        print(f"⚠️ 읽을 수 없는 파일을 옮김: {self.path.name} → {target.name}", file=sys.stderr)
+        return target
+
+    def migrate(self):
+        """기존 JSON 파일을 SQLite 형식으로 변환 (JSON 파일은 그대로 둠)"""
+        data = self._from_json(self.legacy_path)
+        self._write_sqlite(data)
+        print(
+            f"🔄 {self.legacy_path.name} → {self.path.name} 마이그레이션 완료 "
+            f"({len(data['files'])}개 노트)",
+            file=sys.stderr,
+        )
+
+    def save(self, data: dict):
+        """데이터 저장
+
+        SQLite 파일에서 로드한 데이터는 로드/변경된 레코드와 삭제된 경로만 한 트랜잭션으로 반영하고,
+        새 파일이거나 다른 곳에서 온 데이터면 임시 파일에 전체를 쓴 뒤 교체합니다.
+
+        Args:
+            data: 데이터 딕셔너리
+        """
+        if not self.is_sqlite:
+            atomic_write_json(self.path, {**data, "files": dict(data["files"].items())})
+            return
+
+        files = data["files"]
+        if (
+            isinstance(files, LazyRecordMap)
+            and files.source == self.path
+            and self.path.exists()
+        ):
+            self._save_incremental(data)
+        else:
+            self._write_sqlite(data)
+
+    def _from_json(self, path: Path) -> dict:
+        """JSON 파일 로드"""
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise UnreadableRecordFile(f"{path.name}: {e}") from e
+        data["files"] = LazyRecordMap(
+            records=data.get("files", {}), summarize=self.summarize
+        )
+        return data
+
+    def _connect(self, path: Optional[Path] = None) -> sqlite3.Connection:
+        """짧게 쓰는 SQLite 연결 (스레드/롤백 시 파일 교체와 무관하게 안전)"""
+        return sqlite3.connect(str(path or self.path))
+
+    @staticmethod
+    def _header_rows(data: dict):
+        """헤더에 저장할 (키, JSON 값) 목록"""
+        header = {key: value for key, value in data.items() if key != "files"}
+        header["format_version"] = FORMAT_VERSION
+        return [(key, dumps(value)) for key, value in header.items()]
+
+    def _load_sqlite(self) -> dict:
+        """헤더와 노트 요약만 로드"""
+        conn = self._connect()
+        try:
+            data = {
+                key: json.loads(value)
+                for key, value in conn.execute("SELECT key, value FROM header")
+            }
+            version = data.pop("format_version", None)
+            if version != FORMAT_VERSION:
+                raise ValueError(
+                    f"지원하지 않는 형식 버전: {version} (지원: {FORMAT_VERSION})"
+                )
+            # 요약 전체를 JSON 객체 하나로 이어 붙여서 한 번에 파싱
+            (joined,) = conn.execute(
+                "SELECT '{' || coalesce(group_concat(json_quote(path) || ':' || summary), '')"
+                " || '}' FROM records"
+            ).fetchone()
+            summaries = json.loads(joined)
+        finally:
+            conn.close()
+
+        files = LazyRecordMap(
+            summaries=summaries, loader=self._load_record, summarize=self.summarize
+        )
+        files.source = self.path
+        data["files"] = files
+        return data
+
+    def _load_record(self, path: str) -> dict:
+        """노트 하나의 전체 레코드 로드 (요약 + 나머지 필드)"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT summary, detail FROM records WHERE path = ?", (path,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            raise KeyError(path)
+        return {**json.loads(row[0]), **json.loads(row[1])}
+
+    def _record_rows(self, records):
+        """(경로, 요약 JSON, 나머지 필드 JSON) 목록
+
+        요약과 값이 같은 필드는 한 번만 저장합니다.
+        """
+        for path, record in records:
+            summary = self.summarize(record)
+            detail = {
+                key: value
+                for key, value in record.items()
+                if key not in summary or summary[key] != value
+            }
+            yield path, dumps(summary), dumps(detail)
+
+    def _write_sqlite(self, data: dict):
+        """전체 데이터를 임시 파일에 쓴 뒤 교체"""
+        files = LazyRecordMap.wrap(data["files"], self.summarize)
+
+        def write(tmp: Path):
+            conn = self._connect(tmp)
+            try:
+                with conn:
+                    conn.execute("CREATE TABLE header (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                    conn.execute(
+                        "CREATE TABLE records ("
+                        "path TEXT PRIMARY KEY, summary TEXT NOT NULL, detail TEXT NOT NULL)"
+                    )
+                    conn.executemany("INSERT INTO header VALUES (?, ?)", self._header_rows(data))
+                    conn.executemany(
+                        "INSERT INTO records VALUES (?, ?, ?)",
+                        self._record_rows(files.items()),
+                    )
+            finally:
+                conn.close()
+
+        _atomic_replace(self.path, write)
+        files.bind(self.path, self._load_record)
+
+    def _save_incremental(self, data: dict):
+        """변경분만 한 트랜잭션으로 반영"""
+        files = data["files"]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO header VALUES (?, ?)", self._header_rows(data)
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO records VALUES (?, ?, ?)",
+                    self._record_rows(files.loaded().items()),
+                )
+                conn.executemany(
+                    "DELETE FROM records WHERE path = ?",
+                    [(path,) for path in files.deleted],
+                )
+        finally:
+            conn.close()
+        files.bind(self.path, self._load_record)
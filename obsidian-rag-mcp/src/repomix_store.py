@@ -1,15 +1,55 @@
-import json
+import bisect
 import sys
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
-
-import tiktoken
+from typing import Dict, Iterable, List, Optional
 
 # 프로젝트 루트를 sys.path에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import PROJECT_ROOT, VAULT_PATH
+from config import PROJECT_ROOT, TOP_TAGS_LIMIT, VAULT_PATH
+from facet_index import FacetIndex
+from note_representations import build_representations
+from obsidian_parser import iter_body_lines
+from persistence import LazyRecordMap, RecordFile, UnreadableRecordFile
+from tag_index import TagIndex
+from time_index import TimeIndex, modified_epoch
+from tokenizer import content_hash, get_token_counter, get_tokenizer
+
+# 스트리밍 토큰 계산 시 한 번에 인코딩하는 최대 문자 수
+TOKENIZE_BLOCK_CHARS = 64 * 1024
+
+
+def summarize_file(file_info: dict) -> dict:
+    """파일 인덱스 항목의 요약 (제목/태그 인덱스, 통계 집계, 토큰 수 재사용에 필요한 필드만)"""
+    summary = {
+        "title": file_info["title"],
+        "para_folder": file_info["para_folder"],
+        "timestamps": file_info["timestamps"],
+        "size": file_info["size"],
+        "metadata": {
+            "tags": file_info["metadata"]["tags"],
+            "backlink_count": file_info["metadata"]["backlink_count"],
+            "forward_link_count": file_info["metadata"]["forward_link_count"],
+        },
+    }
+    if "content_hash" in file_info:
+        summary["content_hash"] = file_info["content_hash"]
+    return summary
+
+
+def file_facets(file_info: dict) -> dict:
+    """파일 인덱스 항목(또는 요약)의 패싯 값 (FacetIndex.set()/rebuild() 형식)"""
+    metadata = file_info["metadata"]
+    return {
+        "modified": modified_epoch(file_info["timestamps"]),
+        "tokens": file_info["size"]["estimated_tokens"],
+        "backlinks": metadata["backlink_count"],
+        "forward_links": metadata["forward_link_count"],
+        "folder": file_info["para_folder"],
+    }
 
 
 class RepomixIndexStore:
@@ -22,31 +62,130 @@ class RepomixIndexStore:
     def __init__(self, index_file: Optional[Path] = None):
         """
         Args:
-            index_file: 인덱스 JSON 파일 경로 (기본값: data/repomix_index.json)
+            index_file: 인덱스 파일 경로 (기본값: data/repomix_index.db)
+                .db/.sqlite면 SQLite(파일 단위 지연 로드), .json이면 JSON으로 저장
         """
         self.index_file = (
-            index_file if index_file else PROJECT_ROOT / "data" / "repomix_index.json"
+            index_file if index_file else PROJECT_ROOT / "data" / "repomix_index.db"
         )
-        # GPT-4용 토크나이저 초기화
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        # 공유 토크나이저와 내용 해시 기반 토큰 수 캐시 (SmartPacker와 공유)
+        self.tokenizer = get_tokenizer()
+        self.token_counter = get_token_counter()
+        # 제목 → 파일 경로 리스트 (경로 오름차순, 첫 번째가 대표)
+        self.title_index: Dict[str, List[str]] = {}
+        # 태그 → 파일 경로 역인덱스
+        self.tag_index = TagIndex()
+        # 수정 시각 정렬 인덱스 (폴더별 파티션 포함)
+        self.time_index = TimeIndex()
+        # 복합 조건 조회용 패싯 열 인덱스 (수정 시각, 토큰 수, 링크 수, 폴더)
+        self.facet_index = FacetIndex()
+        # 델타로 유지되는 집계 (전체/폴더별 파일·단어·토큰 수)
+        self._totals = self._empty_totals()
+        self._folder_stats: Dict[str, dict] = {}
+        # 기존 파일을 읽지 못해 빈 인덱스로 시작했으면 그 원인 (재인덱싱 필요)
+        self.load_error: Optional[str] = None
         self.index = self.load_index()
 
+    @property
+    def index(self) -> dict:
+        """인덱스 딕셔너리"""
+        return self._index
+
+    @index.setter
+    def index(self, value: dict):
+        """인덱스 교체 (롤백 등) 시 제목/태그/수정 시각/패싯 인덱스와 집계 재구축"""
+        files = LazyRecordMap.wrap(value.get("files", {}), summarize_file)
+        value["files"] = files
+        self._index = value
+        self.title_index = {}
+        self.tag_index.clear()
+        self._totals = self._empty_totals()
+        self._folder_stats = {}
+        times = []
+        facets = []
+        for path in sorted(files):
+            file_info = files.summary(path)
+            if "backlink_count" not in file_info["metadata"]:
+                # 링크 수가 없는 이전 형식의 요약: 전체 레코드 로드 (다음 저장 때 요약 갱신)
+                file_info = files[path]
+            self._apply_stats(file_info, 1)
+            facets.append((path, file_facets(file_info)))
+            self.title_index.setdefault(file_info["title"], []).append(path)
+            self.tag_index.add(path, file_info["metadata"]["tags"])
+            times.append(
+                (path, modified_epoch(file_info["timestamps"]), file_info["para_folder"])
+            )
+        self.time_index.rebuild(times)
+        self.facet_index.rebuild(facets)
+
+    @staticmethod
+    def _empty_totals() -> dict:
+        """빈 전체 집계"""
+        return {"files": 0, "words": 0, "tokens": 0, "bytes": 0}
+
+    def _apply_stats(self, file_info: dict, sign: int):
+        """파일 하나를 집계에 더하거나(sign=1) 빼기(sign=-1)"""
+        size = file_info["size"]
+        delta = {
+            "files": 1,
+            "words": size["words"],
+            "tokens": size["estimated_tokens"],
+            "bytes": size.get("bytes", 0),
+        }
+        folder = file_info["para_folder"]
+        folder_stats = self._folder_stats.setdefault(
+            folder, {"files": 0, "words": 0, "tokens": 0}
+        )
+        for key, value in delta.items():
+            self._totals[key] += sign * value
+            if key in folder_stats:
+                folder_stats[key] += sign * value
+        if folder_stats["files"] == 0:
+            del self._folder_stats[folder]
+
+    def _index_title(self, title: str, path: str):
+        """제목 인덱스에 경로 추가 (정렬 유지)"""
+        paths = self.title_index.setdefault(title, [])
+        position = bisect.bisect_left(paths, path)
+        if position == len(paths) or paths[position] != path:
+            paths.insert(position, path)
+
+    def _unindex_title(self, title: str, path: str):
+        """제목 인덱스에서 경로 제거"""
+        paths = self.title_index.get(title)
+        if not paths:
+            return
+        position = bisect.bisect_left(paths, path)
+        if position < len(paths) and paths[position] == path:
+            del paths[position]
+        if not paths:
+            del self.title_index[title]
+
+    def _record_file(self) -> RecordFile:
+        """인덱스 파일 (확장자로 SQLite/JSON 선택)"""
+        return RecordFile(self.index_file, summarize_file)
+
     def load_index(self) -> dict:
         """인덱스 파일 로드
 
+        SQLite 파일은 헤더(통계)와 파일 요약만 읽고, 전체 항목은 처음 접근할 때 로드합니다.
+        SQLite 파일이 없고 같은 이름의 JSON 파일이 있으면 자동으로 마이그레이션합니다.
+
         Returns:
             인덱스 딕셔너리. 파일이 없으면 초기 구조 반환
+            (형식 버전이 다르거나 손상된 파일은 옮겨 두고 초기 구조 반환, 원인은 load_error)
         """
-        if self.index_file.exists():
-            try:
-                with open(self.index_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"⚠️ 인덱스 로드 실패: {e}")
-                return self._create_empty_index()
-        else:
-            # 파일이 없으면 초기 구조 생성
+        record_file = self._record_file()
+        try:
+            index = record_file.load()
+        except UnreadableRecordFile as e:
+            # 빈 저장소로 시작하되 기존 파일은 덮어쓰지 않도록 옮기고 재인덱싱 필요 표시
+            print(f"⚠️ 인덱스 로드 실패: {e}", file=sys.stderr)
+            record_file.quarantine()
+            self.load_error = str(e)
             return self._create_empty_index()
+        # 파일이 없으면 초기 구조 생성
+        return index if index is not None else self._create_empty_index()
 
     def _create_empty_index(self) -> dict:
         """초기 인덱스 구조 생성"""
@@ -58,34 +197,39 @@ class RepomixIndexStore:
                 "total_files": 0,
                 "total_words": 0,
                 "total_tokens_estimated": 0,
+                "total_bytes": 0,
+                "total_tags": 0,
                 "by_folder": {},
                 "top_tags": {},
             },
         }
 
     def save_index(self):
-        """인덱스를 파일에 저장"""
-        # 디렉토리가 없으면 생성
-        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        """인덱스를 파일에 저장
 
+        SQLite 파일은 로드/변경된 항목과 삭제된 항목만 한 트랜잭션으로 반영하고,
+        새 파일은 임시 파일에 쓴 뒤 이름을 바꿔서 교체합니다.
+        """
         # last_update 갱신
         self.index["last_update"] = datetime.now().isoformat()
 
-        # 통계 갱신
+        # 통계 갱신 (헤더에 저장)
         self._update_stats()
 
         try:
-            with open(self.index_file, "w", encoding="utf-8") as f:
-                json.dump(self.index, f, indent=2, ensure_ascii=False)
+            self._record_file().save(self.index)
         except Exception as e:
-            print(f"⚠️ 인덱스 저장 실패: {e}")
+            print(f"⚠️ 인덱스 저장 실패: {e}", file=sys.stderr)
 
-    def calculate_stats(self, content: str, file_path: Path) -> dict:
+    def calculate_stats(
+        self, content: str, file_path: Path, digest: Optional[str] = None
+    ) -> dict:
         """파일 통계 계산
 
         Args:
             content: 파일 컨텐츠
             file_path: 파일 경로
+            digest: 미리 계산한 content_hash(content) (토큰 수 캐시 키)
 
         Returns:
             통계 딕셔너리
@@ -107,13 +251,8 @@ class RepomixIndexStore:
         # 줄 수
         line_count = content.count("\n") + 1
 
-        # 토큰 수 추정 (tiktoken 사용)
-        try:
-            token_count = len(self.tokenizer.encode(content))
-        except Exception as e:
-            print(f"⚠️ 토큰 계산 실패 ({file_path}): {e}")
-            # 토큰 계산 실패 시 근사값 사용 (평균적으로 1 토큰 ≈ 4 문자)
-            token_count = char_count // 4
+        # 토큰 수 (내용 해시로 캐시, 실패 시 1 토큰 ≈ 4 문자 근사값)
+        token_count = self.token_counter.count(content, digest)
 
         return {
             "bytes": file_size,
@@ -123,6 +262,58 @@ class RepomixIndexStore:
             "estimated_tokens": token_count,
         }
 
+    def calculate_stats_streaming(self, lines: Iterable[str], file_path: Path) -> dict:
+        """파일 통계를 줄 단위로 누적 계산 (대용량 파일용)
+
+        전체 텍스트를 한 번에 토큰화하지 않고 TOKENIZE_BLOCK_CHARS 크기의
+        줄 묶음 단위로 인코딩하여 메모리 사용량을 제한합니다.
+
+        Args:
+            lines: 본문 줄 이터레이터 (줄바꿈 문자 제외)
+            file_path: 파일 경로
+
+        Returns:
+            calculate_stats()와 같은 형식의 통계 딕셔너리
+        """
+        file_size = file_path.stat().st_size if file_path.exists() else 0
+
+        word_count = 0
+        char_count = 0
+        line_count = 0
+        token_count = 0
+
+        block = []
+        block_chars = 0
+
+        def flush():
+            nonlocal token_count
+            # 블록은 파일마다 다르므로 캐시하지 않음
+            token_count += self.token_counter.encode_length("\n".join(block))
+
+        for line in lines:
+            line_count += 1
+            word_count += len(line.split())
+            # 줄바꿈 문자 포함 (마지막 줄 제외는 아래에서 보정)
+            char_count += len(line) + 1
+
+            block.append(line)
+            block_chars += len(line) + 1
+            if block_chars >= TOKENIZE_BLOCK_CHARS:
+                flush()
+                block = []
+                block_chars = 0
+
+        if block:
+            flush()
+
+        return {
+            "bytes": file_size,
+            "words": word_count,
+            "characters": max(char_count - 1, 0),
+            "lines": max(line_count, 1),
+            "estimated_tokens": token_count,
+        }
+
     def _calculate_relative_path(self, absolute_path: str) -> str:
         """절대 경로를 Vault 기준 상대 경로로 변환
 
@@ -138,6 +329,21 @@ class RepomixIndexStore:
             # VAULT_PATH에 속하지 않는 경우 절대 경로 그대로 반환
             return absolute_path
 
+    def prefetch_token_counts(self, docs: Iterable[dict]):
+        """곧 update_index()할 문서들의 토큰 수를 배치로 미리 계산
+
+        tiktoken 배치 인코딩(스레드 병렬)으로 계산해서 캐시에 넣어 두면
+        update_index()는 캐시에서 토큰 수를 가져옵니다. 대용량(스트리밍) 문서는 제외합니다.
+
+        Args:
+            docs: ObsidianParser.parse_file()의 반환값들
+        """
+        contents = [
+            doc.get("content", "") for doc in docs if doc and not doc.get("streamed")
+        ]
+        if contents:
+            self.token_counter.count_many(contents)
+
     def update_index(self, doc: dict, file_path: Path):
         """문서의 인덱스 업데이트
 
@@ -153,31 +359,64 @@ class RepomixIndexStore:
         """
         path_str = str(file_path)
         content = doc.get("content", "")
+        previous = self.index["files"].summary(path_str)
 
-        # 파일 통계 계산
-        size_stats = self.calculate_stats(content, file_path)
+        # 파일 통계 계산 (대용량 파일은 스트리밍)
+        representations = None
+        if doc.get("streamed"):
+            digest = None
+            size_stats = self.calculate_stats_streaming(iter_body_lines(doc), file_path)
+        else:
+            digest = content_hash(content)
+            if previous and previous.get("content_hash") == digest:
+                # 내용이 그대로면 저장된 토큰 수와 요약 표현 재사용
+                self.token_counter.remember(digest, previous["size"]["estimated_tokens"])
+                representations = self.get_representations(path_str, digest)
+            size_stats = self.calculate_stats(content, file_path, digest)
+            if representations is None:
+                representations = build_representations(
+                    content, self.token_counter.count, digest
+                )
 
         # 파일 타임스탬프
         stat = file_path.stat()
         created_time = datetime.fromtimestamp(stat.st_ctime).isoformat()
         modified_time = datetime.fromtimestamp(stat.st_mtime).isoformat()
 
-        # 백링크/포워드링크 정보 (network_store에서 가져와야 함)
-        # 일단 doc에서 가져올 수 있는 정보만 저장
-        backlinks = doc.get("backlinks", [])
+        # 백링크는 network_store에서 계산되어 update_backlinks()로 동기화됨
+        # (doc에 있으면 사용, 없으면 기존 값 유지)
+        if "backlinks" in doc:
+            backlinks = doc["backlinks"]
+        elif previous:
+            backlinks = self.index["files"][path_str]["metadata"]["backlinks"]
+        else:
+            backlinks = []
         forward_links = doc.get("wiki_links", [])
 
         # 태그 정보
         tags = doc.get("tags", [])
 
+        # 제목/태그/수정 시각 인덱스 갱신
+        title = doc.get("title", "")
+        para_folder = doc.get("para_folder", "root")
+        if previous:
+            self._apply_stats(previous, -1)
+            self.tag_index.remove(path_str, previous["metadata"]["tags"])
+            if previous["title"] != title:
+                self._unindex_title(previous["title"], path_str)
+        self._index_title(title, path_str)
+        self.tag_index.add(path_str, tags)
+        self.time_index.add(path_str, stat.st_mtime, para_folder)
+
         # 인덱스 업데이트
         self.index["files"][path_str] = {
-            "title": doc.get("title", ""),
-            "para_folder": doc.get("para_folder", "root"),
+            "title": title,
+            "para_folder": para_folder,
             "relative_path": self._calculate_relative_path(path_str),
             "timestamps": {
                 "created": created_time,
                 "modified": modified_time,
+                "modified_epoch": stat.st_mtime,
                 "indexed": datetime.now().isoformat(),
             },
             "size": size_stats,
@@ -189,6 +428,18 @@ class RepomixIndexStore:
                 "forward_link_count": len(forward_links),
             },
         }
+        if digest:
+            self.index["files"][path_str]["content_hash"] = digest
+            self.index["files"][path_str]["representations"] = representations
+        self._apply_stats(self.index["files"][path_str], 1)
+        self.facet_index.set(path_str, **file_facets(self.index["files"][path_str]))
+
+        # 대용량 파일 처리 내역 기록 (스트리밍 여부, 잘라냄/건너뜀)
+        if doc.get("streamed"):
+            self.index["files"][path_str]["large_file"] = {
+                "streamed": True,
+                "oversize": doc.get("oversize"),
+            }
 
     def delete_index(self, path: str):
         """파일의 인덱스 삭제
@@ -197,60 +448,162 @@ class RepomixIndexStore:
             path: 파일 경로
         """
         if path in self.index["files"]:
+            file_info = self.index["files"].summary(path)
+            self._apply_stats(file_info, -1)
+            self._unindex_title(file_info["title"], path)
+            self.tag_index.remove(path, file_info["metadata"]["tags"])
+            self.time_index.remove(path)
+            self.facet_index.remove(path)
             del self.index["files"][path]
 
-    def query_by_timeframe(self, days: int, folder: Optional[str] = None) -> List[dict]:
-        """수정 날짜 기준으로 파일 필터링
+    def get_representations(
+        self, path: str, digest: Optional[str] = None
+    ) -> Optional[dict]:
+        """저장된 요약 표현 (outline/lead/key_lines)
 
         Args:
-            days: 최근 N일 이내
-            folder: PARA 폴더 필터 (Optional)
+            path: 파일 경로
+            digest: 현재 본문의 content_hash (주어지면 저장된 표현과 다를 때 None)
 
         Returns:
-            필터링된 파일 정보 리스트
+            build_representations()의 반환값 (없거나 내용이 바뀌었으면 None)
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
-        results = []
+        if path not in self.index["files"]:
+            return None
+        representations = self.index["files"][path].get("representations")
+        if not representations:
+            return None
+        if digest is not None and representations.get("content_hash") != digest:
+            return None
+        return representations
+
+    def update_backlinks(self, backlinks_by_path: Dict[str, List[str]]):
+        """NetworkMetadataStore에서 계산한 백링크 동기화
 
-        for path, file_info in self.index["files"].items():
-            # 수정 시간 확인
-            modified_str = file_info["timestamps"]["modified"]
-            modified_date = datetime.fromisoformat(modified_str)
+        Args:
+            backlinks_by_path: {파일 경로: 백링크 제목 리스트}
+                (NetworkMetadataStore.pop_dirty_backlinks()의 반환값)
+        """
+        for path, backlinks in backlinks_by_path.items():
+            file_info = self.index["files"].get(path)
+            if file_info:
+                file_info["metadata"]["backlinks"] = list(backlinks)
+                file_info["metadata"]["backlink_count"] = len(backlinks)
+                self.facet_index.set(path, backlinks=len(backlinks))
+
+    def query_by_timeframe(
+        self, days: int, folder: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[dict]:
+        """수정 날짜 기준으로 파일 필터링 (수정 시각 정렬 인덱스, O(log N + k))
 
-            if modified_date < cutoff_date:
-                continue
+        Args:
+            days: 최근 N일 이내
+            folder: PARA 폴더 필터 (Optional)
+            limit: 최대 개수 (Optional)
 
-            # 폴더 필터
-            if folder and file_info["para_folder"] != folder:
-                continue
+        Returns:
+            필터링된 파일 정보 리스트 (수정 시간 최신순)
+        """
+        since = time.time() - days * 86400
+        files = self.index["files"]
+        return [
+            {"path": path, **files[path]}
+            for _, path in self.time_index.window(since, folder=folder, limit=limit)
+        ]
 
-            results.append({"path": path, **file_info})
+    def count_by_timeframe(self, days: int, folder: Optional[str] = None) -> int:
+        """최근 N일 이내 수정된 파일 수 (O(log N))
 
-        # 수정 시간 기준 정렬 (최신순)
-        results.sort(
-            key=lambda x: x["timestamps"]["modified"],
-            reverse=True,
-        )
+        Args:
+            days: 최근 N일 이내
+            folder: PARA 폴더 필터 (Optional)
 
-        return results
+        Returns:
+            파일 수
+        """
+        return self.time_index.count(time.time() - days * 86400, folder=folder)
 
-    def query_by_tag(self, tag: str) -> List[dict]:
-        """태그로 파일 필터링
+    def query_by_tag(self, tag: str, include_nested: bool = True) -> List[dict]:
+        """태그로 파일 필터링 (태그 역인덱스)
 
         Args:
             tag: 태그 이름
+            include_nested: 중첩 태그(tag/...)가 붙은 파일 포함 여부
 
         Returns:
-            필터링된 파일 정보 리스트
+            필터링된 파일 정보 리스트 (경로 오름차순)
         """
-        results = []
+        return [
+            {"path": path, **self.index["files"][path]}
+            for path in sorted(self.tag_index.paths(tag, include_nested))
+        ]
+
+    def query_notes(
+        self,
+        folder: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        tag_mode: str = "all",
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_tokens: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        min_backlinks: Optional[int] = None,
+        min_forward_links: Optional[int] = None,
+        sort: str = "modified",
+        offset: int = 0,
+        limit: Optional[int] = 20,
+    ) -> dict:
+        """복합 조건 조회 (패싯 열 인덱스의 벡터 마스크 교집합)
+
+        모든 조건은 AND로 결합합니다. 태그는 중첩 태그(tag/...)를 포함합니다.
 
-        for path, file_info in self.index["files"].items():
-            tags = file_info["metadata"]["tags"]
-            if tag in tags:
-                results.append({"path": path, **file_info})
+        Args:
+            folder: PARA 폴더
+            tags: 태그 리스트
+            tag_mode: "all"이면 모든 태그, "any"면 하나 이상의 태그가 붙은 노트
+            since: 수정 시각 하한 (epoch 초, 포함)
+            until: 수정 시각 상한 (epoch 초, 포함)
+            min_tokens: 최소 토큰 수
+            max_tokens: 최대 토큰 수
+            min_backlinks: 최소 백링크 수
+            min_forward_links: 최소 포워드링크 수
+            sort: 정렬 기준 ("modified", "tokens", "backlinks", "forward_links", 큰 값이 먼저)
+            offset: 건너뛸 개수 (페이지 시작 위치)
+            limit: 최대 개수 (None이면 전부)
 
-        return results
+        Returns:
+            {"total": 전체 일치 수, "offset": offset, "results": [파일 정보, ...]}
+        """
+        if tag_mode not in ("all", "any"):
+            raise ValueError(f"지원하지 않는 tag_mode: {tag_mode}")
+
+        include = []
+        if tags:
+            tag_paths = [self.tag_index.paths(tag) for tag in tags]
+            if tag_mode == "all":
+                include = [self.facet_index.mask_for(paths) for paths in tag_paths]
+            else:
+                include = [self.facet_index.mask_for(set().union(*tag_paths))]
+
+        total, paths = self.facet_index.query(
+            folder=folder,
+            include=include,
+            ranges={
+                "modified": (since, until),
+                "tokens": (min_tokens, max_tokens),
+                "backlinks": (min_backlinks, None),
+                "forward_links": (min_forward_links, None),
+            },
+            sort=sort,
+            offset=offset,
+            limit=limit,
+        )
+        files = self.index["files"]
+        return {
+            "total": total,
+            "offset": offset,
+            "results": [{"path": path, **files[path]} for path in paths],
+        }
 
     def query_by_backlinks(self, note_title: str, depth: int = 1) -> List[dict]:
         """백링크 그래프 순회
@@ -267,31 +620,22 @@ class RepomixIndexStore:
         if not start_file:
             return []
 
-        visited = set()
+        visited = {start_file["path"]}
         results = []
-        queue = [(start_file["path"], 0)]  # (path, current_depth)
+        queue = deque([(start_file["path"], 0)])  # (path, current_depth)
 
         while queue:
-            current_path, current_depth = queue.pop(0)
-
-            if current_path in visited or current_depth > depth:
-                continue
-
-            visited.add(current_path)
-            file_info = self.index["files"].get(current_path)
-
-            if not file_info:
-                continue
-
+            current_path, current_depth = queue.popleft()
+            file_info = self.index["files"][current_path]
             results.append({"path": current_path, **file_info})
 
             # depth가 남아있으면 백링크 탐색
             if current_depth < depth:
-                backlinks = file_info["metadata"]["backlinks"]
-                for backlink_title in backlinks:
-                    backlink_file = self.get_by_title(backlink_title)
-                    if backlink_file:
-                        queue.append((backlink_file["path"], current_depth + 1))
+                for backlink_title in file_info["metadata"]["backlinks"]:
+                    paths = self.title_index.get(backlink_title)
+                    if paths and paths[0] not in visited:
+                        visited.add(paths[0])
+                        queue.append((paths[0], current_depth + 1))
 
         return results
 
@@ -304,66 +648,52 @@ class RepomixIndexStore:
         Returns:
             파일 정보 (없으면 None)
         """
-        for path, file_info in self.index["files"].items():
-            if file_info["title"] == title:
-                return {"path": path, **file_info}
-        return None
+        paths = self.title_index.get(title)
+        if not paths:
+            return None
+        return {"path": paths[0], **self.index["files"][paths[0]]}
 
     def get_folder_stats(self) -> Dict[str, dict]:
-        """PARA 폴더별 통계 집계
+        """PARA 폴더별 통계 (델타로 유지되는 집계, 폴더 이름순)
 
         Returns:
             폴더별 통계 딕셔너리
             {"folder_name": {"files": count, "words": total, "tokens": total}}
         """
-        folder_stats = {}
-
-        for file_info in self.index["files"].values():
-            folder = file_info["para_folder"]
-            if folder not in folder_stats:
-                folder_stats[folder] = {
-                    "files": 0,
-                    "words": 0,
-                    "tokens": 0,
-                }
-
-            folder_stats[folder]["files"] += 1
-            folder_stats[folder]["words"] += file_info["size"]["words"]
-            folder_stats[folder]["tokens"] += file_info["size"]["estimated_tokens"]
-
-        return folder_stats
+        return {
+            folder: dict(stats) for folder, stats in sorted(self._folder_stats.items())
+        }
 
     def get_tag_stats(self) -> Dict[str, int]:
-        """태그 빈도 집계
+        """태그 빈도 집계 (태그는 소문자로 정규화)
 
         Returns:
             태그별 사용 횟수 딕셔너리 (빈도순 정렬)
         """
-        tag_counts = {}
+        return self.tag_index.counts()
 
-        for file_info in self.index["files"].values():
-            tags = file_info["metadata"]["tags"]
-            for tag in tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    def get_stats(self, top_tags: int = TOP_TAGS_LIMIT) -> dict:
+        """전역 통계 (델타로 유지되는 집계에서 O(폴더 수 + 태그 수) 조회)
 
-        # 빈도순 정렬
-        return dict(sorted(tag_counts.items(), key=lambda x: x[1], reverse=True))
-
-    def _update_stats(self):
-        """전역 통계 업데이트 (save_index 호출 시 자동 실행)"""
-        total_files = len(self.index["files"])
-        total_words = sum(
-            file_info["size"]["words"] for file_info in self.index["files"].values()
-        )
-        total_tokens = sum(
-            file_info["size"]["estimated_tokens"]
-            for file_info in self.index["files"].values()
-        )
+        Args:
+            top_tags: 포함할 상위 태그 수
 
-        self.index["stats"] = {
-            "total_files": total_files,
-            "total_words": total_words,
-            "total_tokens_estimated": total_tokens,
+        Returns:
+            {
+                "total_files", "total_words", "total_tokens_estimated", "total_bytes",
+                "total_tags", "by_folder", "top_tags"
+            }
+        """
+        return {
+            "total_files": self._totals["files"],
+            "total_words": self._totals["words"],
+            "total_tokens_estimated": self._totals["tokens"],
+            "total_bytes": self._totals["bytes"],
+            "total_tags": len(self.tag_index.notes),
             "by_folder": self.get_folder_stats(),
-            "top_tags": self.get_tag_stats(),
+            "top_tags": self.tag_index.top(top_tags),
         }
+
+    def _update_stats(self):
+        """전역 통계 업데이트 (save_index 호출 시 자동 실행, 헤더에 저장)"""
+        self.index["stats"] = self.get_stats()
@@ -0,0 +1,134 @@
+"""태그 역인덱스
+
+태그 → 노트 경로 집합을 유지하고, 정렬된 태그 키 리스트에서 이분 탐색으로
+Obsidian 중첩 태그(#project/alpha)를 접두사 조회합니다.
+"""
+
+import bisect
+import heapq
+from typing import Dict, Iterable, List, Set
+
+
+def normalize_tag(tag: str) -> str:
+    """태그를 인덱스 키로 정규화 ('#' 제거, 앞뒤 '/' 제거, 대소문자 무시)
+
+    Args:
+        tag: 태그 문자열 ("#Project/Alpha", "project/alpha" 등)
+
+    Returns:
+        정규화된 태그 ("project/alpha")
+    """
+    return str(tag).strip().lstrip("#").strip("/").casefold()
+
+
+class TagIndex:
+    """태그 → 노트 경로 역인덱스"""
+
+    def __init__(self):
+        # 정규화된 태그 → 노트 경로 집합
+        self.notes: Dict[str, Set[str]] = {}
+        # 정렬된 태그 키 (중첩 태그 접두사 조회용)
+        self._keys: List[str] = []
+
+    def clear(self):
+        """인덱스 비우기"""
+        self.notes = {}
+        self._keys = []
+
+    def add(self, path: str, tags: Iterable[str]):
+        """노트의 태그 추가
+
+        Args:
+            path: 노트 경로
+            tags: 태그 리스트
+        """
+        for tag in tags:
+            key = normalize_tag(tag)
+            if not key:
+                continue
+            if key not in self.notes:
+                self.notes[key] = set()
+                bisect.insort(self._keys, key)
+            self.notes[key].add(path)
+
+    def remove(self, path: str, tags: Iterable[str]):
+        """노트의 태그 제거
+
+        Args:
+            path: 노트 경로
+            tags: 추가할 때 사용한 태그 리스트
+        """
+        for tag in tags:
+            key = normalize_tag(tag)
+            paths = self.notes.get(key)
+            if not paths:
+                continue
+            paths.discard(path)
+            if not paths:
+                del self.notes[key]
+                del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def tags_under(self, tag: str) -> List[str]:
+        """태그 자신과 그 아래 중첩 태그 키 목록
+
+        "project"는 "project", "project/alpha", "project/alpha/x"와 일치하고
+        "projects"와는 일치하지 않습니다.
+
+        Args:
+            tag: 태그
+
+        Returns:
+            정렬된 태그 키 리스트
+        """
+        key = normalize_tag(tag)
+        if not key:
+            return []
+        matches = [key] if key in self.notes else []
+        # "project/" 이상 "project0" 미만 구간 ("0"은 "/" 다음 문자)
+        start = bisect.bisect_left(self._keys, key + "/")
+        end = bisect.bisect_left(self._keys, key + "0")
+        matches.extend(self._keys[start:end])
+        return matches
+
+    def paths(self, tag: str, include_nested: bool = True) -> Set[str]:
+        """태그가 붙은 노트 경로 집합
+
+        Args:
+            tag: 태그
+            include_nested: 중첩 태그(tag/...)가 붙은 노트도 포함할지 여부
+
+        Returns:
+            노트 경로 집합
+        """
+        if not include_nested:
+            return set(self.notes.get(normalize_tag(tag), ()))
+        result: Set[str] = set()
+        for key in self.tags_under(tag):
+            result |= self.notes[key]
+        return result
+
+    def counts(self) -> Dict[str, int]:
+        """태그별 노트 수 (빈도순 정렬)"""
+        return dict(
+            sorted(
+                ((key, len(paths)) for key, paths in self.notes.items()),
+                key=lambda item: (-item[1], item[0]),
+            )
+        )
+
+    def top(self, limit: int) -> Dict[str, int]:
+        """노트 수 상위 태그 (전체 정렬 없이 O(T log limit))
+
+        Args:
+            limit: 최대 태그 수
+
+        Returns:
+            {태그: 노트 수} (빈도순, 동률은 태그 이름순)
+        """
+        return dict(
+            heapq.nsmallest(
+                limit,
+                ((key, len(paths)) for key, paths in self.notes.items()),
+                key=lambda item: (-item[1], item[0]),
+            )
+        )
@@ -0,0 +1,146 @@
+"""수정 시각 정렬 인덱스
+
+(수정 시각 epoch, 노트 경로) 쌍을 정렬된 리스트로 유지하고, PARA 폴더별로도 같은 리스트를
+나눠서 유지합니다. 시간 범위 조회는 이분 탐색으로 구간을 찾은 뒤 최신순으로 k개만 꺼내므로
+O(log N + k)입니다.
+"""
+
+import bisect
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def modified_epoch(timestamps: dict) -> float:
+    """타임스탬프 딕셔너리의 수정 시각 (epoch 초)
+
+    modified_epoch가 없으면 (이전 형식) ISO 문자열 modified를 파싱합니다.
+
+    Args:
+        timestamps: RepomixIndexStore 파일 항목의 "timestamps"
+
+    Returns:
+        수정 시각 (epoch 초)
+    """
+    epoch = timestamps.get("modified_epoch")
+    if epoch is None:
+        epoch = datetime.fromisoformat(timestamps["modified"]).timestamp()
+    return epoch
+
+
+class TimeIndex:
+    """수정 시각 → 노트 경로 정렬 인덱스 (폴더별 파티션 포함)"""
+
+    def __init__(self):
+        # 전체 (epoch, 경로) 정렬 리스트
+        self.entries: List[Tuple[float, str]] = []
+        # PARA 폴더 → (epoch, 경로) 정렬 리스트
+        self.folders: Dict[str, List[Tuple[float, str]]] = {}
+        # 경로 → (epoch, 폴더) (제거할 때 위치를 찾기 위해 사용)
+        self._positions: Dict[str, Tuple[float, str]] = {}
+
+    def clear(self):
+        """인덱스 비우기"""
+        self.entries = []
+        self.folders = {}
+        self._positions = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def rebuild(self, items: Iterable[Tuple[str, float, str]]):
+        """전체 재구축 (한 번 정렬)
+
+        Args:
+            items: (노트 경로, 수정 시각 epoch, PARA 폴더) 목록
+        """
+        self.clear()
+        for path, epoch, folder in items:
+            self.entries.append((epoch, path))
+            self.folders.setdefault(folder, []).append((epoch, path))
+            self._positions[path] = (epoch, folder)
+        self.entries.sort()
+        for entries in self.folders.values():
+            entries.sort()
+
+    def add(self, path: str, epoch: float, folder: str):
+        """노트 추가 (이미 있으면 위치 갱신)
+
+        Args:
+            path: 노트 경로
+            epoch: 수정 시각 (epoch 초)
+            folder: PARA 폴더
+        """
+        if path in self._positions:
+            self.remove(path)
+        entry = (epoch, path)
+        bisect.insort(self.entries, entry)
+        bisect.insort(self.folders.setdefault(folder, []), entry)
+        self._positions[path] = (epoch, folder)
+
+    def remove(self, path: str):
+        """노트 제거
+
+        Args:
+            path: 노트 경로
+        """
+        position = self._positions.pop(path, None)
+        if position is None:
+            return
+        epoch, folder = position
+        entry = (epoch, path)
+        self._discard(self.entries, entry)
+        folder_entries = self.folders[folder]
+        self._discard(folder_entries, entry)
+        if not folder_entries:
+            del self.folders[folder]
+
+    @staticmethod
+    def _discard(entries: List[Tuple[float, str]], entry: Tuple[float, str]):
+        """정렬 리스트에서 항목 제거"""
+        index = bisect.bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
+
+    def _bounds(
+        self, since: float, until: Optional[float], folder: Optional[str]
+    ) -> Tuple[List[Tuple[float, str]], int, int]:
+        """구간에 해당하는 (정렬 리스트, 시작 위치, 끝 위치)"""
+        entries = self.entries if folder is None else self.folders.get(folder, [])
+        start = bisect.bisect_left(entries, (since,))
+        end = (
+            len(entries)
+            if until is None
+            else bisect.bisect_left(entries, (math.nextafter(until, math.inf),))
+        )
+        return entries, start, max(start, end)
+
+    def count(
+        self, since: float, until: Optional[float] = None, folder: Optional[str] = None
+    ) -> int:
+        """수정 시각 구간의 노트 수 (O(log N))"""
+        _, start, end = self._bounds(since, until, folder)
+        return end - start
+
+    def window(
+        self,
+        since: float,
+        until: Optional[float] = None,
+        folder: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[float, str]]:
+        """수정 시각 구간의 노트 (최신순)
+
+        Args:
+            since: 시작 시각 (epoch 초, 포함)
+            until: 끝 시각 (epoch 초, 포함, None이면 제한 없음)
+            folder: PARA 폴더 (None이면 전체)
+            limit: 최대 개수
+
+        Returns:
+            [(epoch, 경로), ...] 최신순 (같은 시각은 경로 내림차순)
+        """
+        entries, start, end = self._bounds(since, until, folder)
+        if limit is not None:
+            start = max(start, end - limit)
+        return entries[start:end][::-1]
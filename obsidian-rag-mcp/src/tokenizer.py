@@ -0,0 +1,180 @@
+"""공유 토크나이저와 토큰 수 캐시
+
+tiktoken 인코딩은 로드 비용이 크고 스레드 안전하므로 프로세스에서 인코딩별로 하나만 만들어
+RepomixIndexStore와 SmartPacker가 같이 사용합니다.
+토큰 수는 내용 해시로 캐시하고, 여러 문서는 tiktoken 배치 인코딩(스레드 병렬)으로 계산합니다.
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import tiktoken
+
+# 프로젝트 루트를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import TOKEN_CACHE_SIZE, TOKENIZE_THREADS, TOKENIZER_ENCODING
+
+_lock = threading.Lock()
+_encodings: Dict[str, "tiktoken.Encoding"] = {}
+_counters: Dict[str, "TokenCounter"] = {}
+
+
+def content_hash(text: str) -> str:
+    """내용 해시 (토큰 수 캐시 키)
+
+    Args:
+        text: 텍스트
+
+    Returns:
+        BLAKE2b 128비트 16진수 문자열
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_tokenizer(encoding: str = TOKENIZER_ENCODING):
+    """공유 tiktoken 인코딩 (인코딩별로 한 번만 로드)
+
+    Args:
+        encoding: 인코딩 이름
+
+    Returns:
+        tiktoken.Encoding
+    """
+    with _lock:
+        if encoding not in _encodings:
+            _encodings[encoding] = tiktoken.get_encoding(encoding)
+        return _encodings[encoding]
+
+
+def get_token_counter(encoding: str = TOKENIZER_ENCODING) -> "TokenCounter":
+    """공유 토큰 수 캐시 (인코딩별로 하나)
+
+    Args:
+        encoding: 인코딩 이름
+
+    Returns:
+        TokenCounter
+    """
+    tokenizer = get_tokenizer(encoding)
+    with _lock:
+        if encoding not in _counters:
+            _counters[encoding] = TokenCounter(tokenizer)
+        return _counters[encoding]
+
+
+class TokenCounter:
+    """내용 해시 기반 토큰 수 캐시 (LRU, 스레드 안전)
+
+    토큰화에 실패하면 근사값(1 토큰 ≈ 4 문자)을 사용합니다.
+    """
+
+    def __init__(self, tokenizer, max_entries: int = TOKEN_CACHE_SIZE):
+        """
+        Args:
+            tokenizer: tiktoken.Encoding
+            max_entries: 최대 캐시 항목 수
+        """
+        self.tokenizer = tokenizer
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, digest: str) -> Optional[int]:
+        """캐시 조회 (최근 사용으로 표시)"""
+        with self._lock:
+            count = self._cache.get(digest)
+            if count is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(digest)
+            self.hits += 1
+            return count
+
+    def remember(self, digest: str, count: int):
+        """토큰 수 기록 (저장된 인덱스의 값을 재사용할 때도 사용)
+
+        Args:
+            digest: content_hash() 값
+            count: 토큰 수
+        """
+        with self._lock:
+            self._cache[digest] = count
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def encode_length(self, text: str) -> int:
+        """캐시 없이 토큰 수 계산
+
+        특수 토큰 문자열("<|endoftext|>" 등)도 일반 텍스트로 취급합니다.
+        """
+        try:
+            return len(self.tokenizer.encode_ordinary(text))
+        except Exception as e:
+            print(f"⚠️ 토큰 계산 실패: {e}", file=sys.stderr)
+            return len(text) // 4
+
+    def count(self, text: str, digest: Optional[str] = None) -> int:
+        """텍스트의 토큰 수 (캐시 사용)
+
+        Args:
+            text: 텍스트
+            digest: 미리 계산한 content_hash(text) (없으면 계산)
+
+        Returns:
+            토큰 수
+        """
+        digest = digest or content_hash(text)
+        count = self._get(digest)
+        if count is None:
+            count = self.encode_length(text)
+            self.remember(digest, count)
+        return count
+
+    def count_many(self, texts: Sequence[str]) -> List[int]:
+        """여러 텍스트의 토큰 수 (캐시에 없는 것만 배치 인코딩)
+
+        Args:
+            texts: 텍스트 리스트
+
+        Returns:
+            texts 순서의 토큰 수 리스트
+        """
+        digests = [content_hash(text) for text in texts]
+        counts = [self._get(digest) for digest in digests]
+
+        # 같은 내용은 한 번만 인코딩
+        missing: Dict[str, str] = {}
+        for text, digest, count in zip(texts, digests, counts):
+            if count is None:
+                missing.setdefault(digest, text)
+
+        if missing:
+            try:
+                encoded = self.tokenizer.encode_ordinary_batch(
+                    list(missing.values()), num_threads=TOKENIZE_THREADS
+                )
+                computed = {
+                    digest: len(tokens) for digest, tokens in zip(missing, encoded)
+                }
+            except Exception as e:
+                print(
+                    f"⚠️ 배치 토큰 계산 실패, 개별 계산으로 전환: {e}", file=sys.stderr
+                )
+                computed = {
+                    digest: self.encode_length(text) for digest, text in missing.items()
+                }
+            for digest, count in computed.items():
+                self.remember(digest, count)
+            counts = [
+                computed[digest] if count is None else count
+                for digest, count in zip(digests, counts)
+            ]
+        return counts
@@ -1,7 +1,16 @@
+import time
+
 import chromadb
 from chromadb.utils import embedding_functions
-from typing import List, Dict, Optional
-from config import CHROMA_PATH, EMBEDDING_MODEL, COLLECTION_NAME, CHUNK_SIZE
+from typing import Dict, Iterable, Iterator, List, Optional
+from config import (
+    CHROMA_PATH,
+    EMBEDDING_MODEL,
+    COLLECTION_NAME,
+    CHUNK_SIZE,
+    EMBED_BATCH_SIZE,
+)
+from obsidian_parser import iter_body_lines
 
 
 class VectorStore:
@@ -31,15 +40,17 @@ class VectorStore:
 
     def chunk_text(self, text: str) -> List[str]:
         """텍스트 청킹"""
-        chunks = []
-        lines = text.split("\n")
+        return list(self.iter_chunks(text.split("\n")))
+
+    def iter_chunks(self, lines: Iterable[str]) -> Iterator[str]:
+        """줄 단위 입력을 CHUNK_SIZE 기준으로 청킹 (스트리밍)"""
         current_chunk = []
         current_size = 0
 
         for line in lines:
             line_size = len(line)
             if current_size + line_size > CHUNK_SIZE and current_chunk:
-                chunks.append("\n".join(current_chunk))
+                yield "\n".join(current_chunk)
                 current_chunk = [line]
                 current_size = line_size
             else:
@@ -47,40 +58,97 @@ class VectorStore:
                 current_size += line_size
 
         if current_chunk:
-            chunks.append("\n".join(current_chunk))
-
-        return chunks
-
-    def add_document(self, doc: Dict):
-        """문서 추가"""
-        chunks = self.chunk_text(doc["content"])
-
-        for i, chunk in enumerate(chunks):
-            chunk_id = f"{doc['path']}_{i}"
-            metadata = {
-                "path": doc["path"],
-                "title": doc["title"],
-                "chunk_index": i,
-                "para_folder": doc["para_folder"],
-                "tags": ",".join(doc["tags"]),
-                "wiki_links": ",".join(doc["wiki_links"]),
-                "modified_time": doc["modified_time"],
-            }
-
-            self.collection.add(ids=[chunk_id], documents=[chunk], metadatas=[metadata])
-
-    def update_document(self, doc: Dict):
-        """문서 업데이트"""
+            yield "\n".join(current_chunk)
+
+    def add_document(self, doc: Dict) -> Dict:
+        """문서 추가
+
+        청크를 EMBED_BATCH_SIZE개씩 묶어 임베딩한 뒤 ChromaDB에 기록합니다.
+        대용량(스트리밍) 문서도 배치 하나 분량만 메모리에 올립니다.
+
+        Returns:
+            쓰기 통계 {"chunks", "embedding_batches", "embed_seconds", "write_seconds"}
+        """
+        stats = {
+            "chunks": 0,
+            "embedding_batches": 0,
+            "embed_seconds": 0.0,
+            "write_seconds": 0.0,
+        }
+
+        batch = []
+        for chunk in self.iter_chunks(iter_body_lines(doc)):
+            batch.append(chunk)
+            if len(batch) >= EMBED_BATCH_SIZE:
+                self._add_chunk_batch(doc, batch, stats)
+                batch = []
+        if batch:
+            self._add_chunk_batch(doc, batch, stats)
+
+        return stats
+
+    def _add_chunk_batch(self, doc: Dict, chunks: List[str], stats: Dict):
+        """청크 배치 하나를 임베딩하고 기록
+
+        Args:
+            doc: 문서
+            chunks: 청크 리스트
+            stats: 누적할 쓰기 통계
+        """
+        start_index = stats["chunks"]
+        ids = []
+        metadatas = []
+        for offset in range(len(chunks)):
+            i = start_index + offset
+            ids.append(f"{doc['path']}_{i}")
+            metadatas.append(
+                {
+                    "path": doc["path"],
+                    "title": doc["title"],
+                    "chunk_index": i,
+                    "para_folder": doc["para_folder"],
+                    "tags": ",".join(doc["tags"]),
+                    "wiki_links": ",".join(doc["wiki_links"]),
+                    "modified_time": doc["modified_time"],
+                }
+            )
+
+        start = time.perf_counter()
+        embeddings = self.embedding_function(chunks)
+        stats["embed_seconds"] += time.perf_counter() - start
+        stats["embedding_batches"] += 1
+
+        start = time.perf_counter()
+        self.collection.add(
+            ids=ids, documents=chunks, metadatas=metadatas, embeddings=embeddings
+        )
+        stats["write_seconds"] += time.perf_counter() - start
+        stats["chunks"] += len(chunks)
+
+    def update_document(self, doc: Dict) -> Dict:
+        """문서 업데이트
+
+        Returns:
+            쓰기 통계 (삭제 시간은 write_seconds에 합산)
+        """
         # 기존 청크 삭제
-        self.delete_document(doc["path"])
+        delete_stats = self.delete_document(doc["path"])
         # 새로 추가
-        self.add_document(doc)
+        stats = self.add_document(doc)
+        stats["write_seconds"] += delete_stats["write_seconds"]
+        return stats
+
+    def delete_document(self, path: str) -> Dict:
+        """문서 삭제
 
-    def delete_document(self, path: str):
-        """문서 삭제"""
+        Returns:
+            쓰기 통계 {"write_seconds"}
+        """
+        start = time.perf_counter()
         results = self.collection.get(where={"path": path})
         if results["ids"]:
             self.collection.delete(ids=results["ids"])
+        return {"write_seconds": time.perf_counter() - start}
 
     def search(
         self,
@@ -20,6 +20,19 @@ from repomix_store import RepomixIndexStore  # noqa: E402
 from vector_store import VectorStore  # noqa: E402
 
 
+@pytest.fixture(autouse=True)
+def isolated_metrics_file(tmp_path, monkeypatch):
+    """인덱싱 실행 리포트를 실제 data/index_metrics.jsonl 대신 임시 파일에 기록
+
+    Yields:
+        Path: 이 테스트의 메트릭 JSONL 경로
+    """
+    metrics_file = tmp_path / "index_metrics.jsonl"
+    monkeypatch.setattr("index_metrics.METRICS_FILE", metrics_file)
+    monkeypatch.setattr("index_metrics.PROMETHEUS_TEXTFILE", None)
+    yield metrics_file
+
+
 @pytest.fixture(scope="function")
 def temp_vault(tmp_path):
     """임시 Vault 디렉토리 생성
@@ -316,9 +329,38 @@ Content: {"Sample content. " * 10}
     return notes
 
 
+@pytest.fixture(scope="function")
+def store(tmp_path):
+    """임시 파일을 사용하는 빈 NetworkMetadataStore
+
+    그래프가 필요한 테스트 모듈은 같은 이름의 fixture로 덮어쓰고 이 저장소를 받아 채웁니다.
+    """
+    return NetworkMetadataStore(metadata_file=tmp_path / "network_metadata.json")
+
+
 # Helper functions
 
 
+def make_doc(path: str, content: str, metadata: dict = None) -> dict:
+    """ObsidianParser.parse_file() 형식의 테스트 문서
+
+    Args:
+        path: 노트 경로 ("/vault/<PARA 폴더>/<제목>.md", 폴더가 없으면 "root")
+        content: 본문
+        metadata: frontmatter 메타데이터
+
+    Returns:
+        dict: NetworkMetadataStore.update_metadata()에 넘길 문서
+    """
+    return {
+        "path": path,
+        "title": Path(path).stem,
+        "content": content,
+        "metadata": metadata or {},
+        "para_folder": Path(path).parts[2] if len(Path(path).parts) > 3 else "root",
+    }
+
+
 def count_documents_in_chroma(vector_store: VectorStore) -> int:
     """ChromaDB의 문서 수 조회
 
@@ -0,0 +1,129 @@
+"""BackfillService 테스트"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from backfill_service import BackfillService
+
+
+def _make_note(vault: Path, relative: str, age_days: float) -> Path:
+    """지정한 나이(일)의 mtime을 가진 노트 생성"""
+    path = vault / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"# {path.stem}\n")
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _make_indexer(vault: Path, files, indexed=()):
+    indexer = MagicMock()
+    indexer.vault_path = vault
+    indexer.metadata = {"indexed_files": {str(f): "hash" for f in indexed}}
+    indexer.get_md_files.return_value = set(files)
+    return indexer
+
+
+def test_plan_orders_priority_then_recent_then_rest(tmp_path):
+    """우선 폴더 → 최근 수정 → 나머지 순서, 그룹 내 최신순"""
+    old_priority = _make_note(tmp_path, "01 Projects/Old Project.md", 100)
+    new_priority = _make_note(tmp_path, "01 Projects/New Project.md", 30)
+    recent = _make_note(tmp_path, "00 Notes/Recent.md", 1)
+    recent_older = _make_note(tmp_path, "00 Notes/Recent Older.md", 5)
+    old = _make_note(tmp_path, "02 Archive/Old.md", 200)
+    already = _make_note(tmp_path, "00 Notes/Already.md", 0)
+
+    indexer = _make_indexer(
+        tmp_path,
+        [old_priority, new_priority, recent, recent_older, old, already],
+        indexed=[already],
+    )
+    service = BackfillService(indexer, priority_folders=["01 Projects"], recent_days=14)
+
+    assert service.plan() == [new_priority, old_priority, recent, recent_older, old]
+
+
+def test_run_indexes_in_growing_batches_and_calls_on_complete(tmp_path):
+    """배치 크기가 커지며 전체 파일을 인덱싱하고 완료 콜백 호출"""
+    files = [_make_note(tmp_path, f"00 Notes/Note {i:02d}.md", i) for i in range(10)]
+    indexer = _make_indexer(tmp_path, files)
+    on_complete = MagicMock()
+
+    service = BackfillService(
+        indexer,
+        priority_folders=[],
+        batch_size=2,
+        max_batch_size=4,
+        on_complete=on_complete,
+    )
+    service.start()
+    service.thread.join(timeout=5)
+
+    batch_sizes = [len(call.args[0]) for call in indexer.index_files.call_args_list]
+    assert batch_sizes == [2, 4, 4]
+    # 백업은 실행 시작 시 한 번만 만들고 모든 배치가 같은 스냅샷을 공유
+    indexer.create_backup.assert_called_once()
+    backup_dirs = {call.kwargs["backup_dir"] for call in indexer.index_files.call_args_list}
+    assert backup_dirs == {indexer.create_backup.return_value}
+    indexer.update_index.assert_called_once()
+    on_complete.assert_called_once()
+
+    progress = service.progress.snapshot()
+    assert progress["done"] == progress["total"] == 10
+    assert not progress["running"]
+    assert service.progress.describe() == ""
+
+
+def test_failed_run_skips_on_complete_and_can_resume(tmp_path):
+    """배치가 실패하면 완료 콜백을 부르지 않고, 다시 시작하면 남은 파일부터 이어서 처리"""
+    files = [_make_note(tmp_path, f"00 Notes/Note {i:02d}.md", i) for i in range(4)]
+    indexer = _make_indexer(tmp_path, files)
+
+    def index_files(batch, metrics=None, backup_dir=None):
+        if len(indexer.metadata["indexed_files"]) >= 2:
+            raise RuntimeError("disk full")
+        indexer.metadata["indexed_files"].update({str(f): "hash" for f in batch})
+
+    indexer.index_files.side_effect = index_files
+    on_complete = MagicMock()
+    service = BackfillService(
+        indexer, priority_folders=[], batch_size=2, max_batch_size=2, on_complete=on_complete
+    )
+    service.start()
+    service.thread.join(timeout=5)
+
+    assert service.failed
+    assert "disk full" in service.progress.describe()
+    on_complete.assert_not_called()
+    indexer.update_index.assert_not_called()
+
+    # 다시 시작하면 이미 인덱싱된 파일은 건너뜀
+    indexer.index_files.side_effect = None
+    service.start()
+    service.thread.join(timeout=5)
+
+    assert [len(call.args[0]) for call in indexer.index_files.call_args_list] == [2, 2, 2]
+    assert not service.failed
+    on_complete.assert_called_once()
+
+
+def test_fully_indexed_vault_completes_without_catch_up(tmp_path):
+    """인덱싱할 파일이 없으면 전체 갱신 없이 바로 완료 콜백 호출"""
+    files = [_make_note(tmp_path, f"00 Notes/Note {i}.md", i) for i in range(3)]
+    indexer = _make_indexer(tmp_path, files, indexed=files)
+    on_complete = MagicMock()
+
+    service = BackfillService(indexer, priority_folders=[], on_complete=on_complete)
+    service.start()
+    service.thread.join(timeout=5)
+
+    indexer.index_files.assert_not_called()
+    indexer.update_index.assert_not_called()
+    on_complete.assert_called_once()
+    assert service.progress.describe() == ""
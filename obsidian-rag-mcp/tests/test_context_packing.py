@@ -0,0 +1,604 @@
+"""ContextBuilder / SmartPacker / ContextPacker 테스트"""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from context_packer import (  # noqa: E402
+    ContextBuilder,
+    ContextPacker,
+    PackageFormatter,
+    SmartPacker,
+    split_parts,
+)
+from network_store import NetworkMetadataStore  # noqa: E402
+from note_cache import NoteCache  # noqa: E402
+from note_representations import build_representations  # noqa: E402
+from obsidian_parser import ObsidianParser  # noqa: E402
+from pack_cache import PackCache  # noqa: E402
+from repomix_store import RepomixIndexStore  # noqa: E402
+from tokenizer import content_hash  # noqa: E402
+
+# 허브 노트: 백링크 10개, 포워드링크 10개
+HUB_BACKLINKS = [f"Back{i}" for i in range(10)]
+HUB_FORWARD_LINKS = [f"Forward{i}" for i in range(10)]
+SEMANTIC_NOTES = [f"Similar{i}" for i in range(4)]
+
+
+class SlowParser(ObsidianParser):
+    """파일 하나를 파싱할 때마다 delay초 걸리는 파서 (느린 디스크 흉내)"""
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__()
+        self.delay = delay
+
+    def parse_file(self, file_path):
+        time.sleep(self.delay)
+        return super().parse_file(file_path)
+
+
+class FakeVectorStore:
+    """고정된 검색 결과를 delay초 뒤에 돌려주는 벡터 저장소"""
+
+    def __init__(self, results, delay: float = 0.0):
+        self.results = results
+        self.delay = delay
+
+    def search(self, query, top_k=5, folder=None):
+        time.sleep(self.delay)
+        return self.results[:top_k]
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    """허브 노트와 이웃 노트가 있는 Vault + 네트워크/Repomix 저장소"""
+    monkeypatch.setattr("obsidian_parser.VAULT_PATH", tmp_path)
+    monkeypatch.setattr("repomix_store.VAULT_PATH", tmp_path)
+    notes_dir = tmp_path / "00 Notes"
+    notes_dir.mkdir()
+
+    hub_links = " ".join(f"[[{title}]]" for title in HUB_FORWARD_LINKS)
+    contents = {"Hub": hub_links + "\n허브 노트 본문"}
+    for title in HUB_BACKLINKS:
+        contents[title] = f"[[Hub]] {title} 본문 " * 20
+    for title in HUB_FORWARD_LINKS + SEMANTIC_NOTES:
+        contents[title] = f"{title} 본문 " * 20
+
+    network_store = NetworkMetadataStore(metadata_file=tmp_path / "network_metadata.db")
+    repomix_store = RepomixIndexStore(index_file=tmp_path / "repomix_index.db")
+    parser = ObsidianParser()
+    for title, content in contents.items():
+        path = notes_dir / f"{title}.md"
+        path.write_text(content, encoding="utf-8")
+        doc = parser.parse_file(path)
+        network_store.update_metadata(doc)
+        repomix_store.update_index(doc, path)
+
+    def path_of(title):
+        return str(notes_dir / f"{title}.md")
+
+    return network_store, repomix_store, path_of
+
+
+def make_builder(vault, parse_delay=0.0, search_delay=0.0):
+    network_store, repomix_store, path_of = vault
+    # 백링크 하나가 검색 결과에도 나오도록 (중복 제외 확인)
+    results = [{"path": path_of("Hub"), "distance": 0.0}]
+    results += [{"path": path_of("Back3"), "distance": 0.1}]
+    results += [
+        {"path": path_of(title), "distance": 0.2 + i / 10}
+        for i, title in enumerate(SEMANTIC_NOTES)
+    ]
+    return ContextBuilder(
+        FakeVectorStore(results, delay=search_delay),
+        network_store,
+        repomix_store,
+        note_cache=NoteCache(SlowParser(parse_delay)),
+    )
+
+
+def titles(notes):
+    return [note["title"] for note in notes]
+
+
+def test_build_context_order_and_dedup(vault):
+    """섹션 순서/중복 제외가 우선순위 순서대로 결정됨"""
+    network_store = vault[0]
+    builder = make_builder(vault)
+    context = builder.build_context("Hub", max_semantic_related=5, rank_backlinks=False)
+
+    assert titles(context["primary"]) == ["Hub"]
+    assert titles(context["backlinks"]) == network_store.get_backlinks("Hub")
+    assert titles(context["forward_links"]) == network_store.get_forward_links("Hub")
+    # Back3은 백링크로 이미 포함되어 시맨틱 섹션에서 제외
+    assert titles(context["semantic_related"]) == SEMANTIC_NOTES
+    assert [note["similarity_score"] for note in context["semantic_related"]] == (
+        pytest.approx([0.2, 0.3, 0.4, 0.5])
+    )
+    assert all(note["token_count"] > 0 for note in context["backlinks"])
+    builder.close()
+
+
+def test_build_context_loads_concurrently(vault):
+    """이웃 노트 로드와 시맨틱 검색이 동시에 실행됨"""
+    builder = make_builder(vault, parse_delay=0.1, search_delay=0.3)
+
+    started = time.perf_counter()
+    context = builder.build_context("Hub", max_semantic_related=5)
+    elapsed = time.perf_counter() - started
+
+    loaded = sum(len(notes) for notes in context.values())
+    assert loaded == 1 + 10 + 10 + 4
+    # 순차 실행이면 0.1 * 25 + 0.3 = 2.8초
+    assert elapsed < 1.5
+    builder.close()
+
+
+class CountingParser(ObsidianParser):
+    """parse_file 호출 횟수를 세는 파서"""
+
+    def __init__(self):
+        super().__init__()
+        self.parsed = 0
+
+    def parse_file(self, file_path):
+        self.parsed += 1
+        return super().parse_file(file_path)
+
+
+def test_pack_cache_reuses_until_note_changes(vault):
+    """같은 노트/파라미터면 재사용, 파라미터/노트 파일/인덱스 세대가 바뀌면 다시 생성"""
+    network_store, repomix_store, path_of = vault
+    parser = CountingParser()
+    results = [{"path": path_of(title), "distance": 0.2} for title in SEMANTIC_NOTES]
+    packer = ContextPacker(
+        FakeVectorStore(results),
+        network_store,
+        repomix_store,
+        max_tokens=5000,
+        note_cache=NoteCache(parser, max_entries=2),
+        pack_cache=PackCache(),
+    )
+
+    first, report = packer.pack_note("Hub", return_report=True)
+    parsed = parser.parsed
+    assert report["cached"] is False
+    second, report = packer.pack_note("Hub", return_report=True)
+    assert second == first
+    assert report["cached"] is True
+    assert parser.parsed == parsed
+
+    # 다른 파라미터는 다른 항목
+    assert packer.pack_note("Hub", max_backlinks=2, return_report=True)[1]["cached"] is False
+
+    # 인덱싱 전에 후보 노트 파일이 바뀌어도 무효화
+    back = Path(path_of("Back1"))
+    back.write_text("[[Hub]] 바뀐 본문", encoding="utf-8")
+    changed, report = packer.pack_note("Hub", return_report=True)
+    assert report["cached"] is False
+    assert "바뀐 본문" in changed
+
+    # 인덱스 세대가 바뀌면 무효화
+    assert packer.pack_note("Hub", return_report=True)[1]["cached"] is True
+    network_store.update_metadata(ObsidianParser().parse_file(back))
+    assert packer.pack_note("Hub", return_report=True)[1]["cached"] is False
+    packer.context_builder.close()
+
+
+def test_concurrent_packs_keep_their_own_budgets(vault):
+    """예산이 다른 패킹을 여러 스레드에서 동시에 실행해도 순차 실행 결과와 같음"""
+    network_store, repomix_store, path_of = vault
+    repomix_store.save_index()
+    # 다시 열어서 레코드 지연 로드도 여러 스레드에서 동시에 일어나도록
+    reloaded = RepomixIndexStore(index_file=repomix_store.index_file)
+    results = [{"path": path_of(title), "distance": 0.2} for title in SEMANTIC_NOTES]
+    packer = ContextPacker(
+        FakeVectorStore(results), network_store, reloaded, max_tokens=100000
+    )
+    budgets = [150, 300, 600, 1200, 5000] * 8
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        concurrent = list(pool.map(
+            lambda budget: packer.pack_note(
+                "Hub", pack_mode="optimal", return_report=True, max_tokens=budget
+            ),
+            budgets,
+        ))
+
+    assert packer.smart_packer.max_tokens == 100000
+    for budget, (text, report) in zip(budgets, concurrent):
+        assert report["max_tokens"] == budget
+        assert report["tokens"] <= budget
+        expected = packer.pack_note("Hub", pack_mode="optimal", max_tokens=budget)
+        assert text == expected
+    packer.context_builder.close()
+
+
+def test_query_context_merges_seed_neighbourhoods(vault):
+    """시드별 링크 확장 결과를 합치고, 여러 시드에서 도달한 노트는 가장 높은 관련도로 한 번만"""
+    network_store, repomix_store, path_of = vault
+    # VectorStore.search()처럼 "score"에 거리, 같은 노트의 청크가 여러 개
+    results = [
+        {"path": path_of("Back1"), "score": 0.0},
+        {"path": path_of("Back1"), "score": 0.1},
+        {"path": path_of("Back2"), "score": 1.0},
+        {"path": path_of("Similar0"), "score": 3.0},
+    ]
+    builder = ContextBuilder(FakeVectorStore(results), network_store, repomix_store)
+
+    context = builder.build_query_context("질문", max_seeds=2)
+    assert titles(context["seeds"]) == ["Back1", "Back2"]
+    assert [note["relevance"] for note in context["seeds"]] == [1.0, 0.5]
+    # Hub는 두 시드의 이웃이지만 더 가까운 Back1 기준 (1.0 × 0.5)
+    assert titles(context["linked"]) == ["Hub"]
+    assert context["linked"][0]["relevance"] == 0.5
+    assert context["linked"][0]["seed"] == "Back1"
+
+    wide = builder.build_query_context("질문", max_seeds=2, depth=2, max_links_per_seed=6)
+    linked_titles = titles(wide["linked"])
+    assert linked_titles[0] == "Hub"
+    assert len(linked_titles) == len(set(linked_titles))
+    assert not set(linked_titles) & {"Back1", "Back2"}
+    assert all(note["relevance"] == 0.25 for note in wide["linked"][1:])
+
+    assert builder.build_query_context("질문", depth=0)["linked"] == []
+    builder.close()
+
+
+def test_pack_query_uses_one_budget(vault):
+    """여러 시드와 이웃을 중복 없이 하나의 예산으로 패킹"""
+    network_store, repomix_store, path_of = vault
+    results = [{"path": path_of(title), "score": 0.1 * i} for i, title in enumerate(HUB_BACKLINKS)]
+    packer = ContextPacker(FakeVectorStore(results), network_store, repomix_store)
+
+    text, report = packer.pack_query(
+        "허브", max_seeds=5, depth=2, return_report=True, max_tokens=800
+    )
+    assert report["tokens"] <= 800
+    assert "**Query**: 허브" in text
+    headings = [line.split(". ", 1)[1] for line in text.split("\n") if line.startswith("### ")]
+    assert len(headings) == len(set(headings)) == report["notes"]
+    assert headings[0] == "Back0"
+
+    # 나눠서 받아도 이어 붙이면 같은 패키지
+    parts = packer.pack_query("허브", max_seeds=5, depth=2, max_tokens=800, part_chars=500)
+    assert len(parts) > 1
+    assert all(len(part) <= 500 for part in parts)
+    assert "".join(parts) == text
+    packer.context_builder.close()
+
+
+def test_mcp_pack_calls_run_concurrently(vault, monkeypatch):
+    """MCP 패킹 호출은 워커 스레드에서 동시에 실행되고 서로 다른 예산을 지킴"""
+    try:
+        import mcp_server
+    except (ImportError, AttributeError) as e:
+        pytest.skip(f"MCP SDK를 불러올 수 없습니다: {e}")
+
+    network_store, repomix_store, path_of = vault
+    results = [{"path": path_of(title), "distance": 0.1} for title in HUB_BACKLINKS]
+    indexer = SimpleNamespace(lock=threading.RLock())
+    packer = ContextPacker(
+        FakeVectorStore(results, delay=0.3), network_store, repomix_store,
+        store_lock=indexer.lock,
+    )
+    monkeypatch.setattr(mcp_server, "indexer", indexer)
+    monkeypatch.setattr(mcp_server, "context_packer", packer)
+    monkeypatch.setattr(mcp_server, "backfill_service", None)
+    budgets = [200, 400, 800, 1600]
+
+    async def pack_all():
+        return await asyncio.gather(*(
+            mcp_server.handle_call_tool(
+                "pack_query_context", {"query": "허브", "max_tokens": budget}
+            )
+            for budget in budgets
+        ))
+
+    started = time.perf_counter()
+    responses = asyncio.run(pack_all())
+    elapsed = time.perf_counter() - started
+
+    # 순차 실행이면 검색 지연만 0.3초 × 4
+    assert elapsed < 0.3 * len(budgets) * 0.75
+    for budget, response in zip(budgets, responses):
+        text = "".join(content.text for content in response)
+        assert text == packer.pack_query("허브", max_tokens=budget)
+    packer.context_builder.close()
+
+
+def test_mcp_pack_budget_is_clamped_with_notice(vault, monkeypatch):
+    """PACK_MAX_TOKENS보다 큰 예산은 잘라서 쓰고 응답 앞과 리포트에 알림"""
+    try:
+        import mcp_server
+    except (ImportError, AttributeError) as e:
+        pytest.skip(f"MCP SDK를 불러올 수 없습니다: {e}")
+
+    network_store, repomix_store, path_of = vault
+    indexer = SimpleNamespace(lock=threading.RLock())
+    packer = ContextPacker(
+        FakeVectorStore([]), network_store, repomix_store, store_lock=indexer.lock
+    )
+    reports = []
+    monkeypatch.setattr(mcp_server, "indexer", indexer)
+    monkeypatch.setattr(mcp_server, "context_packer", packer)
+    monkeypatch.setattr(mcp_server, "backfill_service", None)
+    monkeypatch.setattr(mcp_server, "PACK_MAX_TOKENS", 500)
+    monkeypatch.setattr(mcp_server, "log_pack_report", lambda report, parts: reports.append(report))
+
+    response = asyncio.run(
+        mcp_server.handle_call_tool("pack_note_context", {"note_title": "Hub", "max_tokens": 5000})
+    )
+    assert "5,000" in response[0].text and "500" in response[0].text
+    assert "".join(content.text for content in response[1:]) == packer.pack_note(
+        "Hub", pack_mode="optimal", max_tokens=500
+    )
+    assert reports[0]["max_tokens"] == 500
+    assert reports[0]["requested_max_tokens"] == 5000
+
+    # 상한 이하면 안내 없음
+    response = asyncio.run(
+        mcp_server.handle_call_tool("pack_note_context", {"note_title": "Hub", "max_tokens": 300})
+    )
+    assert "".join(content.text for content in response) == packer.pack_note(
+        "Hub", pack_mode="optimal", max_tokens=300
+    )
+    packer.context_builder.close()
+
+
+def make_note(title, tokens, **extra):
+    """토큰 수가 정해진 테스트 노트"""
+    return {
+        "path": f"/vault/{title}.md",
+        "title": title,
+        "content": title,
+        "token_count": tokens,
+        **extra,
+    }
+
+
+def test_optimal_pack_beats_greedy_on_large_backlink():
+    """큰 백링크 하나가 예산을 다 쓰는 대신 작은 관련 노트 여러 개를 고름"""
+    context = {
+        "primary": [make_note("Hub", 50)],
+        "backlinks": [make_note("Huge", 900)],
+        "forward_links": [],
+        "semantic_related": [
+            make_note(f"Small{i}", 100, similarity_score=0.1) for i in range(9)
+        ],
+        "tag_related": [],
+    }
+    packer = SmartPacker(max_tokens=1000)
+
+    greedy = packer.pack(context)
+    assert titles(greedy["backlinks"]) == ["Huge"]
+    assert greedy["semantic_related"] == []
+
+    packed, report = packer.pack_with_report(context, mode="optimal")
+    assert titles(packed["primary"]) == ["Hub"]
+    assert packed["backlinks"] == []
+    # 섹션 안의 원래 순서 유지
+    assert titles(packed["semantic_related"]) == [f"Small{i}" for i in range(9)]
+    assert report["tokens"] == 950 <= report["max_tokens"]
+    assert report["utility"] > report["greedy"]["utility"]
+    assert report["greedy"]["tokens"] == 950
+    assert report["notes"] == 10
+
+    with pytest.raises(ValueError):
+        packer.pack(context, mode="best")
+
+
+def test_knapsack_refines_density_order():
+    """가치 밀도 순 greedy가 놓치는 조합을 DP로 찾음"""
+    options = [[(60, 61.0)], [(50, 50.0)], [(50, 50.0)]]
+    assert SmartPacker._select_knapsack(options, 100) == {1: 0, 2: 0}
+    assert SmartPacker._select_knapsack([[(10, 1.0)], [(20, 1.0)]], 5) == {}
+
+
+def test_knapsack_picks_one_option_per_note():
+    """노트마다 전체/요약 중 하나만 고르고, 요약을 섞어 더 많은 노트를 담음"""
+    options = [[(100, 1.0), (30, 0.5)] for _ in range(4)]
+    selected = SmartPacker._select_knapsack(options, 200)
+    assert len(selected) == 4
+    assert sorted(selected.values()) == [0, 1, 1, 1]
+
+
+def test_knapsack_never_exceeds_budget():
+    """예산을 칸 단위로 나눠도 (무게 올림) 실제 토큰 합은 예산 이하"""
+    rng = random.Random(11)
+    for budget in [1000, 100000]:
+        for _ in range(20):
+            weights = [rng.randrange(1, budget // 4) for _ in range(200)]
+            values = [rng.random() for _ in weights]
+            options = [[(weight, value)] for weight, value in zip(weights, values)]
+            selected = SmartPacker._select_knapsack(options, budget)
+            assert set(selected.values()) <= {0}
+            assert sum(weights[i] for i in selected) <= budget
+            # 가치 밀도 순 greedy 이상
+            remaining, greedy_value = budget, 0.0
+            for i in sorted(range(len(weights)), key=lambda i: -values[i] / weights[i]):
+                if weights[i] <= remaining:
+                    remaining -= weights[i]
+                    greedy_value += values[i]
+            assert sum(values[i] for i in selected) >= greedy_value - 1e-9
+
+
+def structured_note(title, packer, sections=6):
+    """제목/목록/체크박스가 있는 긴 노트 (요약 표현 포함)"""
+    parts = [f"{title} 노트의 첫 문단입니다. 핵심 내용을 짧게 소개합니다."]
+    for i in range(sections):
+        parts.append(f"## {title} 섹션 {i}")
+        parts.append(f"- [ ] **할 일 {i}**: [[{title} 관련 {i}]] 정리하기")
+        parts.append(f"{title} 섹션 {i}의 긴 설명 문단입니다. " * 15)
+    content = "\n\n".join(parts)
+    digest = content_hash(content)
+    return make_note(
+        title,
+        packer.token_counter.count(content),
+        content=content,
+        representations=build_representations(content, packer.token_counter.count, digest),
+    )
+
+
+@pytest.mark.parametrize("mode", ["greedy", "optimal"])
+def test_compact_representations_fit_more_notes(mode):
+    """예산이 모자라면 전체 노트 대신 첫 문단 + 핵심 줄/제목 계층을 넣음"""
+    packer = SmartPacker(max_tokens=1)
+    notes = [structured_note(f"Note{i}", packer) for i in range(4)]
+    full_tokens = notes[0]["token_count"]
+    packer.max_tokens = full_tokens * 2
+    context = {
+        "primary": [make_note("Hub", 10)],
+        "backlinks": notes,
+        "forward_links": [],
+        "semantic_related": [],
+        "tag_related": [],
+    }
+
+    packed, report = packer.pack_with_report(context, mode=mode)
+    backlinks = packed["backlinks"]
+    assert titles(backlinks) == [f"Note{i}" for i in range(4)]
+    assert report["tokens"] <= packer.max_tokens
+    assert report["compact"] >= 2
+    for note in backlinks:
+        assert note["token_count"] == packer.token_counter.count(note["content"])
+        if note.get("representation") == "digest":
+            assert note["content"].startswith("Note")
+            assert "- [ ] **할 일" in note["content"]
+
+    output = PackageFormatter().format(packed)
+    assert "Showing digest only" in output or "Showing outline only" in output
+
+
+def korean_note(paragraphs=12):
+    """한국어 문단과 제목이 섞인 긴 노트"""
+    parts = []
+    for i in range(paragraphs):
+        if i % 4 == 0:
+            parts.append(f"## 섹션 {i // 4}")
+        parts.append(f"{i}번째 문단입니다. 한국어 문장은 글자당 토큰이 많이 나옵니다. " * 5)
+    content = "\n\n".join(parts)
+    return make_note("Korean", 0, content=content)
+
+
+@pytest.mark.parametrize("max_tokens", [120, 300, 777])
+def test_trim_never_exceeds_budget(max_tokens):
+    """정확한 토큰 경계에서 자르고, token_count는 실제 토큰 수와 같음"""
+    packer = SmartPacker()
+    note = korean_note()
+    trimmed = packer._trim_note(note, max_tokens)
+
+    actual = len(packer.tokenizer.encode_ordinary(trimmed["content"]))
+    assert trimmed["token_count"] == actual <= max_tokens
+    assert trimmed["trimmed"]
+    body = trimmed["content"].rsplit("\n\n... (", 1)[0]
+    assert note["content"].startswith(body)
+    # 문단/제목 경계에서 자름
+    assert note["content"][len(body):].lstrip(" ").startswith("\n")
+
+
+def test_trim_keeps_query_relevant_sections():
+    """검색어가 있으면 앞부분 + 관련 섹션을 남김"""
+    content = "\n\n".join(
+        ["# 노트\n머리말 문단입니다."]
+        + [f"## 섹션 {i}\n" + "관련 없는 내용입니다. " * 30 for i in range(5)]
+        + ["## 번아웃 회복\n번아웃 회복 방법과 휴식에 대한 내용입니다."]
+    )
+    packer = SmartPacker()
+    trimmed = packer._trim_note(make_note("Long", 0, content=content), 120, query="번아웃 회복")
+
+    assert trimmed["content"].startswith("# 노트\n머리말 문단입니다.")
+    assert "## 번아웃 회복" in trimmed["content"]
+    assert "(...)" in trimmed["content"]
+    assert trimmed["token_count"] == len(packer.tokenizer.encode_ordinary(trimmed["content"]))
+    assert trimmed["token_count"] <= 120
+
+
+def test_packed_tokens_stay_within_budget():
+    """모든 모드에서 패킹된 노트 토큰 합이 예산 이하"""
+    packer = SmartPacker(max_tokens=500)
+    context = {
+        "primary": [korean_note()],
+        "backlinks": [korean_note(6) | {"path": "/vault/Back.md"}],
+        "forward_links": [],
+        "semantic_related": [],
+        "tag_related": [],
+    }
+    for mode in ("greedy", "optimal"):
+        packed = packer.pack(context, mode=mode)
+        total = sum(
+            len(packer.tokenizer.encode_ordinary(note["content"]))
+            for notes in packed.values()
+            for note in notes
+        )
+        assert 0 < total <= 500
+
+
+def test_split_parts_prefers_piece_and_line_boundaries():
+    """조각은 통째로, 큰 조각은 줄 경계에서 나누고, 이어 붙이면 원래 텍스트"""
+    pieces = ["헤더\n", "a" * 6, "줄1\n줄2\n줄3\n", "c" * 3 + "\n" + "b" * 25]
+    parts = list(split_parts(pieces, 10))
+
+    assert "".join(parts) == "".join(pieces)
+    assert all(len(part) <= 10 for part in parts)
+    assert parts[0] == "헤더\n" + "a" * 6
+    # 큰 조각은 남은 자리의 마지막 줄바꿈에서, 줄바꿈이 없으면 최대 길이에서 자름
+    assert parts[1] == "줄1\n줄2\n줄3\n"
+    assert parts[2] == "ccc\n"
+    assert parts[3:] == ["b" * 10, "b" * 10, "b" * 5]
+    assert list(split_parts([], 10)) == []
+
+
+def test_streaming_format_bounds_peak_memory():
+    """조각 생성 + 부분 나누기는 전체를 하나의 문자열로 만들 때보다 최대 메모리가 작음"""
+    notes = [
+        make_note(f"Note{i}", 0, content=f"line of text {i}\n" * 4000) for i in range(20)
+    ]
+    packed = {"primary": notes[:1], "backlinks": notes[1:]}
+    formatter = PackageFormatter()
+    text = formatter.format(packed)
+    part_chars = 100_000
+
+    def peak(func):
+        tracemalloc.start()
+        try:
+            result = func()
+            return result, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    parts, streamed_peak = peak(
+        lambda: list(split_parts(formatter.iter_format(packed), part_chars))
+    )
+    _, joined_peak = peak(lambda: formatter.format(packed))
+
+    assert "".join(parts) == text
+    assert all(len(part) <= part_chars for part in parts)
+    # 이모지 헤더가 있는 부분만 글자당 4바이트, 나머지는 ASCII 그대로
+    assert streamed_peak < len(text) * 1.5
+    assert streamed_peak < joined_peak / 2
+
+
+def test_pack_report_measures_peak_memory(vault):
+    """리포트에 패킹 최대 메모리를 넣고, 측정을 끄면 None"""
+    network_store, repomix_store, path_of = vault
+    packer = ContextPacker(FakeVectorStore([]), network_store, repomix_store)
+    text, report = packer.pack_note("Hub", return_report=True)
+    assert report["peak_memory_bytes"] >= len(text)
+    assert not tracemalloc.is_tracing()
+    packer.context_builder.close()
+
+    packer = ContextPacker(FakeVectorStore([]), network_store, repomix_store, trace_memory=False)
+    assert packer.pack_note("Hub", return_report=True)[1]["peak_memory_bytes"] is None
+    packer.context_builder.close()
@@ -0,0 +1,141 @@
+"""패싯 인덱스와 복합 조건 조회 테스트"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from facet_index import FacetIndex  # noqa: E402
+from repomix_store import RepomixIndexStore  # noqa: E402
+
+
+def facets(modified, tokens, backlinks=0, forward_links=0, folder="00 Notes"):
+    return {
+        "modified": modified,
+        "tokens": tokens,
+        "backlinks": backlinks,
+        "forward_links": forward_links,
+        "folder": folder,
+    }
+
+
+def test_query_combines_conditions_and_paginates():
+    """조건 AND 결합, 큰 값 먼저 (같으면 경로순), 전체 개수 + 페이지"""
+    index = FacetIndex(capacity=2)
+    index.set("a.md", **facets(100.0, 500, backlinks=3))
+    index.set("b.md", **facets(200.0, 1500, folder="01 Projects"))
+    index.set("c.md", **facets(300.0, 2500, backlinks=1))
+    index.set("d.md", **facets(300.0, 800, backlinks=5))
+
+    assert index.query() == (4, ["c.md", "d.md", "b.md", "a.md"])
+    assert index.query(limit=2, offset=1) == (4, ["d.md", "b.md"])
+    assert index.query(folder="00 Notes", ranges={"tokens": (None, 1000)}) == (
+        2,
+        ["d.md", "a.md"],
+    )
+    assert index.query(ranges={"backlinks": (1, None)}, sort="backlinks") == (
+        3,
+        ["d.md", "a.md", "c.md"],
+    )
+    assert index.query(include=[index.mask_for(["a.md", "b.md", "x.md"])]) == (
+        2,
+        ["b.md", "a.md"],
+    )
+    assert index.query(folder="02 Areas") == (0, [])
+    assert index.query(offset=10) == (4, [])
+
+    with pytest.raises(ValueError):
+        index.query(sort="title")
+
+
+def test_remove_reuses_slots():
+    """제거된 슬롯은 조회에서 빠지고 다음 추가 때 재사용"""
+    index = FacetIndex(capacity=1)
+    index.set("a.md", **facets(1.0, 10))
+    index.set("b.md", **facets(2.0, 20))
+    index.remove("a.md")
+    index.set("c.md", **facets(3.0, 30))
+
+    assert len(index) == 2
+    assert index.slots["c.md"] == 0
+    assert index.query() == (2, ["c.md", "b.md"])
+
+    index.set("b.md", tokens=99)
+    assert index.query(ranges={"tokens": (50, None)}) == (1, ["b.md"])
+
+
+def test_top_page_matches_full_sort():
+    """상위 페이지만 고르는 경로와 전체 정렬 결과가 같음 (동률 포함)"""
+    rng = random.Random(5)
+    index = FacetIndex()
+    items = [(f"note{i:03d}.md", facets(float(rng.randrange(20)), i)) for i in range(300)]
+    index.rebuild(items)
+
+    _, everything = index.query()
+    for offset, limit in [(0, 7), (13, 20), (290, 50)]:
+        assert index.query(offset=offset, limit=limit) == (
+            300,
+            everything[offset:offset + limit],
+        )
+
+
+def test_store_query_notes(tmp_path):
+    """RepomixIndexStore: 폴더/태그/시각/토큰/백링크 조건 결합"""
+    store = RepomixIndexStore(index_file=tmp_path / "repomix_index.db")
+    now = time.time()
+    specs = [
+        ("Alpha", "01 Projects", ["project/x"], 10, now),
+        ("Beta", "01 Projects", ["project/x", "idea"], 400, now - 3600),
+        ("Gamma", "01 Projects", ["idea"], 10, now - 40 * 86400),
+        ("Delta", "00 Notes", ["project/x"], 10, now - 7200),
+    ]
+    for title, folder, tags, words, mtime in specs:
+        note = tmp_path / f"{title}.md"
+        note.write_text("단어 " * words, encoding="utf-8")
+        os.utime(note, (mtime, mtime))
+        doc = {
+            "title": title,
+            "content": note.read_text(encoding="utf-8"),
+            "para_folder": folder,
+            "tags": tags,
+            "wiki_links": ["Alpha"] if title != "Alpha" else [],
+        }
+        store.update_index(doc, note)
+    store.update_backlinks({str(tmp_path / "Alpha.md"): ["Beta", "Gamma", "Delta"]})
+
+    def titles(**conditions):
+        result = store.query_notes(**conditions)
+        return result["total"], [note["title"] for note in result["results"]]
+
+    assert titles(folder="01 Projects", tags=["project"], since=now - 30 * 86400) == (
+        2,
+        ["Alpha", "Beta"],
+    )
+    assert titles(tags=["project/x", "idea"]) == (1, ["Beta"])
+    assert titles(tags=["project/x", "idea"], tag_mode="any", limit=2) == (
+        4,
+        ["Alpha", "Beta"],
+    )
+    small = store.query_notes(folder="01 Projects", max_tokens=200)
+    assert [note["title"] for note in small["results"]] == ["Alpha", "Gamma"]
+    assert titles(min_backlinks=1) == (1, ["Alpha"])
+    assert titles(min_forward_links=1, sort="tokens", limit=1) == (3, ["Beta"])
+
+    # 삭제와 재로드 후에도 같은 결과
+    store.delete_index(str(tmp_path / "Delta.md"))
+    store.save_index()
+    reloaded = RepomixIndexStore(index_file=tmp_path / "repomix_index.db")
+    # 패싯은 요약만으로 구축
+    assert reloaded.index["files"].loaded() == {}
+    assert reloaded.query_notes(tags=["project"], limit=0) == {
+        "total": 2,
+        "offset": 0,
+        "results": [],
+    }
+    assert reloaded.query_notes(min_backlinks=3)["results"][0]["title"] == "Alpha"
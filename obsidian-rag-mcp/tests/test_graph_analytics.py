@@ -0,0 +1,92 @@
+"""링크 그래프 분석 테스트"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from conftest import make_doc  # noqa: E402
+from context_packer import ContextBuilder  # noqa: E402
+from graph_analytics import GraphAnalytics, pagerank, weakly_connected_components  # noqa: E402
+
+
+@pytest.fixture
+def store(store):
+    """Hub를 모두가 링크하는 그래프 + 따로 떨어진 쌍(X ↔ Y) + 고립 노트"""
+    store.update_many(
+        [
+            make_doc("/vault/A.md", "[[Hub]] [[B]]"),
+            make_doc("/vault/B.md", "[[Hub]]"),
+            make_doc("/vault/C.md", "[[Hub]]"),
+            make_doc("/vault/Hub.md", "[[A]]"),
+            make_doc("/vault/X.md", "[[Y]]"),
+            make_doc("/vault/Y.md", "[[X]]"),
+            make_doc("/vault/Lonely.md", "[[Missing]]"),
+        ]
+    )
+    return store
+
+
+def test_pagerank_properties(store):
+    """PageRank 합은 1이고 가장 많이 링크된 노트가 최상위"""
+    graph = store.graph
+    ranks = pagerank(graph)
+
+    assert ranks.sum() == pytest.approx(1.0)
+    assert graph.paths[int(np.argmax(ranks))] == "/vault/Hub.md"
+    # 대칭 쌍은 같은 점수
+    x, y = graph.node_id("/vault/X.md"), graph.node_id("/vault/Y.md")
+    assert ranks[x] == pytest.approx(ranks[y])
+
+
+def test_weakly_connected_components(store):
+    """링크 방향을 무시한 연결 요소"""
+    graph = store.graph
+    labels = weakly_connected_components(graph)
+    groups = {}
+    for node, label in enumerate(labels):
+        groups.setdefault(int(label), set()).add(graph.titles[node])
+
+    assert sorted(map(sorted, groups.values())) == [
+        ["A", "B", "C", "Hub"],
+        ["Lonely"],
+        ["X", "Y"],
+    ]
+
+
+def test_summary_cached_per_generation(store):
+    """generation이 바뀔 때만 다시 계산"""
+    analytics = GraphAnalytics(store)
+    summary = analytics.summary(limit=2)
+
+    assert summary["total_notes"] == 7
+    assert summary["components"] == 3
+    assert summary["largest_component"] == 4
+    assert summary["isolated_notes"] == 1
+    assert summary["top_pagerank"][0]["title"] == "Hub"
+    assert summary["top_backlinked"][0] == {"title": "Hub", "path": "/vault/Hub.md", "score": 3}
+    assert len(summary["top_linking"]) == 2
+
+    cached = analytics._cache
+    analytics.summary()
+    assert analytics._cache is cached
+
+    store.update_metadata(make_doc("/vault/Lonely.md", "[[Hub]]"))
+    assert analytics.summary()["isolated_notes"] == 0
+    assert analytics._cache is not cached
+
+
+def test_context_builder_orders_backlinks_by_pagerank(store):
+    """백링크를 PageRank 높은 순으로 선택"""
+    # D는 B만 가리키므로 B가 C보다 중심 노트가 됨
+    store.update_metadata(make_doc("/vault/D.md", "[[B]]"))
+    builder = ContextBuilder(Mock(), store, Mock())
+
+    assert store.get_backlinks("Hub") == ["A", "B", "C"]
+    assert builder._rank_titles(store.get_backlinks("Hub")) == ["A", "B", "C"]
+    assert builder._rank_titles(["C", "B", "Missing"]) == ["B", "C", "Missing"]
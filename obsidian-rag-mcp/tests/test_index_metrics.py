@@ -0,0 +1,62 @@
+"""인덱싱 계측 리포트 테스트"""
+
+import json
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from index_metrics import STAGES, IndexRunMetrics, write_run_report
+
+
+def test_stage_timings_and_counters():
+    """단계 시간과 카운터가 누적되는지 확인"""
+    metrics = IndexRunMetrics(source="test")
+
+    with metrics.stage("parse"):
+        pass
+    with metrics.stage("parse"):
+        pass
+    metrics.incr("files_scanned", 10)
+    metrics.record_vector_write(
+        {"chunks": 8, "embedding_batches": 2, "embed_seconds": 0.5, "write_seconds": 0.1}
+    )
+    # Mock 반환값 등 dict가 아닌 값은 무시
+    metrics.record_vector_write(None)
+
+    report = metrics.to_report()
+
+    assert report["source"] == "test"
+    assert report["status"] == "ok"
+    assert set(STAGES) <= set(report["timings_seconds"])
+    assert report["timings_seconds"]["parse"] >= 0.0
+    assert report["timings_seconds"]["embed"] == 0.5
+    assert report["counters"]["files_scanned"] == 10
+    assert report["counters"]["chunks"] == 8
+    assert report["embedding_chunks_per_second"] == 16.0
+
+
+def test_write_run_report_jsonl_and_prometheus(tmp_path):
+    """JSONL 추가 기록과 Prometheus textfile 생성 확인"""
+    metrics_file = tmp_path / "index_metrics.jsonl"
+    prom_file = tmp_path / "textfile" / "obsidian_rag.prom"
+
+    metrics = IndexRunMetrics(source="auto_update")
+    metrics.incr("files_new", 3)
+    write_run_report(metrics.to_report(), metrics_file, prom_file)
+    write_run_report(
+        IndexRunMetrics(source="manual").to_report(status="failed", error="boom"),
+        metrics_file,
+        prom_file,
+    )
+
+    lines = metrics_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["counters"]["files_new"] == 3
+    assert json.loads(lines[1])["error"] == "boom"
+
+    prom_text = prom_file.read_text(encoding="utf-8")
+    assert 'obsidian_rag_index_stage_seconds{source="manual",stage="walk"}' in prom_text
+    assert 'obsidian_rag_index_last_success{source="manual"} 0' in prom_text
+    assert not (prom_file.parent / "obsidian_rag.prom.tmp").exists()
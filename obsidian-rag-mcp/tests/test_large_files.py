@@ -0,0 +1,120 @@
+"""대용량 마크다운 파일 스트리밍 처리 테스트"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import obsidian_parser  # noqa: E402
+from obsidian_parser import ObsidianParser, iter_body_lines  # noqa: E402
+from repomix_store import RepomixIndexStore  # noqa: E402
+
+
+@pytest.fixture
+def large_note(tmp_path, monkeypatch):
+    """스트리밍 경로를 타도록 임계값을 낮춘 vault와 노트"""
+    monkeypatch.setattr("obsidian_parser.VAULT_PATH", tmp_path)
+    monkeypatch.setattr("obsidian_parser.LARGE_FILE_THRESHOLD_BYTES", 1024)
+
+    note = tmp_path / "01 Reference" / "Converted PDF.md"
+    note.parent.mkdir(parents=True)
+    body = "\n".join(
+        f"Line {i} mentions [[Source {i % 3}]] and #clipping" for i in range(200)
+    )
+    note.write_text(f"---\ntags: [pdf]\nauthor: someone\n---\n{body}\n", encoding="utf-8")
+    return note, body
+
+
+def test_large_file_is_streamed(large_note):
+    """임계값을 넘는 파일은 본문 없이 링크/태그만 추출"""
+    note, body = large_note
+    doc = ObsidianParser().parse_file(note)
+
+    assert doc["streamed"] is True
+    assert doc["content"] == ""
+    assert doc["metadata"]["author"] == "someone"
+    assert doc["para_folder"] == "01 Reference"
+    assert set(doc["wiki_links"]) == {"Source 0", "Source 1", "Source 2"}
+    assert doc["tags"] == ["pdf", "clipping"]
+    assert doc["oversize"] is None
+
+    # 본문은 필요할 때 줄 단위로 다시 읽음
+    assert "\n".join(iter_body_lines(doc)).strip() == body
+
+
+def test_oversize_policies(large_note, monkeypatch, capsys):
+    """MAX_FILE_BYTES 초과 시 잘라내거나 본문을 건너뛰고 기록 (경고는 stderr로)"""
+    note, _ = large_note
+    monkeypatch.setattr("obsidian_parser.MAX_FILE_BYTES", 2048)
+
+    truncated = ObsidianParser().parse_file(note)
+    assert truncated["oversize"]["action"] == "truncated"
+    assert sum(len(line) + 1 for line in iter_body_lines(truncated)) <= 2048
+
+    monkeypatch.setattr("obsidian_parser.OVERSIZE_POLICY", "skip")
+    skipped = ObsidianParser().parse_file(note)
+    assert skipped["oversize"]["action"] == "skipped"
+    assert list(iter_body_lines(skipped)) == []
+    assert skipped["wiki_links"] == []
+
+    # MCP 서버의 stdout은 JSON-RPC 스트림이므로 진단 메시지는 stderr로만
+    output = capsys.readouterr()
+    assert output.out == ""
+    assert "대용량 파일" in output.err
+
+
+def test_streaming_keeps_multibyte_characters_and_tag_order(tmp_path, monkeypatch):
+    """긴 줄 분할과 잘라내기 위치가 한글 문자 중간이어도 문자를 버리지 않고, 태그는 처음 나온 순서"""
+    monkeypatch.setattr("obsidian_parser.VAULT_PATH", tmp_path)
+    monkeypatch.setattr("obsidian_parser.LARGE_FILE_THRESHOLD_BYTES", 64)
+    # 3바이트 문자 경계와 어긋나는 분할 크기
+    monkeypatch.setattr(obsidian_parser, "MAX_LINE_BYTES", 16)
+
+    note = tmp_path / "Korean.md"
+    body = "한국어 본문 #다 #가 #나 #가 " * 20
+    note.write_text(body, encoding="utf-8")
+
+    doc = ObsidianParser().parse_file(note)
+    assert "".join(iter_body_lines(doc)) == body
+    assert doc["tags"] == ["다", "가", "나"]
+
+    # 잘라내는 위치도 문자 중간 (99바이트째는 "가"의 두 번째 바이트)
+    monkeypatch.setattr("obsidian_parser.MAX_FILE_BYTES", 99)
+    truncated = ObsidianParser().parse_file(note)
+    text = "".join(iter_body_lines(truncated))
+    assert body.startswith(text)
+    assert len(text.encode("utf-8")) == 100
+
+
+def test_streaming_stats_match_in_memory_stats(large_note, tmp_path):
+    """스트리밍 통계가 전체 로드 통계와 같은지 확인"""
+    note, body = large_note
+    store = RepomixIndexStore(tmp_path / "repomix_index.json")
+
+    doc = ObsidianParser().parse_file(note)
+    streamed = store.calculate_stats_streaming(iter_body_lines(doc), note)
+    in_memory = store.calculate_stats(body, note)
+
+    for key in ("bytes", "words", "characters", "lines"):
+        assert streamed[key] == in_memory[key]
+    assert streamed["estimated_tokens"] > 0
+
+    store.update_index(doc, note)
+    entry = store.index["files"][str(note)]
+    assert entry["large_file"] == {"streamed": True, "oversize": None}
+    assert entry["size"]["words"] == in_memory["words"]
+
+
+def test_small_file_is_not_streamed(tmp_path, monkeypatch):
+    """임계값 이하 파일은 기존처럼 전체를 파싱"""
+    monkeypatch.setattr("obsidian_parser.VAULT_PATH", tmp_path)
+    note = tmp_path / "Small.md"
+    note.write_text("Hello [[World]] #tag\n", encoding="utf-8")
+
+    doc = ObsidianParser().parse_file(note)
+    assert not doc.get("streamed")
+    assert "Hello" in doc["content"]
+    assert obsidian_parser.ObsidianParser().load_content(doc, max_chars=5) == "Hello"
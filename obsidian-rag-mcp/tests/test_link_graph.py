@@ -0,0 +1,113 @@
+"""CSR 링크 그래프 테스트"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from conftest import make_doc  # noqa: E402
+from network_store import NetworkMetadataStore  # noqa: E402
+
+
+@pytest.fixture
+def store(store):
+    """A → B, A → C, B → C, C → A (+ 해석되지 않는 링크)"""
+    store.update_many(
+        [
+            make_doc("/vault/A.md", "[[B]] [[C]] [[B|again]]"),
+            make_doc("/vault/B.md", "[[C]] [[Missing]]"),
+            make_doc("/vault/C.md", "[[A]]"),
+        ]
+    )
+    return store
+
+
+def test_csr_adjacency_matches_dict(store):
+    """CSR 인접 배열이 딕셔너리 백링크/포워드링크와 일치"""
+    graph = store.graph
+    a, b, c = (graph.node_id(f"/vault/{name}.md") for name in "ABC")
+
+    assert graph.num_nodes == 3
+    assert graph.num_edges == 4  # 중복 링크와 해석되지 않는 링크 제외
+    assert sorted(graph.successors(a).tolist()) == [b, c]
+    assert sorted(graph.predecessors(c).tolist()) == [a, b]
+    assert graph.in_degrees().tolist() == [1, 1, 2]
+    assert graph.out_degrees().tolist() == [2, 1, 1]
+
+    for path, file_data in store.metadata["files"].items():
+        node = graph.node_id(path)
+        backlink_titles = {graph.titles[i] for i in graph.predecessors(node)}
+        assert backlink_titles == set(file_data["backlinks"])
+
+
+def test_graph_rebuilt_lazily_per_generation(store):
+    """변경이 없으면 같은 스냅샷을 재사용하고, 변경 후에는 다시 구축"""
+    graph = store.graph
+    assert store.graph is graph
+
+    store.delete_metadata("/vault/C.md")
+    rebuilt = store.graph
+    assert rebuilt is not graph
+    assert rebuilt.num_nodes == 2
+    assert rebuilt.num_edges == 1
+
+    store.metadata = store._create_empty_metadata()
+    assert store.graph.num_nodes == 0
+    assert store.graph.num_edges == 0
+
+
+@pytest.fixture
+def chain_store(tmp_path):
+    """A → B → C → D, E → C, F (고립)"""
+    store = NetworkMetadataStore(metadata_file=tmp_path / "network_metadata.json")
+    store.update_many(
+        [
+            make_doc("/vault/A.md", "[[B]]"),
+            make_doc("/vault/B.md", "[[C]]"),
+            make_doc("/vault/C.md", "[[D]]"),
+            make_doc("/vault/D.md", ""),
+            make_doc("/vault/E.md", "[[C]]"),
+            make_doc("/vault/F.md", ""),
+        ]
+    )
+    return store
+
+
+def test_neighborhood_directions_and_cap(chain_store):
+    """방향별 k-hop 이웃과 노드 수 제한"""
+
+    def titles(**kwargs):
+        return {n["title"]: n["distance"] for n in chain_store.get_neighborhood(**kwargs)}
+
+    assert titles(note_title="B", depth=2, direction="out") == {"B": 0, "C": 1, "D": 2}
+    assert titles(note_title="C", depth=2, direction="in") == {"C": 0, "B": 1, "E": 1, "A": 2}
+    assert titles(note_title="A", depth=3) == {"A": 0, "B": 1, "C": 2, "D": 3, "E": 3}
+    assert len(chain_store.get_neighborhood("A", depth=5, max_nodes=3)) == 3
+    assert chain_store.get_neighborhood("Missing") == []
+
+
+def test_find_path(chain_store):
+    """최단 경로와 각 단계의 링크 방향"""
+    path = chain_store.find_path("A", "E")
+    assert [step["title"] for step in path] == ["A", "B", "C", "E"]
+    assert [step["link"] for step in path] == [None, "→", "→", "←"]
+
+    # 포워드링크만 따라가면 E에 도달할 수 없음
+    assert chain_store.find_path("A", "E", direction="out") is None
+    assert chain_store.find_path("A", "D", max_depth=2) is None
+    assert chain_store.find_path("A", "F") is None
+    assert [step["title"] for step in chain_store.find_path("D", "D")] == ["D"]
+
+
+def test_dirty_backlinks_popped_once(chain_store):
+    """백링크가 바뀐 노트만 동기화 대상으로 꺼냄"""
+    chain_store.pop_dirty_backlinks()
+    chain_store.update_metadata(make_doc("/vault/F.md", "[[A]]"))
+
+    dirty = chain_store.pop_dirty_backlinks()
+    assert dirty["/vault/A.md"] == ["F"]
+    assert "/vault/C.md" not in dirty
+    assert chain_store.pop_dirty_backlinks() == {}
@@ -0,0 +1,196 @@
+"""NetworkMetadataStore 링크 인덱스 테스트"""
+
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from conftest import make_doc  # noqa: E402
+from network_store import NetworkMetadataStore  # noqa: E402
+
+
+def test_title_index_lookup(store):
+    """제목 인덱스로 경로 해석"""
+    store.update_metadata(make_doc("/vault/00 Notes/Alpha.md", "links [[Beta]]"))
+    store.update_metadata(make_doc("/vault/00 Notes/Beta.md", "no links"))
+
+    assert store._find_file_by_title("Alpha") == "/vault/00 Notes/Alpha.md"
+    assert store._find_file_by_title("Missing") is None
+    assert store.get_backlinks("Beta") == ["Alpha"]
+
+
+def test_duplicate_titles_resolve_deterministically(store):
+    """같은 제목은 경로 오름차순 첫 번째가 대표"""
+    store.update_metadata(make_doc("/vault/02 Journals/Same.md", ""))
+    store.update_metadata(make_doc("/vault/00 Notes/Same.md", ""))
+
+    assert store._find_file_by_title("Same") == "/vault/00 Notes/Same.md"
+    assert store.find_files_by_title("Same") == [
+        "/vault/00 Notes/Same.md",
+        "/vault/02 Journals/Same.md",
+    ]
+
+    store.delete_metadata("/vault/00 Notes/Same.md")
+    assert store._find_file_by_title("Same") == "/vault/02 Journals/Same.md"
+
+    store.delete_metadata("/vault/02 Journals/Same.md")
+    assert store._find_file_by_title("Same") is None
+    assert "Same" not in store.title_index
+
+
+def test_title_index_rebuilt_on_reload(store):
+    """저장 후 다시 로드하거나 메타데이터를 교체(롤백)하면 인덱스 재구축"""
+    store.update_metadata(make_doc("/vault/00 Notes/Alpha.md", ""))
+    store.save_metadata()
+
+    reloaded = NetworkMetadataStore(metadata_file=store.metadata_file)
+    assert reloaded._find_file_by_title("Alpha") == "/vault/00 Notes/Alpha.md"
+
+    reloaded.metadata = reloaded._create_empty_metadata()
+    assert reloaded._find_file_by_title("Alpha") is None
+
+
+def backlinks_snapshot(store) -> dict:
+    """경로 → 백링크 리스트"""
+    return {path: list(data["backlinks"]) for path, data in store.metadata["files"].items()}
+
+
+def test_delta_backlinks_match_full_rebuild(store):
+    """생성/수정/이름변경/삭제 후 델타 결과가 전체 재계산과 같은지 확인"""
+    store.update_metadata(make_doc("/vault/00 Notes/Alpha.md", "[[Beta]] [[Gamma]]"))
+    store.update_metadata(make_doc("/vault/00 Notes/Beta.md", "[[Gamma]]"))
+    # 대상 노트가 나중에 생겨도 기존 링크가 연결됨
+    store.update_metadata(make_doc("/vault/00 Notes/Gamma.md", "[[Alpha]]"))
+    assert store.get_backlinks("Gamma") == ["Alpha", "Beta"]
+
+    # 링크 변경
+    store.update_metadata(make_doc("/vault/00 Notes/Beta.md", "[[Alpha]]"))
+    assert store.get_backlinks("Gamma") == ["Alpha"]
+    assert store.get_backlinks("Alpha") == ["Beta", "Gamma"]
+
+    # 같은 경로에서 제목 변경 → 대상 노트의 백링크 표시 이름도 바뀜
+    renamed = make_doc("/vault/00 Notes/Beta.md", "[[Alpha]]")
+    renamed["title"] = "Beta Renamed"
+    store.update_metadata(renamed)
+    assert store.get_backlinks("Alpha") == ["Beta Renamed", "Gamma"]
+
+    # 대상 삭제 후 같은 제목의 다른 경로가 대표가 되면 백링크가 이동
+    store.update_metadata(make_doc("/vault/02 Journals/Gamma.md", ""))
+    store.delete_metadata("/vault/00 Notes/Gamma.md")
+    assert store.get_backlinks("Gamma") == ["Alpha"]
+    assert store.get_backlinks("Alpha") == ["Beta Renamed"]
+
+    delta = backlinks_snapshot(store)
+    store._rebuild_backlinks()
+    assert backlinks_snapshot(store) == delta
+
+
+def test_update_many_defers_backlinks(store, monkeypatch):
+    """update_many는 백링크를 배치 종료 시 한 번만 계산"""
+    calls = []
+    original = store._rebuild_backlinks
+    monkeypatch.setattr(store, "_rebuild_backlinks", lambda: calls.append(1) or original())
+
+    store.update_many(
+        make_doc(f"/vault/00 Notes/Note {i}.md", f"[[Note {(i + 1) % 5}]]") for i in range(5)
+    )
+
+    assert calls == [1]
+    assert store.get_backlinks("Note 0") == ["Note 4"]
+    assert store.link_sources["note 1"] == {"/vault/00 Notes/Note 0.md"}
+
+
+def test_normalized_link_resolution(store):
+    """헤딩/블록/경로/대소문자/별칭 링크도 같은 노트로 해석"""
+    store.update_metadata(
+        make_doc("/vault/10 Projects/Roadmap.md", "", metadata={"aliases": ["Plan 2025"]})
+    )
+    store.update_metadata(
+        make_doc(
+            "/vault/00 Notes/Links.md",
+            "[[Roadmap#Goals]] [[roadmap^abc123]] [[10 Projects/Roadmap.md|로드맵]] "
+            "[[plan 2025]] [[#Local heading]]",
+        )
+    )
+
+    assert store._find_file_by_title("ROADMAP") == "/vault/10 Projects/Roadmap.md"
+    assert store._find_file_by_title("Plan 2025") == "/vault/10 Projects/Roadmap.md"
+    assert store.get_backlinks("Roadmap") == ["Links"]
+    assert store.graph.num_edges == 1
+
+    # 별칭이 바뀌면 해당 링크의 백링크도 갱신
+    store.update_metadata(make_doc("/vault/10 Projects/Roadmap.md", ""))
+    store.update_metadata(make_doc("/vault/00 Notes/Links.md", "[[Plan 2025]]"))
+    assert store.get_backlinks("Roadmap") == []
+
+    store.update_metadata(
+        make_doc("/vault/10 Projects/Roadmap.md", "", metadata={"aliases": "Plan 2025"})
+    )
+    assert store.get_backlinks("Roadmap") == ["Links"]
+
+
+def test_file_name_wins_over_alias(store):
+    """같은 키면 파일명이 별칭보다 우선"""
+    store.update_metadata(make_doc("/vault/00 Notes/A.md", "", metadata={"aliases": ["Topic"]}))
+    store.update_metadata(make_doc("/vault/00 Notes/Source.md", "[[topic]]"))
+    assert store.get_backlinks("A") == ["Source"]
+
+    store.update_metadata(make_doc("/vault/00 Notes/Topic.md", ""))
+    assert store.get_backlinks("Topic") == ["Source"]
+    assert store.get_backlinks("A") == []
+
+    delta = backlinks_snapshot(store)
+    store._rebuild_backlinks()
+    assert backlinks_snapshot(store) == delta
+
+
+def test_link_health_tracks_dangling_and_orphans(store):
+    """깨진 링크 참조 수와 고립 노트를 델타로 유지"""
+    store.update_metadata(make_doc("/vault/00 Notes/A.md", "[[Missing]] [[Later]]"))
+    store.update_metadata(make_doc("/vault/00 Notes/B.md", "[[missing#Heading]]"))
+    store.update_metadata(make_doc("/vault/00 Notes/Alone.md", "no links"))
+
+    assert store.get_unresolved_links() == [
+        {"target": "Missing", "references": 2, "sources": ["A", "B"]},
+        {"target": "Later", "references": 1, "sources": ["A"]},
+    ]
+    assert store.get_orphaned_notes() == ["Alone"]
+
+    # 대상 노트가 생기면 깨진 링크에서 빠지고 백링크로 연결
+    store.update_metadata(make_doc("/vault/00 Notes/Later.md", ""))
+    store.delete_metadata("/vault/00 Notes/B.md")
+
+    health = store.get_link_health()
+    assert health["unresolved"] == [{"target": "Missing", "references": 1, "sources": ["A"]}]
+    assert health["unresolved_links"] == 1
+    assert health["total_backlinks"] == 1
+    assert health["orphans"] == ["Alone"]
+
+    stats = store.get_network_stats()
+    store._rebuild_backlinks()
+    assert store.get_network_stats() == stats
+
+
+def test_link_health_limit_reads_sorted_index(store):
+    """정렬 유지되는 버킷/고립 노트 목록에서 limit개만 순위대로 조회 (재구축 결과와 같음)"""
+    for i in range(6):
+        links = " ".join(f"[[Missing{j}]]" for j in range(i + 1))
+        store.update_metadata(make_doc(f"/vault/00 Notes/Src{i}.md", links))
+    for name in ("Zeta", "Alpha", "Mid"):
+        store.update_metadata(make_doc(f"/vault/00 Notes/{name}.md", "no links"))
+    store.delete_metadata("/vault/00 Notes/Mid.md")
+
+    top = store.get_unresolved_links(limit=3, max_sources=2)
+    assert [(link["target"], link["references"]) for link in top] == [
+        ("Missing0", 6),
+        ("Missing1", 5),
+        ("Missing2", 4),
+    ]
+    assert top[0]["sources"] == ["Src0", "Src1"]
+    assert store.get_link_health(limit=1)["orphans"] == ["Alpha"]
+    assert store.get_orphaned_notes() == ["Alpha", "Zeta"]
+
+    delta = (store.orphans, store._dangling_buckets, store._dangling_counts)
+    store._rebuild_health()
+    assert (store.orphans, store._dangling_buckets, store._dangling_counts) == delta
@@ -0,0 +1,75 @@
+"""파싱된 노트 캐시 테스트"""
+
+import os
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from note_cache import NoteCache  # noqa: E402
+from obsidian_parser import ObsidianParser  # noqa: E402
+
+
+class CountingParser(ObsidianParser):
+    """parse_file 호출 횟수를 세는 파서"""
+
+    def __init__(self):
+        super().__init__()
+        self.parsed = []
+
+    def parse_file(self, file_path):
+        self.parsed.append(file_path.name)
+        return super().parse_file(file_path)
+
+
+def write_note(path: Path, text: str, mtime_ns: int):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_hit_until_file_changes(tmp_path, monkeypatch):
+    """같은 (mtime, 크기)면 캐시 사용, 바뀌면 다시 파싱"""
+    monkeypatch.setattr("obsidian_parser.VAULT_PATH", tmp_path)
+    note = tmp_path / "Alpha.md"
+    write_note(note, "---\ntags: [idea]\n---\n[[Beta]] 본문", 1_000_000_000)
+    parser = CountingParser()
+    cache = NoteCache(parser)
+
+    first = cache.get(str(note))
+    second = cache.get(str(note))
+    assert first == second
+    assert first["wiki_links"] == ["Beta"]
+    assert parser.parsed == ["Alpha.md"]
+
+    # 반환값은 복사본이라 호출자가 키를 추가해도 캐시는 그대로
+    first["similarity_score"] = 0.5
+    assert "similarity_score" not in cache.get(str(note))
+
+    # 크기가 같아도 mtime(나노초)이 바뀌면 다시 파싱
+    write_note(note, "---\ntags: [idea]\n---\n[[Gamma]] 본문", 1_000_000_001)
+    assert cache.get(str(note))["wiki_links"] == ["Gamma"]
+    assert parser.parsed == ["Alpha.md", "Alpha.md"]
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_eviction_and_deleted_file(tmp_path, monkeypatch):
+    """최대 항목 수를 넘으면 가장 오래 쓰지 않은 노트 제거, 삭제된 파일은 None"""
+    monkeypatch.setattr("obsidian_parser.VAULT_PATH", tmp_path)
+    paths = []
+    for name in ["A", "B", "C"]:
+        note = tmp_path / f"{name}.md"
+        write_note(note, f"{name} 본문", 1_000_000_000)
+        paths.append(str(note))
+    cache = NoteCache(CountingParser(), max_entries=2)
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+    assert list(cache._cache) == [paths[0], paths[2]]
+
+    os.remove(paths[0])
+    assert cache.get(paths[0]) is None
+    assert len(cache) == 1
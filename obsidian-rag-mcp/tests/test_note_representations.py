@@ -0,0 +1,96 @@
+"""노트 요약 표현 (outline / lead / key_lines) 테스트"""
+
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import note_representations  # noqa: E402
+from note_representations import (  # noqa: E402
+    build_key_lines,
+    build_lead,
+    build_outline,
+    build_representations,
+)
+from repomix_store import RepomixIndexStore  # noqa: E402
+from tokenizer import content_hash  # noqa: E402
+
+CONTENT = """# 프로젝트 계획
+
+이 노트는 새 검색 기능의 계획을 정리합니다.
+두 번째 줄도 같은 문단입니다.
+
+## 할 일
+
+- [ ] **인덱스 구조** 정하기
+- 참고: [[검색 설계]]와 [[토큰 예산]]
+그냥 평범한 문장입니다.
+
+```python
+# 코드 안의 주석은 제목이 아님
+- 코드 안의 목록도 제외
+```
+
+### 결정 사항
+
+> 결정: 증분 인덱싱을 먼저 한다
+"""
+
+
+def test_outline_lead_and_key_lines():
+    """제목 계층, 첫 문단, 점수가 높은 줄을 원래 순서로 추출"""
+    assert build_outline(CONTENT) == "- 프로젝트 계획\n  - 할 일\n    - 결정 사항"
+    assert build_lead(CONTENT) == (
+        "이 노트는 새 검색 기능의 계획을 정리합니다. 두 번째 줄도 같은 문단입니다."
+    )
+    assert build_key_lines(CONTENT).split("\n") == [
+        "- [ ] **인덱스 구조** 정하기",
+        "- 참고: [[검색 설계]]와 [[토큰 예산]]",
+        "> 결정: 증분 인덱싱을 먼저 한다",
+    ]
+    assert build_outline("제목 없는 노트") == ""
+
+
+def test_lead_is_cut_at_word_boundary(monkeypatch):
+    """첫 문단이 길면 단어 경계에서 자르고 생략 표시"""
+    monkeypatch.setattr(note_representations, "REPRESENTATION_LEAD_CHARS", 20)
+    lead = build_lead("하나 둘 셋 넷 다섯 여섯 일곱 여덟 아홉 열")
+    assert lead == "하나 둘 셋 넷 다섯 여섯 일곱 …"
+
+
+def test_store_reuses_representations_by_hash(tmp_path, monkeypatch):
+    """인덱스에 저장하고, 내용이 같으면 재사용, 바뀌면 다시 계산"""
+    monkeypatch.setattr("repomix_store.VAULT_PATH", tmp_path)
+    built = []
+
+    def counting_build(content, count_tokens, digest):
+        built.append(digest)
+        return build_representations(content, count_tokens, digest)
+
+    monkeypatch.setattr("repomix_store.build_representations", counting_build)
+    store = RepomixIndexStore(index_file=tmp_path / "repomix_index.db")
+    note = tmp_path / "Plan.md"
+    note.write_text(CONTENT, encoding="utf-8")
+    doc = {"title": "Plan", "content": CONTENT, "para_folder": "00 Notes", "tags": []}
+
+    store.update_index(doc, note)
+    store.update_index(doc, note)
+    assert built == [content_hash(CONTENT)]
+
+    representations = store.get_representations(str(note), content_hash(CONTENT))
+    assert representations["outline"]["text"] == build_outline(CONTENT)
+    assert representations["lead"]["tokens"] == store.token_counter.count(
+        representations["lead"]["text"]
+    )
+    assert store.get_representations(str(note), content_hash("다른 내용")) is None
+
+    changed = CONTENT + "\n## 추가 섹션\n"
+    store.update_index({**doc, "content": changed}, note)
+    assert len(built) == 2
+    assert "추가 섹션" in store.get_representations(str(note))["outline"]["text"]
+
+    # 저장 후 다시 열어도 유지
+    store.save_index()
+    reloaded = RepomixIndexStore(index_file=tmp_path / "repomix_index.db")
+    assert reloaded.get_representations(str(note), content_hash(changed)) is not None
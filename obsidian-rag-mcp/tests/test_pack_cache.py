@@ -0,0 +1,66 @@
+"""패킹 결과 캐시 테스트"""
+
+import os
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from pack_cache import PackCache, file_stamp  # noqa: E402
+
+
+def test_generation_change_clears_entries(tmp_path):
+    """인덱스 세대가 바뀌면 이전 항목은 모두 무효"""
+    cache = PackCache()
+    cache.put(("Hub", 1000), 1, "패키지", {"tokens": 10}, {})
+
+    text, report = cache.get(("Hub", 1000), 1)
+    assert text == "패키지"
+    # 반환된 리포트를 바꿔도 캐시에 영향 없음
+    report["tokens"] = 0
+    assert cache.get(("Hub", 1000), 1)[1] == {"tokens": 10}
+
+    assert cache.get(("Hub", 1000), 2) is None
+    assert len(cache) == 0
+    # 만드는 동안 세대가 바뀐 (낡은) 결과는 저장하지 않음
+    cache.put(("Hub", 1000), 1, "낡은 패키지", None, {})
+    assert len(cache) == 0
+
+
+def test_changed_note_file_invalidates(tmp_path):
+    """후보 노트 파일이 바뀌거나 삭제되면 조회 시 제거"""
+    note = tmp_path / "Back.md"
+    note.write_text("본문", encoding="utf-8")
+    os.utime(note, ns=(1_000_000_000, 1_000_000_000))
+    cache = PackCache()
+    cache.put("key", 1, "패키지", None, {str(note): file_stamp(str(note))})
+    assert cache.get("key", 1) == ("패키지", None)
+
+    os.utime(note, ns=(2_000_000_000, 2_000_000_000))
+    assert cache.get("key", 1) is None
+    assert len(cache) == 0
+
+    cache.put("key", 1, "패키지", None, {str(note): file_stamp(str(note))})
+    note.unlink()
+    assert cache.get("key", 1) is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+
+
+def test_memory_cap_evicts_least_recently_used():
+    """메모리 합계가 상한을 넘으면 오래 쓰지 않은 항목부터 제거, 상한보다 큰 항목은 저장 안 함"""
+    text = "가" * 1000
+    size = sys.getsizeof(text)
+    cache = PackCache(max_entries=10, max_bytes=size * 2)
+
+    cache.put("a", 1, text, None, {})
+    cache.put("b", 1, text, None, {})
+    cache.get("a", 1)
+    cache.put("c", 1, text, None, {})
+    assert list(cache._cache) == ["a", "c"]
+    assert cache.stats()["bytes"] == size * 2
+    assert cache.stats()["evictions"] == 1
+
+    cache.put("huge", 1, "가" * 5000, None, {})
+    assert "huge" not in cache._cache
+    assert len(cache) == 2
@@ -0,0 +1,217 @@
+"""메타데이터 파일 저장/로드 (SQLite 지연 로드, JSON 마이그레이션) 테스트"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import indexer as indexer_module  # noqa: E402
+from conftest import make_doc  # noqa: E402
+from indexer import UnifiedIndexer  # noqa: E402
+from network_store import NetworkMetadataStore  # noqa: E402
+from persistence import FORMAT_VERSION, LazyRecordMap  # noqa: E402
+from repomix_store import RepomixIndexStore  # noqa: E402
+
+
+def build_store(metadata_file: Path) -> NetworkMetadataStore:
+    """노트 3개를 가진 저장소"""
+    store = NetworkMetadataStore(metadata_file=metadata_file)
+    store.update_metadata(
+        make_doc("/vault/00 Notes/Alpha.md", "[[Beta]] [[Gamma]]", {"status": "draft"})
+    )
+    store.update_metadata(
+        make_doc("/vault/00 Notes/Beta.md", "[[Gamma]] #idea", {"aliases": ["B"]})
+    )
+    store.update_metadata(make_doc("/vault/00 Notes/Gamma.md", "#idea/sub"))
+    store.save_metadata()
+    return store
+
+
+def record_count(db_file: Path) -> int:
+    """SQLite 파일의 레코드 수"""
+    conn = sqlite3.connect(str(db_file))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_sqlite_roundtrip_loads_lazily(tmp_path):
+    """SQLite 저장 후 재로드: 요약만 읽고 전체 레코드는 접근할 때 로드"""
+    db_file = tmp_path / "network_metadata.db"
+    store = build_store(db_file)
+    assert db_file.exists()
+
+    reloaded = NetworkMetadataStore(metadata_file=db_file)
+    files = reloaded.metadata["files"]
+    assert isinstance(files, LazyRecordMap)
+    assert files.loaded() == {}
+
+    # 인덱스는 요약만으로 구축 (별칭 포함)
+    assert reloaded.get_backlinks("Gamma") == ["Alpha", "Beta"]
+    assert reloaded._find_file_by_title("B") == "/vault/00 Notes/Beta.md"
+    assert reloaded.get_notes_by_tag("idea") == ["Beta", "Gamma"]
+    assert reloaded.metadata["stats"] == store.get_network_stats()
+    assert files.loaded() == {}
+
+    # 전체 레코드는 처음 접근할 때 로드
+    alpha = files["/vault/00 Notes/Alpha.md"]
+    assert alpha["yaml_frontmatter"] == {"status": "draft"}
+    assert list(files.loaded()) == ["/vault/00 Notes/Alpha.md"]
+    assert dict(files) == dict(store.metadata["files"])
+
+
+def test_repomix_sqlite_roundtrip(tmp_path):
+    """Repomix 인덱스: 통계/태그/최근 수정 조회는 요약으로, 상세 정보는 지연 로드"""
+    note = tmp_path / "Alpha.md"
+    note.write_text("# Alpha\n\n[[Beta]] #idea", encoding="utf-8")
+    doc = {
+        "path": str(note),
+        "title": "Alpha",
+        "content": note.read_text(encoding="utf-8"),
+        "tags": ["idea"],
+        "wiki_links": ["Beta"],
+        "backlinks": ["Gamma"],
+        "para_folder": "00 Notes",
+    }
+
+    db_file = tmp_path / "repomix_index.db"
+    store = RepomixIndexStore(index_file=db_file)
+    store.update_index(doc, note)
+    store.save_index()
+
+    reloaded = RepomixIndexStore(index_file=db_file)
+    files = reloaded.index["files"]
+    assert reloaded.index["stats"] == store.index["stats"]
+    assert reloaded.get_folder_stats() == store.get_folder_stats()
+    assert reloaded.get_tag_stats() == {"idea": 1}
+    assert files.loaded() == {}
+
+    assert [r["title"] for r in reloaded.query_by_timeframe(days=1)] == ["Alpha"]
+    assert files[str(note)] == store.index["files"][str(note)]
+    assert files[str(note)]["metadata"]["backlinks"] == ["Gamma"]
+
+
+def test_incremental_save(tmp_path):
+    """재저장 시 변경/삭제된 레코드만 반영"""
+    db_file = tmp_path / "network_metadata.db"
+    build_store(db_file)
+
+    store = NetworkMetadataStore(metadata_file=db_file)
+    store.delete_metadata("/vault/00 Notes/Beta.md")
+    store.update_metadata(make_doc("/vault/00 Notes/Delta.md", "[[Alpha]]"))
+    store.save_metadata()
+    assert record_count(db_file) == 3
+    assert store.metadata["files"].loaded() == {}
+
+    reloaded = NetworkMetadataStore(metadata_file=db_file)
+    assert sorted(reloaded.metadata["files"]) == [
+        "/vault/00 Notes/Alpha.md",
+        "/vault/00 Notes/Delta.md",
+        "/vault/00 Notes/Gamma.md",
+    ]
+    assert reloaded.get_backlinks("Alpha") == ["Delta"]
+    assert reloaded.get_backlinks("Gamma") == ["Alpha"]
+
+
+def test_migrates_legacy_json(tmp_path):
+    """SQLite 파일이 없으면 같은 이름의 JSON 파일을 자동 변환"""
+    legacy = build_store(tmp_path / "network_metadata.json")
+    db_file = tmp_path / "network_metadata.db"
+    assert not db_file.exists()
+
+    migrated = NetworkMetadataStore(metadata_file=db_file)
+    assert db_file.exists()
+    assert (tmp_path / "network_metadata.json").exists()
+    assert dict(migrated.metadata["files"]) == dict(legacy.metadata["files"])
+    assert migrated.get_network_stats() == legacy.get_network_stats()
+
+
+def test_json_backend_writes_compact_json(tmp_path):
+    """.json 경로는 공백 없는 JSON으로 저장 (임시 파일이 남지 않음)"""
+    json_file = tmp_path / "network_metadata.json"
+    build_store(json_file)
+
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert len(data["files"]) == 3
+    assert "\n" not in json_file.read_text(encoding="utf-8")
+    assert [p.name for p in tmp_path.iterdir()] == ["network_metadata.json"]
+
+
+def test_unsupported_format_version(tmp_path, capsys):
+    """다른 형식 버전의 파일은 로드하지 않고 옮겨 두어 저장 시 덮어쓰지 않음"""
+    db_file = tmp_path / "network_metadata.db"
+    build_store(db_file)
+
+    conn = sqlite3.connect(str(db_file))
+    with conn:
+        conn.execute(
+            "UPDATE header SET value = ? WHERE key = 'format_version'",
+            (json.dumps(FORMAT_VERSION + 1),),
+        )
+    conn.close()
+
+    store = NetworkMetadataStore(metadata_file=db_file)
+    assert len(store.metadata["files"]) == 0
+    assert "형식 버전" in capsys.readouterr().err
+    assert "형식 버전" in store.load_error
+
+    (moved,) = tmp_path.glob("network_metadata.db.unreadable-*")
+    store.save_metadata()
+    assert record_count(moved) == 3
+    assert record_count(db_file) == 0
+
+
+def test_corrupt_file_forces_reindex(tmp_path, monkeypatch):
+    """손상된 파일은 옮겨 두고, 인덱서는 vault에 남은 파일을 다시 인덱싱하도록 기록을 비움"""
+    db_file = tmp_path / "repomix_index.db"
+    db_file.write_bytes(b"not a sqlite file" * 100)
+    note = tmp_path / "Note.md"
+    note.write_text("# Note", encoding="utf-8")
+    metadata_file = tmp_path / "index_metadata.json"
+    metadata_file.write_text(
+        json.dumps(
+            {"indexed_files": {str(note): "hash", str(tmp_path / "Gone.md"): "hash"}}
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(indexer_module, "METADATA_FILE", metadata_file)
+
+    repomix_store = RepomixIndexStore(index_file=db_file)
+    assert repomix_store.load_error
+    assert not db_file.exists()
+    assert len(list(tmp_path.glob("repomix_index.db.unreadable-*"))) == 1
+
+    network_store = NetworkMetadataStore(metadata_file=tmp_path / "network_metadata.db")
+    indexer = UnifiedIndexer(object(), network_store, repomix_store)
+    # 남은 파일은 다시 인덱싱 (ChromaDB 청크는 교체), 사라진 파일은 삭제 처리를 위해 유지
+    assert indexer.metadata["indexed_files"] == {str(tmp_path / "Gone.md"): "hash"}
+    assert indexer.metadata["reindex_paths"] == [str(note)]
+    saved = json.loads(metadata_file.read_text(encoding="utf-8"))
+    assert saved["reindex_paths"] == [str(note)]
+
+
+@pytest.mark.parametrize("suffix", [".db", ".json"])
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch, suffix):
+    """쓰기 도중 실패하면 기존 파일이 그대로 남음"""
+    metadata_file = tmp_path / f"network_metadata{suffix}"
+    store = build_store(metadata_file)
+    before = metadata_file.read_bytes()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("persistence.os.replace", fail)
+    # 전체 쓰기 경로를 타도록 새 데이터로 교체
+    store.metadata = {**store.metadata, "files": dict(store.metadata["files"])}
+    store.update_metadata(make_doc("/vault/00 Notes/Delta.md", "[[Alpha]]"))
+    store.save_metadata()
+
+    assert metadata_file.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == [metadata_file.name]
@@ -1,4 +1,5 @@
 import json
+import os
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -208,7 +209,9 @@ def test_query_by_timeframe(temp_index_file):
         }
         store.update_index(recent_doc, recent_file)
 
-        # 오래된 파일 추가 (타임스탬프 조작)
+        # 오래된 파일 추가 (파일 수정 시각을 30일 전으로 설정)
+        old_mtime = (datetime.now() - timedelta(days=30)).timestamp()
+        os.utime(old_file, (old_mtime, old_mtime))
         old_doc = {
             "title": "Old Note",
             "content": "Old note",
@@ -219,18 +222,26 @@ def test_query_by_timeframe(temp_index_file):
         }
         store.update_index(old_doc, old_file)
 
-        # 오래된 파일의 타임스탬프를 30일 전으로 설정
-        old_timestamp = (datetime.now() - timedelta(days=30)).isoformat()
-        store.index["files"][str(old_file)]["timestamps"]["modified"] = old_timestamp
-
         # 최근 7일 이내 파일 쿼리
         results = store.query_by_timeframe(days=7)
         assert len(results) == 1
         assert results[0]["title"] == "Recent Note"
+        assert store.count_by_timeframe(days=7) == 1
 
-        # 최근 60일 이내 파일 쿼리
+        # 최근 60일 이내 파일 쿼리 (최신순)
         results = store.query_by_timeframe(days=60)
-        assert len(results) == 2
+        assert [r["title"] for r in results] == ["Recent Note", "Old Note"]
+        assert [r["title"] for r in store.query_by_timeframe(days=60, limit=1)] == [
+            "Recent Note"
+        ]
+
+        # 폴더 파티션
+        assert store.query_by_timeframe(days=60, folder="01 Reference") == []
+        assert len(store.query_by_timeframe(days=60, folder="00 Notes")) == 2
+
+        # 삭제하면 인덱스에서도 제거
+        store.delete_index(str(recent_file))
+        assert store.query_by_timeframe(days=7) == []
 
     finally:
         recent_file.unlink()
@@ -405,6 +416,67 @@ def test_get_tag_stats(temp_index_file):
             f.unlink()
 
 
+def test_running_stats_match_full_recount(tmp_path):
+    """델타로 유지한 집계가 전체 재계산과 같고, 저장 후 재로드해도 유지됨"""
+    index_file = tmp_path / "repomix_index.db"
+    store = RepomixIndexStore(index_file)
+
+    notes = {}
+    for i, (folder, tags) in enumerate(
+        [("00 Notes", ["ai"]), ("00 Notes", ["ai", "db"]), ("01 Projects", ["db"])]
+    ):
+        note = tmp_path / f"Note{i}.md"
+        note.write_text("word " * (10 * (i + 1)), encoding="utf-8")
+        notes[i] = note
+        doc = {
+            "title": note.stem,
+            "content": note.read_text(encoding="utf-8"),
+            "para_folder": folder,
+            "tags": tags,
+        }
+        store.update_index(doc, note)
+
+    # 내용/폴더 변경과 삭제
+    notes[0].write_text("word " * 5, encoding="utf-8")
+    store.update_index(
+        {
+            "title": "Note0",
+            "content": notes[0].read_text(encoding="utf-8"),
+            "para_folder": "01 Projects",
+            "tags": ["db"],
+        },
+        notes[0],
+    )
+    store.delete_index(str(notes[2]))
+
+    files = [store.index["files"][path] for path in store.index["files"]]
+    stats = store.get_stats()
+    assert stats["total_files"] == 2
+    assert stats["total_words"] == sum(f["size"]["words"] for f in files)
+    assert stats["total_tokens_estimated"] == sum(
+        f["size"]["estimated_tokens"] for f in files
+    )
+    assert stats["by_folder"] == {
+        "00 Notes": {
+            "files": 1,
+            "words": 20,
+            "tokens": files[1]["size"]["estimated_tokens"],
+        },
+        "01 Projects": {
+            "files": 1,
+            "words": 5,
+            "tokens": files[0]["size"]["estimated_tokens"],
+        },
+    }
+    assert stats["top_tags"] == {"db": 2, "ai": 1}
+    assert store.get_stats(top_tags=1)["top_tags"] == {"db": 2}
+
+    store.save_index()
+    reloaded = RepomixIndexStore(index_file)
+    assert reloaded.index["stats"] == stats
+    assert reloaded.get_stats() == stats
+
+
 def test_token_estimation_accuracy(temp_index_file):
     """토큰 추정 정확도 테스트"""
     store = RepomixIndexStore(temp_index_file)
@@ -440,5 +512,34 @@ def test_token_estimation_accuracy(temp_index_file):
             temp_file.unlink()
 
 
+def test_query_by_backlinks_with_synced_backlinks(temp_index_file, tmp_path):
+    """network_store에서 동기화한 백링크로 다단계 순회"""
+    store = RepomixIndexStore(temp_index_file)
+
+    for title in ("Hub", "Spoke", "Leaf"):
+        note = tmp_path / f"{title}.md"
+        note.write_text(f"# {title}", encoding="utf-8")
+        store.update_index({"title": title, "content": f"# {title}", "tags": []}, note)
+
+    store.update_backlinks(
+        {
+            str(tmp_path / "Hub.md"): ["Spoke"],
+            str(tmp_path / "Spoke.md"): ["Leaf", "Hub"],
+        }
+    )
+
+    assert store.index["files"][str(tmp_path / "Hub.md")]["metadata"]["backlink_count"] == 1
+    assert [r["title"] for r in store.query_by_backlinks("Hub", depth=1)] == ["Hub", "Spoke"]
+    assert [r["title"] for r in store.query_by_backlinks("Hub", depth=2)] == [
+        "Hub",
+        "Spoke",
+        "Leaf",
+    ]
+
+    # 재인덱싱해도 동기화된 백링크 유지
+    store.update_index({"title": "Hub", "content": "changed", "tags": []}, tmp_path / "Hub.md")
+    assert store.index["files"][str(tmp_path / "Hub.md")]["metadata"]["backlinks"] == ["Spoke"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,57 @@
+"""태그 역인덱스 테스트"""
+
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from network_store import NetworkMetadataStore  # noqa: E402
+from tag_index import TagIndex, normalize_tag  # noqa: E402
+
+
+def test_nested_prefix_queries():
+    """중첩 태그 접두사 조회는 '/' 경계에서만 일치"""
+    index = TagIndex()
+    index.add("a.md", ["project/alpha", "#Idea"])
+    index.add("b.md", ["project/beta/x"])
+    index.add("c.md", ["project", "projects"])
+
+    assert index.paths("project") == {"a.md", "b.md", "c.md"}
+    assert index.paths("#Project/Beta") == {"b.md"}
+    assert index.paths("project", include_nested=False) == {"c.md"}
+    assert index.paths("idea") == {"a.md"}
+    assert index.tags_under("project") == ["project", "project/alpha", "project/beta/x"]
+
+    index.remove("b.md", ["project/beta/x"])
+    assert index.tags_under("project/beta") == []
+    assert index.counts() == {"idea": 1, "project": 1, "project/alpha": 1, "projects": 1}
+    assert normalize_tag(" #Area/Health/ ") == "area/health"
+
+
+def test_network_store_tag_index(tmp_path):
+    """인라인/YAML 태그를 델타로 색인하고 중첩 태그로 조회"""
+    store = NetworkMetadataStore(metadata_file=tmp_path / "network_metadata.json")
+    store.update_metadata(
+        {
+            "path": "/vault/A.md",
+            "title": "A",
+            "content": "#project/alpha 진행 중",
+            "metadata": {"tags": ["Area/Work"]},
+        }
+    )
+    store.update_metadata(
+        {"path": "/vault/B.md", "title": "B", "content": "#project", "metadata": {}}
+    )
+
+    assert store.get_notes_by_tag("project") == ["A", "B"]
+    assert store.get_notes_by_tag("area") == ["A"]
+    assert store.get_paths_by_tag("project/alpha") == ["/vault/A.md"]
+
+    store.update_metadata({"path": "/vault/A.md", "title": "A", "content": "", "metadata": {}})
+    assert store.get_notes_by_tag("project") == ["B"]
+
+    reloaded = NetworkMetadataStore(metadata_file=tmp_path / "network_metadata.json")
+    store.save_metadata()
+    reloaded.metadata = reloaded.load_metadata()
+    assert reloaded.get_all_tags() == {"project": 1}
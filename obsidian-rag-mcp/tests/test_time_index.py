@@ -0,0 +1,70 @@
+"""수정 시각 정렬 인덱스 테스트"""
+
+import random
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from time_index import TimeIndex, modified_epoch  # noqa: E402
+
+
+def test_window_is_newest_first_and_inclusive():
+    """구간은 양 끝 포함, 최신순, limit개만"""
+    index = TimeIndex()
+    index.add("a.md", 100.0, "00 Notes")
+    index.add("b.md", 200.0, "01 Projects")
+    index.add("c.md", 300.0, "00 Notes")
+    index.add("d.md", 300.0, "00 Notes")
+
+    assert index.window(200.0) == [(300.0, "d.md"), (300.0, "c.md"), (200.0, "b.md")]
+    assert index.window(100.0, until=200.0) == [(200.0, "b.md"), (100.0, "a.md")]
+    assert index.window(0.0, limit=2) == [(300.0, "d.md"), (300.0, "c.md")]
+    assert index.window(0.0, folder="00 Notes", until=299.0) == [(100.0, "a.md")]
+    assert index.window(0.0, folder="02 Areas") == []
+    assert index.count(150.0) == 3
+    assert index.count(150.0, folder="00 Notes") == 2
+
+
+def test_update_and_remove():
+    """같은 경로를 다시 추가하면 시각/폴더가 옮겨지고, 제거하면 빈 폴더도 정리"""
+    index = TimeIndex()
+    index.add("a.md", 100.0, "00 Notes")
+    index.add("a.md", 500.0, "01 Projects")
+
+    assert index.entries == [(500.0, "a.md")]
+    assert index.folders == {"01 Projects": [(500.0, "a.md")]}
+
+    index.remove("a.md")
+    index.remove("missing.md")
+    assert len(index) == 0
+    assert index.folders == {}
+
+
+def test_rebuild_matches_incremental():
+    """한 번에 재구축한 결과와 하나씩 추가한 결과가 같음"""
+    rng = random.Random(3)
+    items = [
+        (f"note{i}.md", float(rng.randrange(50)), f"{rng.randrange(3):02d} Folder")
+        for i in range(200)
+    ]
+
+    incremental = TimeIndex()
+    for path, epoch, folder in items:
+        incremental.add(path, epoch, folder)
+    rebuilt = TimeIndex()
+    rebuilt.rebuild(items)
+
+    assert rebuilt.entries == incremental.entries
+    assert rebuilt.folders == incremental.folders
+    assert rebuilt.window(10.0, until=20.0, limit=5) == incremental.window(
+        10.0, until=20.0, limit=5
+    )
+
+
+def test_modified_epoch_falls_back_to_iso():
+    """이전 형식(ISO 문자열만 있음)도 epoch로 변환"""
+    assert modified_epoch({"modified": "2024-01-01T00:00:00", "modified_epoch": 42.0}) == 42.0
+    epoch = modified_epoch({"modified": "2024-01-01T00:00:00"})
+    assert isinstance(epoch, float)
@@ -0,0 +1,105 @@
+"""공유 토크나이저와 토큰 수 캐시 테스트"""
+
+import sys
+from pathlib import Path
+
+# src 디렉토리를 Python path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from context_packer import SmartPacker  # noqa: E402
+from repomix_store import RepomixIndexStore  # noqa: E402
+from tokenizer import TokenCounter, content_hash, get_token_counter, get_tokenizer  # noqa: E402
+
+
+class CountingTokenizer:
+    """인코딩 호출 횟수를 세는 토크나이저 래퍼"""
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self.encoded = []
+
+    def encode_ordinary(self, text):
+        self.encoded.append(text)
+        return self.tokenizer.encode_ordinary(text)
+
+    def encode_ordinary_batch(self, texts, num_threads=8):
+        self.encoded.extend(texts)
+        return self.tokenizer.encode_ordinary_batch(texts, num_threads=num_threads)
+
+
+def test_shared_tokenizer(tmp_path):
+    """RepomixIndexStore와 SmartPacker가 같은 토크나이저/캐시 사용"""
+    store = RepomixIndexStore(index_file=tmp_path / "repomix_index.json")
+    packer = SmartPacker()
+
+    assert store.tokenizer is get_tokenizer() is packer.tokenizer
+    assert store.token_counter is get_token_counter() is packer.token_counter
+
+
+def test_count_is_cached_by_content():
+    """같은 내용은 한 번만 인코딩"""
+    tokenizer = CountingTokenizer(get_tokenizer())
+    counter = TokenCounter(tokenizer)
+
+    first = counter.count("같은 내용의 노트 본문")
+    second = counter.count("같은 내용의 노트 본문")
+
+    assert first == second == len(get_tokenizer().encode_ordinary("같은 내용의 노트 본문"))
+    assert tokenizer.encoded == ["같은 내용의 노트 본문"]
+    assert (counter.hits, counter.misses) == (1, 1)
+
+
+def test_count_many_batches_missing_texts():
+    """배치 계산: 캐시에 없는 고유 텍스트만 인코딩하고 입력 순서대로 반환"""
+    tokenizer = CountingTokenizer(get_tokenizer())
+    counter = TokenCounter(tokenizer)
+    counter.count("alpha")
+
+    texts = ["alpha", "beta gamma", "beta gamma", "delta <|endoftext|>"]
+    counts = counter.count_many(texts)
+
+    assert counts == [len(get_tokenizer().encode_ordinary(t)) for t in texts]
+    assert tokenizer.encoded == ["alpha", "beta gamma", "delta <|endoftext|>"]
+
+
+def test_cache_is_bounded():
+    """최대 항목 수를 넘으면 가장 오래 쓰지 않은 항목부터 제거"""
+    counter = TokenCounter(get_tokenizer(), max_entries=2)
+    counter.count("one")
+    counter.count("two")
+    counter.count("one")
+    counter.count("three")
+
+    assert list(counter._cache) == [content_hash("one"), content_hash("three")]
+
+
+def test_repomix_reuses_stored_token_count(tmp_path):
+    """내용이 바뀌지 않은 노트는 저장된 토큰 수 재사용 (재시작 후에도)"""
+    note = tmp_path / "Alpha.md"
+    content = "# Alpha\n\n" + "긴 노트 본문 " * 200
+    note.write_text(content, encoding="utf-8")
+    doc = {"path": str(note), "title": "Alpha", "content": content, "tags": []}
+
+    index_file = tmp_path / "repomix_index.db"
+    store = RepomixIndexStore(index_file=index_file)
+    store.update_index(doc, note)
+    store.save_index()
+    tokens = store.index["files"][str(note)]["size"]["estimated_tokens"]
+
+    reloaded = RepomixIndexStore(index_file=index_file)
+    tokenizer = CountingTokenizer(get_tokenizer())
+    reloaded.token_counter = TokenCounter(tokenizer)
+
+    reloaded.update_index(doc, note)
+    assert reloaded.index["files"][str(note)]["size"]["estimated_tokens"] == tokens
+    assert tokenizer.encoded == []
+
+    changed = {**doc, "content": content + "\n추가된 문단"}
+    reloaded.prefetch_token_counts([changed])
+    reloaded.update_index(changed, note)
+    # 본문은 배치로 한 번만 인코딩 (나머지는 요약 표현의 짧은 텍스트)
+    assert tokenizer.encoded.count(changed["content"]) == 1
+    assert tokenizer.encoded[0] == changed["content"]
+    assert reloaded.index["files"][str(note)]["content_hash"] == content_hash(
+        changed["content"]
+    )
@@ -8,7 +8,7 @@ from unittest.mock import MagicMock, patch
 # 프로젝트 루트를 sys.path에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from indexer import UnifiedIndexer
+from indexer import UnifiedIndexer, iter_batches
 
 
 def test_unified_indexer_initialization():
@@ -196,6 +196,27 @@ def test_unified_indexer_backward_compatibility():
     print("✅ 하위 호환성 테스트 통과")
 
 
+def test_iter_batches_bounds_count_and_bytes(tmp_path):
+    """배치는 파일 수와 크기 합계 중 먼저 닿는 상한에서 끊김 (큰 파일은 단독 배치)"""
+    sizes = [10, 10, 10, 50, 10, 10, 10, 10]
+    files = []
+    for i, size in enumerate(sizes):
+        path = tmp_path / f"Note {i}.md"
+        path.write_text("x" * size)
+        files.append(path)
+
+    batches = list(iter_batches(files, max_files=3, max_bytes=25))
+
+    assert [[files.index(file) for file in batch] for batch in batches] == [
+        [0, 1], [2], [3], [4, 5], [6, 7]
+    ]
+    assert list(iter_batches(files, max_files=3, max_bytes=1000)) == [
+        files[0:3], files[3:6], files[6:8]
+    ]
+
+    print("✅ 배치 분할 테스트 통과")
+
+
 if __name__ == "__main__":
     print("🧪 UnifiedIndexer 테스트 시작\n")
 